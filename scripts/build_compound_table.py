@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed compound decomposition table.
+
+Decomposes every custom dictionary entry, plus every long Thai token seen
+often enough in an optional sample corpus, and writes the result next to the
+dictionary (thai_compounds.json -> thai_compounds.decompositions.json).
+The tokenizer service loads that table at startup, so compound splitting at
+query time is a lookup instead of a run of the fallback engines.
+
+Rebuild the table whenever the dictionary changes:
+
+    python scripts/build_compound_table.py
+    python scripts/build_compound_table.py --corpus samples/queries.txt --min-count 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tokenizer.compound_table import (
+    DEFAULT_ENGINES,
+    build_compound_table,
+    default_table_path,
+    frequent_long_tokens
+)
+
+
+def load_dictionary_words(dict_path: Path) -> list:
+    """Load words from a list or category -> list JSON dictionary."""
+    with open(dict_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    words = []
+    if isinstance(data, list):
+        words = data
+    elif isinstance(data, dict):
+        for _, entries in data.items():
+            if isinstance(entries, list):
+                words.extend(entries)
+            elif isinstance(entries, str):
+                words.append(entries)
+
+    return [word.strip() for word in words if word.strip()]
+
+
+def read_corpus(corpus_path: Path):
+    """Yield lines of a plain-text corpus, one document or query per line."""
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line.strip()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Precompute compound word decompositions for the Thai tokenizer"
+    )
+    parser.add_argument(
+        "--dictionary",
+        default="data/dictionaries/thai_compounds.json",
+        help="Custom dictionary file (default: data/dictionaries/thai_compounds.json)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Output table path (default: next to the dictionary)"
+    )
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        default=[],
+        help="Plain-text sample corpus whose frequent long tokens are added (repeatable)"
+    )
+    parser.add_argument(
+        "--min-count",
+        type=int,
+        default=3,
+        help="Minimum corpus occurrences for a long token to be included (default: 3)"
+    )
+    parser.add_argument(
+        "--engines",
+        default=",".join(DEFAULT_ENGINES),
+        help="Comma-separated engines proposing decompositions; unavailable ones are skipped"
+    )
+
+    args = parser.parse_args()
+
+    dict_path = Path(args.dictionary)
+    if not dict_path.exists():
+        print(f"❌ Dictionary not found: {dict_path}")
+        sys.exit(1)
+
+    output_path = Path(args.output) if args.output else default_table_path(dict_path)
+    engines = tuple(engine.strip() for engine in args.engines.split(",") if engine.strip())
+
+    start_time = time.time()
+    words = load_dictionary_words(dict_path)
+    print(f"📖 Loaded {len(words)} dictionary words from {dict_path}")
+
+    extra_words = []
+    for corpus in args.corpus:
+        tokens = frequent_long_tokens(read_corpus(Path(corpus)), min_count=args.min_count)
+        print(f"📄 {len(tokens)} frequent long tokens from {corpus}")
+        extra_words.extend(tokens)
+
+    table = build_compound_table(words, extra_words=extra_words, engines=engines)
+    table.save(output_path)
+
+    split = sum(1 for parts in table.entries.values() if len(parts) > 1)
+    print(f"✅ Wrote {len(table.entries)} entries ({split} compounds) to {output_path}")
+    print(f"   Engines: {', '.join(table.engines) or 'vocabulary only'}")
+    print(f"   Dictionary version: {table.dictionary_version}")
+    print(f"   Build time: {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,66 @@
 """
 Reindex Existing MeiliSearch Data with Thai Tokenization
 
-This script extracts documents from existing MeiliSearch indexes,
-processes them through the Thai tokenizer, and re-indexes them
-with proper tokenized_content fields for compound word search.
+This script streams documents from existing MeiliSearch indexes page by
+page, processes them through the Thai tokenizer, and writes back
+tokenized_content fields for compound word search.
+
+By default the index is rebuilt in a shadow index that is validated and
+then atomically swapped with the live index; the previous contents are
+kept under the shadow name for rollback. --mode in-place updates the live
+index directly instead.
+
+With --all-indexes, several indexes are reindexed at once, smallest first,
+under a global budget of tokenization workers, upload bytes in flight and
+outstanding MeiliSearch tasks, with a combined progress report and ETA.
+
+Each document stores a fingerprint (content hash, tokenizer version and
+dictionary version); documents whose fingerprint is current are skipped.
+Progress is checkpointed after every committed batch, so an interrupted
+run resumes where it stopped.
+
+When SEARCH_PROXY_MEILISEARCH_SHARD_URLS is set, every shard is reindexed
+in turn, each in place on its own node with its own checkpoints, so each
+document stays on the shard that owns it.
 
 Usage:
     python scripts/maintenance/reindex-existing-data.py --index research
     python scripts/maintenance/reindex-existing-data.py --all-indexes
-    python scripts/maintenance/reindex-existing-data.py --dry-run
+    python scripts/maintenance/reindex-existing-data.py --index research --dry-run
+    python scripts/maintenance/reindex-existing-data.py --index research --no-resume
+    python scripts/maintenance/reindex-existing-data.py --index research --validate-query วากาเมะ
+    python scripts/maintenance/reindex-existing-data.py --index research --rollback research__reindex_20250101_120000
 """
 
 import asyncio
 import argparse
 import json
 import logging
+import os
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 from src.meilisearch_integration.client import MeiliSearchClient, MeiliSearchConfig
 from src.meilisearch_integration.document_processor import DocumentProcessor
+from src.meilisearch_integration.reindexer import (
+    CheckpointStore,
+    ReindexBudget,
+    ReindexStats,
+    ReindexVersions,
+    SHADOW_INDEX_MARKER,
+    StreamingReindexer,
+    iter_document_pages
+)
+from src.meilisearch_integration.reindex_scheduler import ReindexScheduler
+from src.meilisearch_integration.sharding import sharding_config_from_settings
+from src.search_proxy.config.settings import SearchProxySettings
 from src.tokenizer.config_manager import ConfigManager
+from src.tokenizer.thai_segmenter import ThaiSegmenter
 
 
 # Configure logging
@@ -43,51 +76,101 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class ReindexStats:
-    """Statistics for reindexing operation."""
-    index_name: str
-    total_documents: int = 0
-    processed_documents: int = 0
-    failed_documents: int = 0
-    skipped_documents: int = 0
-    processing_time_ms: float = 0.0
-    errors: List[str] = None
-    
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
-
-
 class MeiliSearchReindexer:
     """
     Handles reindexing of existing MeiliSearch data with Thai tokenization.
     """
     
-    def __init__(self, config_manager: ConfigManager, dry_run: bool = False):
-        """Initialize reindexer with configuration."""
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        dry_run: bool = False,
+        checkpoint_dir: str = "reindex_checkpoints",
+        page_size: int = 1000,
+        queue_size: int = 4,
+        dictionary_version: Optional[str] = None,
+        mode: str = "shadow",
+        validation_queries: Optional[List[str]] = None,
+        budget: Optional[ReindexBudget] = None,
+        max_concurrent_indexes: int = 4,
+        progress_interval: float = 10.0,
+        host: Optional[str] = None
+    ):
+        """
+        Initialize reindexer with configuration.
+        
+        Args:
+            host: MeiliSearch node to reindex, e.g. one shard (the configured
+                host when None)
+        """
         self.config_manager = config_manager
         self.dry_run = dry_run
+        self.mode = mode
+        self.validation_queries = validation_queries or []
+        self.page_size = page_size
+        self.queue_size = queue_size
+        self.checkpoint_store = CheckpointStore(checkpoint_dir)
+        self.budget = budget or ReindexBudget()
+        self.max_concurrent_indexes = max_concurrent_indexes
+        self.progress_interval = progress_interval
         
         # Initialize MeiliSearch client
         meilisearch_config = config_manager.get_meilisearch_config()
+        self.host = host or meilisearch_config.host
         client_config = MeiliSearchConfig(
-            host=meilisearch_config.host,
+            host=self.host,
             api_key=meilisearch_config.api_key,
             timeout=meilisearch_config.timeout_ms // 1000,
             max_retries=meilisearch_config.max_retries
         )
         self.meilisearch_client = MeiliSearchClient(client_config)
         
+        # Tokenize with the configured engine and custom dictionary, and
+        # version fingerprints by both so a dictionary update is detected
+        tokenizer_config = config_manager.get_tokenizer_config()
+        engine = getattr(tokenizer_config.engine, "value", tokenizer_config.engine)
+        self.versions = ReindexVersions.for_tokenizer(engine, tokenizer_config.custom_dictionary)
+        if dictionary_version:
+            self.versions = ReindexVersions(self.versions.tokenizer_version, dictionary_version)
+        
         # Initialize document processor
         self.document_processor = DocumentProcessor(
+            thai_segmenter=ThaiSegmenter(
+                engine=engine,
+                custom_dict=tokenizer_config.custom_dictionary
+            ),
             meilisearch_client=self.meilisearch_client,
             batch_size=50,  # Smaller batches for reindexing
-            max_concurrent=5  # Conservative concurrency
+            concurrency_limiter=self.budget.tokenize_slots  # Shared by all indexes
         )
         
-        logger.info(f"Initialized reindexer (dry_run={dry_run})")
-        logger.info(f"MeiliSearch host: {meilisearch_config.host}")
+        logger.info(f"Initialized reindexer (mode={mode}, dry_run={dry_run})")
+        logger.info(f"MeiliSearch host: {self.host}")
+        logger.info(
+            f"Versions: tokenizer={self.versions.tokenizer_version}, "
+            f"dictionary={self.versions.dictionary_version}"
+        )
+    
+    def _build_pipeline(
+        self,
+        force: bool = False,
+        on_batch: Optional[Callable[[str, int], None]] = None,
+        on_resume: Optional[Callable[[str, int], None]] = None
+    ) -> StreamingReindexer:
+        """Create a streaming reindex pipeline on the shared budget."""
+        return StreamingReindexer(
+            meilisearch_client=self.meilisearch_client,
+            document_processor=self.document_processor,
+            versions=self.versions,
+            checkpoint_store=self.checkpoint_store,
+            page_size=self.page_size,
+            queue_size=self.queue_size,
+            force=force,
+            dry_run=self.dry_run,
+            budget=self.budget,
+            on_batch=on_batch,
+            on_resume=on_resume
+        )
     
     async def get_all_indexes(self) -> List[str]:
         """Get list of all available indexes."""
@@ -105,208 +188,8 @@ class MeiliSearchReindexer:
             logger.error(f"Failed to get indexes: {e}")
             raise
     
-    async def get_all_documents_from_index(self, index_name: str) -> List[Dict[str, Any]]:
-        """
-        Extract all documents from a MeiliSearch index.
-        
-        Args:
-            index_name: Name of the index to extract from
-            
-        Returns:
-            List of all documents in the index
-        """
-        try:
-            logger.info(f"Extracting documents from index: {index_name}")
-            
-            # Get index reference
-            index = await self.meilisearch_client.get_index(index_name)
-            
-            # Get all documents in batches
-            all_documents = []
-            offset = 0
-            limit = 1000  # MeiliSearch limit per request
-            
-            while True:
-                # Get batch of documents
-                batch = await self.meilisearch_client._retry_operation(
-                    index.get_documents,
-                    {"offset": offset, "limit": limit}
-                )
-                
-                documents = batch.get("results", [])
-                if not documents:
-                    break
-                
-                all_documents.extend(documents)
-                logger.info(f"Extracted {len(documents)} documents (total: {len(all_documents)})")
-                
-                # Check if we got fewer documents than requested (end of data)
-                if len(documents) < limit:
-                    break
-                
-                offset += limit
-            
-            logger.info(f"Total documents extracted from {index_name}: {len(all_documents)}")
-            return all_documents
-            
-        except Exception as e:
-            logger.error(f"Failed to extract documents from {index_name}: {e}")
-            raise
-    
-    async def check_documents_need_reindexing(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """
-        Check which documents need reindexing based on missing tokenized_content.
-        
-        Args:
-            documents: List of documents to check
-            
-        Returns:
-            Analysis of documents that need reindexing
-        """
-        needs_reindexing = []
-        has_tokenized_content = []
-        has_thai_content = []
-        
-        for doc in documents:
-            doc_id = doc.get("id", "unknown")
-            
-            # Check if document has tokenized_content field
-            if not doc.get("tokenized_content"):
-                needs_reindexing.append(doc_id)
-                
-                # Check if document has Thai content
-                title = doc.get("title", "")
-                content = doc.get("content", "")
-                full_text = f"{title} {content}"
-                
-                # Simple Thai detection
-                thai_chars = sum(1 for c in full_text if '\\u0e00' <= c <= '\\u0e7f')
-                if thai_chars > 0:
-                    has_thai_content.append(doc_id)
-            else:
-                has_tokenized_content.append(doc_id)
-        
-        analysis = {
-            "total_documents": len(documents),
-            "needs_reindexing": len(needs_reindexing),
-            "already_tokenized": len(has_tokenized_content),
-            "has_thai_content": len(has_thai_content),
-            "documents_to_process": needs_reindexing[:10],  # Sample
-            "recommendation": self._get_reindexing_recommendation(
-                len(documents), len(needs_reindexing), len(has_thai_content)
-            )
-        }
-        
-        return analysis
-    
-    def _get_reindexing_recommendation(self, total: int, needs_reindexing: int, has_thai: int) -> str:
-        """Get recommendation based on analysis."""
-        if needs_reindexing == 0:
-            return "✅ No reindexing needed - all documents have tokenized_content"
-        elif needs_reindexing == total:
-            return "🔄 Full reindexing recommended - no documents have tokenized_content"
-        elif has_thai > 0:
-            return f"⚠️ Partial reindexing needed - {needs_reindexing} documents missing tokenized_content, {has_thai} have Thai content"
-        else:
-            return "ℹ️ Documents missing tokenized_content but no Thai content detected"
-    
-    async def reindex_documents(
-        self, 
-        index_name: str, 
-        documents: List[Dict[str, Any]],
-        backup_index: bool = True
-    ) -> ReindexStats:
-        """
-        Reindex documents with Thai tokenization.
-        
-        Args:
-            index_name: Name of the index to reindex
-            documents: Documents to reindex
-            backup_index: Whether to create backup before reindexing
-            
-        Returns:
-            Reindexing statistics
-        """
-        start_time = time.time()
-        stats = ReindexStats(index_name=index_name, total_documents=len(documents))
-        
-        try:
-            logger.info(f"Starting reindexing of {len(documents)} documents in {index_name}")
-            
-            if self.dry_run:
-                logger.info("DRY RUN: Would reindex documents but not making actual changes")
-                stats.processed_documents = len(documents)
-                stats.processing_time_ms = (time.time() - start_time) * 1000
-                return stats
-            
-            # Create backup if requested
-            if backup_index:
-                backup_name = f"{index_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                await self._create_backup_index(index_name, backup_name, documents)
-                logger.info(f"Created backup index: {backup_name}")
-            
-            # Filter documents that need processing
-            documents_to_process = [
-                doc for doc in documents 
-                if not doc.get("tokenized_content")
-            ]
-            
-            if not documents_to_process:
-                logger.info("No documents need reindexing")
-                stats.skipped_documents = len(documents)
-                return stats
-            
-            logger.info(f"Processing {len(documents_to_process)} documents that need tokenization")
-            
-            # Process documents through Thai tokenizer
-            batch_result = await self.document_processor.process_batch(
-                documents_to_process,
-                preserve_original=True
-            )
-            
-            # Update statistics
-            stats.processed_documents = batch_result.processed_count
-            stats.failed_documents = batch_result.failed_count
-            stats.skipped_documents = batch_result.skipped_count + (len(documents) - len(documents_to_process))
-            stats.errors = [error.get("error", str(error)) for error in batch_result.errors]
-            
-            # Index processed documents back to MeiliSearch
-            if batch_result.processed_documents:
-                index_result = await self.document_processor.index_processed_documents(
-                    batch_result.processed_documents,
-                    index_name,
-                    update_existing=True
-                )
-                
-                logger.info(f"Indexed {index_result.get('indexed_count', 0)} processed documents")
-            
-            stats.processing_time_ms = (time.time() - start_time) * 1000
-            
-            logger.info(
-                f"Reindexing completed for {index_name}: "
-                f"{stats.processed_documents} processed, "
-                f"{stats.failed_documents} failed, "
-                f"{stats.skipped_documents} skipped "
-                f"({stats.processing_time_ms:.2f}ms)"
-            )
-            
-            return stats
-            
-        except Exception as e:
-            error_msg = f"Reindexing failed for {index_name}: {str(e)}"
-            logger.error(error_msg)
-            stats.errors.append(error_msg)
-            stats.failed_documents = len(documents)
-            stats.processing_time_ms = (time.time() - start_time) * 1000
-            return stats
-    
-    async def _create_backup_index(
-        self, 
-        source_index: str, 
-        backup_index: str, 
-        documents: List[Dict[str, Any]]
-    ):
-        """Create a backup index with original documents."""
+    async def _create_backup_index(self, source_index: str, backup_index: str) -> int:
+        """Stream original documents into a backup index."""
         try:
             # Create backup index
             await self.meilisearch_client.create_index(backup_index)
@@ -315,10 +198,16 @@ class MeiliSearchReindexer:
             source_settings = await self.meilisearch_client.get_index_settings(source_index)
             await self.meilisearch_client.update_index_settings(backup_index, source_settings)
             
-            # Add documents to backup index
-            await self.meilisearch_client.add_documents(backup_index, documents)
+            # Copy documents page by page
+            copied = 0
+            async for _, documents in iter_document_pages(
+                self.meilisearch_client, source_index, page_size=self.page_size
+            ):
+                await self.meilisearch_client.add_documents(backup_index, documents)
+                copied += len(documents)
             
-            logger.info(f"Backup created: {backup_index} with {len(documents)} documents")
+            logger.info(f"Backup created: {backup_index} with {copied} documents")
+            return copied
             
         except Exception as e:
             logger.error(f"Failed to create backup {backup_index}: {e}")
@@ -328,15 +217,21 @@ class MeiliSearchReindexer:
         self, 
         index_name: str, 
         force: bool = False,
-        backup: bool = True
+        backup: bool = True,
+        resume: bool = True,
+        on_batch: Optional[Callable[[str, int], None]] = None,
+        on_resume: Optional[Callable[[str, int], None]] = None
     ) -> ReindexStats:
         """
         Reindex a single MeiliSearch index.
         
         Args:
             index_name: Name of the index to reindex
-            force: Force reindexing even if not needed
-            backup: Create backup before reindexing
+            force: Reprocess documents even if their fingerprint is current
+            backup: Create backup before reindexing (in-place mode only)
+            resume: Continue from the last checkpoint if one matches
+            on_batch: Progress callback for committed batches
+            on_resume: Progress callback for the offset a run resumes from
             
         Returns:
             Reindexing statistics
@@ -348,29 +243,24 @@ class MeiliSearchReindexer:
             if not await self.meilisearch_client.index_exists(index_name):
                 raise ValueError(f"Index '{index_name}' does not exist")
             
-            # Extract all documents
-            documents = await self.get_all_documents_from_index(index_name)
-            
-            if not documents:
-                logger.warning(f"No documents found in index: {index_name}")
-                return ReindexStats(index_name=index_name)
-            
-            # Analyze documents
-            analysis = await self.check_documents_need_reindexing(documents)
-            logger.info(f"Analysis for {index_name}: {analysis['recommendation']}")
-            logger.info(f"Documents needing reindexing: {analysis['needs_reindexing']}/{analysis['total_documents']}")
-            
-            # Check if reindexing is needed
-            if analysis['needs_reindexing'] == 0 and not force:
-                logger.info(f"Index {index_name} already has tokenized content, skipping")
-                return ReindexStats(
-                    index_name=index_name,
-                    total_documents=analysis['total_documents'],
-                    skipped_documents=analysis['total_documents']
+            if self.mode == "shadow":
+                # Build, validate and swap; the old index is kept for rollback
+                return await self._build_pipeline(force, on_batch, on_resume).reindex_with_swap(
+                    index_name,
+                    sample_queries=self.validation_queries,
+                    resume=resume
                 )
             
-            # Perform reindexing
-            stats = await self.reindex_documents(index_name, documents, backup)
+            # Back up only when starting fresh; a resumed run already has one
+            checkpoint = self.checkpoint_store.load(index_name) if resume else None
+            resuming = checkpoint is not None and checkpoint.matches(index_name, self.versions)
+            if backup and not self.dry_run and not resuming:
+                backup_name = f"{index_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                await self._create_backup_index(index_name, backup_name)
+                logger.info(f"Created backup index: {backup_name}")
+            
+            # Stream documents through the tokenizer
+            stats = await self._build_pipeline(force, on_batch, on_resume).reindex_index(index_name, resume=resume)
             
             return stats
             
@@ -381,25 +271,34 @@ class MeiliSearchReindexer:
                 errors=[str(e)]
             )
     
+    async def rollback(self, index_name: str, previous_index: str) -> None:
+        """Swap a live index back with its previous contents."""
+        if not await self.meilisearch_client.index_exists(previous_index):
+            raise ValueError(f"Index '{previous_index}' does not exist")
+        
+        await self._build_pipeline().rollback_swap(index_name, previous_index)
+        logger.info(f"Rolled back {index_name}; the reverted contents are now in {previous_index}")
+    
     async def reindex_all_indexes(
         self, 
         exclude_indexes: List[str] = None,
         force: bool = False,
-        backup: bool = True
+        backup: bool = True,
+        resume: bool = True
     ) -> Dict[str, ReindexStats]:
         """
-        Reindex all MeiliSearch indexes.
+        Reindex all MeiliSearch indexes concurrently, smallest first.
         
         Args:
             exclude_indexes: List of indexes to exclude
-            force: Force reindexing even if not needed
+            force: Reprocess documents even if their fingerprint is current
             backup: Create backup before reindexing
+            resume: Continue from matching checkpoints
             
         Returns:
             Dictionary of reindexing statistics per index
         """
         exclude_indexes = exclude_indexes or []
-        results = {}
         
         try:
             # Get all indexes
@@ -409,21 +308,34 @@ class MeiliSearchReindexer:
             indexes_to_process = [
                 idx for idx in all_indexes 
                 if idx not in exclude_indexes
+                and SHADOW_INDEX_MARKER not in idx
+                and "_backup_" not in idx
             ]
             
             logger.info(f"Reindexing {len(indexes_to_process)} indexes: {indexes_to_process}")
             
-            # Process each index
-            for index_name in indexes_to_process:
-                logger.info(f"\\n{'='*60}")
-                logger.info(f"Processing index: {index_name}")
-                logger.info(f"{'='*60}")
-                
-                stats = await self.reindex_single_index(index_name, force, backup)
-                results[index_name] = stats
-                
-                # Brief pause between indexes
-                await asyncio.sleep(1)
+            # Size indexes for smallest-first scheduling and the ETA
+            index_stats = await asyncio.gather(*(
+                self.meilisearch_client.get_index_stats(idx) for idx in indexes_to_process
+            ))
+            index_sizes = {
+                idx: stats.number_of_documents
+                for idx, stats in zip(indexes_to_process, index_stats)
+            }
+            
+            scheduler = ReindexScheduler(
+                max_concurrent_indexes=self.max_concurrent_indexes,
+                progress_interval=self.progress_interval
+            )
+            
+            async def reindex(index_name: str) -> ReindexStats:
+                return await self.reindex_single_index(
+                    index_name, force, backup, resume,
+                    on_batch=scheduler.progress.advance,
+                    on_resume=scheduler.progress.resume
+                )
+            
+            results = await scheduler.run(index_sizes, reindex)
             
             return results
             
@@ -447,6 +359,7 @@ class MeiliSearchReindexer:
         total_processed = sum(stats.processed_documents for stats in results.values())
         total_failed = sum(stats.failed_documents for stats in results.values())
         total_skipped = sum(stats.skipped_documents for stats in results.values())
+        total_unchanged = sum(stats.unchanged_documents for stats in results.values())
         total_time = sum(stats.processing_time_ms for stats in results.values())
         
         report_lines.extend([
@@ -456,6 +369,7 @@ class MeiliSearchReindexer:
             f"  Processed: {total_processed:,}",
             f"  Failed: {total_failed:,}",
             f"  Skipped: {total_skipped:,}",
+            f"  Unchanged: {total_unchanged:,}",
             f"  Total processing time: {total_time/1000:.2f}s",
             ""
         ])
@@ -463,16 +377,23 @@ class MeiliSearchReindexer:
         # Per-index details
         report_lines.append("DETAILS BY INDEX:")
         for index_name, stats in results.items():
-            status = "✅ SUCCESS" if stats.failed_documents == 0 else "❌ ERRORS"
+            status = "✅ SUCCESS" if stats.failed_documents == 0 and not stats.errors else "❌ ERRORS"
             report_lines.extend([
                 f"\\n  {index_name}: {status}",
                 f"    Total documents: {stats.total_documents:,}",
                 f"    Processed: {stats.processed_documents:,}",
                 f"    Failed: {stats.failed_documents:,}",
                 f"    Skipped: {stats.skipped_documents:,}",
+                f"    Unchanged: {stats.unchanged_documents:,}",
                 f"    Processing time: {stats.processing_time_ms/1000:.2f}s"
             ])
             
+            if stats.shadow_index:
+                if stats.swapped:
+                    report_lines.append(f"    Swapped: previous version kept as {stats.shadow_index}")
+                else:
+                    report_lines.append(f"    Not swapped: shadow index {stats.shadow_index} left for inspection")
+            
             if stats.errors:
                 report_lines.append("    Errors:")
                 for error in stats.errors[:3]:  # Show first 3 errors
@@ -493,8 +414,8 @@ class MeiliSearchReindexer:
             report_lines.append("  ✅ Reindexing completed - Thai compound word search should now work")
             report_lines.append("  🔍 Test search with: วากาเมะ, รูเมน, ซูชิ, เทมปุระ")
         
-        if total_skipped == total_docs:
-            report_lines.append("  ℹ️ All documents already have tokenized content")
+        if total_docs and total_unchanged == total_docs:
+            report_lines.append("  ℹ️ All documents are already tokenized with the current versions")
         
         report_lines.extend([
             "",
@@ -543,12 +464,90 @@ async def main():
     parser.add_argument(
         "--force", 
         action="store_true", 
-        help="Force reindexing even if documents already have tokenized_content"
+        help="Reprocess documents even if their fingerprint is current"
     )
     parser.add_argument(
         "--no-backup", 
         action="store_true", 
-        help="Skip creating backup indexes"
+        help="Skip creating backup indexes (in-place mode)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["shadow", "in-place"],
+        default="shadow",
+        help="Rebuild in a shadow index and swap it in, or update the live index in place"
+    )
+    parser.add_argument(
+        "--validate-query",
+        dest="validation_queries",
+        action="append",
+        default=[],
+        help="Query that must still return hits in the shadow index before swapping (repeatable)"
+    )
+    parser.add_argument(
+        "--rollback",
+        type=str,
+        metavar="PREVIOUS_INDEX",
+        help="Swap --index back with the index holding its previous contents"
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore existing checkpoints and start from the beginning"
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default="reindex_checkpoints",
+        help="Directory for resumable checkpoints"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=1000,
+        help="Documents fetched and committed per batch"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="Batches buffered between fetch, tokenize and upload stages"
+    )
+    parser.add_argument(
+        "--max-concurrent-indexes",
+        type=int,
+        default=4,
+        help="Indexes reindexed at the same time (--all-indexes)"
+    )
+    parser.add_argument(
+        "--tokenize-workers",
+        type=int,
+        default=os.cpu_count() or 4,
+        help="Documents tokenized concurrently across all indexes"
+    )
+    parser.add_argument(
+        "--max-inflight-mb",
+        type=int,
+        default=64,
+        help="Upload payload megabytes in flight across all indexes"
+    )
+    parser.add_argument(
+        "--max-pending-tasks",
+        type=int,
+        default=8,
+        help="MeiliSearch document tasks outstanding across all indexes "
+             "(each index has at most one in flight)"
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between combined progress reports"
+    )
+    parser.add_argument(
+        "--dictionary-version",
+        type=str,
+        help="Override the dictionary version (defaults to a hash of the custom dictionary)"
     )
     parser.add_argument(
         "--config", 
@@ -565,31 +564,77 @@ async def main():
     if args.index and args.all_indexes:
         parser.error("Cannot specify both --index and --all-indexes")
     
+    if args.rollback and not args.index:
+        parser.error("--rollback requires --index")
+    
     try:
         # Initialize configuration
         config_manager = ConfigManager()
         if args.config:
             config_manager.load_config(args.config)
         
-        # Initialize reindexer
-        reindexer = MeiliSearchReindexer(config_manager, dry_run=args.dry_run)
+        # Shards are reindexed one after another on the shared budget
+        sharding_config = sharding_config_from_settings(SearchProxySettings())
+        hosts = sharding_config.hosts if sharding_config else [None]
+        budget = ReindexBudget(
+            tokenize_workers=args.tokenize_workers,
+            max_inflight_bytes=args.max_inflight_mb * 1024 * 1024,
+            max_pending_tasks=args.max_pending_tasks
+        )
         
-        # Perform reindexing
-        if args.index:
-            logger.info(f"Reindexing single index: {args.index}")
-            stats = await reindexer.reindex_single_index(
-                args.index, 
-                force=args.force, 
-                backup=not args.no_backup
-            )
-            results = {args.index: stats}
-        else:
-            logger.info("Reindexing all indexes")
-            results = await reindexer.reindex_all_indexes(
-                exclude_indexes=args.exclude,
-                force=args.force,
-                backup=not args.no_backup
+        results = {}
+        for shard, host in enumerate(hosts):
+            # Initialize reindexer
+            reindexer = MeiliSearchReindexer(
+                config_manager,
+                dry_run=args.dry_run,
+                checkpoint_dir=(
+                    args.checkpoint_dir if host is None
+                    else os.path.join(args.checkpoint_dir, f"shard-{shard}")
+                ),
+                page_size=args.page_size,
+                queue_size=args.queue_size,
+                dictionary_version=args.dictionary_version,
+                mode=args.mode,
+                validation_queries=args.validation_queries,
+                budget=budget,
+                max_concurrent_indexes=args.max_concurrent_indexes,
+                progress_interval=args.progress_interval,
+                host=host
             )
+            
+            try:
+                if args.rollback:
+                    await reindexer.rollback(args.index, args.rollback)
+                    continue
+                
+                # Perform reindexing
+                if args.index:
+                    logger.info(f"Reindexing single index: {args.index} on {reindexer.host}")
+                    stats = await reindexer.reindex_single_index(
+                        args.index, 
+                        force=args.force, 
+                        backup=not args.no_backup,
+                        resume=not args.no_resume
+                    )
+                    host_results = {args.index: stats}
+                else:
+                    logger.info(f"Reindexing all indexes on {reindexer.host}")
+                    host_results = await reindexer.reindex_all_indexes(
+                        exclude_indexes=args.exclude,
+                        force=args.force,
+                        backup=not args.no_backup,
+                        resume=not args.no_resume
+                    )
+            finally:
+                # Clean up
+                await reindexer.close()
+            
+            prefix = "" if host is None else f"{host}/"
+            results.update({f"{prefix}{name}": stats for name, stats in host_results.items()})
+        
+        if args.rollback:
+            sys.exit(0)
         
         # Generate and display report
         report = await reindexer.generate_reindex_report(results)
@@ -601,12 +646,10 @@ async def main():
             f.write(report)
         logger.info(f"Report saved to: {report_file}")
         
-        # Clean up
-        await reindexer.close()
-        
         # Exit with appropriate code
         total_failed = sum(stats.failed_documents for stats in results.values())
-        sys.exit(1 if total_failed > 0 else 0)
+        has_errors = any(stats.errors for stats in results.values())
+        sys.exit(1 if total_failed > 0 or has_errors else 0)
         
     except KeyboardInterrupt:
         logger.info("Reindexing interrupted by user")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Memory report for a running Thai tokenizer server.
+
+Prints RSS, USS and PSS for the gunicorn master and each worker, and how
+much memory the workers share. Run it once with preloading enabled and once
+with THAI_TOKENIZER_PRELOAD_ENABLED=false to see what preloading saves:
+
+    python scripts/memory_report.py                # finds the gunicorn master
+    python scripts/memory_report.py --pid 1234 --json
+
+In a container, GET /metrics/memory reports the same figures.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.api.preload import memory_report  # noqa: E402
+
+
+def find_master_pid():
+    """PID of the oldest gunicorn process serving src.api.main:app."""
+    candidates = []
+    for process in psutil.process_iter(["pid", "cmdline", "create_time"]):
+        cmdline = " ".join(process.info["cmdline"] or [])
+        if "gunicorn" in cmdline and "src.api.main:app" in cmdline:
+            candidates.append(process)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda process: process.info["create_time"]).pid
+
+
+def print_report(report):
+    def mb(value):
+        return "n/a" if value is None else f"{value:.1f}"
+
+    print(f"{'PID':>8}  {'ROLE':<7} {'RSS MB':>9} {'USS MB':>9} {'PSS MB':>9} {'SHARED MB':>10}")
+    for process in report["processes"]:
+        print(f"{process['pid']:>8}  {process['role']:<7} {mb(process['rss_mb']):>9} "
+              f"{mb(process['uss_mb']):>9} {mb(process['pss_mb']):>9} {mb(process['shared_mb']):>10}")
+
+    totals = report["totals"]
+    workers = [process for process in report["processes"] if process["role"] == "worker"]
+    print()
+    print(f"Total RSS:  {mb(totals['rss_mb'])} MB (counts shared pages once per process)")
+    print(f"Total USS:  {mb(totals['uss_mb'])} MB")
+    print(f"Total PSS:  {mb(totals['pss_mb'])} MB (actual footprint)")
+    print(f"Saved by sharing: {mb(totals['shared_savings_mb'])} MB")
+    if workers:
+        average_uss = sum(process["uss_mb"] for process in workers) / len(workers)
+        print(f"Average worker USS: {average_uss:.1f} MB across {len(workers)} workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-process memory report for the Thai tokenizer server")
+    parser.add_argument("--pid", type=int, help="Master process ID (default: find the gunicorn master)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    pid = args.pid or find_master_pid()
+    if pid is None:
+        print("No gunicorn master found; pass --pid", file=sys.stderr)
+        return 1
+
+    # The report is read from outside the server, so "preloaded" is unknown here
+    report = memory_report(pid)
+    report.pop("preloaded", None)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -213,21 +213,29 @@ async def search_documents(
     query = search_data.get("q", "")
     limit = search_data.get("limit", 20)
     
-    # Simple mock search - return all documents if no query, or filter by content
+    offset = search_data.get("offset", 0)
+    
+    # Simple mock search - return all documents if no query, or filter by content.
+    # The score is the share of the content made up by the query, so results
+    # from several mock shards can be merged by ranking score.
     results = []
     if index_uid in mock_documents:
         for doc_id, doc in mock_documents[index_uid].items():
-            if not query or query.lower() in str(doc.get("content", "")).lower():
-                results.append(doc)
-                if len(results) >= limit:
-                    break
+            content = str(doc.get("content", "")).lower()
+            if not query or query.lower() in content:
+                score = len(query) * content.count(query.lower()) / len(content) if query and content else 1.0
+                results.append({**doc, "_rankingScore": round(min(score, 1.0), 6)})
+    results.sort(key=lambda hit: -hit["_rankingScore"])
+    
+    if not search_data.get("showRankingScore"):
+        results = [{k: v for k, v in hit.items() if k != "_rankingScore"} for hit in results]
     
     return JSONResponse({
-        "hits": results,
+        "hits": results[offset:offset + limit],
         "query": query,
         "processingTimeMs": 5,
         "limit": limit,
-        "offset": 0,
+        "offset": offset,
         "estimatedTotalHits": len(results)
     })
 
@@ -257,8 +265,15 @@ async def get_task(
     })
 
 if __name__ == "__main__":
+    import argparse
+    
+    # Run several instances on different ports to test sharded search
+    parser = argparse.ArgumentParser(description="Mock Meilisearch server")
+    parser.add_argument("--port", type=int, default=7700, help="Port to listen on")
+    args = parser.parse_args()
+    
     print("🚀 Starting Mock Meilisearch Server...")
-    print("📍 Server will be available at: http://localhost:7700")
+    print(f"📍 Server will be available at: http://localhost:{args.port}")
     print("🔑 Accepted API keys: test-key, your-secure-api-key, development-key")
     print("📋 Available endpoints:")
     print("   - GET  /health")
@@ -272,4 +287,4 @@ if __name__ == "__main__":
     print("   - POST /indexes/{uid}/search")
     print("   - GET  /tasks/{uid}")
     
-    uvicorn.run(app, host="0.0.0.0", port=7700, log_level="info")
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=args.port, log_level="info")
\ No newline at end of file
@@ -11,7 +11,7 @@ from src.api.models.requests import MeiliSearchConfigRequest, TokenizerConfigReq
 from src.api.models.responses import ConfigurationResponse, ErrorResponse
 from src.tokenizer.config_manager import ConfigManager
 from src.meilisearch_integration.client import MeiliSearchClient
-from src.meilisearch_integration.settings_manager import TokenizationSettingsManager
+from src.meilisearch_integration.settings_manager import TokenizationSettingsManager, configure_thai_tokenization
 
 logger = logging.getLogger(__name__)
 
@@ -158,12 +158,8 @@ async def update_meilisearch_configuration(
         
         # Apply Thai tokenization settings to the index
         try:
-            # Create Thai tokenization settings
-            thai_settings = settings_manager.create_meilisearch_settings()
-            
-            # Apply settings to the index
-            await test_client.update_index_settings(request.index_name, thai_settings)
-            logger.info(f"Thai tokenization settings applied to index: {request.index_name}")
+            # Apply only the Thai tokenization settings that changed
+            await configure_thai_tokenization(test_client, request.index_name, settings_manager)
         except Exception as e:
             logger.warning(f"Failed to apply Thai tokenization settings: {e}")
             # Continue anyway as the connection update was successful
@@ -11,6 +11,7 @@ from src.api.models.requests import IndexDocumentRequest
 from src.api.models.responses import DocumentProcessingResult, ErrorResponse
 from src.meilisearch_integration.document_processor import DocumentProcessor, ProcessingStatus
 from src.meilisearch_integration.client import MeiliSearchClient
+from src.meilisearch_integration.sharding import ShardedMeiliSearchClient, sharding_config_from_settings
 from src.tokenizer.thai_segmenter import ThaiSegmenter
 from src.tokenizer.token_processor import TokenProcessor
 
@@ -25,9 +26,36 @@ _meilisearch_client: MeiliSearchClient = None
 
 def get_document_processor() -> DocumentProcessor:
     """Dependency to get document processor instance."""
-    global _document_processor, _meilisearch_client
+    global _document_processor
     if _document_processor is None:
-        if _meilisearch_client is None:
+        from src.tokenizer.config_manager import ConfigManager
+        
+        processing_config = ConfigManager().get_processing_config()
+        _document_processor = DocumentProcessor(
+            meilisearch_client=get_meilisearch_client(),
+            batch_size=processing_config.batch_size,
+            max_concurrent=processing_config.max_concurrent,
+            chunk_size=processing_config.chunk_size
+        )
+    return _document_processor
+
+
+def get_meilisearch_client() -> MeiliSearchClient:
+    """
+    Dependency to get MeiliSearch client instance.
+    
+    With shard URLs configured for the search proxy this is a
+    ShardedMeiliSearchClient, so documents are written to the shards
+    that searches fan out to.
+    """
+    global _meilisearch_client
+    if _meilisearch_client is None:
+        from src.search_proxy.config.settings import SearchProxySettings
+        
+        sharding_config = sharding_config_from_settings(SearchProxySettings())
+        if sharding_config is not None:
+            _meilisearch_client = ShardedMeiliSearchClient.from_config(sharding_config)
+        else:
             from src.tokenizer.config_manager import ConfigManager
             from src.meilisearch_integration.client import MeiliSearchConfig as ClientConfig
             
@@ -40,26 +68,6 @@ def get_document_processor() -> DocumentProcessor:
                 max_retries=meilisearch_config.max_retries
             )
             _meilisearch_client = MeiliSearchClient(client_config)
-        _document_processor = DocumentProcessor(meilisearch_client=_meilisearch_client)
-    return _document_processor
-
-
-def get_meilisearch_client() -> MeiliSearchClient:
-    """Dependency to get MeiliSearch client instance."""
-    global _meilisearch_client
-    if _meilisearch_client is None:
-        from src.tokenizer.config_manager import ConfigManager
-        from src.meilisearch_integration.client import MeiliSearchConfig as ClientConfig
-        
-        config_manager = ConfigManager()
-        meilisearch_config = config_manager.get_meilisearch_config()
-        client_config = ClientConfig(
-            host=meilisearch_config.host,
-            api_key=meilisearch_config.api_key,
-            timeout=meilisearch_config.timeout_ms // 1000,
-            max_retries=meilisearch_config.max_retries
-        )
-        _meilisearch_client = MeiliSearchClient(client_config)
     return _meilisearch_client
 
 
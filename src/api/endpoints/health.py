@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
 from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.utils.health import health_checker, HealthStatus
+from src.api.warmup import startup_warmup
 from src.utils.logging import get_structured_logger
 from src.api.models.responses import ErrorResponse
 
@@ -99,8 +100,15 @@ async def readiness_probe():
     Kubernetes readiness probe endpoint.
     
     Returns 200 if the service is ready to accept traffic, 503 if not ready.
+    Not ready while the startup warm-up is running.
     """
     try:
+        if not startup_warmup.ready:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "not_ready", "reason": "warming_up", "warmup": startup_warmup.get_state()}
+            )
+        
         # Check all critical dependencies
         check_results = await health_checker.run_all_checks()
         
@@ -116,7 +124,15 @@ async def readiness_probe():
                         media_type="application/json"
                     )
         
-        return {"status": "ready", "timestamp": datetime.now().isoformat()}
+        return {
+            "status": "ready",
+            "timestamp": datetime.now().isoformat(),
+            "warmup": {
+                "status": startup_warmup.status,
+                "duration_ms": startup_warmup.get_state()["duration_ms"],
+                "failed_steps": startup_warmup.failed_steps
+            }
+        }
         
     except Exception as e:
         logger.error("Readiness probe failed", error=e)
@@ -138,6 +154,13 @@ async def startup_probe():
         # Check if all initialization is complete
         uptime = time.time() - health_checker.start_time
         
+        if not startup_warmup.ready:
+            return Response(
+                content='{"status": "starting", "reason": "warming_up", "uptime_seconds": ' + str(int(uptime)) + '}',
+                status_code=503,
+                media_type="application/json"
+            )
+        
         # Allow 30 seconds for startup
         if uptime < 30:
             # Check if critical components are initialized
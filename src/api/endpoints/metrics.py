@@ -1,5 +1,6 @@
 """Prometheus-compatible metrics endpoints for monitoring integration."""
 
+import asyncio
 import time
 from typing import Dict, Any, List
 from datetime import datetime
@@ -8,7 +9,10 @@ from fastapi import APIRouter, Response
 from fastapi.responses import PlainTextResponse
 
 from src.utils.health import health_checker, HealthStatus
-from src.utils.logging import get_structured_logger
+from src.utils.loop_monitor import loop_monitor
+from src.api.warmup import startup_warmup
+from src.api.preload import get_master_pid, get_preload_report, memory_report
+from src.utils.logging import get_structured_logger, get_log_sampling_stats, log_writer
 
 logger = get_structured_logger(__name__)
 
@@ -147,6 +151,36 @@ class PrometheusMetrics:
             help_text="Number of system processes"
         ))
         
+        # Metrics of this worker process
+        if system_metrics.process_cpu_percent is not None:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_process_cpu_usage_percent",
+                system_metrics.process_cpu_percent,
+                help_text="CPU usage of the worker process"
+            ))
+            metrics.append(self.format_metric(
+                "thai_tokenizer_process_resident_memory_bytes",
+                system_metrics.process_memory_rss_mb * 1024 * 1024,
+                help_text="Resident memory of the worker process in bytes"
+            ))
+            metrics.append(self.format_metric(
+                "thai_tokenizer_process_threads",
+                system_metrics.process_threads,
+                help_text="Threads of the worker process"
+            ))
+        if system_metrics.process_open_fds is not None:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_process_open_fds",
+                system_metrics.process_open_fds,
+                help_text="Open file descriptors of the worker process"
+            ))
+        if system_metrics.sample_age_seconds is not None:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_system_metrics_age_seconds",
+                system_metrics.sample_age_seconds,
+                help_text="Age of the system metrics sample"
+            ))
+        
         # Load average (if available)
         if system_metrics.load_average:
             for i, load in enumerate(system_metrics.load_average):
@@ -398,6 +432,158 @@ class PrometheusMetrics:
         
         return metrics
     
+    def format_event_loop_metrics(self) -> List[str]:
+        """Format event loop lag and blocking stall metrics."""
+        metrics = []
+        
+        if not loop_monitor.running:
+            return metrics
+        
+        lines = [
+            "# HELP thai_tokenizer_event_loop_lag_seconds Event loop lag over the rolling window",
+            "# TYPE thai_tokenizer_event_loop_lag_seconds summary"
+        ]
+        histogram = loop_monitor.lag_histogram()
+        for quantile in (0.5, 0.9, 0.99, 0.999):
+            value = histogram.value_at_percentile(quantile * 100) / 1_000_000
+            lines.append(f'thai_tokenizer_event_loop_lag_seconds{{quantile="{quantile}"}} {value}')
+        lines.append(f"thai_tokenizer_event_loop_lag_seconds_sum {histogram.mean * histogram.total_count / 1_000_000}")
+        lines.append(f"thai_tokenizer_event_loop_lag_seconds_count {histogram.total_count}")
+        metrics.append("\n".join(lines))
+        
+        metrics.append(self.format_metric(
+            "thai_tokenizer_event_loop_lag_max_seconds",
+            histogram.max_value / 1_000_000,
+            help_text="Maximum event loop lag over the rolling window"
+        ))
+        
+        metrics.append(self.format_metric(
+            "thai_tokenizer_event_loop_stalls_total",
+            loop_monitor.stalls_total,
+            help_text="Event loop stalls above the blocking threshold",
+            metric_type="counter"
+        ))
+        
+        metrics.append(self.format_metric(
+            "thai_tokenizer_event_loop_blocked_seconds_total",
+            loop_monitor.blocked_seconds_total,
+            help_text="Total event loop lag of stalls above the blocking threshold",
+            metric_type="counter"
+        ))
+        
+        return metrics
+    
+    def format_warmup_metrics(self) -> List[str]:
+        """Format startup warm-up state and step timings."""
+        metrics = []
+        
+        if startup_warmup.status == "not_started":
+            return metrics
+        
+        metrics.append(self.format_metric(
+            "thai_tokenizer_warmup_complete",
+            0 if startup_warmup.status == "running" else 1,
+            help_text="Whether the startup warm-up has finished (0=running, 1=finished)"
+        ))
+        
+        if startup_warmup.duration_ms is not None:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_warmup_duration_seconds",
+                startup_warmup.duration_ms / 1000,
+                help_text="Duration of the startup warm-up"
+            ))
+        
+        if startup_warmup.steps:
+            lines = [
+                "# HELP thai_tokenizer_warmup_step_duration_seconds Duration of each startup warm-up step",
+                "# TYPE thai_tokenizer_warmup_step_duration_seconds gauge"
+            ]
+            for step in startup_warmup.steps:
+                outcome = "success" if step.success else "failure"
+                lines.append(
+                    f'thai_tokenizer_warmup_step_duration_seconds{{step="{step.name}",outcome="{outcome}"}} '
+                    f"{step.duration_ms / 1000}"
+                )
+            metrics.append("\n".join(lines))
+        
+        return metrics
+    
+    def format_logging_metrics(self) -> List[str]:
+        """Format async log writer and log sampling counters."""
+        metrics = []
+        stats = log_writer.get_stats()
+        
+        metrics.append(self.format_metric(
+            "thai_tokenizer_log_queue_depth",
+            stats["queued"],
+            help_text="Log records waiting for the background writer"
+        ))
+        metrics.append(self.format_metric(
+            "thai_tokenizer_log_records_written_total",
+            stats["records_written"],
+            help_text="Log records written by the background writer",
+            metric_type="counter"
+        ))
+        metrics.append(self.format_metric(
+            "thai_tokenizer_log_records_dropped_total",
+            stats["records_dropped"],
+            help_text="Log records dropped because the log queue was full",
+            metric_type="counter"
+        ))
+        
+        sampling = get_log_sampling_stats()
+        if sampling:
+            lines = [
+                "# HELP thai_tokenizer_log_records_sampled_out_total Log records dropped by per-logger sampling and rate limits",
+                "# TYPE thai_tokenizer_log_records_sampled_out_total counter"
+            ]
+            for name, limiter in sampling.items():
+                lines.append(f'thai_tokenizer_log_records_sampled_out_total{{logger="{name}"}} {limiter["dropped"]}')
+            metrics.append("\n".join(lines))
+        
+        return metrics
+    
+    def format_memory_metrics(self, report: Dict[str, Any]) -> List[str]:
+        """Format a per-process memory report of the server (see src/api/preload.py)."""
+        metrics = []
+        
+        preload_report = get_preload_report()
+        metrics.append(self.format_metric(
+            "thai_tokenizer_preloaded",
+            1 if preload_report else 0,
+            help_text="Whether tokenizer state was preloaded in the master process"
+        ))
+        if preload_report:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_preload_frozen_objects",
+                preload_report.frozen_objects,
+                help_text="Objects moved to the permanent generation by gc.freeze() before forking"
+            ))
+        
+        for kind, help_text in (
+            ("rss", "Resident set size, including pages shared with other processes"),
+            ("uss", "Unique set size, memory freed if the process exited"),
+            ("pss", "Proportional set size, with shared pages split between their processes")
+        ):
+            name = f"thai_tokenizer_process_memory_{kind}_bytes"
+            lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for process in report["processes"]:
+                value = process[f"{kind}_mb"]
+                if value is not None:
+                    lines.append(f'{name}{{pid="{process["pid"]}",role="{process["role"]}"}} {int(value * 1024 * 1024)}')
+            if len(lines) > 2:
+                metrics.append("\n".join(lines))
+        
+        savings = report["totals"]["shared_savings_mb"]
+        if savings is not None:
+            metrics.append(self.format_metric(
+                "thai_tokenizer_shared_memory_savings_bytes",
+                int(savings * 1024 * 1024),
+                help_text="Total RSS minus total PSS of the server processes, memory saved by sharing pages"
+            ))
+        
+        return metrics
+    
     def format_search_proxy_metrics(self) -> List[str]:
         """Format search proxy specific metrics."""
         metrics = []
@@ -455,6 +641,15 @@ class PrometheusMetrics:
             all_metrics.extend(self.format_custom_metrics())
             all_metrics.append("")
             
+            all_metrics.extend(self.format_event_loop_metrics())
+            all_metrics.append("")
+            
+            all_metrics.extend(self.format_warmup_metrics())
+            all_metrics.append("")
+            
+            all_metrics.extend(self.format_logging_metrics())
+            all_metrics.append("")
+            
             all_metrics.extend(self.format_search_proxy_metrics())
             all_metrics.append("")
             
@@ -607,6 +802,40 @@ async def performance_metrics():
         )
 
 
+@router.get("/metrics/memory", response_class=PlainTextResponse)
+async def memory_metrics():
+    """
+    Per-process memory of the server in Prometheus format.
+    
+    Reports RSS, USS and PSS for the gunicorn master and all of its workers
+    (or this process alone when not preforked), which shows how much memory
+    the workers share. Reading PSS walks every process's page mappings, so
+    this is not part of /metrics.
+    """
+    try:
+        report = await asyncio.to_thread(memory_report, get_master_pid())
+        memory_metrics_list = prometheus_metrics.format_memory_metrics(report)
+        
+        metrics_text = "\n".join([
+            "# Thai Tokenizer Memory Metrics",
+            f"# Generated at: {datetime.now().isoformat()}",
+            ""
+        ] + memory_metrics_list)
+        
+        return PlainTextResponse(
+            content=metrics_text,
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+        
+    except Exception as e:
+        logger.error("Memory metrics endpoint failed", error=e)
+        return PlainTextResponse(
+            content=f"# Error: Failed to generate memory metrics - {str(e)}\n",
+            status_code=500,
+            media_type="text/plain"
+        )
+
+
 @router.get("/metrics/custom", response_class=PlainTextResponse)
 async def custom_metrics():
     """
@@ -1,14 +1,18 @@
 """Monitoring and health endpoints for the Thai tokenizer API."""
 
 import logging
+import os
 from typing import Dict, Any, List
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends, status, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.utils.health import health_checker, HealthStatus
 from src.utils.logging import get_structured_logger
+from src.utils.profiler import ProfilerBusyError, profile_current_process
+from src.utils.loop_monitor import loop_monitor
+from src.api.middleware.auth import api_key_auth
 from src.api.models.responses import ErrorResponse
 
 logger = get_structured_logger(__name__)
@@ -829,4 +833,97 @@ async def run_diagnostic_tests(
                 message=f"Failed to run diagnostic tests: {str(e)}",
                 timestamp=datetime.now()
             ).model_dump()
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/diagnostics/event-loop")
+async def get_event_loop_diagnostics(
+    include_events: bool = Query(True, description="Include recent stalls with their stacks")
+):
+    """
+    Get event loop lag statistics and recent blocking stalls.
+    
+    Stalls are callbacks or task steps that kept the event loop busy for
+    longer than the blocking threshold; each carries the stack captured
+    while it was running. Offenders rank code locations by total lag.
+    """
+    stats = loop_monitor.get_stats(include_events=include_events)
+    stats["timestamp"] = datetime.now().isoformat()
+    stats["pid"] = os.getpid()
+    return stats
+
+
+@router.get("/diagnostics/profile")
+async def profile_process(
+    seconds: float = Query(10.0, gt=0, le=60, description="How long to sample"),
+    mode: str = Query("wall", pattern="^(wall|cpu)$", description="wall (all threads and tasks) or cpu (running threads only)"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Time between samples"),
+    output_format: str = Query("json", alias="format", pattern="^(json|collapsed)$", description="json summary or collapsed stacks"),
+    include_idle: bool = Query(False, description="Keep samples of threads waiting for work"),
+    include_lines: bool = Query(False, description="Add line numbers to frames"),
+    top: int = Query(20, ge=1, le=200, description="Number of frames in the summary"),
+    api_key: str = Depends(api_key_auth)
+):
+    """
+    Profile this worker process with a statistical stack sampler.
+
+    Samples the stacks of all threads, and of suspended asyncio tasks in
+    wall mode, for the requested number of seconds while requests keep being
+    served. Requires API key authentication, or PROFILER_ENABLED=true when
+    authentication is disabled.
+
+    Returns:
+        A top-frames summary with collapsed stacks, or with format=collapsed
+        the collapsed stacks as text for flamegraph tools
+    """
+    if not api_key_auth.api_key_required and os.getenv("PROFILER_ENABLED", "false").lower() != "true":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorResponse(
+                error="profiler_disabled",
+                message="Profiling requires API key authentication or PROFILER_ENABLED=true",
+                timestamp=datetime.now()
+            ).model_dump(mode="json")
+        )
+
+    try:
+        result = await profile_current_process(
+            seconds,
+            mode=mode,
+            interval_seconds=interval_ms / 1000,
+            include_idle=include_idle,
+            include_lines=include_lines
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=ErrorResponse(
+                error="profiler_busy",
+                message=str(e),
+                timestamp=datetime.now()
+            ).model_dump(mode="json")
+        )
+    except Exception as e:
+        logger.error("Profiling failed", error=e, mode=mode)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error="diagnostics_error",
+                message=f"Failed to profile process: {str(e)}",
+                timestamp=datetime.now()
+            ).model_dump(mode="json")
+        )
+
+    logger.info("Process profile completed",
+               mode=mode,
+               duration_seconds=round(result.duration_seconds, 3),
+               samples=result.samples,
+               overhead_percent=round(result.overhead_percent, 3))
+
+    if output_format == "collapsed":
+        return PlainTextResponse(result.collapsed())
+
+    response = result.to_dict(top)
+    response["timestamp"] = datetime.now().isoformat()
+    response["pid"] = os.getpid()
+    return response
@@ -12,7 +12,9 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError as PydanticValidationError
 
 from src.utils.logging import get_structured_logger
+from src.utils.tracing import SpanKind, start_span
 from src.api.middleware.auth import api_key_auth
+from src.api.serialization import PydanticJSONResponse
 from src.search_proxy.models.requests import SearchRequest, BatchSearchRequest
 from src.search_proxy.models.responses import SearchResponse, SearchErrorResponse
 from src.search_proxy.services.search_proxy_service import SearchProxyService
@@ -72,7 +74,7 @@ async def get_search_proxy_service() -> SearchProxyService:
     - Mixed Thai-English content support
     - Fallback tokenization strategies
     - Intelligent result ranking and deduplication
-    - Optional tokenization debugging information
+    - Optional tokenization and ranking debugging information
     """,
     responses={
         200: {"description": "Search completed successfully"},
@@ -131,22 +133,26 @@ async def search(
                 value=len(request.query)
             )
         
-        # Execute search
-        response = await service.search(request)
-        
-        # Log successful response
-        processing_time = (time.time() - start_time) * 1000
-        logger.info(
-            "Search completed successfully",
-            total_hits=response.total_hits,
-            returned_hits=len(response.hits),
-            processing_time_ms=processing_time,
-            thai_content_detected=response.query_info.thai_content_detected,
-            query_variants_used=response.query_info.query_variants_used,
-            fallback_used=response.query_info.fallback_used
-        )
-        
-        return response
+        with start_span("POST /api/v1/search", kind=SpanKind.SERVER, root=True):
+            # Execute search
+            response = await service.search(request)
+            
+            # Log successful response
+            processing_time = (time.time() - start_time) * 1000
+            logger.info(
+                "Search completed successfully",
+                total_hits=response.total_hits,
+                returned_hits=len(response.hits),
+                processing_time_ms=processing_time,
+                thai_content_detected=response.query_info.thai_content_detected,
+                query_variants_used=response.query_info.query_variants_used,
+                fallback_used=response.query_info.fallback_used
+            )
+            
+            with start_span("response.serialize") as span:
+                json_response = PydanticJSONResponse(response)
+                span.set_attribute("bytes", len(json_response.body))
+            return json_response
         
     except ValidationError as e:
         # Handle custom validation errors
@@ -282,8 +288,9 @@ async def batch_search(
                     value=len(query)
                 )
         
-        # Execute batch search
-        responses = await service.batch_search(request)
+        with start_span("POST /api/v1/batch-search", kind=SpanKind.SERVER, root=True):
+            # Execute batch search
+            responses = await service.batch_search(request)
         
         # Calculate batch statistics
         processing_time = (time.time() - start_time) * 1000
@@ -301,7 +308,7 @@ async def batch_search(
             processing_time_ms=processing_time
         )
         
-        return responses
+        return PydanticJSONResponse(responses)
         
     except ValidationError as e:
         # Handle custom validation errors
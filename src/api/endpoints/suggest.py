@@ -0,0 +1,83 @@
+"""Search-as-you-type suggestion endpoint for the Thai tokenizer API."""
+
+import asyncio
+import threading
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.api.models.responses import Suggestion, SuggestionResult
+from src.search_proxy.analytics import analytics_collector
+from src.tokenizer.suggestion_index import SuggestionService
+from src.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+router = APIRouter()
+
+# Global instance (will be injected via dependency injection)
+_suggestion_service: SuggestionService = None
+_suggestion_service_lock = threading.Lock()
+
+
+def load_suggestion_service() -> SuggestionService:
+    """
+    Get the suggestion service, building it on first use.
+
+    Building the index takes a few hundred milliseconds, so call this from a
+    worker thread (startup warm-up does) rather than on the event loop.
+    """
+    global _suggestion_service
+    if _suggestion_service is None:
+        with _suggestion_service_lock:
+            if _suggestion_service is None:
+                from pythainlp.corpus.common import thai_words
+                from src.tokenizer.config_manager import ConfigManager
+
+                config_manager = ConfigManager()
+                service = SuggestionService(
+                    dictionary_words=config_manager.get_tokenizer_config().custom_dictionary,
+                    base_words=thai_words(),
+                    query_source=analytics_collector.get_query_frequencies
+                )
+                logger.info("Suggestion service initialized", **service.index.get_stats())
+                _suggestion_service = service
+    return _suggestion_service
+
+
+async def get_suggestion_service() -> SuggestionService:
+    """Dependency to get the suggestion service; a first build runs in a worker thread."""
+    if _suggestion_service is not None:
+        return _suggestion_service
+    return await asyncio.to_thread(load_suggestion_service)
+
+
+@router.get("/suggest", response_model=SuggestionResult)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=20, description="Maximum number of suggestions"),
+    service: SuggestionService = Depends(get_suggestion_service)
+):
+    """
+    Suggest completions for a partially typed query.
+
+    Served from an in-memory prefix index built from the compound dictionary,
+    the PyThaiNLP word list and recorded search queries; MeiliSearch is never
+    queried, so this is safe to call on every keystroke. Query statistics
+    are refreshed in the background.
+    """
+    try:
+        start_time = time.perf_counter()
+        service.maybe_refresh()
+        suggestions = service.suggest(q, limit)
+        processing_time = (time.perf_counter() - start_time) * 1000
+
+        return SuggestionResult(
+            query=q,
+            suggestions=[Suggestion(text=text, score=score) for text, score in suggestions],
+            processing_time_ms=processing_time
+        )
+
+    except Exception as e:
+        logger.error("Suggestion lookup failed", error=e, prefix=q)
+        raise HTTPException(status_code=500, detail=f"Suggestion lookup failed: {str(e)}") from e
@@ -1,27 +1,32 @@
 """Tokenization endpoints for the Thai tokenizer API."""
 
+import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from src.api.models.requests import TokenizeRequest, QueryProcessingRequest, SearchResultEnhancementRequest
-from src.api.models.responses import TokenizationResult, ErrorResponse, QueryProcessingResult, SearchResultEnhancementResult
-from src.tokenizer.thai_segmenter import ThaiSegmenter
+from src.api.models.requests import TokenizeRequest, BatchTokenizeRequest, QueryProcessingRequest, SearchResultEnhancementRequest
+from src.api.models.responses import TokenizationResult, BatchTokenizationItem, ErrorResponse, QueryProcessingResult, SearchResultEnhancementResult
+from src.tokenizer.thai_segmenter import ThaiSegmenter, TokenizationResult as SegmentationResult
 from src.tokenizer.token_processor import TokenProcessor
 from src.tokenizer.query_processor import QueryProcessor
 from src.tokenizer.result_enhancer import SearchResultEnhancer
 from src.utils.logging import get_structured_logger, set_correlation_id, generate_correlation_id
 from src.api.middleware.auth import api_key_auth
+from src.api.serialization import PydanticJSONResponse
 
 logger = get_structured_logger(__name__)
 
 router = APIRouter()
 
+# Number of distinct texts segmented per worker dispatch in batch tokenization
+BATCH_TOKENIZE_CHUNK_SIZE = 100
+
 # Global instances (will be injected via dependency injection)
 _thai_segmenter: ThaiSegmenter = None
 _token_processor: TokenProcessor = None
@@ -44,7 +49,8 @@ def get_thai_segmenter() -> ThaiSegmenter:
         _thai_segmenter = ThaiSegmenter(
             engine=tokenizer_config.engine.value,
             custom_dict=custom_dict,
-            keep_whitespace=tokenizer_config.keep_whitespace
+            keep_whitespace=tokenizer_config.keep_whitespace,
+            compound_table=config_manager.get_compound_table()
         )
         logger.info(f"Thai segmenter initialized with {len(custom_dict)} compound words from config manager")
     return _thai_segmenter
@@ -101,7 +107,7 @@ def get_token_processor() -> TokenProcessor:
     """Dependency to get token processor instance."""
     global _token_processor
     if _token_processor is None:
-        _token_processor = TokenProcessor()
+        _token_processor = TokenProcessor(compound_table=get_thai_segmenter().compound_table)
     return _token_processor
 
 
@@ -109,7 +115,11 @@ def get_query_processor() -> QueryProcessor:
     """Dependency to get query processor instance."""
     global _query_processor
     if _query_processor is None:
-        _query_processor = QueryProcessor()
+        from src.api.endpoints.suggest import load_suggestion_service
+        _query_processor = QueryProcessor(
+            compound_table=get_thai_segmenter().compound_table,
+            suggestion_index=load_suggestion_service().index
+        )
     return _query_processor
 
 
@@ -117,7 +127,10 @@ def get_result_enhancer() -> SearchResultEnhancer:
     """Dependency to get result enhancer instance."""
     global _result_enhancer
     if _result_enhancer is None:
-        _result_enhancer = SearchResultEnhancer()
+        _result_enhancer = SearchResultEnhancer(
+            thai_segmenter=get_thai_segmenter(),
+            query_processor=get_query_processor()
+        )
     return _result_enhancer
 
 
@@ -180,7 +193,7 @@ async def tokenize_text(
                    processing_time_ms=response.processing_time_ms,
                    endpoint="tokenize")
         
-        return response
+        return PydanticJSONResponse(response)
         
     except Exception as e:
         logger.error("Tokenization failed", error=e, 
@@ -259,6 +272,119 @@ async def tokenize_compound_words(
         )
 
 
+def _segment_chunk(
+    thai_segmenter: ThaiSegmenter,
+    texts: List[str],
+    compound: bool
+) -> List[Optional[SegmentationResult]]:
+    """Segment a chunk of texts in a worker thread; failed texts map to None."""
+    segment = thai_segmenter.segment_compound_words if compound else thai_segmenter.segment_text
+    results = []
+    for text in texts:
+        try:
+            results.append(segment(text))
+        except Exception as e:
+            logger.error("Batch tokenization failed for text", error=e, text_length=len(text))
+            results.append(None)
+    return results
+
+
+async def _stream_batch_tokenization(
+    request: BatchTokenizeRequest,
+    thai_segmenter: ThaiSegmenter,
+    chunk_size: int = BATCH_TOKENIZE_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield NDJSON lines for a batch tokenization request in input order.
+    
+    Identical texts are segmented once. Distinct texts are dispatched to a
+    worker thread in chunks, and each chunk's lines are streamed as soon as it
+    completes, so the event loop is never blocked by a whole batch.
+    """
+    texts = request.texts
+    confidence = 0.85 if request.compound else 0.95
+    results: Dict[str, Optional[SegmentationResult]] = {}
+    position = 0
+    
+    while position < len(texts):
+        # Scan forward until the chunk holds chunk_size new distinct texts
+        chunk: Dict[str, None] = {}
+        end = position
+        while end < len(texts):
+            text = texts[end]
+            if text not in results and text not in chunk:
+                if len(chunk) == chunk_size:
+                    break
+                chunk[text] = None
+            end += 1
+        
+        if chunk:
+            chunk_texts = list(chunk)
+            chunk_results = await asyncio.to_thread(
+                _segment_chunk, thai_segmenter, chunk_texts, request.compound
+            )
+            results.update(zip(chunk_texts, chunk_results))
+        
+        lines = []
+        for index in range(position, end):
+            text = texts[index]
+            result = results[text]
+            if result is None:
+                item = BatchTokenizationItem(
+                    index=index,
+                    original_text=text,
+                    tokens=[],
+                    word_boundaries=[],
+                    processing_time_ms=0,
+                    error="Failed to tokenize text"
+                )
+            else:
+                item = BatchTokenizationItem(
+                    index=index,
+                    original_text=text,
+                    tokens=result.tokens,
+                    word_boundaries=result.word_boundaries,
+                    confidence_scores=[confidence] * len(result.tokens) if request.include_confidence else None,
+                    processing_time_ms=int(result.processing_time_ms)
+                )
+            lines.append(item.model_dump_json())
+        
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+        position = end
+
+
+@router.post(
+    "/tokenize/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def tokenize_batch(
+    request: BatchTokenizeRequest,
+    http_request: Request,
+    thai_segmenter: ThaiSegmenter = Depends(get_thai_segmenter),
+    api_key: str = Depends(api_key_auth)
+):
+    """
+    Tokenize many Thai texts in one request.
+    
+    Results are streamed back as NDJSON, one BatchTokenizationItem per line in
+    the same order as the request texts. Duplicate texts are segmented once.
+    """
+    correlation_id = http_request.headers.get("X-Correlation-ID", generate_correlation_id())
+    set_correlation_id(correlation_id)
+    
+    logger.info("Batch tokenization request received",
+               text_count=len(request.texts),
+               unique_text_count=len(set(request.texts)),
+               compound=request.compound,
+               endpoint="tokenize_batch")
+    
+    return StreamingResponse(
+        _stream_batch_tokenization(request, thai_segmenter),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.post("/query/process", response_model=QueryProcessingResult)
 async def process_search_query(
     request: QueryProcessingRequest,
@@ -422,58 +548,61 @@ async def process_compound_query(
 
 @router.post("/search/enhance", response_model=SearchResultEnhancementResult)
 async def enhance_search_results(
-    request: SearchResultEnhancementRequest
+    request: SearchResultEnhancementRequest,
+    result_enhancer: SearchResultEnhancer = Depends(get_result_enhancer)
 ):
     """
     Enhance search results with Thai-specific improvements.
     
     This endpoint post-processes search results to improve highlighting,
     relevance scoring, and result presentation for Thai compound words.
-    
-    Note: Currently simplified to avoid datetime serialization issues.
+    Hits indexed with stored token offsets are highlighted without
+    re-segmenting their text.
     """
     try:
         logger.info(f"Enhancing search results for query: '{request.original_query}'")
-        logger.info(f"Search results type: {type(request.search_results)}")
         
-        # Simplified response without using SearchResultEnhancer to avoid datetime issues
-        # TODO: Re-implement full enhancement once datetime serialization is fixed
+        # Configure result enhancer based on request
+        result_enhancer.enable_compound_highlighting = request.enable_compound_highlighting
+        result_enhancer.enable_relevance_boosting = request.enable_relevance_boosting
+        
+        enhancement = result_enhancer.enhance_search_results(
+            request.search_results,
+            request.original_query,
+            request.highlight_fields
+        )
         
+        # Convert internal models to API models
         enhanced_hits = []
-        # Handle both dict and list formats for search_results
-        if isinstance(request.search_results, dict):
-            results_list = request.search_results.get('hits', [])
-        else:
-            results_list = request.search_results if isinstance(request.search_results, list) else []
-            
-        for result in results_list:
-            enhanced_hit = {
-                "original_hit": result,
-                "enhanced_score": 1.0,
-                "highlight_spans": [],
-                "compound_matches": [],
-                "original_text_preserved": {},
-                "tokenized_text": {},
-                "relevance_factors": {}
-            }
-            enhanced_hits.append(enhanced_hit)
+        for hit in enhancement.enhanced_hits:
+            enhanced_hits.append({
+                "original_hit": hit.original_hit,
+                "enhanced_score": hit.enhanced_score,
+                "highlight_spans": [
+                    {
+                        "start": span.start,
+                        "end": span.end,
+                        "text": span.text,
+                        "highlight_type": span.highlight_type.value,
+                        "confidence": span.confidence,
+                        "matched_query": span.matched_query
+                    }
+                    for span in hit.highlight_spans
+                ],
+                "compound_matches": hit.compound_matches,
+                "original_text_preserved": hit.original_text_preserved,
+                "tokenized_text": hit.tokenized_text,
+                "relevance_factors": hit.relevance_factors
+            })
         
         response = SearchResultEnhancementResult(
-            original_results={"query": request.original_query, "results": request.search_results},
+            original_results=enhancement.original_results,
             enhanced_hits=enhanced_hits,
-            query_analysis={"processed_query": request.original_query, "total_tokens": 1},
-            enhancement_metadata={
-                "status": "simplified_mode", 
-                "total_hits": len(enhanced_hits),
-                "compound_matches": 0,
-                "enhancement_enabled": {
-                    "compound_highlighting": request.enable_compound_highlighting,
-                    "relevance_boosting": request.enable_relevance_boosting
-                }
-            }
+            query_analysis=enhancement.query_analysis,
+            enhancement_metadata={"status": "enhanced", **enhancement.enhancement_metadata}
         )
         
-        logger.info(f"Search result enhancement completed (simplified mode): {len(enhanced_hits)} hits")
+        logger.info(f"Search result enhancement completed: {len(enhanced_hits)} hits")
         
         return response
         
@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for the Thai tokenizer API.
+
+Usage:
+    gunicorn src.api.main:app --config python:src.api.gunicorn_conf
+
+With THAI_TOKENIZER_PRELOAD_ENABLED (the default) the master imports the
+application and builds the tokenizer state before forking, so the workers
+share it instead of each loading a copy (see src/api/preload.py). Worker
+count and the other server options can still be overridden on the command
+line or through GUNICORN_CMD_ARGS.
+"""
+
+import gc
+import os
+
+from src.tokenizer.config_manager import ThaiTokenizerSettings
+
+_settings = ThaiTokenizerSettings()
+
+bind = "0.0.0.0:8000"
+workers = int(os.environ.get("WORKER_PROCESSES", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+max_requests = 1000
+max_requests_jitter = 100
+timeout = 30
+keepalive = 5
+
+preload_app = _settings.preload_enabled
+
+if preload_app:
+    # Keep collections from leaving freed holes in the pages that the
+    # workers will share; when_ready re-enables gc once the state is frozen
+    gc.disable()
+
+
+def when_ready(server):
+    """Build the shared tokenizer state in the master before the first fork."""
+    if server.cfg.preload_app:
+        from src.api.preload import preload_tokenizer_state
+
+        # Collects and freezes the state; frozen objects are never scanned
+        # again, so the master can collect its own garbage from here on
+        preload_tokenizer_state(_settings)
+    gc.enable()
+
+
+def post_fork(server, worker):
+    """Re-enable garbage collection in the worker."""
+    from src.api.preload import worker_started
+
+    worker_started(server.pid)
@@ -8,16 +8,20 @@ import logging
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from src.utils.logging import setup_logging, get_structured_logger, set_correlation_id, generate_correlation_id
+from src.utils.logging import setup_logging, get_structured_logger, flush_logs
 from src.api.models.responses import HealthCheckResponse, ErrorResponse
-from src.tokenizer.config_manager import ConfigManager
+from src.tokenizer.config_manager import ConfigManager, ThaiTokenizerSettings
 from src.meilisearch_integration.client import MeiliSearchClient
 from src.utils.health import health_checker, register_default_checks
+from src.utils.loop_monitor import loop_monitor
+from src.api.warmup import startup_warmup
+from src.api.middleware.request_context import RequestContextMiddleware
 
 # Set up logging
 setup_logging()
@@ -63,6 +67,23 @@ async def lifespan(app: FastAPI):
         )
         logger.info("Health checks registered")
         
+        # Probes and scrapes read cached results instead of re-running checks
+        settings = ThaiTokenizerSettings()
+        health_checker.results_ttl_seconds = settings.health_check_cache_seconds
+        health_checker.sampler.configure(settings.system_metrics_interval_seconds)
+        await health_checker.sampler.start()
+        
+        # Watch for blocking calls on this worker's event loop
+        if settings.event_loop_monitor_enabled:
+            loop_monitor.configure(
+                probe_interval_seconds=settings.event_loop_probe_interval_ms / 1000,
+                block_threshold_seconds=settings.event_loop_block_threshold_ms / 1000
+            )
+            await loop_monitor.start()
+        
+        # Readiness is held back until engines and caches are warm
+        startup_warmup.start(settings)
+        
         yield
         
     except Exception as e:
@@ -71,9 +92,13 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down Thai tokenizer service")
+        await startup_warmup.stop()
+        await loop_monitor.stop()
+        await health_checker.sampler.stop()
         if app_state.get("meilisearch_client"):
             # Cleanup MeiliSearch client if needed
             pass
+        flush_logs()
 
 
 # Create FastAPI application
@@ -101,53 +126,24 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure appropriately for production
 )
 
-
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time header to responses and record metrics."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    process_time_ms = process_time * 1000
-    
-    # Record request metrics for monitoring
-    success = response.status_code < 400
-    health_checker.record_request(success, process_time_ms)
-    
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Compress large responses (search pages with full Thai documents) for
+# clients that negotiate it via Accept-Encoding
+_response_settings = ThaiTokenizerSettings()
+if _response_settings.response_compression_enabled:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=_response_settings.response_compression_min_size,
+        compresslevel=_response_settings.response_compression_level
+    )
 
 
-@app.middleware("http")
-async def logging_middleware(request: Request, call_next):
-    """Log all requests and responses with correlation tracking."""
-    start_time = time.time()
-    
-    # Set up correlation ID for request tracking
-    correlation_id = request.headers.get("X-Correlation-ID", generate_correlation_id())
-    set_correlation_id(correlation_id)
-    
-    # Log request
-    logger.info("HTTP request received",
-               method=request.method,
-               path=request.url.path,
-               query_params=dict(request.query_params),
-               user_agent=request.headers.get("user-agent"),
-               client_ip=request.client.host if request.client else None)
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info("HTTP request completed",
-               status_code=response.status_code,
-               processing_time_ms=process_time * 1000,
-               response_size=response.headers.get("content-length"))
-    
-    # Add correlation ID to response headers
-    response.headers["X-Correlation-ID"] = correlation_id
-    
-    return response
+# Correlation IDs, timing headers, request metrics and sampled access
+# logs in one ASGI middleware; added last, so it wraps all of the above
+app.add_middleware(
+    RequestContextMiddleware,
+    access_log_sample_rate=_response_settings.access_log_sample_rate,
+    slow_request_ms=_response_settings.access_log_slow_request_ms
+)
 
 
 # Exception handlers
@@ -165,7 +161,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             message="Request validation failed",
             details={"errors": exc.errors()},
             timestamp=datetime.now()
-        ).model_dump()
+        ).model_dump(mode="json")
     )
 
 
@@ -232,8 +228,9 @@ async def health_check():
 
 
 # Include routers
-from src.api.endpoints import tokenize, documents, config, monitoring, health, metrics, monitoring_integration, search_proxy, analytics, config_management
+from src.api.endpoints import tokenize, documents, config, monitoring, health, metrics, monitoring_integration, search_proxy, analytics, config_management, suggest
 app.include_router(tokenize.router, prefix="/api/v1", tags=["tokenization"])
+app.include_router(suggest.router, prefix="/api/v1", tags=["suggestions"])
 app.include_router(documents.router, prefix="/api/v1", tags=["documents"])
 app.include_router(config.router, prefix="/api/v1", tags=["configuration"])
 app.include_router(monitoring.router, prefix="/api/v1", tags=["monitoring"])
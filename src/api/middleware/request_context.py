@@ -0,0 +1,98 @@
+"""
+Request context middleware for the Thai tokenizer API.
+
+Sets the correlation ID, adds the X-Correlation-ID and X-Process-Time
+response headers, records request metrics and writes access logs. It is a
+plain ASGI middleware: unlike @app.middleware("http") functions, which run
+through Starlette's BaseHTTPMiddleware, it starts no task per request and
+does not wrap the request or response body streams. Only the response
+start message is touched, to add the headers.
+"""
+
+import random
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.health import health_checker
+from src.utils.logging import generate_correlation_id, get_structured_logger, set_correlation_id
+
+logger = get_structured_logger(__name__)
+
+_CORRELATION_ID_HEADER = b"x-correlation-id"
+_USER_AGENT_HEADER = b"user-agent"
+
+
+class RequestContextMiddleware:
+    """
+    Correlation IDs, timing headers, request metrics and sampled access logs.
+
+    Every request is counted in the health checker's request statistics.
+    Logging every request costs more than a small /tokenize call itself, so
+    access logs are written for failed (5xx) and slow requests and for a
+    random sample of the rest.
+    """
+
+    def __init__(self, app: ASGIApp, access_log_sample_rate: float = 0.01, slow_request_ms: float = 1000.0):
+        self.app = app
+        self.access_log_sample_rate = access_log_sample_rate
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        correlation_id = _header(scope, _CORRELATION_ID_HEADER) or generate_correlation_id()
+        set_correlation_id(correlation_id)
+
+        # Reported as 500 when the application raises before responding
+        status_code = 500
+        response_size = None
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+                headers.append("X-Correlation-ID", correlation_id)
+                response_size = headers.get("content-length")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            process_time_ms = (time.perf_counter() - start_time) * 1000
+            health_checker.record_request(status_code < 400, process_time_ms)
+
+            if status_code >= 500:
+                reason = "error"
+            elif process_time_ms >= self.slow_request_ms:
+                reason = "slow"
+            elif random.random() < self.access_log_sample_rate:
+                reason = "sampled"
+            else:
+                reason = None
+
+            if reason:
+                client = scope.get("client")
+                logger.info("HTTP request completed",
+                            method=scope["method"],
+                            path=scope["path"],
+                            status_code=status_code,
+                            processing_time_ms=process_time_ms,
+                            response_size=response_size,
+                            user_agent=_header(scope, _USER_AGENT_HEADER),
+                            client_ip=client[0] if client else None,
+                            log_reason=reason)
+
+
+def _header(scope: Scope, name: bytes):
+    """First value of a request header (name in lower case), or None."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
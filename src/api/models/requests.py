@@ -10,6 +10,13 @@ class TokenizeRequest(BaseModel):
     include_confidence: bool = Field(False, description="Include confidence scores")
 
 
+class BatchTokenizeRequest(BaseModel):
+    """Request model for batch text tokenization."""
+    texts: List[str] = Field(..., min_length=1, max_length=10000, description="Thai texts to tokenize")
+    include_confidence: bool = Field(False, description="Include confidence scores")
+    compound: bool = Field(False, description="Use compound word segmentation")
+
+
 class IndexDocumentRequest(BaseModel):
     """Request model for document indexing."""
     id: str = Field(..., description="Document ID")
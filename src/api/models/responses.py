@@ -14,6 +14,12 @@ class TokenizationResult(BaseModel):
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
 
 
+class BatchTokenizationItem(TokenizationResult):
+    """Single NDJSON line of a batch tokenization response."""
+    index: int = Field(..., description="Position of the text in the request")
+    error: Optional[str] = Field(None, description="Error message if this text failed to tokenize")
+
+
 class DocumentProcessingResult(BaseModel):
     """Response model for document processing."""
     document_id: str = Field(..., description="Document ID")
@@ -58,6 +64,19 @@ class QueryProcessingResult(BaseModel):
     processing_metadata: Dict[str, Any] = Field(..., description="Processing metadata")
 
 
+class Suggestion(BaseModel):
+    """Response model for a single query suggestion."""
+    text: str = Field(..., description="Suggested query text")
+    score: float = Field(..., description="Suggestion weight")
+
+
+class SuggestionResult(BaseModel):
+    """Response model for prefix suggestions."""
+    query: str = Field(..., description="Typed prefix")
+    suggestions: List[Suggestion] = Field(..., description="Suggestions, best first")
+    processing_time_ms: float = Field(..., description="Lookup time in milliseconds")
+
+
 class HighlightSpan(BaseModel):
     """Response model for highlighted spans in search results."""
     start: int = Field(..., description="Start position of highlight")
@@ -0,0 +1,221 @@
+"""
+Pre-fork preloading of immutable tokenizer state.
+
+Without preloading, every worker imports PyThaiNLP, loads the thai_words()
+set, builds the custom-dictionary trie and loads the engine models on its
+own, so each worker carries a private copy of the same few hundred MB.
+
+With gunicorn's preload_app (see src/api/gunicorn_conf.py) the master builds
+this state once before forking. The workers inherit it through copy-on-write
+pages, and gc.freeze() moves the objects out of the collector's generations
+so the workers' garbage collections do not write to those pages and unshare
+them. memory_report() measures the effect as USS/PSS per process.
+"""
+
+import gc
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+# Short text run through each engine so that it loads its dictionary or model
+PRELOAD_SAMPLE_TEXT = "การพัฒนาซอฟต์แวร์ในกรุงเทพมหานคร"
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class PreloadReport:
+    """Outcome of preloading in the master process."""
+
+    duration_ms: float = 0.0
+    frozen_objects: int = 0
+    steps: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_ms": round(self.duration_ms, 3),
+            "frozen_objects": self.frozen_objects,
+            "steps": {name: round(duration, 3) for name, duration in self.steps.items()},
+            "errors": self.errors
+        }
+
+
+# Set in the master by preload_tokenizer_state() and inherited by the workers
+_preload_report: Optional[PreloadReport] = None
+
+# Set in a forked worker by worker_started()
+_master_pid: Optional[int] = None
+
+
+def get_preload_report() -> Optional[PreloadReport]:
+    """Get the preload report, or None when this process tree was not preloaded."""
+    return _preload_report
+
+
+def get_master_pid() -> Optional[int]:
+    """PID of the master that forked this worker, or None outside a preforked server."""
+    return _master_pid
+
+
+def worker_started(master_pid: int) -> None:
+    """
+    Record the master PID and re-enable garbage collection in a forked worker.
+
+    The master runs with gc disabled while it builds the shared state so that
+    collections do not leave freed holes in the pages the workers inherit.
+    """
+    global _master_pid
+    _master_pid = master_pid
+    gc.enable()
+
+
+def preload_tokenizer_state(settings=None, freeze: bool = True) -> PreloadReport:
+    """
+    Build the immutable tokenizer state and freeze it for sharing.
+
+    Runs synchronously and starts no threads or event loops, so it is safe
+    to call in a process that forks afterwards. A failing step is recorded
+    and skipped; the worker builds that state lazily as it would without
+    preloading.
+
+    Args:
+        settings: ThaiTokenizerSettings (loaded from the environment when None)
+        freeze: Call gc.freeze() after building
+
+    Returns:
+        PreloadReport with the step timings and the number of frozen objects
+    """
+    global _preload_report
+
+    if settings is None:
+        from src.tokenizer.config_manager import ThaiTokenizerSettings
+        settings = ThaiTokenizerSettings()
+
+    report = PreloadReport()
+    start_time = time.perf_counter()
+
+    def step(name: str, func: Callable[[], None]) -> None:
+        step_start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            report.errors[name] = f"{type(e).__name__}: {e}"
+            logger.warning("Preload step failed", step=name, error=str(e))
+        report.steps[name] = (time.perf_counter() - step_start) * 1000
+
+    step("dictionary", _load_dictionary)
+    step("segmenter", _build_segmenter)
+    step("query_processor", _build_query_processor)
+    if settings.preload_engine_models:
+        for engine in _engines_to_preload(settings):
+            step(f"engine:{engine}", lambda engine=engine: _load_engine(engine))
+
+    if freeze:
+        # Collect first so that garbage from the build is not frozen with it
+        gc.collect()
+        gc.freeze()
+    report.frozen_objects = gc.get_freeze_count()
+    report.duration_ms = (time.perf_counter() - start_time) * 1000
+    _preload_report = report
+
+    logger.info("Tokenizer state preloaded",
+                pid=os.getpid(),
+                duration_ms=round(report.duration_ms, 3),
+                frozen_objects=report.frozen_objects,
+                steps=report.to_dict()["steps"],
+                failed_steps=list(report.errors))
+    return report
+
+
+def _load_dictionary() -> None:
+    from pythainlp.corpus.common import thai_words
+
+    thai_words()
+
+
+def _build_segmenter() -> None:
+    """Build the tokenize endpoint segmenter (custom trie, compound table)."""
+    from src.api.endpoints.tokenize import get_thai_segmenter
+
+    get_thai_segmenter().segment_text(PRELOAD_SAMPLE_TEXT)
+
+
+def _build_query_processor() -> None:
+    from src.api.endpoints.tokenize import get_query_processor, get_result_enhancer, get_token_processor
+
+    get_token_processor()
+    get_result_enhancer()
+    get_query_processor()
+
+
+def _engines_to_preload(settings) -> List[str]:
+    """Configured engines that load a model; newmm only needs the dictionary."""
+    from src.api.warmup import StartupWarmup
+
+    return [engine for engine in StartupWarmup._configured_engines(settings) if engine != "newmm"]
+
+
+def _load_engine(engine: str) -> None:
+    from src.tokenizer.thai_segmenter import ThaiSegmenter
+
+    result = ThaiSegmenter(engine=engine).segment_text(PRELOAD_SAMPLE_TEXT)
+    if result.engine != engine:
+        raise RuntimeError(f"{engine} is unavailable (fell back to {result.engine})")
+
+
+def memory_report(pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Memory of a process and its children, split into private and shared.
+
+    RSS counts pages shared with other processes in full for every process,
+    so summing it overstates the footprint of a preforked server. USS is the
+    memory only that process uses and PSS charges each shared page
+    proportionally, so the PSS total is the real footprint and the
+    difference between the RSS and PSS totals is what sharing saves.
+
+    Args:
+        pid: Root process, usually the gunicorn master (this process when None)
+
+    Returns:
+        Per-process and total RSS/USS/PSS in MB. PSS is None where the
+        platform does not report it.
+    """
+    import psutil
+
+    root = psutil.Process(pid or os.getpid())
+    processes = []
+    for role, process in [("master", root)] + [("worker", child) for child in root.children(recursive=True)]:
+        try:
+            info = process.memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        pss = getattr(info, "pss", None)
+        processes.append({
+            "pid": process.pid,
+            "role": role,
+            "rss_mb": round(info.rss / _MB, 2),
+            "uss_mb": round(info.uss / _MB, 2),
+            "pss_mb": round(pss / _MB, 2) if pss is not None else None,
+            "shared_mb": round((info.rss - info.uss) / _MB, 2)
+        })
+
+    rss_total = sum(p["rss_mb"] for p in processes)
+    pss_values = [p["pss_mb"] for p in processes if p["pss_mb"] is not None]
+    pss_total = sum(pss_values) if len(pss_values) == len(processes) else None
+    return {
+        "root_pid": root.pid,
+        "preloaded": _preload_report is not None,
+        "processes": processes,
+        "totals": {
+            "rss_mb": round(rss_total, 2),
+            "uss_mb": round(sum(p["uss_mb"] for p in processes), 2),
+            "pss_mb": round(pss_total, 2) if pss_total is not None else None,
+            "shared_savings_mb": round(rss_total - pss_total, 2) if pss_total is not None else None
+        }
+    }
@@ -0,0 +1,39 @@
+"""Fast JSON response serialization for large API payloads."""
+
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response that serializes pydantic models straight to bytes.
+
+    FastAPI's default path re-validates the returned model against the
+    endpoint's ``response_model``, converts it to plain Python objects with
+    ``jsonable_encoder`` and then encodes those with ``json.dumps``. For a
+    search page of full Thai documents that walks every nested dict several
+    times. Returning this response from an endpoint skips those passes:
+    pydantic-core writes models (or lists of models) directly to UTF-8 JSON.
+
+    The ``response_model`` declared on the route is still used for the
+    OpenAPI schema.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        exclude_none: bool = False
+    ) -> None:
+        # render() is called from the base constructor
+        self.exclude_none = exclude_none
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, exclude_none=self.exclude_none)
@@ -0,0 +1,292 @@
+"""
+Startup warm-up for tokenizer engines, request dependencies and caches.
+
+A fresh worker pays one-time costs on its first requests: PyThaiNLP
+dictionary and model loads, construction of the lazily created endpoint
+dependencies and an empty search cache. The warm-up runs these up front in
+the background after startup, and the readiness probe reports not-ready
+until it has finished, so traffic only reaches warm workers.
+
+Every step is timed. A failing step is recorded and the warm-up moves on:
+an engine that cannot be loaded would fail on the first request anyway,
+and a worker must not stay unready forever because of it.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+# Short queries covering Thai, compound words and mixed Thai-English text
+DEFAULT_WARMUP_QUERIES = [
+    "ร้านอาหารญี่ปุ่น",
+    "การพัฒนาซอฟต์แวร์",
+    "โรงพยาบาลในกรุงเทพมหานคร",
+    "สมาร์ทโฟน Android ราคาถูก",
+    "machine learning ภาษาไทย",
+]
+
+
+@dataclass
+class WarmupStep:
+    """Outcome of one warm-up step."""
+
+    name: str
+    duration_ms: float
+    success: bool
+    error: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "success": self.success,
+            "error": self.error,
+            "details": self.details
+        }
+
+
+class StartupWarmup:
+    """
+    Runs the warm-up steps once and tracks whether the worker is ready.
+
+    Status moves from "not_started" to "running" and ends as "complete",
+    "timed_out" or "disabled". Only a running warm-up holds readiness back.
+    """
+
+    def __init__(self):
+        self.status = "not_started"
+        self.steps: List[WarmupStep] = []
+        self.started_at: Optional[datetime] = None
+        self.duration_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status != "running"
+
+    @property
+    def failed_steps(self) -> List[str]:
+        return [step.name for step in self.steps if not step.success]
+
+    def start(self, settings) -> None:
+        """
+        Start the warm-up in the background on the running loop.
+
+        Args:
+            settings: ThaiTokenizerSettings with the warm-up options
+        """
+        if not settings.warmup_enabled:
+            self.status = "disabled"
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self.status = "running"
+        self._task = asyncio.get_running_loop().create_task(self.run(settings), name="startup-warmup")
+
+    async def stop(self) -> None:
+        """Cancel a warm-up still running at shutdown."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run(self, settings) -> None:
+        """Run all steps, giving up after settings.warmup_timeout_seconds."""
+        self.status = "running"
+        self.steps = []
+        self.started_at = datetime.now()
+        start_time = time.perf_counter()
+        logger.info("Startup warm-up started", timeout_seconds=settings.warmup_timeout_seconds)
+
+        try:
+            await asyncio.wait_for(self._run_steps(settings), timeout=settings.warmup_timeout_seconds)
+            self.status = "complete"
+        except asyncio.TimeoutError:
+            self.status = "timed_out"
+        finally:
+            self.duration_ms = (time.perf_counter() - start_time) * 1000
+            if self.status == "running":
+                # Cancelled at shutdown
+                self.status = "not_started"
+
+        log = logger.warning if self.status == "timed_out" or self.failed_steps else logger.info
+        log("Startup warm-up finished",
+            status=self.status,
+            duration_ms=round(self.duration_ms, 3),
+            steps={step.name: round(step.duration_ms, 3) for step in self.steps},
+            failed_steps=self.failed_steps)
+
+    async def _step(self, name: str, func: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> bool:
+        start_time = time.perf_counter()
+        try:
+            details = await func()
+            step = WarmupStep(name, (time.perf_counter() - start_time) * 1000, True, details=details or {})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            step = WarmupStep(name, (time.perf_counter() - start_time) * 1000, False, error=f"{type(e).__name__}: {e}")
+            logger.warning("Warm-up step failed", step=name, error=str(e))
+        self.steps.append(step)
+        return step.success
+
+    async def _run_steps(self, settings) -> None:
+        queries = list(settings.warmup_queries) or DEFAULT_WARMUP_QUERIES
+
+        await self._step("tokenizer", lambda: self._warm_tokenizer(queries))
+        for engine in self._configured_engines(settings):
+            await self._step(f"engine:{engine}", lambda engine=engine: self._warm_engine(engine, queries))
+        await self._step("query_processor", lambda: self._warm_query_processor(queries))
+        if settings.warmup_search_proxy:
+            await self._step("search_proxy", lambda: self._search(settings, queries))
+            if settings.warmup_replay_top_queries > 0:
+                await self._step("cache_replay", lambda: self._replay_top_queries(settings))
+
+    @staticmethod
+    def _configured_engines(settings) -> List[str]:
+        """Tokenization engines the API and the search proxy may use."""
+        from src.search_proxy.config.settings import SearchProxySettings
+
+        engines = [settings.tokenizer_engine.value]
+        if settings.tokenizer_enable_fallback and settings.tokenizer_fallback_engine:
+            engines.append(settings.tokenizer_fallback_engine.value)
+        tokenization = SearchProxySettings().tokenization
+        engines.append(tokenization.primary_engine)
+        engines.extend(tokenization.fallback_engines)
+        return list(dict.fromkeys(engines))
+
+    @staticmethod
+    async def _warm_tokenizer(queries: List[str]) -> Dict[str, Any]:
+        """Build the shared segmenter (dictionary trie, compound table)."""
+        from src.api.endpoints.tokenize import get_thai_segmenter
+
+        def build_and_segment():
+            segmenter = get_thai_segmenter()
+            for query in queries:
+                segmenter.segment_text(query)
+            return segmenter
+
+        segmenter = await asyncio.to_thread(build_and_segment)
+        return {"engine": segmenter.engine, "queries": len(queries)}
+
+    @staticmethod
+    async def _warm_engine(engine: str, queries: List[str]) -> Dict[str, Any]:
+        """Load an engine's dictionary or model by segmenting with it."""
+        from src.tokenizer.thai_segmenter import ThaiSegmenter
+
+        def segment():
+            segmenter = ThaiSegmenter(engine=engine)
+            for query in queries:
+                result = segmenter.segment_text(query)
+                if result.engine != engine:
+                    # The segmenter fell back; the engine itself did not load
+                    raise RuntimeError(f"{engine} is unavailable (fell back to {result.engine})")
+
+        await asyncio.to_thread(segment)
+        return {"queries": len(queries)}
+
+    @staticmethod
+    async def _warm_query_processor(queries: List[str]) -> Dict[str, Any]:
+        """Build the query processing dependencies of the tokenize endpoints."""
+        from src.api.endpoints.tokenize import get_query_processor, get_result_enhancer, get_token_processor
+
+        def build_and_process():
+            get_token_processor()
+            get_result_enhancer()
+            processor = get_query_processor()
+            for query in queries:
+                processor.process_search_query(query)
+
+        await asyncio.to_thread(build_and_process)
+        return {"queries": len(queries)}
+
+    @staticmethod
+    async def _search(settings, queries: List[str]) -> Dict[str, Any]:
+        """
+        Run searches through the search proxy, initializing it on first use.
+
+        The searches are not recorded in metrics or query analytics: warm-up
+        traffic would otherwise inflate the query frequencies that the next
+        warm-up replays.
+        """
+        from src.api.endpoints.search_proxy import get_search_proxy_service
+        from src.search_proxy.models.requests import SearchRequest
+
+        service = await get_search_proxy_service()
+        index_name = settings.warmup_index_name or settings.meilisearch_index
+        semaphore = asyncio.Semaphore(settings.warmup_concurrency)
+
+        async def search(query: str) -> bool:
+            async with semaphore:
+                response = await service.search(SearchRequest(query=query, index_name=index_name), record=False)
+            return response.total_hits >= 0
+
+        outcomes = await asyncio.gather(*(search(query) for query in queries), return_exceptions=True)
+        succeeded = sum(1 for outcome in outcomes if outcome is True)
+        if queries and not succeeded:
+            raise RuntimeError(f"All {len(queries)} warm-up searches failed")
+        return {"index": index_name, "queries": len(queries), "succeeded": succeeded}
+
+    async def _replay_top_queries(self, settings) -> Dict[str, Any]:
+        """Fill the search cache with the most frequent recent queries."""
+        # Reads an exported analytics file
+        queries = await asyncio.to_thread(top_queries, settings.warmup_replay_top_queries)
+        if not queries:
+            return {"queries": 0}
+        return await self._search(settings, queries)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "failed_steps": self.failed_steps,
+            "steps": [step.to_dict() for step in self.steps]
+        }
+
+
+def top_queries(limit: int) -> List[str]:
+    """
+    Most frequent queries from search analytics.
+
+    Uses this worker's in-memory analytics, topped up from the newest
+    exported query pattern file so a fresh worker has history to replay.
+    """
+    from src.search_proxy.analytics import analytics_collector
+
+    frequencies = dict(analytics_collector.get_query_frequencies(limit=limit))
+    if len(frequencies) < limit:
+        exports = sorted(analytics_collector.analytics_dir.glob("query_patterns_*.json"))
+        if exports:
+            try:
+                with open(exports[-1], encoding="utf-8") as f:
+                    patterns = json.load(f)
+                for pattern in patterns:
+                    if pattern.get("success_rate", 1.0) >= 0.5:
+                        query = pattern["query"]
+                        frequencies[query] = max(frequencies.get(query, 0), pattern.get("frequency", 0))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Could not read exported query patterns", path=str(exports[-1]), error=str(e))
+
+    ranked = sorted(frequencies.items(), key=lambda item: item[1], reverse=True)
+    return [query for query, _ in ranked[:limit]]
+
+
+# Global warm-up instance
+startup_warmup = StartupWarmup()
+
+
+def get_startup_warmup() -> StartupWarmup:
+    """Get the global startup warm-up."""
+    return startup_warmup
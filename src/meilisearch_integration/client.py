@@ -19,6 +19,7 @@ from meilisearch.errors import MeilisearchError, MeilisearchApiError
 from pydantic import BaseModel, Field
 
 from ..utils.logging import get_structured_logger, SearchMetrics, performance_monitor
+from ..utils.tracing import SpanKind, current_span, start_span
 
 
 logger = get_structured_logger(__name__)
@@ -86,7 +87,9 @@ class MeiliSearchClient:
                         f"MeiliSearch operation failed (attempt {attempt + 1}): {e}. "
                         f"Retrying in {wait_time}s..."
                     )
-                    await asyncio.sleep(wait_time)
+                    current_span().add_event("retry", {"attempt": attempt + 1, "error": str(e)[:200]})
+                    with start_span("retry.wait", {"attempt": attempt + 1, "delay_ms": wait_time * 1000}):
+                        await asyncio.sleep(wait_time)
                 else:
                     logger.error(f"MeiliSearch operation failed after {self.config.max_retries} attempts: {e}")
                     
@@ -148,6 +151,38 @@ class MeiliSearchClient:
                     
         return self._indexes[index_name]
     
+    async def get_primary_key(self, index_name: str) -> Optional[str]:
+        """Get the primary key of an index."""
+        try:
+            index = await self.get_index(index_name)
+            return await self._retry_operation(index.get_primary_key)
+        except Exception as e:
+            logger.error(f"Failed to get primary key for index {index_name}: {e}")
+            raise
+    
+    async def swap_indexes(self, index_a: str, index_b: str, timeout: int = 60) -> Dict[str, Any]:
+        """
+        Atomically swap the documents and settings of two indexes.
+        
+        Searches see either the old or the new contents of each index,
+        never a mix. Swapping the same pair again reverts the swap.
+        """
+        try:
+            task = await self._retry_operation(
+                self.client.swap_indexes,
+                [{"indexes": [index_a, index_b]}]
+            )
+            
+            # Wait for swap to complete
+            await self._wait_for_task(task["taskUid"], timeout=timeout)
+            
+            logger.info(f"Swapped indexes: {index_a} <-> {index_b}")
+            return {"status": "swapped", "indexes": [index_a, index_b], "task_uid": task["taskUid"]}
+            
+        except Exception as e:
+            logger.error(f"Failed to swap indexes {index_a} and {index_b}: {e}")
+            raise
+    
     async def update_index_settings(self, index_name: str, settings: Dict[str, Any]) -> Dict[str, Any]:
         """Update index settings including tokenization configuration."""
         try:
@@ -288,7 +323,17 @@ class MeiliSearchClient:
             index = await self.get_index(index_name)
             search_options = options or {}
             
-            results = await self._retry_operation(index.search, query, search_options)
+            with start_span("meilisearch.search", {
+                "db.system": "meilisearch",
+                "db.operation": "search",
+                "index": index_name,
+                "server.address": self.config.host
+            }, kind=SpanKind.CLIENT) as span:
+                results = await self._retry_operation(index.search, query, search_options)
+                span.set_attributes({
+                    "hits": len(results.get('hits', [])),
+                    "meilisearch.processing_time_ms": results.get('processingTimeMs', 0)
+                })
             
             processing_time_ms = (time.time() - start_time) * 1000
             
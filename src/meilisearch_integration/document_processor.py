@@ -8,15 +8,18 @@ while creating searchable tokens.
 
 import asyncio
 import logging
-import re
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
 from ..tokenizer.thai_segmenter import ThaiSegmenter, TokenizationResult
+from ..tokenizer import script_scanner
+from ..tokenizer.script_scanner import scan_text, extract_thai_runs, thai_runs
+from ..tokenizer.token_offsets import TOKEN_OFFSETS_FIELD, encode_boundaries, field_boundaries
 from ..tokenizer.token_processor import TokenProcessor, TokenProcessingResult, ContentType
 from .client import MeiliSearchClient, DocumentModel
+from .sharding import ShardedMeiliSearchClient
 
 
 logger = logging.getLogger(__name__)
@@ -52,6 +55,7 @@ class ProcessedDocument:
     content: str
     thai_content: Optional[str] = None
     tokenized_content: Optional[str] = None
+    token_offsets: Optional[Dict[str, str]] = None
     metadata: ProcessingMetadata = field(default_factory=ProcessingMetadata)
     original_document: Optional[Dict[str, Any]] = None
     status: ProcessingStatus = ProcessingStatus.PENDING
@@ -73,8 +77,8 @@ class ThaiContentDetector:
     """Utility class for detecting Thai content in text."""
     
     # Thai Unicode ranges
-    THAI_RANGE = (0x0E00, 0x0E7F)
-    THAI_PATTERN = re.compile(r'[\u0E00-\u0E7F]+')
+    THAI_RANGE = script_scanner.THAI_RANGE
+    THAI_PATTERN = script_scanner.THAI_RUN_PATTERN
     
     @classmethod
     def contains_thai(cls, text: str) -> bool:
@@ -89,16 +93,16 @@ class ThaiContentDetector:
         if not text:
             return 0.0
         
-        thai_chars = sum(1 for c in text if '\u0e00' <= c <= '\u0e7f')
+        profile = scan_text(text)
         # Count all characters that are letters (including Thai characters)
-        total_chars = sum(1 for c in text if c.isalpha() or '\u0e00' <= c <= '\u0e7f')
+        total_chars = profile.thai_chars + profile.letter_chars
         
-        return thai_chars / total_chars if total_chars > 0 else 0.0
+        return profile.thai_chars / total_chars if total_chars > 0 else 0.0
     
     @classmethod
     def extract_thai_content(cls, text: str) -> List[str]:
         """Extract Thai text segments from mixed content."""
-        return cls.THAI_PATTERN.findall(text)
+        return extract_thai_runs(text)
     
     @classmethod
     def is_mixed_content(cls, text: str) -> bool:
@@ -106,10 +110,7 @@ class ThaiContentDetector:
         if not text:
             return False
         
-        has_thai = cls.contains_thai(text)
-        has_non_thai = bool(re.search(r'[a-zA-Z0-9]', text))
-        
-        return has_thai and has_non_thai
+        return scan_text(text).is_mixed
 
 
 class DocumentProcessor:
@@ -126,16 +127,52 @@ class DocumentProcessor:
         token_processor: Optional[TokenProcessor] = None,
         meilisearch_client: Optional[MeiliSearchClient] = None,
         batch_size: int = 100,
-        max_concurrent: int = 10
+        max_concurrent: int = 10,
+        chunk_size: int = 1000,
+        concurrency_limiter: Optional[asyncio.Semaphore] = None
     ):
-        """Initialize document processor with components."""
+        """
+        Initialize document processor with components.
+        
+        Args:
+            concurrency_limiter: Semaphore shared with other processors to bound
+                concurrent documents globally; defaults to a per-batch
+                semaphore of max_concurrent
+        """
         self.thai_segmenter = thai_segmenter or ThaiSegmenter()
         self.token_processor = token_processor or TokenProcessor()
         self.meilisearch_client = meilisearch_client
         self.batch_size = batch_size
         self.max_concurrent = max_concurrent
+        self.chunk_size = chunk_size
+        self.concurrency_limiter = concurrency_limiter
         self.content_detector = ThaiContentDetector()
         
+    async def _segment_thai_text(self, text: str) -> TokenizationResult:
+        """
+        Segment Thai text, splitting long text into chunks segmented concurrently.
+        
+        Chunks are split at whitespace/punctuation near chunk_size and the
+        results are stitched back with offsets relative to text; words cut by
+        a split inside a Thai run are rejoined by segmenting the seam again.
+        """
+        if len(text) <= self.chunk_size:
+            return await asyncio.to_thread(self.thai_segmenter.segment_text, text)
+        
+        chunks = self.thai_segmenter.split_into_chunks(text, self.chunk_size)
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        
+        async def segment_chunk(chunk: str) -> TokenizationResult:
+            async with semaphore:
+                return await asyncio.to_thread(self.thai_segmenter.segment_text, chunk)
+        
+        results = await asyncio.gather(*(segment_chunk(chunk) for _, chunk in chunks))
+        return await asyncio.to_thread(
+            self.thai_segmenter.merge_chunk_results,
+            text,
+            [(offset, result) for (offset, _), result in zip(chunks, results, strict=True)]
+        )
+        
     async def process_document(
         self,
         document: Dict[str, Any],
@@ -171,11 +208,11 @@ class DocumentProcessor:
                 status=ProcessingStatus.PROCESSING
             )
             
-            # Detect Thai content
-            title_has_thai = self.content_detector.contains_thai(title)
-            content_has_thai = self.content_detector.contains_thai(content)
+            # Detect Thai content (one scan per field)
+            title_profile = scan_text(title or "")
+            content_profile = scan_text(content or "")
             
-            if not (title_has_thai or content_has_thai):
+            if not (title_profile.has_thai or content_profile.has_thai):
                 # No Thai content - skip tokenization
                 processed_doc.status = ProcessingStatus.SKIPPED
                 processed_doc.metadata.thai_content_detected = False
@@ -184,10 +221,7 @@ class DocumentProcessor:
             
             # Process Thai content
             processed_doc.metadata.thai_content_detected = True
-            processed_doc.metadata.mixed_content = (
-                self.content_detector.is_mixed_content(title) or
-                self.content_detector.is_mixed_content(content)
-            )
+            processed_doc.metadata.mixed_content = title_profile.is_mixed or content_profile.is_mixed
             
             # Combine text for processing
             full_text = f"{title} {content}".strip()
@@ -200,14 +234,20 @@ class DocumentProcessor:
             if thai_segments:
                 tokenized_segments = []
                 total_tokens = 0
+                token_offsets = {}
                 
-                for segment in thai_segments:
-                    if segment.strip():
-                        # Tokenize Thai segment
-                        tokenization_result = await asyncio.to_thread(
-                            self.thai_segmenter.segment_text,
-                            segment
-                        )
+                # Segment field by field (the runs of full_text are the title
+                # runs followed by the content runs) so token boundaries can
+                # be stored per field for highlighting
+                for field_name, text in (("title", title), ("content", content)):
+                    if not text:
+                        continue
+                    run_tokens = []
+                    
+                    for start, end in thai_runs(text):
+                        # Tokenize Thai segment (chunked when long)
+                        tokenization_result = await self._segment_thai_text(text[start:end])
+                        run_tokens.append(tokenization_result.tokens)
                         
                         # Process tokens for MeiliSearch
                         token_result = await asyncio.to_thread(
@@ -217,8 +257,14 @@ class DocumentProcessor:
                         
                         tokenized_segments.append(token_result.processed_text)
                         total_tokens += len(token_result.tokens)
+                    
+                    if run_tokens:
+                        token_offsets[field_name] = encode_boundaries(
+                            field_boundaries(text, run_tokens)
+                        )
                 
                 processed_doc.tokenized_content = " ".join(tokenized_segments)
+                processed_doc.token_offsets = token_offsets or None
                 processed_doc.metadata.token_count = total_tokens
             
             # Update metadata
@@ -293,7 +339,7 @@ class DocumentProcessor:
         errors = []
         
         # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        semaphore = self.concurrency_limiter or asyncio.Semaphore(self.max_concurrent)
         
         async def process_with_semaphore(doc):
             async with semaphore:
@@ -351,6 +397,11 @@ class DocumentProcessor:
         """
         Index processed documents in MeiliSearch.
         
+        With a ShardedMeiliSearchClient each document is written to the shard
+        its partition key maps to, the same placement searches rely on. A
+        partition field other than the primary key is copied from the
+        original document, so preserve_original must be set when processing.
+        
         Args:
             processed_documents: List of processed documents
             index_name: MeiliSearch index name
@@ -375,6 +426,10 @@ class DocumentProcessor:
             logger.warning("No successfully processed documents to index")
             return {"indexed_count": 0, "errors": ["No documents to index"]}
         
+        partition_field = None
+        if isinstance(self.meilisearch_client, ShardedMeiliSearchClient):
+            partition_field = self.meilisearch_client.partitioner.partition_field
+        
         # Convert to MeiliSearch document format
         meilisearch_docs = []
         for doc in documents_to_index:
@@ -384,6 +439,7 @@ class DocumentProcessor:
                 "content": doc.content,
                 "thai_content": doc.thai_content,
                 "tokenized_content": doc.tokenized_content,
+                TOKEN_OFFSETS_FIELD: doc.token_offsets,
                 "metadata": {
                     "language": doc.metadata.language,
                     "tokenization_version": doc.metadata.tokenization_version,
@@ -394,6 +450,8 @@ class DocumentProcessor:
                     "mixed_content": doc.metadata.mixed_content
                 }
             }
+            if partition_field and doc.original_document and partition_field in doc.original_document:
+                meilisearch_doc.setdefault(partition_field, doc.original_document[partition_field])
             meilisearch_docs.append(meilisearch_doc)
         
         try:
@@ -406,12 +464,15 @@ class DocumentProcessor:
             
             logger.info(f"Indexed {len(meilisearch_docs)} documents in index '{index_name}'")
             
-            return {
+            indexing_result = {
                 "indexed_count": len(meilisearch_docs),
                 "task_uid": result.get("taskUid"),
                 "index_name": index_name,
                 "errors": []
             }
+            if "shard_counts" in result:
+                indexing_result["shard_counts"] = result["shard_counts"]
+            return indexing_result
             
         except Exception as e:
             error_msg = f"Failed to index documents: {str(e)}"
@@ -468,6 +529,7 @@ class DocumentProcessor:
         return {
             "batch_size": self.batch_size,
             "max_concurrent": self.max_concurrent,
+            "chunk_size": self.chunk_size,
             "thai_segmenter_engine": getattr(self.thai_segmenter, 'engine', 'unknown'),
             "meilisearch_configured": self.meilisearch_client is not None
         }
@@ -476,7 +538,8 @@ class DocumentProcessor:
 def create_document_processor(
     meilisearch_client: Optional[MeiliSearchClient] = None,
     batch_size: int = 100,
-    max_concurrent: int = 10
+    max_concurrent: int = 10,
+    chunk_size: int = 1000
 ) -> DocumentProcessor:
     """
     Create a document processor with default configuration.
@@ -485,6 +548,7 @@ def create_document_processor(
         meilisearch_client: Optional MeiliSearch client
         batch_size: Batch size for processing
         max_concurrent: Maximum concurrent operations
+        chunk_size: Target chunk length for segmenting long Thai text
         
     Returns:
         Configured DocumentProcessor instance
@@ -492,5 +556,6 @@ def create_document_processor(
     return DocumentProcessor(
         meilisearch_client=meilisearch_client,
         batch_size=batch_size,
-        max_concurrent=max_concurrent
+        max_concurrent=max_concurrent,
+        chunk_size=chunk_size
     )
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Concurrent reindexing of many MeiliSearch indexes.
+
+Runs several index pipelines at once, smallest index first, and reports
+combined progress with an ETA. Pipelines share a ReindexBudget so the total
+tokenization, upload and MeiliSearch task load stays bounded no matter how
+many indexes run concurrently.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .reindexer import ReindexStats
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexProgress:
+    """Progress of one index."""
+    index_name: str
+    total_documents: int
+    done_documents: int = 0
+    # Committed by an interrupted earlier run this one resumed from
+    resumed_documents: int = 0
+    started_at: Optional[float] = None
+    finished: bool = False
+
+    @property
+    def percent(self) -> float:
+        """Completion percentage."""
+        if not self.total_documents:
+            return 100.0 if self.finished else 0.0
+        return min(100.0, self.done_documents * 100.0 / self.total_documents)
+
+
+class ReindexProgress:
+    """Combined progress of all scheduled indexes."""
+
+    def __init__(self):
+        """Initialize empty progress."""
+        self.indexes: Dict[str, IndexProgress] = {}
+        self.started_at = time.monotonic()
+
+    def register(self, index_name: str, total_documents: int) -> None:
+        """Add an index to track."""
+        self.indexes[index_name] = IndexProgress(index_name, total_documents)
+
+    def start(self, index_name: str) -> None:
+        """Mark an index as running."""
+        self.indexes[index_name].started_at = time.monotonic()
+
+    def resume(self, index_name: str, offset: int) -> None:
+        """Count the documents an interrupted run of an index already committed."""
+        progress = self.indexes[index_name]
+        progress.resumed_documents = offset
+        progress.done_documents = max(progress.done_documents, offset)
+
+    def advance(self, index_name: str, documents: int) -> None:
+        """Record documents committed for an index."""
+        self.indexes[index_name].done_documents += documents
+
+    def finish(self, index_name: str) -> None:
+        """Mark an index as finished."""
+        progress = self.indexes[index_name]
+        progress.finished = True
+        progress.done_documents = max(progress.done_documents, progress.total_documents)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get combined progress with throughput and ETA.
+
+        Documents of resumed runs count as done but not towards the
+        throughput, which only measures this run.
+        """
+        total = sum(p.total_documents for p in self.indexes.values())
+        done = sum(min(p.done_documents, p.total_documents) for p in self.indexes.values())
+        resumed = sum(min(p.resumed_documents, p.total_documents) for p in self.indexes.values())
+        elapsed = time.monotonic() - self.started_at
+        rate = (done - resumed) / elapsed if elapsed > 0 else 0.0
+        remaining = total - done
+
+        return {
+            "indexes_total": len(self.indexes),
+            "indexes_finished": sum(1 for p in self.indexes.values() if p.finished),
+            "documents_total": total,
+            "documents_done": done,
+            "documents_resumed": resumed,
+            "percent": done * 100.0 / total if total else 100.0,
+            "documents_per_second": rate,
+            "eta_seconds": remaining / rate if rate > 0 else None,
+            "elapsed_seconds": elapsed,
+            "active": {
+                p.index_name: round(p.percent, 1)
+                for p in self.indexes.values()
+                if p.started_at is not None and not p.finished
+            }
+        }
+
+    def format(self) -> str:
+        """Format a one-line progress report."""
+        snap = self.snapshot()
+        eta = snap["eta_seconds"]
+        eta_text = f"{int(eta // 60)}m{int(eta % 60):02d}s" if eta is not None else "unknown"
+        active = ", ".join(f"{name} {pct}%" for name, pct in snap["active"].items())
+        return (
+            f"{snap['indexes_finished']}/{snap['indexes_total']} indexes, "
+            f"{snap['documents_done']:,}/{snap['documents_total']:,} documents "
+            f"({snap['percent']:.1f}%), {snap['documents_per_second']:.0f} docs/s, "
+            f"ETA {eta_text}" + (f" | active: {active}" if active else "")
+        )
+
+
+class ReindexScheduler:
+    """
+    Reindex several indexes concurrently, smallest first.
+
+    Small indexes finish (and become searchable with the new tokenization)
+    early instead of queueing behind large ones; large ones then share the
+    remaining concurrency.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_indexes: int = 4,
+        progress_interval: float = 10.0
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrent_indexes: Indexes reindexed at the same time
+            progress_interval: Seconds between progress log lines (0 disables)
+        """
+        self.max_concurrent_indexes = max_concurrent_indexes
+        self.progress_interval = progress_interval
+        self.progress = ReindexProgress()
+
+    async def _report_progress(self) -> None:
+        """Log combined progress periodically."""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            logger.info(f"Reindex progress: {self.progress.format()}")
+
+    async def run(
+        self,
+        index_sizes: Dict[str, int],
+        reindex: Callable[[str], Awaitable[ReindexStats]]
+    ) -> Dict[str, ReindexStats]:
+        """
+        Reindex indexes concurrently.
+
+        Args:
+            index_sizes: Document count per index, used for ordering and ETA
+            reindex: Coroutine function reindexing one index; it should
+                report a resumed offset through ``self.progress.resume`` and
+                committed batches through ``self.progress.advance``
+
+        Returns:
+            Reindexing statistics per index, in scheduling order
+        """
+        order: List[str] = sorted(index_sizes, key=lambda name: (index_sizes[name], name))
+        for index_name in order:
+            self.progress.register(index_name, index_sizes[index_name])
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index_name in order:
+            queue.put_nowait(index_name)
+
+        results: Dict[str, ReindexStats] = {}
+
+        async def worker():
+            while not queue.empty():
+                index_name = queue.get_nowait()
+                self.progress.start(index_name)
+                try:
+                    results[index_name] = await reindex(index_name)
+                except Exception as e:
+                    error_msg = f"Failed to reindex {index_name}: {e}"
+                    logger.error(error_msg)
+                    results[index_name] = ReindexStats(index_name=index_name, errors=[error_msg])
+                finally:
+                    self.progress.finish(index_name)
+                    logger.info(f"Finished {index_name}; {self.progress.format()}")
+
+        logger.info(
+            f"Scheduling {len(order)} indexes, {self.max_concurrent_indexes} at a time "
+            f"({sum(index_sizes.values()):,} documents)"
+        )
+
+        reporter = asyncio.create_task(self._report_progress()) if self.progress_interval > 0 else None
+        try:
+            workers = min(self.max_concurrent_indexes, len(order))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            if reporter:
+                reporter.cancel()
+
+        return {index_name: results[index_name] for index_name in order}
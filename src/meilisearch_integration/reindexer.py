@@ -0,0 +1,731 @@
+"""
+Streaming, checkpointed reindexing of existing MeiliSearch indexes.
+
+This module provides the reindex pipeline used by the maintenance scripts:
+- Paging through an index as an async generator instead of loading it whole
+- Per-document fingerprints (content hash plus tokenizer and dictionary
+  version) so unchanged documents are skipped
+- Resumable checkpoints written after each committed batch
+- Overlapping fetch, tokenization and upload stages joined by bounded queues
+- Blue/green reindexing into a shadow index that is validated and then
+  atomically swapped with the live index
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from pydantic_core import to_json
+
+from .client import MeiliSearchClient
+from .document_processor import DocumentProcessor, ProcessingMetadata, ProcessingStatus
+from ..tokenizer.compound_table import dictionary_version as compute_dictionary_version
+from ..tokenizer.token_offsets import TOKEN_OFFSETS_FIELD
+
+
+logger = logging.getLogger(__name__)
+
+# Document field holding the reindex fingerprint
+FINGERPRINT_FIELD = "reindex_fingerprint"
+
+# Source fields that feed tokenization
+DEFAULT_HASH_FIELDS: Tuple[str, ...] = ("title", "content")
+
+# Tokenization output version written by DocumentProcessor
+TOKENIZATION_VERSION = ProcessingMetadata.tokenization_version
+
+# Separates the live index name from the shadow build timestamp
+SHADOW_INDEX_MARKER = "__reindex_"
+
+_END_OF_STREAM = None
+
+
+def compute_content_hash(document: Dict[str, Any], fields: Sequence[str] = DEFAULT_HASH_FIELDS) -> str:
+    """
+    Hash the source fields of a document.
+
+    Args:
+        document: Document dictionary
+        fields: Fields that feed tokenization
+
+    Returns:
+        Hex digest of the field values
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in fields:
+        value = document.get(name)
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(("" if value is None else str(value)).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def shadow_index_name(index_name: str) -> str:
+    """Name a new shadow index for a live index."""
+    return f"{index_name}{SHADOW_INDEX_MARKER}{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+@dataclass(frozen=True)
+class ReindexVersions:
+    """Tokenizer and dictionary versions a reindex run produces."""
+    tokenizer_version: str
+    dictionary_version: str
+
+    @classmethod
+    def for_tokenizer(cls, engine: str, custom_dictionary: Iterable[str] = ()) -> "ReindexVersions":
+        """Build versions for a tokenizer engine and custom dictionary."""
+        return cls(
+            tokenizer_version=f"{TOKENIZATION_VERSION}-{engine}",
+            dictionary_version=compute_dictionary_version(custom_dictionary)
+        )
+
+    def fingerprint(self, content_hash: str) -> Dict[str, str]:
+        """Build the fingerprint stored on a reindexed document."""
+        return {
+            "content_hash": content_hash,
+            "tokenizer_version": self.tokenizer_version,
+            "dictionary_version": self.dictionary_version
+        }
+
+    def is_current(self, document: Dict[str, Any], hash_fields: Sequence[str] = DEFAULT_HASH_FIELDS) -> bool:
+        """Check whether a document was tokenized from its current content with these versions."""
+        stored = document.get(FINGERPRINT_FIELD)
+        if not isinstance(stored, dict):
+            return False
+        return stored == self.fingerprint(compute_content_hash(document, hash_fields))
+
+
+@dataclass
+class ReindexStats:
+    """Statistics for reindexing operation."""
+    index_name: str
+    total_documents: int = 0
+    processed_documents: int = 0
+    failed_documents: int = 0
+    skipped_documents: int = 0
+    unchanged_documents: int = 0
+    committed_batches: int = 0
+    resumed_from_offset: int = 0
+    completed: bool = False
+    shadow_index: Optional[str] = None
+    swapped: bool = False
+    validation: Dict[str, Any] = field(default_factory=dict)
+    processing_time_ms: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ReindexCheckpoint:
+    """Progress of a reindex run, as of the last committed batch."""
+    index_name: str
+    target_index: str
+    tokenizer_version: str
+    dictionary_version: str
+    offset: int = 0
+    total_documents: int = 0
+    processed_documents: int = 0
+    failed_documents: int = 0
+    skipped_documents: int = 0
+    unchanged_documents: int = 0
+    completed: bool = False
+    updated_at: Optional[str] = None
+
+    def matches(self, target_index: str, versions: ReindexVersions) -> bool:
+        """Check whether this checkpoint belongs to an equivalent run."""
+        return (
+            not self.completed
+            and self.target_index == target_index
+            and self.tokenizer_version == versions.tokenizer_version
+            and self.dictionary_version == versions.dictionary_version
+        )
+
+
+class CheckpointStore:
+    """
+    JSON checkpoint files, one per source index.
+
+    Files are replaced atomically so a crash never leaves a partial checkpoint.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize store rooted at directory."""
+        self.directory = Path(directory)
+
+    def path_for(self, index_name: str) -> Path:
+        """Get checkpoint file path for an index."""
+        return self.directory / f"{index_name}.checkpoint.json"
+
+    def load(self, index_name: str) -> Optional[ReindexCheckpoint]:
+        """Load the checkpoint for an index, if any."""
+        path = self.path_for(index_name)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return ReindexCheckpoint(**json.load(f))
+        except (json.JSONDecodeError, TypeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def save(self, checkpoint: ReindexCheckpoint) -> None:
+        """Write a checkpoint atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        checkpoint.updated_at = datetime.now().isoformat()
+
+        path = self.path_for(checkpoint.index_name)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(checkpoint), f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def clear(self, index_name: str) -> None:
+        """Remove the checkpoint for an index."""
+        self.path_for(index_name).unlink(missing_ok=True)
+
+
+class ByteBudget:
+    """
+    Async budget of bytes in flight.
+
+    A request larger than the whole budget is admitted once nothing else is
+    in flight, so oversized batches are serialized rather than deadlocked.
+    """
+
+    def __init__(self, limit: int):
+        """Initialize budget with a byte limit."""
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> None:
+        """Wait until size bytes fit in the budget and claim them."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight == 0 or self.in_flight + size <= self.limit
+            )
+            self.in_flight += size
+
+    async def release(self, size: int) -> None:
+        """Return size bytes to the budget."""
+        async with self._condition:
+            self.in_flight -= size
+            self._condition.notify_all()
+
+
+class ReindexBudget:
+    """
+    Resource budget shared by concurrently running reindex pipelines.
+
+    Bounds tokenization workers (pass ``tokenize_slots`` to the
+    DocumentProcessor of every pipeline), upload bytes in flight and
+    MeiliSearch tasks not yet applied.
+
+    A pipeline commits one batch at a time and waits for its task before
+    the next, so that checkpoints only ever cover applied batches. Each
+    running index therefore holds at most one task slot, and
+    max_pending_tasks only limits anything when more indexes run at once
+    than there are slots; pipelining within an index comes from the fetch
+    and tokenize stages running ahead of the upload.
+    """
+
+    def __init__(
+        self,
+        tokenize_workers: int = 8,
+        max_inflight_bytes: int = 64 * 1024 * 1024,
+        max_pending_tasks: int = 8
+    ):
+        """Initialize budget limits."""
+        self.tokenize_workers = tokenize_workers
+        self.max_inflight_bytes = max_inflight_bytes
+        self.max_pending_tasks = max_pending_tasks
+        self.tokenize_slots = asyncio.Semaphore(tokenize_workers)
+        self.upload_bytes = ByteBudget(max_inflight_bytes)
+        self.task_slots = asyncio.Semaphore(max_pending_tasks)
+
+    @asynccontextmanager
+    async def upload(self, size: int):
+        """Hold a task slot and size upload bytes until the task is applied."""
+        async with self.task_slots:
+            await self.upload_bytes.acquire(size)
+            try:
+                yield
+            finally:
+                await self.upload_bytes.release(size)
+
+
+def _page_documents(response: Any) -> List[Dict[str, Any]]:
+    """Extract plain document dicts from a get_documents response."""
+    if isinstance(response, dict):
+        results = response.get("results", [])
+    else:
+        results = getattr(response, "results", [])
+    return [doc if isinstance(doc, dict) else dict(doc) for doc in results]
+
+
+async def iter_document_pages(
+    client: MeiliSearchClient,
+    index_name: str,
+    page_size: int = 1000,
+    start_offset: int = 0,
+    fields: Optional[Sequence[str]] = None
+) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Page through the documents of an index.
+
+    Args:
+        client: MeiliSearch client
+        index_name: Index to read
+        page_size: Documents per request
+        start_offset: Offset to start from (e.g. a checkpoint)
+        fields: Optional subset of fields to fetch
+
+    Yields:
+        (offset after the page, documents) tuples
+    """
+    index = await client.get_index(index_name)
+    offset = start_offset
+
+    while True:
+        parameters: Dict[str, Any] = {"offset": offset, "limit": page_size}
+        if fields:
+            parameters["fields"] = list(fields)
+
+        response = await client._retry_operation(index.get_documents, parameters)
+        documents = _page_documents(response)
+        if not documents:
+            break
+
+        offset += len(documents)
+        yield offset, documents
+
+        if len(documents) < page_size:
+            break
+
+
+@dataclass
+class _ReindexBatch:
+    """A tokenized page waiting to be uploaded."""
+    end_offset: int
+    total: int
+    updates: List[Dict[str, Any]]
+    processed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class StreamingReindexer:
+    """
+    Reindex an index page by page with change detection and checkpoints.
+
+    Fetch, tokenization and upload run as three concurrent stages joined by
+    bounded queues, so at most ``queue_size`` pages are buffered between
+    stages regardless of index size. Only documents whose fingerprint is
+    missing or stale are tokenized, and they are written back as partial
+    updates (tokenized fields and fingerprint only). The checkpoint advances
+    once MeiliSearch has committed a batch.
+
+    ``reindex_with_swap`` instead builds a complete copy of the index in a
+    shadow index, validates it and swaps it with the live index in one
+    MeiliSearch task, so searches never see a partially reindexed index.
+    The previous contents stay in the shadow index for rollback. Writes to
+    the live index made during the build fail the document count check and
+    block the swap.
+    """
+
+    def __init__(
+        self,
+        meilisearch_client: MeiliSearchClient,
+        document_processor: DocumentProcessor,
+        versions: ReindexVersions,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        page_size: int = 1000,
+        queue_size: int = 4,
+        hash_fields: Sequence[str] = DEFAULT_HASH_FIELDS,
+        task_timeout: int = 300,
+        force: bool = False,
+        dry_run: bool = False,
+        budget: Optional[ReindexBudget] = None,
+        on_batch: Optional[Callable[[str, int], None]] = None,
+        on_resume: Optional[Callable[[str, int], None]] = None
+    ):
+        """
+        Initialize reindexer with pipeline configuration.
+
+        Args:
+            budget: Resource budget shared with other pipelines; uploads wait
+                for upload bytes and a task slot
+            on_batch: Called with (index_name, documents) after each
+                committed batch, e.g. for progress reporting
+            on_resume: Called with (index_name, offset) when a run resumes
+                from a checkpoint, before the first batch
+        """
+        self.meilisearch_client = meilisearch_client
+        self.document_processor = document_processor
+        self.versions = versions
+        self.checkpoint_store = checkpoint_store
+        self.page_size = page_size
+        self.queue_size = queue_size
+        self.hash_fields = tuple(hash_fields)
+        self.task_timeout = task_timeout
+        self.force = force
+        self.dry_run = dry_run
+        self.budget = budget
+        self.on_batch = on_batch
+        self.on_resume = on_resume
+
+    @property
+    def fetch_fields(self) -> List[str]:
+        """Fields needed to tokenize a document and check its fingerprint."""
+        return list(dict.fromkeys(["id", *DEFAULT_HASH_FIELDS, *self.hash_fields, FINGERPRINT_FIELD]))
+
+    def _start_checkpoint(self, index_name: str, target_index: str, resume: bool) -> ReindexCheckpoint:
+        """Load a resumable checkpoint or start a new one."""
+        if resume and self.checkpoint_store and not self.dry_run:
+            checkpoint = self.checkpoint_store.load(index_name)
+            if checkpoint and checkpoint.matches(target_index, self.versions):
+                logger.info(f"Resuming {index_name} from offset {checkpoint.offset}")
+                return checkpoint
+
+        return ReindexCheckpoint(
+            index_name=index_name,
+            target_index=target_index,
+            tokenizer_version=self.versions.tokenizer_version,
+            dictionary_version=self.versions.dictionary_version
+        )
+
+    async def _tokenize_page(
+        self,
+        end_offset: int,
+        documents: List[Dict[str, Any]],
+        copy_documents: bool = False
+    ) -> _ReindexBatch:
+        """
+        Tokenize the stale documents of a page.
+
+        With copy_documents, every document of the page is emitted in full
+        (unchanged and failed ones as they are); otherwise only partial
+        updates for reprocessed documents are emitted.
+        """
+        batch = _ReindexBatch(end_offset=end_offset, total=len(documents), updates=[])
+
+        stale = []
+        for doc in documents:
+            if not self.force and self.versions.is_current(doc, self.hash_fields):
+                batch.unchanged += 1
+                if copy_documents:
+                    batch.updates.append(doc)
+            else:
+                stale.append(doc)
+
+        if not stale:
+            return batch
+
+        if self.dry_run:
+            batch.processed = len(stale)
+            return batch
+
+        originals = {doc.get("id"): doc for doc in stale}
+        result = await self.document_processor.process_batch(stale, preserve_original=False)
+
+        for processed in result.processed_documents:
+            original = originals.get(processed.id, {})
+
+            if processed.status == ProcessingStatus.FAILED:
+                batch.failed += 1
+                batch.errors.append(f"{processed.id}: {processed.metadata.error_message}")
+                if copy_documents and original:
+                    batch.updates.append(original)
+                continue
+
+            if processed.status == ProcessingStatus.COMPLETED:
+                batch.processed += 1
+            else:
+                batch.skipped += 1
+
+            # Documents without Thai content clear any stale tokenized fields
+            update = {
+                "id": processed.id,
+                "thai_content": processed.thai_content,
+                "tokenized_content": processed.tokenized_content,
+                TOKEN_OFFSETS_FIELD: processed.token_offsets,
+                FINGERPRINT_FIELD: self.versions.fingerprint(
+                    compute_content_hash(original, self.hash_fields)
+                )
+            }
+            batch.updates.append({**original, **update} if copy_documents else update)
+
+        batch.failed += len(result.errors)
+        batch.errors.extend(str(error.get("error", error)) for error in result.errors)
+        return batch
+
+    async def _commit(self, target_index: str, updates: List[Dict[str, Any]], replace: bool = False) -> None:
+        """Upload documents and wait until MeiliSearch has applied them."""
+        if self.budget is None:
+            await self._upload(target_index, updates, replace)
+            return
+
+        async with self.budget.upload(len(to_json(updates))):
+            await self._upload(target_index, updates, replace)
+
+    async def _upload(self, target_index: str, updates: List[Dict[str, Any]], replace: bool) -> None:
+        """Send one batch and wait for its task."""
+        if replace:
+            result = await self.meilisearch_client.add_documents(target_index, updates)
+        else:
+            result = await self.meilisearch_client.update_documents(target_index, updates, primary_key="id")
+        await self.meilisearch_client._wait_for_task(result["task_uid"], timeout=self.task_timeout)
+
+    async def reindex_index(
+        self,
+        index_name: str,
+        target_index: Optional[str] = None,
+        resume: bool = True
+    ) -> ReindexStats:
+        """
+        Stream an index through the tokenizer.
+
+        Args:
+            index_name: Index to read documents from
+            target_index: Index to write to (defaults to index_name). A
+                different index receives full copies of every document.
+            resume: Whether to continue from a matching checkpoint
+
+        Returns:
+            Reindexing statistics for this run
+        """
+        start_time = time.time()
+        target_index = target_index or index_name
+        copy_documents = target_index != index_name
+        checkpoint = self._start_checkpoint(index_name, target_index, resume)
+        stats = ReindexStats(index_name=index_name, resumed_from_offset=checkpoint.offset)
+        if checkpoint.offset and self.on_resume:
+            self.on_resume(index_name, checkpoint.offset)
+
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        tokenized: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def fetch_stage():
+            async for end_offset, documents in iter_document_pages(
+                self.meilisearch_client,
+                index_name,
+                page_size=self.page_size,
+                start_offset=checkpoint.offset,
+                fields=None if copy_documents else self.fetch_fields
+            ):
+                await fetched.put((end_offset, documents))
+            await fetched.put(_END_OF_STREAM)
+
+        async def tokenize_stage():
+            while (item := await fetched.get()) is not _END_OF_STREAM:
+                await tokenized.put(await self._tokenize_page(*item, copy_documents=copy_documents))
+            await tokenized.put(_END_OF_STREAM)
+
+        async def upload_stage():
+            while (batch := await tokenized.get()) is not _END_OF_STREAM:
+                if batch.updates and not self.dry_run:
+                    await self._commit(target_index, batch.updates, replace=copy_documents)
+
+                stats.total_documents += batch.total
+                stats.processed_documents += batch.processed
+                stats.failed_documents += batch.failed
+                stats.skipped_documents += batch.skipped
+                stats.unchanged_documents += batch.unchanged
+                stats.committed_batches += 1
+                stats.errors.extend(batch.errors)
+
+                checkpoint.offset = batch.end_offset
+                checkpoint.total_documents += batch.total
+                checkpoint.processed_documents += batch.processed
+                checkpoint.failed_documents += batch.failed
+                checkpoint.skipped_documents += batch.skipped
+                checkpoint.unchanged_documents += batch.unchanged
+                if self.checkpoint_store and not self.dry_run:
+                    self.checkpoint_store.save(checkpoint)
+                if self.on_batch:
+                    self.on_batch(index_name, batch.total)
+
+                logger.info(
+                    f"{index_name}: committed offset {checkpoint.offset} "
+                    f"({batch.processed} processed, {batch.unchanged} unchanged, "
+                    f"{batch.skipped} skipped, {batch.failed} failed)"
+                )
+
+        try:
+            logger.info(
+                f"Streaming reindex of {index_name} -> {target_index} "
+                f"(page_size={self.page_size}, queue_size={self.queue_size}, "
+                f"dry_run={self.dry_run}, force={self.force})"
+            )
+
+            async with asyncio.TaskGroup() as group:
+                group.create_task(fetch_stage())
+                group.create_task(tokenize_stage())
+                group.create_task(upload_stage())
+
+            stats.completed = checkpoint.completed = True
+            if self.checkpoint_store and not self.dry_run:
+                self.checkpoint_store.save(checkpoint)
+
+        except* Exception as group_error:
+            for error in group_error.exceptions:
+                error_msg = f"Reindexing failed for {index_name} at offset {checkpoint.offset}: {error}"
+                logger.error(error_msg)
+                stats.errors.append(error_msg)
+
+        stats.processing_time_ms = (time.time() - start_time) * 1000
+        logger.info(
+            f"Reindexing finished for {index_name}: "
+            f"{stats.processed_documents} processed, "
+            f"{stats.unchanged_documents} unchanged, "
+            f"{stats.skipped_documents} skipped, "
+            f"{stats.failed_documents} failed "
+            f"({stats.processing_time_ms:.2f}ms)"
+        )
+        return stats
+
+    async def _prepare_shadow_index(self, index_name: str, resume: bool) -> str:
+        """Reuse the shadow index of an interrupted build or create a new one."""
+        if resume and self.checkpoint_store:
+            checkpoint = self.checkpoint_store.load(index_name)
+            if (
+                checkpoint
+                and checkpoint.target_index.startswith(f"{index_name}{SHADOW_INDEX_MARKER}")
+                and checkpoint.matches(checkpoint.target_index, self.versions)
+                and await self.meilisearch_client.index_exists(checkpoint.target_index)
+            ):
+                logger.info(f"Resuming shadow build {checkpoint.target_index}")
+                return checkpoint.target_index
+
+        shadow_index = shadow_index_name(index_name)
+        primary_key = await self.meilisearch_client.get_primary_key(index_name)
+        await self.meilisearch_client.create_index(shadow_index, primary_key)
+
+        # Apply settings while the shadow index is empty so they cost no reindex
+        settings = await self.meilisearch_client.get_index_settings(index_name)
+        await self.meilisearch_client.update_index_settings(shadow_index, settings)
+
+        logger.info(f"Created shadow index {shadow_index} for {index_name}")
+        return shadow_index
+
+    async def validate_shadow_index(
+        self,
+        index_name: str,
+        shadow_index: str,
+        sample_queries: Sequence[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Compare a shadow index with the live index before swapping.
+
+        Args:
+            index_name: Live index
+            shadow_index: Shadow index built from it
+            sample_queries: Queries that must still return hits in the shadow
+                index whenever they do in the live index
+
+        Returns:
+            Validation report with "passed" and "problems" keys
+        """
+        problems = []
+
+        live_stats = await self.meilisearch_client.get_index_stats(index_name)
+        shadow_stats = await self.meilisearch_client.get_index_stats(shadow_index)
+        if live_stats.number_of_documents != shadow_stats.number_of_documents:
+            problems.append(
+                f"Document count mismatch: {index_name} has {live_stats.number_of_documents}, "
+                f"{shadow_index} has {shadow_stats.number_of_documents}"
+            )
+
+        query_hits = {}
+        for query in sample_queries:
+            live_result = await self.meilisearch_client.search(index_name, query, {"limit": 1})
+            shadow_result = await self.meilisearch_client.search(shadow_index, query, {"limit": 1})
+            live_hits = live_result.get("estimatedTotalHits", len(live_result.get("hits", [])))
+            shadow_hits = shadow_result.get("estimatedTotalHits", len(shadow_result.get("hits", [])))
+            query_hits[query] = {"live": live_hits, "shadow": shadow_hits}
+
+            if live_hits and not shadow_hits:
+                problems.append(f"Query '{query}' returned no hits in {shadow_index} ({live_hits} in {index_name})")
+
+        return {
+            "live_documents": live_stats.number_of_documents,
+            "shadow_documents": shadow_stats.number_of_documents,
+            "queries": query_hits,
+            "passed": not problems,
+            "problems": problems
+        }
+
+    async def reindex_with_swap(
+        self,
+        index_name: str,
+        sample_queries: Sequence[str] = (),
+        resume: bool = True
+    ) -> ReindexStats:
+        """
+        Rebuild an index in a shadow index and atomically swap it in.
+
+        Args:
+            index_name: Live index to rebuild
+            sample_queries: Queries used to validate the shadow index
+            resume: Whether to continue an interrupted shadow build
+
+        Returns:
+            Reindexing statistics; after a swap, ``shadow_index`` holds the
+            previous contents of the live index
+        """
+        if self.dry_run:
+            return await self.reindex_index(index_name, resume=False)
+
+        start_time = time.time()
+
+        try:
+            shadow_index = await self._prepare_shadow_index(index_name, resume)
+        except Exception as e:
+            error_msg = f"Failed to prepare shadow index for {index_name}: {e}"
+            logger.error(error_msg)
+            return ReindexStats(index_name=index_name, errors=[error_msg])
+
+        stats = await self.reindex_index(index_name, target_index=shadow_index, resume=resume)
+        stats.shadow_index = shadow_index
+
+        try:
+            if not stats.completed:
+                logger.error(f"Shadow build of {index_name} failed; {shadow_index} kept for resume")
+                return stats
+
+            stats.validation = await self.validate_shadow_index(index_name, shadow_index, sample_queries)
+            if not stats.validation["passed"]:
+                stats.errors.extend(stats.validation["problems"])
+                logger.error(f"Validation of {shadow_index} failed, not swapping: {stats.validation['problems']}")
+                return stats
+
+            await self.meilisearch_client.swap_indexes(index_name, shadow_index)
+            stats.swapped = True
+            logger.info(f"Swapped rebuilt index into {index_name}; previous version kept as {shadow_index}")
+
+        except Exception as e:
+            error_msg = f"Shadow swap failed for {index_name}: {e}"
+            logger.error(error_msg)
+            stats.errors.append(error_msg)
+
+        finally:
+            stats.processing_time_ms = (time.time() - start_time) * 1000
+
+        return stats
+
+    async def rollback_swap(self, index_name: str, previous_index: str) -> Dict[str, Any]:
+        """Swap a live index back with the index holding its previous contents."""
+        return await self.meilisearch_client.swap_indexes(index_name, previous_index)
@@ -0,0 +1,287 @@
+"""
+Read routing across MeiliSearch replicas with hedged requests.
+
+Searches go to the replica with the fewest outstanding requests, ties broken
+by its EWMA latency. If a search has not finished within the recent p95
+latency, a duplicate is sent to the next best replica. Whichever answers
+first wins and the other request is cancelled, so one slow replica (GC,
+snapshotting) no longer sets the tail latency. Writes and index management
+always go to the primary.
+
+Cancelling the losing request frees the caller immediately. The SDK call
+itself runs in a worker thread and finishes in the background.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Sequence
+
+from .client import MeiliSearchClient
+from ..utils.logging import get_structured_logger
+from ..utils.tracing import current_span
+
+
+logger = get_structured_logger(__name__)
+
+# New latency samples after which the hedge delay (p95) is recomputed
+HEDGE_DELAY_REFRESH_SAMPLES = 32
+
+
+@dataclass
+class ReplicaState:
+    """Live routing state and counters of one replica."""
+    host: str
+    outstanding: int = 0
+    ewma_latency_ms: Optional[float] = None
+    requests: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    unhealthy_until: float = 0.0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the replica is routable (not in an error cooldown)."""
+        return time.monotonic() >= self.unhealthy_until
+
+    def p95_ms(self) -> Optional[float]:
+        """95th percentile of recent latencies."""
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class ReplicatedMeiliSearchClient:
+    """
+    MeiliSearch client reading from a replica set and writing to the primary.
+
+    Methods other than search are delegated to the primary client, so this
+    can be passed wherever a MeiliSearchClient is expected.
+    """
+
+    def __init__(
+        self,
+        primary: MeiliSearchClient,
+        replicas: Sequence[MeiliSearchClient],
+        hedge_after_ms: Optional[float] = None,
+        min_hedge_delay_ms: float = 5.0,
+        ewma_alpha: float = 0.2,
+        max_consecutive_errors: int = 3,
+        error_cooldown_seconds: float = 10.0
+    ):
+        """
+        Initialize replicated client.
+
+        Args:
+            primary: Client for the primary (all writes)
+            replicas: Read replica clients; the primary is used when empty
+            hedge_after_ms: Fixed hedge delay; the replica set's recent p95
+                latency when None
+            min_hedge_delay_ms: Lower bound of the adaptive hedge delay
+            ewma_alpha: Weight of the newest latency sample
+            max_consecutive_errors: Errors before a replica is taken out of rotation
+            error_cooldown_seconds: How long an erroring replica stays out
+        """
+        self.primary = primary
+        self.replicas = list(replicas) or [primary]
+        self.hedge_after_ms = hedge_after_ms
+        self.min_hedge_delay_ms = min_hedge_delay_ms
+        self.ewma_alpha = ewma_alpha
+        self.max_consecutive_errors = max_consecutive_errors
+        self.error_cooldown_seconds = error_cooldown_seconds
+
+        self.states = [
+            ReplicaState(host=getattr(getattr(client, "config", None), "host", f"replica-{i}"))
+            for i, client in enumerate(self.replicas)
+        ]
+        self._recent_latencies_ms: Deque[float] = deque(maxlen=512)
+        # Cached p95 of the recent latencies and samples added since
+        self._p95_ms: Optional[float] = None
+        self._samples_since_p95 = 0
+        self.hedges = 0
+
+    def __getattr__(self, name: str) -> Any:
+        # Writes and index management go to the primary
+        if name == "primary":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def _pick(self, exclude: Optional[int] = None) -> Optional[int]:
+        """Pick the least loaded, fastest healthy replica."""
+        candidates = [
+            i for i, state in enumerate(self.states)
+            if i != exclude and state.healthy
+        ]
+        if not candidates:
+            # Everything is cooling down; route anyway rather than fail
+            candidates = [i for i in range(len(self.states)) if i != exclude]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda i: (self.states[i].outstanding, self.states[i].ewma_latency_ms or 0.0)
+        )
+
+    def hedge_delay_ms(self) -> float:
+        """Time a search may take before a hedged duplicate is sent."""
+        if self.hedge_after_ms is not None:
+            return self.hedge_after_ms
+        if len(self._recent_latencies_ms) < 20:
+            # Not enough samples for a meaningful p95 yet
+            return max(self.min_hedge_delay_ms, 100.0)
+        if self._p95_ms is None or self._samples_since_p95 >= HEDGE_DELAY_REFRESH_SAMPLES:
+            # Sorting the window on every search would cost more than the lookup
+            ordered = sorted(self._recent_latencies_ms)
+            self._p95_ms = ordered[int(len(ordered) * 0.95)]
+            self._samples_since_p95 = 0
+        return max(self.min_hedge_delay_ms, self._p95_ms)
+
+    def _start_search(self, replica: int, index_name: str, query: str, options: Optional[Dict[str, Any]]) -> "asyncio.Future":
+        """
+        Start a search on one replica.
+
+        The replica counts as loaded from this point on, so searches started
+        right after this one already see it as busy.
+        """
+        state = self.states[replica]
+        state.outstanding += 1
+        state.requests += 1
+
+        def release(_):
+            state.outstanding -= 1
+
+        task = asyncio.ensure_future(self._search_replica(replica, index_name, query, options))
+        task.add_done_callback(release)
+        return task
+
+    async def _search_replica(self, replica: int, index_name: str, query: str, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a search on one replica, tracking latency and errors."""
+        state = self.states[replica]
+        start_time = time.perf_counter()
+        try:
+            result = await self.replicas[replica].search(index_name, query, options)
+        except Exception:
+            state.errors += 1
+            state.consecutive_errors += 1
+            if state.consecutive_errors >= self.max_consecutive_errors:
+                state.unhealthy_until = time.monotonic() + self.error_cooldown_seconds
+                logger.warning(
+                    "Replica taken out of rotation",
+                    host=state.host,
+                    consecutive_errors=state.consecutive_errors
+                )
+            raise
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        state.consecutive_errors = 0
+        state.unhealthy_until = 0.0
+        state.latencies_ms.append(latency_ms)
+        self._recent_latencies_ms.append(latency_ms)
+        self._samples_since_p95 += 1
+        state.ewma_latency_ms = (
+            latency_ms if state.ewma_latency_ms is None
+            else self.ewma_alpha * latency_ms + (1 - self.ewma_alpha) * state.ewma_latency_ms
+        )
+        return result
+
+    async def search(
+        self,
+        index_name: str,
+        query: str,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Search on the best replica, hedging to a second one when slow."""
+        first = self._pick()
+        tasks = {self._start_search(first, index_name, query, options): first}
+        hedge_delay_ms = self.hedge_delay_ms()
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay_ms / 1000)
+            second = self._pick(exclude=first)
+
+            if done:
+                task = next(iter(done))
+                if task.exception() is None or second is None:
+                    return task.result()
+                # The first replica failed fast; retry on another one
+                logger.warning("Replica search failed, retrying on another replica", host=self.states[first].host)
+                current_span().add_event("replica.retry", {"failed_host": self.states[first].host, "host": self.states[second].host})
+                retry = self._start_search(second, index_name, query, options)
+                tasks[retry] = second
+                return await retry
+
+            if second is None:
+                return await next(iter(tasks))
+
+            self.hedges += 1
+            self.states[second].hedged_requests += 1
+            current_span().add_event("hedge", {"host": self.states[second].host, "delay_ms": hedge_delay_ms})
+            tasks[self._start_search(second, index_name, query, options)] = second
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] == second:
+                            self.states[second].hedge_wins += 1
+                            current_span().add_event("hedge.won", {"host": self.states[second].host})
+                        return task.result()
+                    error = task.exception()
+            raise error
+
+        finally:
+            # Cancel the losing (or abandoned) request
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-replica routing statistics."""
+        return {
+            "hedge_delay_ms": self.hedge_delay_ms(),
+            "hedges": self.hedges,
+            "replicas": {
+                state.host: {
+                    "healthy": state.healthy,
+                    "outstanding": state.outstanding,
+                    "ewma_latency_ms": state.ewma_latency_ms or 0.0,
+                    "p95_latency_ms": state.p95_ms() or 0.0,
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "hedged_requests": state.hedged_requests,
+                    "hedge_wins": state.hedge_wins
+                }
+                for state in self.states
+            }
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check the primary and every replica."""
+        clients = [self.primary] + [r for r in self.replicas if r is not self.primary]
+        checks = await asyncio.gather(*(client.health_check() for client in clients))
+        primary_health = checks[0]
+        healthy_replicas = sum(1 for check in checks[1:] if check.get("status") == "healthy")
+        if primary_health.get("status") != "healthy":
+            status = "unhealthy"
+        elif healthy_replicas < len(checks) - 1:
+            status = "degraded"
+        else:
+            status = "healthy"
+        return {
+            "status": status,
+            "primary": primary_health,
+            "healthy_replicas": healthy_replicas,
+            "total_replicas": len(checks) - 1
+        }
+
+    async def close(self):
+        """Close the primary and every replica client."""
+        clients = [self.primary] + [r for r in self.replicas if r is not self.primary]
+        await asyncio.gather(*(client.close() for client in clients))
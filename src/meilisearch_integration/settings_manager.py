@@ -3,8 +3,10 @@ Custom tokenization settings manager for Thai text in MeiliSearch.
 
 This module provides functions to configure MeiliSearch separator and non-separator tokens,
 update dictionary and synonym settings for Thai text, and validate tokenization configuration.
+Settings are reconciled against the live index so only changed keys are sent.
 """
 
+import json
 import logging
 from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
@@ -16,6 +18,33 @@ from pydantic import BaseModel, Field, field_validator
 logger = logging.getLogger(__name__)
 
 
+# Settings whose change makes MeiliSearch re-process every document
+REINDEXING_SETTINGS: Set[str] = {
+    "separatorTokens",
+    "nonSeparatorTokens",
+    "dictionary",
+    "stopWords",
+    "searchableAttributes",
+    "filterableAttributes",
+    "sortableAttributes",
+    "distinctAttribute",
+    "typoTolerance",
+    "proximityPrecision",
+    "localizedAttributes",
+    "embedders"
+}
+
+# List settings MeiliSearch treats as sets (and returns sorted)
+UNORDERED_SETTINGS: Set[str] = {
+    "separatorTokens",
+    "nonSeparatorTokens",
+    "dictionary",
+    "stopWords",
+    "filterableAttributes",
+    "sortableAttributes"
+}
+
+
 class TokenizerEngine(str, Enum):
     """Supported Thai tokenizer engines."""
     PYTHAINLP = "pythainlp"
@@ -92,6 +121,7 @@ class ThaiTokenizationConfig:
         "title",
         "content",
         "thai_content",
+        "token_offsets",
         "metadata"
     ])
     
@@ -388,6 +418,151 @@ class TokenizationSettingsManager:
             raise ValueError(f"Invalid configuration format: {e}")
 
 
+@dataclass
+class SettingChange:
+    """A single settings key that differs from the live index."""
+    key: str
+    current: Any
+    desired: Any
+    requires_reindex: bool
+
+
+@dataclass
+class SettingsDiff:
+    """Minimal settings update that brings an index to the desired state."""
+    changes: List[SettingChange] = field(default_factory=list)
+    
+    @property
+    def is_noop(self) -> bool:
+        """Whether the index already has the desired settings."""
+        return not self.changes
+    
+    @property
+    def update(self) -> Dict[str, Any]:
+        """Changed keys only, to be sent as one settings task."""
+        return {change.key: change.desired for change in self.changes}
+    
+    @property
+    def requires_reindex(self) -> bool:
+        """Whether applying the update re-processes every document."""
+        return any(change.requires_reindex for change in self.changes)
+    
+    @property
+    def reindexing_keys(self) -> List[str]:
+        """Changed keys that trigger a full reindex."""
+        return [change.key for change in self.changes if change.requires_reindex]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Describe the diff for logs and API responses."""
+        return {
+            "changed_settings": [change.key for change in self.changes],
+            "requires_reindex": self.requires_reindex,
+            "reindexing_settings": self.reindexing_keys
+        }
+
+
+def _normalize_setting(key: str, value: Any) -> Any:
+    """Normalize a settings value so equivalent values compare equal."""
+    if key in UNORDERED_SETTINGS and isinstance(value, list):
+        # Stored as sets: ignore order and duplicates
+        unique = {json.dumps(item, sort_keys=True, ensure_ascii=False): item for item in value}
+        return [unique[item_key] for item_key in sorted(unique)]
+    if key == "synonyms" and isinstance(value, dict):
+        return {word: sorted(variants) for word, variants in value.items()}
+    return value
+
+
+def _setting_matches(current: Any, desired: Any) -> bool:
+    """Check a desired value against the live one; nested objects may be partial."""
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return all(
+            key in current and _setting_matches(current[key], value)
+            for key, value in desired.items()
+        )
+    return current == desired
+
+
+def diff_settings(current: Dict[str, Any], desired: Dict[str, Any]) -> SettingsDiff:
+    """
+    Compute the minimal per-key update from current to desired settings.
+    
+    Args:
+        current: Settings returned by MeiliSearch for the index
+        desired: Settings to apply
+        
+    Returns:
+        SettingsDiff with one entry per key that actually changes
+    """
+    diff = SettingsDiff()
+    
+    for key, desired_value in desired.items():
+        current_value = current.get(key)
+        
+        if key == "synonyms" and isinstance(desired_value, dict):
+            # Synonyms are replaced as a whole, so compare the full mapping
+            matches = _normalize_setting(key, current_value or {}) == _normalize_setting(key, desired_value)
+        else:
+            matches = _setting_matches(
+                _normalize_setting(key, current_value),
+                _normalize_setting(key, desired_value)
+            )
+        
+        if not matches:
+            diff.changes.append(SettingChange(
+                key=key,
+                current=current_value,
+                desired=desired_value,
+                requires_reindex=key in REINDEXING_SETTINGS
+            ))
+    
+    return diff
+
+
+async def reconcile_index_settings(
+    client,
+    index_name: str,
+    desired: Dict[str, Any],
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Apply only the settings that differ from the live index.
+    
+    Any settings write can make MeiliSearch rebuild the index, so unchanged
+    keys are never sent and all changed keys go out as a single task.
+    
+    Args:
+        client: MeiliSearch client instance
+        index_name: Name of the index to reconcile
+        desired: Settings the index should have
+        dry_run: Only report the diff without applying it
+        
+    Returns:
+        Dictionary with the diff summary and task uid (if applied)
+    """
+    current = await client.get_index_settings(index_name)
+    diff = diff_settings(current, desired)
+    result = {"index": index_name, "applied": False, "task_uid": None, **diff.summary()}
+    
+    if diff.is_noop:
+        logger.info(f"Settings for index {index_name} are up to date, skipping update")
+        return result
+    
+    if diff.requires_reindex:
+        logger.warning(
+            f"Settings update for index {index_name} will trigger a full reindex "
+            f"(changed: {', '.join(diff.reindexing_keys)})"
+        )
+    
+    if dry_run:
+        return result
+    
+    update_result = await client.update_index_settings(index_name, diff.update)
+    logger.info(f"Updated settings for index {index_name}: {', '.join(diff.update)}")
+    
+    result.update(applied=True, task_uid=update_result.get("task_uid"))
+    return result
+
+
 def create_default_thai_settings() -> TokenizationSettingsManager:
     """
     Create a settings manager with default Thai tokenization configuration.
@@ -420,17 +595,27 @@ def create_minimal_thai_settings() -> TokenizationSettingsManager:
     return TokenizationSettingsManager(minimal_config)
 
 
-async def configure_thai_tokenization(client, index_name: str, settings_manager: Optional[TokenizationSettingsManager] = None) -> Dict[str, Any]:
+async def configure_thai_tokenization(
+    client,
+    index_name: str,
+    settings_manager: Optional[TokenizationSettingsManager] = None,
+    force: bool = False
+) -> Dict[str, Any]:
     """
     Configure Thai tokenization settings for a MeiliSearch index.
     
+    Only settings that differ from the index are sent (see
+    reconcile_index_settings), so re-applying unchanged settings costs no
+    MeiliSearch reindex.
+    
     Args:
         client: MeiliSearch client instance
         index_name: Name of the index to configure
         settings_manager: Optional settings manager instance
+        force: Push the full settings object without diffing
         
     Returns:
-        Dictionary with configuration status
+        Dictionary with configuration status and applied changes
     """
     try:
         # Use provided settings manager or create a default one
@@ -439,15 +624,20 @@ async def configure_thai_tokenization(client, index_name: str, settings_manager:
         # Create Thai tokenization settings
         thai_settings = manager.create_meilisearch_settings()
         
-        # Apply settings to the index
-        result = await client.update_index_settings(index_name, thai_settings)
+        if force:
+            result = await client.update_index_settings(index_name, thai_settings)
+            logger.info(f"Thai tokenization settings applied to index: {index_name}")
+            return {
+                "status": "configured",
+                "index": index_name,
+                "task_uid": result.get("task_uid")
+            }
+        
+        # Apply only the settings that changed
+        result = await reconcile_index_settings(client, index_name, thai_settings)
         
-        logger.info(f"Thai tokenization settings applied to index: {index_name}")
-        return {
-            "status": "configured",
-            "index": index_name,
-            "task_uid": result.get("task_uid")
-        }
+        logger.info(f"Thai tokenization settings reconciled for index: {index_name}")
+        return {"status": "configured", **result}
         
     except Exception as e:
         logger.error(f"Failed to configure Thai tokenization for index {index_name}: {e}")
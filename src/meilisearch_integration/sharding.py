@@ -0,0 +1,540 @@
+"""
+Scatter-gather access to an index partitioned across several MeiliSearch hosts.
+
+Each shard is a separate MeiliSearch node holding a partition of every index.
+Documents are placed by a stable hash of their primary key, or of a tenant
+field when tenants must stay together. Searches are sent to every shard
+concurrently with a per-shard deadline. The per-shard result lists, already
+sorted by MeiliSearch, are merged with a k-way heap merge. Shards that fail
+or miss the deadline are reported and the remaining shards still answer
+(partial results).
+
+ShardedMeiliSearchClient exposes the MeiliSearchClient methods used by the
+search executor and document processor, so it can be passed wherever a
+single-node client is expected.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .client import MeiliSearchClient, MeiliSearchConfig, DocumentModel, IndexStats
+from ..utils.logging import get_structured_logger
+from ..utils.tracing import current_span
+
+
+logger = get_structured_logger(__name__)
+
+
+class ShardUnavailableError(Exception):
+    """Raised when too few shards answered a search or accepted a write."""
+
+    def __init__(self, message: str, failures: Optional[List[Dict[str, Any]]] = None):
+        super().__init__(message)
+        self.failures = failures or []
+
+
+@dataclass
+class ShardingConfig:
+    """Configuration for a sharded MeiliSearch deployment."""
+    hosts: List[str]
+    api_key: Optional[str] = None
+    timeout: int = 30
+    shard_timeout_ms: int = 2000
+    min_successful_shards: int = 1
+    primary_key: str = "id"
+    # Tenant field; documents are placed by primary key hash when unset
+    partition_field: Optional[str] = None
+    # Explicit tenant -> shard placement, overriding the hash
+    tenant_shards: Dict[str, int] = field(default_factory=dict)
+
+
+def sharding_config_from_settings(settings: Any) -> Optional[ShardingConfig]:
+    """
+    Build the sharding configuration from search proxy settings.
+
+    The search proxy, the documents API and the reindex script all place
+    documents with this configuration, so writes land on the shards that
+    searches fan out to.
+
+    Args:
+        settings: SearchProxySettings
+
+    Returns:
+        ShardingConfig, or None when no shard URLs are configured
+    """
+    if not settings.meilisearch_shard_urls:
+        return None
+    return ShardingConfig(
+        hosts=list(settings.meilisearch_shard_urls),
+        api_key=settings.meilisearch_api_key,
+        timeout=int(settings.meilisearch_timeout_ms / 1000),
+        shard_timeout_ms=settings.search.shard_timeout_ms,
+        min_successful_shards=settings.search.min_successful_shards,
+        partition_field=settings.meilisearch_partition_field
+    )
+
+
+class ShardPartitioner:
+    """
+    Stable mapping of documents to shards.
+
+    The same function places documents at write time and narrows searches
+    scoped to one partition key, so both sides always agree.
+    """
+
+    def __init__(
+        self,
+        shard_count: int,
+        partition_field: Optional[str] = None,
+        primary_key: str = "id",
+        tenant_shards: Optional[Mapping[str, int]] = None
+    ):
+        """
+        Initialize partitioner.
+
+        Args:
+            shard_count: Number of shards
+            partition_field: Tenant field to partition by (primary key otherwise)
+            primary_key: Document primary key field
+            tenant_shards: Explicit partition key -> shard placement
+        """
+        if shard_count < 1:
+            raise ValueError("At least one shard is required")
+        for tenant, shard in (tenant_shards or {}).items():
+            if not 0 <= shard < shard_count:
+                raise ValueError(f"Tenant {tenant!r} is placed on unknown shard {shard}")
+
+        self.shard_count = shard_count
+        self.partition_field = partition_field
+        self.primary_key = primary_key
+        self.tenant_shards = dict(tenant_shards or {})
+
+    @property
+    def routes_by_primary_key(self) -> bool:
+        """Whether a document ID alone determines its shard."""
+        return self.partition_field is None or self.partition_field == self.primary_key
+
+    def shard_for_key(self, key: Any) -> int:
+        """Get the shard owning a partition key."""
+        key = str(key)
+        if key in self.tenant_shards:
+            return self.tenant_shards[key]
+        # crc32 is stable across processes, unlike hash()
+        return zlib.crc32(key.encode("utf-8")) % self.shard_count
+
+    def shard_for_document(self, document: Union[Dict[str, Any], DocumentModel]) -> int:
+        """Get the shard a document is written to."""
+        field_name = self.partition_field or self.primary_key
+        if isinstance(document, DocumentModel):
+            key = getattr(document, field_name, None)
+            if key is None:
+                key = document.metadata.get(field_name)
+        else:
+            key = document.get(field_name)
+        if key is None:
+            raise ValueError(f"Document has no partition key '{field_name}'")
+        return self.shard_for_key(key)
+
+    def split_documents(
+        self,
+        documents: Iterable[Union[Dict[str, Any], DocumentModel]]
+    ) -> Dict[int, List[Union[Dict[str, Any], DocumentModel]]]:
+        """Group documents by owning shard, keeping their order."""
+        groups: Dict[int, List[Union[Dict[str, Any], DocumentModel]]] = {}
+        for document in documents:
+            groups.setdefault(self.shard_for_document(document), []).append(document)
+        return groups
+
+
+def _hit_score(hit: Dict[str, Any]) -> float:
+    """Ranking score of a raw hit (field name differs across versions)."""
+    return float(hit.get("_rankingScore", hit.get("_score", 0.0)) or 0.0)
+
+
+class _Descending:
+    """Wrapper reversing the order of a sort value."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def merge_key(sort: Optional[Sequence[str]] = None):
+    """
+    Build the merge key matching the order MeiliSearch returned hits in.
+
+    Args:
+        sort: MeiliSearch sort rules ("field:asc" / "field:desc"), if any
+
+    Returns:
+        Key function for heapq.merge over raw hits
+    """
+    rules = []
+    for rule in sort or []:
+        name, _, direction = rule.partition(":")
+        if "(" in name:
+            # Geo sorting cannot be reproduced from the hits alone
+            continue
+        rules.append((name, direction.lower() == "desc"))
+
+    if not rules:
+        return lambda hit: -_hit_score(hit)
+
+    def key(hit: Dict[str, Any]) -> Tuple:
+        parts = []
+        for name, descending in rules:
+            value = hit.get(name)
+            if value is None:
+                # Missing values sort last in both directions, like MeiliSearch
+                parts.append((True, 0))
+            else:
+                parts.append((False, _Descending(value) if descending else value))
+        parts.append(-_hit_score(hit))
+        return tuple(parts)
+
+    return key
+
+
+def merge_shard_hits(
+    shard_hits: Sequence[List[Dict[str, Any]]],
+    limit: int,
+    offset: int = 0,
+    sort: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-shard result lists into one page.
+
+    Every list must already be in MeiliSearch order, so a k-way heap merge
+    reads only offset + limit hits in total.
+
+    Args:
+        shard_hits: Sorted hits returned by each shard
+        limit: Page size
+        offset: Hits to skip
+        sort: Sort rules used for the search
+
+    Returns:
+        Hits of the requested page
+    """
+    merged = heapq.merge(*shard_hits, key=merge_key(sort))
+    return list(itertools.islice(merged, offset, offset + limit))
+
+
+class ShardedMeiliSearchClient:
+    """
+    MeiliSearch client fanning requests out to several shards.
+
+    Searches go to every shard and are merged; writes are routed to the
+    owning shard; index management is applied to every shard.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[MeiliSearchClient],
+        partitioner: Optional[ShardPartitioner] = None,
+        shard_timeout_ms: int = 2000,
+        min_successful_shards: int = 1
+    ):
+        """
+        Initialize sharded client.
+
+        Args:
+            shards: One client per shard, in shard order
+            partitioner: Document placement (hash of "id" by default)
+            shard_timeout_ms: Deadline for each shard's search
+            min_successful_shards: Shards that must answer a search
+        """
+        if not shards:
+            raise ValueError("At least one shard is required")
+        self.shards = list(shards)
+        self.partitioner = partitioner or ShardPartitioner(len(self.shards))
+        if self.partitioner.shard_count != len(self.shards):
+            raise ValueError(
+                f"Partitioner expects {self.partitioner.shard_count} shards, got {len(self.shards)}"
+            )
+        self.shard_timeout_ms = shard_timeout_ms
+        self.min_successful_shards = min(min_successful_shards, len(self.shards))
+
+        self.partial_searches = 0
+        self.shard_failures = [0] * len(self.shards)
+
+    @classmethod
+    def from_config(cls, config: ShardingConfig) -> "ShardedMeiliSearchClient":
+        """Create one client per configured host."""
+        shards = [
+            MeiliSearchClient(MeiliSearchConfig(host=host, api_key=config.api_key, timeout=config.timeout))
+            for host in config.hosts
+        ]
+        partitioner = ShardPartitioner(
+            len(shards),
+            partition_field=config.partition_field,
+            primary_key=config.primary_key,
+            tenant_shards=config.tenant_shards
+        )
+        return cls(
+            shards,
+            partitioner,
+            shard_timeout_ms=config.shard_timeout_ms,
+            min_successful_shards=config.min_successful_shards
+        )
+
+    def _host(self, shard: int) -> str:
+        """Host of a shard for logs and error reports."""
+        config = getattr(self.shards[shard], "config", None)
+        return getattr(config, "host", f"shard-{shard}")
+
+    async def _gather(self, calls: Mapping[int, Any], timeout: Optional[float] = None) -> Tuple[Dict[int, Any], List[Dict[str, Any]]]:
+        """Await per-shard calls concurrently, separating results from failures."""
+        shards = list(calls)
+        awaitables = [
+            asyncio.wait_for(calls[shard], timeout) if timeout else calls[shard]
+            for shard in shards
+        ]
+        outcomes = await asyncio.gather(*awaitables, return_exceptions=True)
+
+        results: Dict[int, Any] = {}
+        failures: List[Dict[str, Any]] = []
+        for shard, outcome in zip(shards, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                self.shard_failures[shard] += 1
+                error = "timed out" if isinstance(outcome, asyncio.TimeoutError) else str(outcome)
+                failures.append({"shard": shard, "host": self._host(shard), "error": error})
+            else:
+                results[shard] = outcome
+        return results, failures
+
+    async def search(
+        self,
+        index_name: str,
+        query: str,
+        options: Optional[Dict[str, Any]] = None,
+        partition_key: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Search every shard (or only the one owning partition_key) and merge.
+
+        Returns:
+            MeiliSearch-shaped results with an extra "shards" summary
+
+        Raises:
+            ShardUnavailableError: If fewer than min_successful_shards answered
+        """
+        start_time = time.time()
+        options = dict(options or {})
+        limit = int(options.get("limit", 20))
+        offset = int(options.get("offset", 0))
+
+        # Any shard may hold the whole requested page
+        shard_options = {**options, "offset": 0, "limit": offset + limit, "showRankingScore": True}
+        targets = (
+            [self.partitioner.shard_for_key(partition_key)]
+            if partition_key is not None else range(len(self.shards))
+        )
+
+        results, failures = await self._gather(
+            {shard: self.shards[shard].search(index_name, query, shard_options) for shard in targets},
+            timeout=self.shard_timeout_ms / 1000
+        )
+        current_span().set_attributes({"shards.total": len(targets), "shards.failed": len(failures)})
+
+        required = min(self.min_successful_shards, len(targets))
+        if len(results) < required:
+            raise ShardUnavailableError(
+                f"Only {len(results)} of {len(targets)} shards answered (need {required})",
+                failures
+            )
+        if failures:
+            self.partial_searches += 1
+            logger.warning(
+                "Partial search results, some shards failed",
+                index_name=index_name,
+                failed_shards=[failure["shard"] for failure in failures],
+                successful_shards=len(results)
+            )
+
+        shard_order = sorted(results)
+        hits = merge_shard_hits(
+            [results[shard].get("hits", []) for shard in shard_order],
+            limit,
+            offset,
+            options.get("sort")
+        )
+
+        return {
+            "hits": hits,
+            "query": query,
+            "processingTimeMs": int((time.time() - start_time) * 1000),
+            "limit": limit,
+            "offset": offset,
+            "estimatedTotalHits": sum(
+                results[shard].get("estimatedTotalHits", len(results[shard].get("hits", [])))
+                for shard in shard_order
+            ),
+            "shards": {
+                "total": len(targets),
+                "successful": len(results),
+                "failed": failures
+            }
+        }
+
+    async def _write(self, method: str, index_name: str, documents: List, primary_key: Optional[str]) -> Dict[str, Any]:
+        """Route documents to their shards and write each group concurrently."""
+        groups = self.partitioner.split_documents(documents)
+        results, failures = await self._gather({
+            shard: getattr(self.shards[shard], method)(index_name, group, primary_key)
+            for shard, group in groups.items()
+        })
+        if failures:
+            raise ShardUnavailableError(
+                f"Writing to {len(failures)} of {len(groups)} shards failed",
+                failures
+            )
+        return {
+            "count": len(documents),
+            "task_uids": {shard: result.get("task_uid") for shard, result in results.items()},
+            "shard_counts": {shard: len(group) for shard, group in groups.items()}
+        }
+
+    async def add_documents(
+        self,
+        index_name: str,
+        documents: List[Union[Dict[str, Any], DocumentModel]],
+        primary_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Add documents, each on the shard owning it."""
+        result = await self._write("add_documents", index_name, documents, primary_key)
+        return {"status": "added", **result}
+
+    async def update_documents(
+        self,
+        index_name: str,
+        documents: List[Union[Dict[str, Any], DocumentModel]],
+        primary_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Update documents, each on the shard owning it."""
+        result = await self._write("update_documents", index_name, documents, primary_key)
+        return {"status": "updated", **result}
+
+    async def delete_documents(self, index_name: str, document_ids: List[str]) -> Dict[str, Any]:
+        """Delete documents by ID (from every shard unless IDs determine placement)."""
+        if self.partitioner.routes_by_primary_key:
+            groups: Dict[int, List[str]] = {}
+            for document_id in document_ids:
+                groups.setdefault(self.partitioner.shard_for_key(document_id), []).append(document_id)
+        else:
+            groups = {shard: list(document_ids) for shard in range(len(self.shards))}
+
+        results, failures = await self._gather({
+            shard: self.shards[shard].delete_documents(index_name, ids)
+            for shard, ids in groups.items()
+        })
+        if failures:
+            raise ShardUnavailableError(f"Deleting from {len(failures)} shards failed", failures)
+        return {
+            "status": "deleted",
+            "count": len(document_ids),
+            "task_uids": {shard: result.get("task_uid") for shard, result in results.items()}
+        }
+
+    async def delete_document(self, index_name: str, document_id: str) -> Dict[str, Any]:
+        """Delete a document by ID."""
+        return await self.delete_documents(index_name, [document_id])
+
+    async def _broadcast(self, method: str, *args, **kwargs) -> List[Any]:
+        """Call a method on every shard, failing if any shard fails."""
+        results, failures = await self._gather({
+            shard: getattr(client, method)(*args, **kwargs)
+            for shard, client in enumerate(self.shards)
+        })
+        if failures:
+            raise ShardUnavailableError(f"{method} failed on {len(failures)} shards", failures)
+        return [results[shard] for shard in range(len(self.shards))]
+
+    async def create_index(self, index_name: str, primary_key: Optional[str] = None) -> Dict[str, Any]:
+        """Create the index on every shard."""
+        await self._broadcast("create_index", index_name, primary_key)
+        return {"status": "created", "index": index_name, "shards": len(self.shards)}
+
+    async def delete_index(self, index_name: str) -> Dict[str, Any]:
+        """Delete the index on every shard."""
+        await self._broadcast("delete_index", index_name)
+        return {"status": "deleted", "index": index_name, "shards": len(self.shards)}
+
+    async def index_exists(self, index_name: str) -> bool:
+        """Check the index exists on every shard."""
+        return all(await self._broadcast("index_exists", index_name))
+
+    async def update_index_settings(self, index_name: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply settings on every shard so ranking scores stay comparable."""
+        results = await self._broadcast("update_index_settings", index_name, settings)
+        return {"status": "updated", "index": index_name, "shards": results}
+
+    async def get_index_settings(self, index_name: str) -> Dict[str, Any]:
+        """Get index settings (identical on every shard)."""
+        return await self.shards[0].get_index_settings(index_name)
+
+    async def get_primary_key(self, index_name: str) -> Optional[str]:
+        """Get the primary key of an index."""
+        return await self.shards[0].get_primary_key(index_name)
+
+    async def swap_indexes(self, index_a: str, index_b: str, timeout: int = 60) -> Dict[str, Any]:
+        """Swap two indexes on every shard."""
+        results = await self._broadcast("swap_indexes", index_a, index_b, timeout)
+        return {"status": "swapped", "indexes": [index_a, index_b], "shards": results}
+
+    async def get_index_stats(self, index_name: str) -> IndexStats:
+        """Get index statistics summed over all shards."""
+        stats = await self._broadcast("get_index_stats", index_name)
+        field_distribution: Dict[str, int] = {}
+        for shard_stats in stats:
+            for name, count in shard_stats.field_distribution.items():
+                field_distribution[name] = field_distribution.get(name, 0) + count
+        return IndexStats(
+            number_of_documents=sum(s.number_of_documents for s in stats),
+            is_indexing=any(s.is_indexing for s in stats),
+            field_distribution=field_distribution
+        )
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Check every shard; degraded while enough shards remain for searches."""
+        checks = await asyncio.gather(*(client.health_check() for client in self.shards))
+        healthy = sum(1 for check in checks if check.get("status") == "healthy")
+        if healthy == len(self.shards):
+            status = "healthy"
+        elif healthy >= self.min_successful_shards:
+            status = "degraded"
+        else:
+            status = "unhealthy"
+        return {
+            "status": status,
+            "shards": {self._host(shard): check for shard, check in enumerate(checks)},
+            "healthy_shards": healthy,
+            "total_shards": len(self.shards)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shard routing statistics."""
+        return {
+            "shards": [self._host(shard) for shard in range(len(self.shards))],
+            "partition_field": self.partitioner.partition_field or self.partitioner.primary_key,
+            "shard_timeout_ms": self.shard_timeout_ms,
+            "min_successful_shards": self.min_successful_shards,
+            "partial_searches": self.partial_searches,
+            "shard_failures": list(self.shard_failures)
+        }
+
+    async def close(self):
+        """Close every shard client."""
+        await asyncio.gather(*(client.close() for client in self.shards))
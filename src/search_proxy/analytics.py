@@ -208,6 +208,29 @@ class SearchAnalyticsCollector:
                     "language": language
                 })
     
+    def get_query_frequencies(
+        self,
+        limit: int = 5000,
+        min_success_rate: float = 0.5
+    ) -> Dict[str, int]:
+        """
+        Get how often each query pattern was searched, for query suggestions.
+        
+        Args:
+            limit: Maximum number of patterns, most frequent first
+            min_success_rate: Patterns that mostly fail are left out
+            
+        Returns:
+            Dictionary of query text to frequency
+        """
+        with self._lock:
+            patterns = [
+                p for p in self._query_patterns.values()
+                if p.frequency > 0 and p.success_rate >= min_success_rate
+            ]
+        patterns.sort(key=lambda p: p.frequency, reverse=True)
+        return {p.query: p.frequency for p in patterns[:limit]}
+    
     def get_query_analytics(self) -> Dict[str, Any]:
         """
         Get comprehensive query analytics.
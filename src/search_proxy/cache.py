@@ -0,0 +1,622 @@
+"""
+Two-tier cache for processed queries and search responses.
+
+L1 is a small in-process LRU. L2 is a network cache shared by every proxy
+replica (Redis protocol), so the hit rate no longer drops as replicas are
+added and a fresh pod starts warm. An in-memory L2 stand-in is provided
+for tests and single-process deployments.
+
+Entries are stored as a compact binary frame: a fixed header with the
+timestamps followed by a JSON payload, zlib-compressed when large. Each
+entry has a fresh period and a stale period after it. Stale entries are
+still served while one background task refreshes them
+(stale-while-revalidate).
+
+Keys include a version derived from the dictionary and ranking
+configuration plus a cluster-wide generation counter. Changing either
+moves every replica onto new keys without deleting the old ones, which
+simply expire. Invalidation bumps the generation in L2 and broadcasts it,
+so every replica drops its L1 at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import struct
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple, Union
+
+from ..utils.logging import get_structured_logger
+
+
+logger = get_structured_logger(__name__)
+
+# Frame header: format version, flags, stored_at, fresh seconds, stale seconds
+_HEADER = struct.Struct("!BBdII")
+_FORMAT_VERSION = 1
+_FLAG_COMPRESSED = 0x01
+# Payloads above this size are zlib-compressed
+_COMPRESS_THRESHOLD = 512
+
+InvalidationCallback = Callable[[str], Union[None, Awaitable[None]]]
+ReconnectCallback = Callable[[], Awaitable[None]]
+
+
+class CacheBackend(ABC):
+    """Shared (L2) cache storage."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, None when missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Store a value that expires after ttl_seconds."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment a counter and return the new value."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        """Broadcast a message to every subscriber of a channel."""
+
+    @abstractmethod
+    async def subscribe(
+        self,
+        channel: str,
+        callback: InvalidationCallback,
+        on_reconnect: Optional[ReconnectCallback] = None
+    ) -> None:
+        """
+        Call callback with every message published on a channel.
+
+        Messages published while the subscription is disconnected are lost;
+        on_reconnect is awaited after it is re-established so the subscriber
+        can catch up.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release connections; a no-op for backends that hold none."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    In-process stand-in for a shared cache.
+
+    Several TwoTierCache instances sharing one backend behave like proxy
+    replicas sharing one Redis.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._subscribers: Dict[str, list] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._data[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._data.get(key, (b"0", 0.0))[0]) + 1
+        self._data[key] = (str(value).encode(), float("inf"))
+        return value
+
+    async def publish(self, channel: str, message: str) -> None:
+        for callback in list(self._subscribers.get(channel, [])):
+            result = callback(message)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def subscribe(
+        self,
+        channel: str,
+        callback: InvalidationCallback,
+        on_reconnect: Optional[ReconnectCallback] = None
+    ) -> None:
+        # In-process subscriptions never disconnect
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on a Redis-protocol server (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url: str, socket_timeout: float = 0.1, reconnect_delay: float = 1.0):
+        """
+        Initialize Redis backend.
+
+        Args:
+            url: Server URL, e.g. redis://cache:6379/0
+            socket_timeout: Per-operation timeout; a slow cache must not
+                slow down searches
+            reconnect_delay: Seconds between attempts to restore a lost
+                invalidation subscription
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise ImportError(
+                "RedisCacheBackend requires the 'redis' package (pip install redis)"
+            ) from e
+
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self._redis = redis_asyncio.from_url(url, socket_timeout=socket_timeout)
+        # Subscriptions block waiting for messages, so they get their own
+        # connections without the per-operation timeout
+        self._pubsub_redis = redis_asyncio.from_url(url)
+        self._listeners: list = []
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._redis.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def incr(self, key: str) -> int:
+        return int(await self._redis.incr(key))
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._redis.publish(channel, message)
+
+    async def subscribe(
+        self,
+        channel: str,
+        callback: InvalidationCallback,
+        on_reconnect: Optional[ReconnectCallback] = None
+    ) -> None:
+        pubsub = self._pubsub_redis.pubsub()
+        await pubsub.subscribe(channel)
+        self._listeners.append(asyncio.create_task(self._listen(pubsub, channel, callback, on_reconnect)))
+
+    async def _listen(
+        self,
+        pubsub,
+        channel: str,
+        callback: InvalidationCallback,
+        on_reconnect: Optional[ReconnectCallback]
+    ) -> None:
+        """Deliver published messages until closed, resubscribing when the connection drops."""
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    await self._deliver(message, callback)
+            except Exception as e:
+                logger.warning("Cache invalidation subscription lost", channel=channel, error=str(e))
+            await self._close_pubsub(pubsub)
+            pubsub = await self._resubscribe(channel)
+            if on_reconnect is not None:
+                try:
+                    await on_reconnect()
+                except Exception as e:
+                    logger.warning("Cache resynchronization after reconnect failed", error=str(e))
+
+    async def _resubscribe(self, channel: str):
+        """Subscribe again, retrying until the server is reachable."""
+        while True:
+            await asyncio.sleep(self.reconnect_delay)
+            pubsub = self._pubsub_redis.pubsub()
+            try:
+                await pubsub.subscribe(channel)
+            except Exception as e:
+                await self._close_pubsub(pubsub)
+                logger.warning("Cache invalidation resubscribe failed", channel=channel, error=str(e))
+                continue
+            logger.info("Cache invalidation subscription restored", channel=channel)
+            return pubsub
+
+    @staticmethod
+    async def _deliver(message: Dict[str, Any], callback: InvalidationCallback) -> None:
+        if message.get("type") != "message":
+            return
+        data = message["data"]
+        try:
+            result = callback(data.decode() if isinstance(data, bytes) else str(data))
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.warning("Cache invalidation callback failed", error=str(e))
+
+    @staticmethod
+    async def _close_pubsub(pubsub) -> None:
+        try:
+            await pubsub.aclose()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        for listener in self._listeners:
+            listener.cancel()
+        await self._redis.aclose()
+        await self._pubsub_redis.aclose()
+
+
+@dataclass
+class CacheEntry:
+    """Decoded cache entry."""
+    payload: bytes
+    stored_at: float
+    fresh_seconds: int
+    stale_seconds: int
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.stored_at + self.fresh_seconds
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stored_at + self.fresh_seconds + self.stale_seconds
+
+
+def encode_entry(payload: bytes, fresh_seconds: int, stale_seconds: int, stored_at: Optional[float] = None) -> bytes:
+    """Pack a payload into the binary cache frame."""
+    flags = 0
+    if len(payload) > _COMPRESS_THRESHOLD:
+        payload = zlib.compress(payload, 6)
+        flags |= _FLAG_COMPRESSED
+    header = _HEADER.pack(
+        _FORMAT_VERSION,
+        flags,
+        time.time() if stored_at is None else stored_at,
+        fresh_seconds,
+        stale_seconds
+    )
+    return header + payload
+
+
+def decode_entry(data: bytes) -> CacheEntry:
+    """
+    Unpack a binary cache frame.
+
+    Raises:
+        ValueError: If the frame is truncated or of an unknown format
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated cache entry")
+    version, flags, stored_at, fresh_seconds, stale_seconds = _HEADER.unpack_from(data)
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache entry format: {version}")
+    payload = data[_HEADER.size:]
+    if flags & _FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    return CacheEntry(payload, stored_at, fresh_seconds, stale_seconds)
+
+
+def content_version(*parts: Any) -> str:
+    """Short stable digest of configuration values."""
+    digest = hashlib.blake2b(digest_size=6)
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def file_version(path: Union[str, Path]) -> str:
+    """Digest of a file's contents ("none" when missing)."""
+    try:
+        return hashlib.blake2b(Path(path).read_bytes(), digest_size=6).hexdigest()
+    except OSError:
+        return "none"
+
+
+class TwoTierCache:
+    """
+    In-process L1 in front of an optional shared L2 cache.
+
+    Values are serialized to bytes by the caller-supplied functions. L1 keeps
+    the decoded value, so hits in the same process skip deserialization.
+    """
+
+    def __init__(
+        self,
+        l2: Optional[CacheBackend] = None,
+        l1_max_entries: int = 10000,
+        fresh_seconds: int = 300,
+        stale_seconds: int = 60,
+        namespace: str = "search-proxy"
+    ):
+        """
+        Initialize two-tier cache.
+
+        Args:
+            l2: Shared backend; L1 only when None
+            l1_max_entries: LRU capacity of the in-process tier
+            fresh_seconds: How long entries are served without refresh
+            stale_seconds: How long after that they are served while refreshing
+            namespace: Key prefix shared by all replicas of a deployment
+        """
+        self.l2 = l2
+        self.l1_max_entries = l1_max_entries
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.namespace = namespace
+
+        # key -> (value, stored_at, fresh_seconds, stale_seconds)
+        self._l1: "OrderedDict[str, Tuple[Any, float, int, int]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._version_parts: Dict[str, str] = {}
+        self._generation = 0
+        self._version = content_version(self._version_parts, self._generation)
+
+        self.stats = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "refreshes": 0,
+            "l2_errors": 0,
+            "invalidations": 0
+        }
+
+    @property
+    def generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    @property
+    def invalidation_channel(self) -> str:
+        return f"{self.namespace}:invalidate"
+
+    @property
+    def version(self) -> str:
+        """Current key version."""
+        return self._version
+
+    async def start(self) -> None:
+        """Join the cluster: adopt the shared generation and listen for invalidations."""
+        if self.l2 is None:
+            return
+        try:
+            current = await self.l2.get(self.generation_key)
+            self._set_generation(int(current) if current else 0)
+            await self.l2.subscribe(self.invalidation_channel, self._on_invalidation, self._sync_generation)
+        except Exception as e:
+            self.stats["l2_errors"] += 1
+            logger.warning("Shared cache unavailable at startup", error=str(e))
+
+    def set_version(self, **parts: str) -> str:
+        """
+        Update the configuration versions keys are derived from.
+
+        Args:
+            parts: e.g. dictionary="3f2a...", ranking="91bc..."
+
+        Returns:
+            New key version
+        """
+        self._version_parts.update(parts)
+        return self._refresh_version()
+
+    def _set_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            self._generation = generation
+            self._refresh_version()
+
+    def _refresh_version(self) -> str:
+        version = content_version(self._version_parts, self._generation)
+        if version != self._version:
+            self._version = version
+            # Old L1 entries can never be hit again
+            self._l1.clear()
+        return version
+
+    def make_key(self, kind: str, parts: Sequence[Any]) -> str:
+        """Versioned key of a cached value."""
+        digest = content_version(list(parts))
+        return f"{self.namespace}:{kind}:{self._version}:{digest}"
+
+    def _l1_get(self, key: str) -> Optional[Tuple[Any, float, int, int]]:
+        item = self._l1.get(key)
+        if item is not None:
+            self._l1.move_to_end(key)
+        return item
+
+    def _l1_put(self, key: str, value: Any, stored_at: float, fresh: int, stale: int) -> None:
+        self._l1[key] = (value, stored_at, fresh, stale)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+    async def _l2_get(self, key: str) -> Optional[CacheEntry]:
+        if self.l2 is None:
+            return None
+        try:
+            data = await self.l2.get(key)
+            return decode_entry(data) if data else None
+        except Exception as e:
+            self.stats["l2_errors"] += 1
+            logger.warning("Shared cache read failed", error=str(e))
+            return None
+
+    async def _store(self, key: str, value: Any, serialize: Callable[[Any], bytes]) -> None:
+        stored_at = time.time()
+        self._l1_put(key, value, stored_at, self.fresh_seconds, self.stale_seconds)
+        if self.l2 is None:
+            return
+        try:
+            frame = encode_entry(serialize(value), self.fresh_seconds, self.stale_seconds, stored_at)
+            await self.l2.set(key, frame, self.fresh_seconds + self.stale_seconds)
+        except Exception as e:
+            self.stats["l2_errors"] += 1
+            logger.warning("Shared cache write failed", error=str(e))
+
+    async def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        serialize: Callable[[Any], bytes],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Compute and store a value; concurrent callers share one computation.
+
+        The computation runs in its own task, so a caller that is cancelled
+        (e.g. a client disconnecting) stops waiting without cancelling it
+        for the other callers.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            async def run():
+                try:
+                    value = await compute()
+                    if cacheable is None or cacheable(value):
+                        await self._store(key, value, serialize)
+                    return value
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.create_task(run())
+            # Mark the exception retrieved when every caller has gone
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        serialize: Callable[[Any], bytes],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> None:
+        if key in self._refreshing or key in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+
+        async def refresh():
+            try:
+                await self._compute_once(key, compute, serialize, cacheable)
+            except Exception as e:
+                logger.warning("Background cache refresh failed", error=str(e))
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def get_or_compute(
+        self,
+        kind: str,
+        parts: Sequence[Any],
+        compute: Callable[[], Awaitable[Any]],
+        serialize: Callable[[Any], bytes],
+        deserialize: Callable[[bytes], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Get a cached value or compute it.
+
+        Args:
+            kind: Value type, part of the key ("query", "search")
+            parts: Inputs identifying the value
+            compute: Produces the value on a miss or refresh
+            serialize: Value -> bytes for L2
+            deserialize: bytes -> value
+            cacheable: Whether a computed value may be stored (e.g. not
+                a degraded result); everything is stored when None
+
+        Returns:
+            (value, whether it came from the cache)
+        """
+        key = self.make_key(kind, parts)
+        now = time.time()
+
+        item = self._l1_get(key)
+        if item is not None:
+            value, stored_at, fresh, stale = item
+            entry = CacheEntry(b"", stored_at, fresh, stale)
+            if entry.is_usable(now):
+                self.stats["l1_hits"] += 1
+                if not entry.is_fresh(now):
+                    self.stats["stale_served"] += 1
+                    self._refresh_in_background(key, compute, serialize, cacheable)
+                return value, True
+            del self._l1[key]
+
+        entry = await self._l2_get(key)
+        if entry is not None and entry.is_usable(now):
+            try:
+                value = deserialize(entry.payload)
+            except Exception as e:
+                logger.warning("Discarding undecodable cache entry", error=str(e))
+            else:
+                self.stats["l2_hits"] += 1
+                self._l1_put(key, value, entry.stored_at, entry.fresh_seconds, entry.stale_seconds)
+                if not entry.is_fresh(now):
+                    self.stats["stale_served"] += 1
+                    self._refresh_in_background(key, compute, serialize, cacheable)
+                return value, True
+
+        self.stats["misses"] += 1
+        return await self._compute_once(key, compute, serialize, cacheable), False
+
+    async def invalidate(self, reason: str = "manual") -> None:
+        """Drop all cached values on every replica."""
+        self.stats["invalidations"] += 1
+        self._l1.clear()
+        if self.l2 is None:
+            self._set_generation(self._generation + 1)
+            return
+        try:
+            generation = await self.l2.incr(self.generation_key)
+            self._set_generation(generation)
+            await self.l2.publish(self.invalidation_channel, str(generation))
+        except Exception as e:
+            self.stats["l2_errors"] += 1
+            # Other replicas keep serving until their entries expire
+            self._set_generation(self._generation + 1)
+            logger.warning("Shared cache invalidation failed", error=str(e), reason=reason)
+            return
+        logger.info("Search cache invalidated", reason=reason, generation=self._generation)
+
+    async def _sync_generation(self) -> None:
+        """Adopt the shared generation, e.g. after missing broadcasts while disconnected."""
+        current = await self.l2.get(self.generation_key)
+        generation = int(current) if current else 0
+        if generation > self._generation:
+            self._set_generation(generation)
+
+    def _on_invalidation(self, message: str) -> None:
+        """Adopt a generation published by another replica."""
+        try:
+            generation = int(message)
+        except ValueError:
+            return
+        self._l1.clear()
+        if generation > self._generation:
+            self._set_generation(generation)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.stats["l1_hits"] + self.stats["l2_hits"] + self.stats["misses"]
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        return {
+            **self.stats,
+            "hit_rate_percent": hits / lookups * 100 if lookups else 0.0,
+            "l1_entries": len(self._l1),
+            "l2_enabled": self.l2 is not None,
+            "version": self._version,
+            "generation": self._generation
+        }
+
+    async def close(self) -> None:
+        """Stop background refreshes and computations and close the shared backend."""
+        for task in list(self._refreshing.values()) + list(self._inflight.values()):
+            task.cancel()
+        if self.l2 is not None:
+            await self.l2.close()
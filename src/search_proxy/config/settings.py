@@ -41,6 +41,9 @@ class SearchConfig(BaseModel):
     enable_fallback_search: bool = Field(default=True, description="Enable fallback search on tokenization failure")
     max_query_variants: int = Field(default=5, ge=1, le=10, description="Maximum number of query variants to generate")
     deduplication_enabled: bool = Field(default=True, description="Enable result deduplication")
+    shard_timeout_ms: int = Field(default=2000, ge=100, le=60000, description="Per-shard search deadline")
+    min_successful_shards: int = Field(default=1, ge=1, le=64, description="Shards that must answer for a search to succeed")
+    hedge_after_ms: Optional[int] = Field(default=None, ge=1, le=60000, description="Delay before a hedged replica search (recent p95 latency when unset)")
     
     class Config:
         json_schema_extra = {
@@ -88,6 +91,8 @@ class PerformanceConfig(BaseModel):
     memory_limit_mb: int = Field(default=256, ge=64, le=2048, description="Memory limit in MB")
     cache_enabled: bool = Field(default=True, description="Enable result caching")
     cache_ttl_seconds: int = Field(default=300, ge=60, le=3600, description="Cache TTL in seconds")
+    cache_stale_seconds: int = Field(default=60, ge=0, le=3600, description="How long expired entries are served while refreshed in the background")
+    cache_l1_max_entries: int = Field(default=10000, ge=0, le=1000000, description="Maximum entries in the in-process cache")
     enable_hot_reload: bool = Field(default=False, description="Enable hot configuration reload")
     
     class Config:
@@ -102,6 +107,28 @@ class PerformanceConfig(BaseModel):
         }
 
 
+class TracingConfig(BaseModel):
+    """Configuration for request tracing."""
+    
+    enabled: bool = Field(default=False, description="Record spans for search requests")
+    sample_rate: float = Field(default=0.01, ge=0.0, le=1.0, description="Share of traces exported regardless of latency (head sampling)")
+    slow_threshold_ms: Optional[int] = Field(default=500, ge=1, le=600000, description="Also export traces slower than this (tail sampling; disabled when unset)")
+    export_errors: bool = Field(default=True, description="Also export traces containing a failed span")
+    export_path: Optional[str] = Field(default=None, description="File receiving OTLP/JSON trace lines")
+    otlp_endpoint: Optional[str] = Field(default=None, description="OTLP/HTTP collector URL receiving traces (e.g. http://otel-collector:4318)")
+    max_spans_per_trace: int = Field(default=256, ge=16, le=10000, description="Spans kept per trace")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "enabled": True,
+                "sample_rate": 0.05,
+                "slow_threshold_ms": 300,
+                "otlp_endpoint": "http://otel-collector:4318"
+            }
+        }
+
+
 class SearchProxySettings(BaseSettings):
     """Main configuration settings for the search proxy service."""
     
@@ -115,11 +142,16 @@ class SearchProxySettings(BaseSettings):
     search: SearchConfig = Field(default_factory=SearchConfig, description="Search execution settings")
     ranking: RankingConfig = Field(default_factory=RankingConfig, description="Result ranking settings")
     performance: PerformanceConfig = Field(default_factory=PerformanceConfig, description="Performance settings")
+    tracing: TracingConfig = Field(default_factory=TracingConfig, description="Request tracing settings")
     
     # External service configurations
     meilisearch_url: str = Field(default="http://localhost:7700", description="Meilisearch server URL")
     meilisearch_api_key: Optional[str] = Field(default=None, description="Meilisearch API key")
     meilisearch_timeout_ms: int = Field(default=30000, ge=1000, le=120000, description="Meilisearch timeout")
+    meilisearch_replica_urls: List[str] = Field(default_factory=list, description="Read replica URLs of meilisearch_url; searches are routed across them")
+    meilisearch_shard_urls: List[str] = Field(default_factory=list, description="Meilisearch shard URLs; searches fan out to all of them when set")
+    meilisearch_partition_field: Optional[str] = Field(default=None, description="Tenant field placing documents on shards (primary key hash when unset)")
+    cache_redis_url: Optional[str] = Field(default=None, description="Redis URL of the cache shared by all replicas (in-process cache only when unset)")
     
     # Logging and monitoring
     log_level: str = Field(default="INFO", description="Logging level")
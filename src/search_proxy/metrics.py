@@ -7,7 +7,7 @@ including query processing, search execution, result ranking, and overall perfor
 
 import time
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -126,6 +126,9 @@ class SearchProxyMetricsCollector:
         self._error_counts: Dict[str, int] = defaultdict(int)
         self._last_error_time: Dict[str, float] = {}
         
+        # Live MeiliSearch replica routing statistics, when replicas are configured
+        self._replica_stats_provider: Optional[Callable[[], Dict[str, Any]]] = None
+        
     def record_search_request(
         self,
         query: str,
@@ -309,6 +312,25 @@ class SearchProxyMetricsCollector:
             if self.performance_metrics.active_searches > self.performance_metrics.peak_concurrent_searches:
                 self.performance_metrics.peak_concurrent_searches = self.performance_metrics.active_searches
     
+    def set_replica_stats_provider(self, provider: Optional[Callable[[], Dict[str, Any]]]) -> None:
+        """
+        Register the source of per-replica health and latency statistics.
+        
+        Args:
+            provider: Returns ReplicatedMeiliSearchClient.get_stats()-shaped data
+        """
+        self._replica_stats_provider = provider
+    
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Get per-replica statistics, empty without replicas."""
+        if self._replica_stats_provider is None:
+            return {}
+        try:
+            return self._replica_stats_provider()
+        except Exception as e:
+            logger.warning("Failed to collect replica statistics", error=str(e))
+            return {}
+    
     def get_metrics_summary(self) -> Dict[str, Any]:
         """
         Get a summary of all collected metrics.
@@ -490,6 +512,34 @@ class SearchProxyMetricsCollector:
             ''
         ])
         
+        # Replica routing metrics
+        replica_stats = self.get_replica_stats()
+        if replica_stats.get("replicas"):
+            replica_metrics = [
+                ("healthy", "gauge", "Whether the replica is in rotation", lambda r: int(r["healthy"])),
+                ("outstanding_requests", "gauge", "Searches in flight on the replica", lambda r: r["outstanding"]),
+                ("ewma_latency_ms", "gauge", "EWMA search latency of the replica", lambda r: r["ewma_latency_ms"]),
+                ("p95_latency_ms", "gauge", "95th percentile of recent replica search latency", lambda r: r["p95_latency_ms"]),
+                ("requests", "counter", "Searches sent to the replica", lambda r: r["requests"]),
+                ("errors", "counter", "Failed searches on the replica", lambda r: r["errors"]),
+                ("hedged_requests", "counter", "Hedged duplicate searches sent to the replica", lambda r: r["hedged_requests"]),
+                ("hedge_wins", "counter", "Hedged searches on the replica that answered first", lambda r: r["hedge_wins"])
+            ]
+            for name, metric_type, description, value in replica_metrics:
+                metrics.extend([
+                    f'# HELP search_proxy_replica_{name} {description}',
+                    f'# TYPE search_proxy_replica_{name} {metric_type}'
+                ])
+                for host, replica in replica_stats["replicas"].items():
+                    metrics.append(f'search_proxy_replica_{name}{{replica="{host}"}} {value(replica):g}')
+                metrics.append('')
+            metrics.extend([
+                '# HELP search_proxy_replica_hedge_delay_ms Current hedge delay',
+                '# TYPE search_proxy_replica_hedge_delay_ms gauge',
+                f'search_proxy_replica_hedge_delay_ms {replica_stats["hedge_delay_ms"]:.2f}',
+                ''
+            ])
+        
         # Error metrics
         error_counts = summary["error_metrics"]["error_counts"]
         if error_counts:
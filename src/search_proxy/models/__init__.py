@@ -5,7 +5,7 @@ Search proxy data models and interfaces.
 from .requests import SearchRequest, BatchSearchRequest, SearchOptions
 from .responses import SearchResponse, SearchHit, QueryInfo, PaginationInfo, TokenizationInfo
 from .query import ProcessedQuery, QueryVariant, QueryVariantType, TokenizationResult
-from .search import SearchResult, RankedResults, QueryContext
+from .search import SearchResult, RankedResults, QueryContext, HitRecord
 
 __all__ = [
     # Request models
@@ -30,4 +30,5 @@ __all__ = [
     "SearchResult",
     "RankedResults",
     "QueryContext",
+    "HitRecord",
 ]
\ No newline at end of file
@@ -2,6 +2,7 @@
 Query processing models for the search proxy service.
 """
 
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, model_validator
@@ -145,6 +146,53 @@ class QueryVariant(BaseModel):
         }
 
 
+@dataclass(slots=True)
+class VariantCandidate:
+    """
+    Lightweight query variant used while generating and pruning variants.
+    
+    Candidates skip pydantic validation; only the variants that survive
+    selection are converted to QueryVariant.
+    """
+    
+    query_text: str
+    variant_type: QueryVariantType
+    tokenization_engine: str
+    weight: float
+    search_options: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def is_original(self) -> bool:
+        """Check if this is the original query variant."""
+        return self.variant_type == QueryVariantType.ORIGINAL
+    
+    @property
+    def is_tokenized(self) -> bool:
+        """Check if this is a tokenized variant."""
+        return self.variant_type in (
+            QueryVariantType.TOKENIZED,
+            QueryVariantType.COMPOUND_SPLIT,
+            QueryVariantType.MIXED_LANGUAGE
+        )
+    
+    @property
+    def is_fallback(self) -> bool:
+        """Check if this is a fallback variant."""
+        return self.variant_type == QueryVariantType.FALLBACK
+    
+    def to_query_variant(self) -> QueryVariant:
+        """Convert to the validated QueryVariant model."""
+        return QueryVariant(
+            query_text=self.query_text,
+            variant_type=self.variant_type,
+            tokenization_engine=self.tokenization_engine,
+            weight=self.weight,
+            search_options=self.search_options,
+            metadata=self.metadata
+        )
+
+
 class ProcessedQuery(BaseModel):
     """Complete result of query processing."""
     
@@ -55,6 +55,7 @@ class SearchRequest(BaseModel):
     index_name: str = Field(..., min_length=1, max_length=100, description="Target Meilisearch index")
     options: SearchOptions = Field(default_factory=SearchOptions, description="Search configuration options")
     include_tokenization_info: bool = Field(default=False, description="Include tokenization details in response")
+    include_ranking_info: bool = Field(default=False, description="Include per-hit ranking calculation details in response")
     
     @validator('query')
     def validate_query(cls, v):
@@ -99,6 +100,7 @@ class BatchSearchRequest(BaseModel):
     index_name: str = Field(..., min_length=1, max_length=100, description="Target Meilisearch index")
     options: SearchOptions = Field(default_factory=SearchOptions, description="Search configuration options")
     include_tokenization_info: bool = Field(default=False, description="Include tokenization details in responses")
+    include_ranking_info: bool = Field(default=False, description="Include per-hit ranking calculation details in responses")
     
     @validator('queries')
     def validate_queries(cls, v):
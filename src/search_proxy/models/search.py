@@ -1,24 +1,76 @@
 """
 Search execution models for the search proxy service.
+
+These models are internal to the executor -> ranker pipeline and are never
+serialized directly, so they are plain slotted dataclasses rather than
+pydantic models. Hits are converted to the public ``SearchHit`` response
+model only when the final page is built.
 """
 
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
 from pydantic import BaseModel, Field
 
 from .query import QueryVariant
 from .responses import SearchHit
 
 
-class SearchResult(BaseModel):
+@dataclass(slots=True)
+class HitRecord:
+    """Lightweight search hit used between search execution and ranking."""
+    
+    id: str
+    score: float
+    document: Dict[str, Any]
+    highlight: Optional[Dict[str, Any]] = None
+    ranking_info: Optional[Dict[str, Any]] = None
+    match_type: Optional[str] = None
+    query_variant_source: Optional[str] = None
+    original_meilisearch_score: Optional[float] = None
+    thai_content_ratio: Optional[float] = None
+    
+    def to_search_hit(self, include_ranking_info: bool = True) -> SearchHit:
+        """Convert to the public (validated) SearchHit response model."""
+        return SearchHit(
+            id=self.id,
+            score=self.score,
+            document=self.document,
+            highlight=self.highlight,
+            ranking_info=self.ranking_info if include_ranking_info else None,
+            match_type=self.match_type,
+            query_variant_source=self.query_variant_source,
+            original_meilisearch_score=self.original_meilisearch_score,
+            thai_content_ratio=self.thai_content_ratio
+        )
+
+
+def to_search_hits(
+    hits: Iterable[Union[HitRecord, SearchHit]],
+    include_ranking_info: bool = True
+) -> List[SearchHit]:
+    """Convert internal hit records to public SearchHit models."""
+    converted = []
+    for hit in hits:
+        if isinstance(hit, HitRecord):
+            converted.append(hit.to_search_hit(include_ranking_info))
+        elif not include_ranking_info and hit.ranking_info is not None:
+            converted.append(hit.model_copy(update={"ranking_info": None}))
+        else:
+            converted.append(hit)
+    return converted
+
+
+@dataclass(slots=True)
+class SearchResult:
     """Result from a single search execution."""
     
-    query_variant: QueryVariant = Field(..., description="Query variant used for this search")
-    hits: List[SearchHit] = Field(..., description="Search result hits")
-    total_hits: int = Field(..., ge=0, description="Total matching documents")
-    processing_time_ms: float = Field(..., description="Search execution time")
-    success: bool = Field(..., description="Whether search was successful")
-    error_message: Optional[str] = Field(default=None, description="Error message if search failed")
-    meilisearch_metadata: Dict[str, Any] = Field(default_factory=dict, description="Raw Meilisearch response metadata")
+    query_variant: QueryVariant
+    hits: List[HitRecord]
+    total_hits: int
+    processing_time_ms: float
+    success: bool
+    error_message: Optional[str] = None
+    meilisearch_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class QueryContext(BaseModel):
@@ -36,45 +88,36 @@ class QueryContext(BaseModel):
     search_intent: Optional[str] = Field(default=None, description="Detected search intent")
 
 
-class RankingMetadata(BaseModel):
+@dataclass(slots=True)
+class RankingMetadata:
     """Metadata about result ranking calculations."""
     
-    base_score: float = Field(..., description="Original Meilisearch score")
-    thai_boost: float = Field(default=1.0, description="Thai content boost factor")
-    exact_match_boost: float = Field(default=1.0, description="Exact match boost factor")
-    tokenization_boost: float = Field(default=1.0, description="Tokenization quality boost")
-    final_score: float = Field(..., description="Final calculated relevance score")
-    ranking_factors: Dict[str, float] = Field(default_factory=dict, description="Individual ranking factor contributions")
+    base_score: float
+    final_score: float
+    thai_boost: float = 1.0
+    exact_match_boost: float = 1.0
+    tokenization_boost: float = 1.0
+    ranking_factors: Dict[str, float] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for hit ranking info."""
+        return {
+            "base_score": self.base_score,
+            "thai_boost": self.thai_boost,
+            "exact_match_boost": self.exact_match_boost,
+            "tokenization_boost": self.tokenization_boost,
+            "final_score": self.final_score,
+            "ranking_factors": dict(self.ranking_factors)
+        }
 
 
-class RankedResults(BaseModel):
+@dataclass(slots=True)
+class RankedResults:
     """Final ranked and merged search results."""
     
-    hits: List[SearchHit] = Field(..., description="Ranked search result hits")
-    total_unique_hits: int = Field(..., ge=0, description="Total unique documents found")
-    deduplication_count: int = Field(..., ge=0, description="Number of duplicate results removed")
-    ranking_time_ms: float = Field(..., description="Time spent ranking results")
-    ranking_algorithm: str = Field(..., description="Ranking algorithm used")
-    query_context: QueryContext = Field(..., description="Query processing context")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "hits": [
-                    {
-                        "id": "doc_1",
-                        "score": 0.95,
-                        "document": {"title": "Thai Document"},
-                        "ranking_info": {
-                            "base_score": 0.8,
-                            "thai_boost": 1.2,
-                            "final_score": 0.95
-                        }
-                    }
-                ],
-                "total_unique_hits": 42,
-                "deduplication_count": 3,
-                "ranking_time_ms": 12.5,
-                "ranking_algorithm": "weighted_score"
-            }
-        }
\ No newline at end of file
+    hits: List[HitRecord]
+    total_unique_hits: int
+    deduplication_count: int
+    ranking_time_ms: float
+    ranking_algorithm: str
+    query_context: QueryContext
@@ -10,13 +10,17 @@ import re
 import time
 from typing import List, Dict, Any, Optional, Tuple
 
+from ...tokenizer.factory import TokenizerFactory
 from ...tokenizer.thai_segmenter import ThaiSegmenter, TokenizationResult as ThaiTokenizationResult
+from ...tokenizer.script_scanner import scan_text, is_thai_text, fallback_tokens
 from ...utils.logging import get_structured_logger
+from ...utils.tracing import start_span
 from ..models.query import (
     ProcessedQuery, 
     QueryVariant, 
     QueryVariantType, 
-    TokenizationResult
+    TokenizationResult,
+    VariantCandidate
 )
 from ..config.settings import SearchProxySettings
 
@@ -58,10 +62,15 @@ class QueryProcessor:
         start_time = time.time()
         
         try:
+            # Compound splitting looks decompositions up in the shipped table
+            # and only runs the fallback engines for words it does not cover
+            compound_table = await asyncio.to_thread(TokenizerFactory.load_compound_table)
+            
             # Initialize primary Thai segmenter
             self._thai_segmenter = ThaiSegmenter(
                 engine=self.settings.tokenization.primary_engine,
-                keep_whitespace=True
+                keep_whitespace=True,
+                compound_table=compound_table
             )
             
             # Initialize fallback segmenters
@@ -69,7 +78,8 @@ class QueryProcessor:
                 if engine != self.settings.tokenization.primary_engine:
                     self._fallback_segmenters[engine] = ThaiSegmenter(
                         engine=engine,
-                        keep_whitespace=True
+                        keep_whitespace=True,
+                        compound_table=compound_table
                     )
             
             self._initialized = True
@@ -168,18 +178,13 @@ class QueryProcessor:
         Returns:
             Dictionary with query analysis results
         """
-        # Count Thai characters
-        thai_char_count = sum(
-            1 for char in query 
-            if self._thai_char_range[0] <= ord(char) <= self._thai_char_range[1]
-        )
-        
-        # Count English words
-        english_matches = self._english_word_pattern.findall(query)
-        english_char_count = sum(len(match) for match in english_matches)
+        # Count Thai and English (ASCII letter) characters in a single scan
+        profile = scan_text(query)
+        thai_char_count = profile.thai_chars
+        english_char_count = profile.ascii_letters
         
         # Calculate ratios
-        total_chars = len(query.replace(' ', ''))  # Exclude spaces from count
+        total_chars = len(query) - query.count(' ')  # Exclude spaces from count
         thai_content_ratio = thai_char_count / total_chars if total_chars > 0 else 0.0
         english_content_ratio = english_char_count / total_chars if total_chars > 0 else 0.0
         
@@ -300,11 +305,13 @@ class QueryProcessor:
         start_time = time.time()
         
         try:
-            # Use compound word segmentation if enabled
-            if self.settings.tokenization.enable_compound_splitting:
-                thai_result = segmenter.segment_compound_words(query)
-            else:
-                thai_result = segmenter.segment_text(query)
+            with start_span("tokenize", {"engine": segmenter.engine, "is_fallback": is_fallback}) as span:
+                # Use compound word segmentation if enabled
+                if self.settings.tokenization.enable_compound_splitting:
+                    thai_result = segmenter.segment_compound_words(query)
+                else:
+                    thai_result = segmenter.segment_text(query)
+                span.set_attribute("tokens", len(thai_result.tokens))
             
             processing_time = (time.time() - start_time) * 1000
             
@@ -406,21 +413,7 @@ class QueryProcessor:
         start_time = time.time()
         
         # Simple character-level tokenization preserving Thai characters
-        tokens = []
-        current_token = ""
-        
-        for char in query:
-            if self._is_thai_char(char):
-                current_token += char
-            else:
-                if current_token:
-                    tokens.append(current_token)
-                    current_token = ""
-                if char.strip():  # Non-whitespace non-Thai character
-                    tokens.append(char)
-        
-        if current_token:
-            tokens.append(current_token)
+        tokens = fallback_tokens(query)
         
         processing_time = (time.time() - start_time) * 1000
         
@@ -497,13 +490,14 @@ class QueryProcessor:
             
             logger.debug(f"Limited query variants to {max_variants} (from {len(variants)})")
         
-        return variants
+        # Only the selected variants are converted to validated models
+        return [variant.to_query_variant() for variant in variants]
     
     def _create_original_variant(
         self, 
         original_query: str, 
         query_analysis: Dict[str, Any]
-    ) -> QueryVariant:
+    ) -> VariantCandidate:
         """Create the original query variant with optimized weight."""
         base_weight = self._calculate_variant_weight(QueryVariantType.ORIGINAL, query_analysis)
         
@@ -511,7 +505,7 @@ class QueryProcessor:
         if not query_analysis["thai_content_detected"]:
             base_weight *= 1.2
         
-        return QueryVariant(
+        return VariantCandidate(
             query_text=original_query,
             variant_type=QueryVariantType.ORIGINAL,
             tokenization_engine="none",
@@ -530,7 +524,7 @@ class QueryProcessor:
         result: TokenizationResult, 
         query_analysis: Dict[str, Any],
         original_query: str
-    ) -> List[QueryVariant]:
+    ) -> List[VariantCandidate]:
         """Generate multiple variants from a single tokenization result."""
         variants = []
         
@@ -545,7 +539,7 @@ class QueryProcessor:
         variant_type = self._determine_variant_type(result, query_analysis)
         
         # Create main tokenized variant
-        main_variant = QueryVariant(
+        main_variant = VariantCandidate(
             query_text=tokenized_query,
             variant_type=variant_type,
             tokenization_engine=result.engine,
@@ -577,7 +571,7 @@ class QueryProcessor:
         self, 
         result: TokenizationResult, 
         query_analysis: Dict[str, Any]
-    ) -> List[QueryVariant]:
+    ) -> List[VariantCandidate]:
         """Generate variants optimized for compound word searches."""
         variants = []
         
@@ -593,7 +587,7 @@ class QueryProcessor:
         if len(compound_tokens) != len(result.tokens):
             compound_query = " ".join(compound_tokens)
             
-            variant = QueryVariant(
+            variant = VariantCandidate(
                 query_text=compound_query,
                 variant_type=QueryVariantType.COMPOUND_SPLIT,
                 tokenization_engine=f"{result.engine}_compound",
@@ -617,7 +611,7 @@ class QueryProcessor:
         self, 
         result: TokenizationResult, 
         query_analysis: Dict[str, Any]
-    ) -> List[QueryVariant]:
+    ) -> List[VariantCandidate]:
         """Generate phrase-based variants for better matching."""
         variants = []
         
@@ -625,7 +619,7 @@ class QueryProcessor:
         if len(result.tokens) > 2:
             phrase_query = f'"{" ".join(result.tokens)}"'
             
-            variant = QueryVariant(
+            variant = VariantCandidate(
                 query_text=phrase_query,
                 variant_type=QueryVariantType.TOKENIZED,
                 tokenization_engine=f"{result.engine}_phrase",
@@ -651,7 +645,7 @@ class QueryProcessor:
         self, 
         original_query: str, 
         query_analysis: Dict[str, Any]
-    ) -> List[QueryVariant]:
+    ) -> List[VariantCandidate]:
         """Generate fallback variants when tokenization fails."""
         variants = []
         
@@ -661,7 +655,7 @@ class QueryProcessor:
             if char_tokens:
                 char_query = " ".join(char_tokens)
                 
-                variant = QueryVariant(
+                variant = VariantCandidate(
                     query_text=char_query,
                     variant_type=QueryVariantType.FALLBACK,
                     tokenization_engine="character_fallback",
@@ -683,7 +677,7 @@ class QueryProcessor:
             if len(word_tokens) > 1:
                 word_query = " ".join(word_tokens)
                 
-                variant = QueryVariant(
+                variant = VariantCandidate(
                     query_text=word_query,
                     variant_type=QueryVariantType.FALLBACK,
                     tokenization_engine="word_split_fallback",
@@ -727,9 +721,9 @@ class QueryProcessor:
     
     def _optimize_variant_selection(
         self, 
-        variants: List[QueryVariant], 
+        variants: List[VariantCandidate], 
         query_analysis: Dict[str, Any]
-    ) -> List[QueryVariant]:
+    ) -> List[VariantCandidate]:
         """Optimize variant selection and adjust weights based on analysis."""
         if not variants:
             return variants
@@ -757,7 +751,7 @@ class QueryProcessor:
         # Ensure we always have at least one variant
         if not variants and query_analysis.get("original_query"):
             # Create emergency fallback
-            emergency_variant = QueryVariant(
+            emergency_variant = VariantCandidate(
                 query_text=query_analysis["original_query"],
                 variant_type=QueryVariantType.ORIGINAL,
                 tokenization_engine="emergency",
@@ -1028,11 +1022,7 @@ class QueryProcessor:
     
     def _is_thai_text(self, text: str) -> bool:
         """Check if text contains primarily Thai characters."""
-        if not text:
-            return False
-        
-        thai_chars = sum(1 for char in text if self._is_thai_char(char))
-        return thai_chars / len(text) > 0.5
+        return is_thai_text(text)
     
     def _is_thai_char(self, char: str) -> bool:
         """Check if character is Thai."""
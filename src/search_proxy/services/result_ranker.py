@@ -6,6 +6,7 @@ search results from multiple query variants, considering Thai language-specific
 factors and tokenization quality.
 """
 
+import logging
 import time
 from typing import Any, Dict, List, Optional, Tuple, Set
 from enum import Enum
@@ -13,9 +14,10 @@ import math
 import hashlib
 from difflib import SequenceMatcher
 
+from ...tokenizer.script_scanner import scan_text
 from ...utils.logging import get_structured_logger
-from ..models.search import SearchResult, QueryContext, RankingMetadata, RankedResults
-from ..models.responses import SearchHit
+from ...utils.tracing import current_span
+from ..models.search import SearchResult, QueryContext, RankingMetadata, RankedResults, HitRecord
 from ..models.query import QueryVariant, QueryVariantType
 from ..config.settings import RankingConfig
 
@@ -230,17 +232,18 @@ class ResultRanker:
             ranked_hits = self._normalize_scores(ranked_hits)
         
         # Log scores before filtering
-        logger.info(
-            "Score distribution before filtering",
-            extra={
-                "total_hits": len(ranked_hits),
-                "min_score_threshold": self.config.min_score_threshold,
-                "score_samples": [
-                    {"id": hit.id, "score": hit.score, "title": hit.document.get("title", "")[:50]}
-                    for hit in ranked_hits[:5]
-                ] if ranked_hits else []
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Score distribution before filtering",
+                extra={
+                    "total_hits": len(ranked_hits),
+                    "min_score_threshold": self.config.min_score_threshold,
+                    "score_samples": [
+                        {"id": hit.id, "score": hit.score, "title": hit.document.get("title", "")[:50]}
+                        for hit in ranked_hits[:5]
+                    ] if ranked_hits else []
+                }
+            )
         
         # Filter by minimum score threshold
         filtered_hits = [
@@ -256,6 +259,12 @@ class ResultRanker:
         
         # Update performance metrics
         self._update_performance_metrics(algorithm_to_use, ranking_time, deduplication_count)
+        current_span().set_attributes({
+            "algorithm": algorithm_to_use.value,
+            "variants": len(search_results),
+            "raw_hits": total_raw_hits,
+            "ranked_hits": len(filtered_hits)
+        })
         
         logger.info(
             "Result ranking completed",
@@ -294,7 +303,7 @@ class ResultRanker:
     
     def calculate_relevance_score(
         self, 
-        result: SearchHit, 
+        result: HitRecord, 
         query_context: QueryContext,
         variant: QueryVariant,
         position: int = 0
@@ -303,7 +312,7 @@ class ResultRanker:
         Calculate relevance score for a single search result.
         
         Args:
-            result: SearchHit object to score
+            result: HitRecord object to score
             query_context: Query processing context
             variant: QueryVariant that produced this result
             position: Position of result in original search results
@@ -389,7 +398,7 @@ class ResultRanker:
             result.ranking_info = {}
         
         result.ranking_info.update({
-            "ranking_metadata": ranking_metadata.model_dump(),
+            "ranking_metadata": ranking_metadata.to_dict(),
             "variant_type": variant.variant_type.value,
             "variant_weight": variant.weight,
             "tokenization_engine": variant.tokenization_engine,
@@ -402,7 +411,7 @@ class ResultRanker:
         self, 
         search_results: List[SearchResult], 
         query_context: QueryContext
-    ) -> List[Tuple[SearchHit, float, QueryVariant, int]]:
+    ) -> List[Tuple[HitRecord, float, QueryVariant, int]]:
         """
         Collect all hits from search results and calculate initial scores.
         
@@ -422,7 +431,7 @@ class ResultRanker:
         
         return scored_hits
     
-    def _calculate_content_similarity(self, hit1: SearchHit, hit2: SearchHit) -> float:
+    def _calculate_content_similarity(self, hit1: HitRecord, hit2: HitRecord) -> float:
         """
         Calculate content similarity between two search hits.
         
@@ -445,7 +454,7 @@ class ResultRanker:
         
         return similarity
     
-    def _extract_text_content(self, hit: SearchHit) -> str:
+    def _extract_text_content(self, hit: HitRecord) -> str:
         """
         Extract text content from a search hit for similarity comparison.
         
@@ -471,7 +480,7 @@ class ResultRanker:
         
         return " ".join(content_parts).lower()
     
-    def _generate_content_hash(self, hit: SearchHit) -> str:
+    def _generate_content_hash(self, hit: HitRecord) -> str:
         """
         Generate a hash of the hit's content for fast duplicate detection.
         
@@ -486,8 +495,8 @@ class ResultRanker:
     
     def _apply_tie_breaking_rules(
         self, 
-        tied_hits: List[Tuple[SearchHit, float, QueryVariant, int]]
-    ) -> Tuple[SearchHit, float, QueryVariant, int]:
+        tied_hits: List[Tuple[HitRecord, float, QueryVariant, int]]
+    ) -> Tuple[HitRecord, float, QueryVariant, int]:
         """
         Apply tie-breaking rules when multiple hits have similar scores.
         
@@ -566,9 +575,9 @@ class ResultRanker:
     
     def _merge_results_with_content_similarity(
         self, 
-        scored_hits: List[Tuple[SearchHit, float, QueryVariant, int]],
+        scored_hits: List[Tuple[HitRecord, float, QueryVariant, int]],
         similarity_threshold: float = 0.8
-    ) -> List[Tuple[SearchHit, float, QueryVariant, int]]:
+    ) -> List[Tuple[HitRecord, float, QueryVariant, int]]:
         """
         Merge results using both document ID and content similarity.
         
@@ -583,7 +592,7 @@ class ResultRanker:
             return []
         
         # First, group by document ID (exact duplicates)
-        id_groups: Dict[str, List[Tuple[SearchHit, float, QueryVariant, int]]] = {}
+        id_groups: Dict[str, List[Tuple[HitRecord, float, QueryVariant, int]]] = {}
         
         for hit_tuple in scored_hits:
             hit, score, variant, position = hit_tuple
@@ -634,9 +643,9 @@ class ResultRanker:
     
     def _apply_content_similarity_deduplication(
         self, 
-        hits: List[Tuple[SearchHit, float, QueryVariant, int]],
+        hits: List[Tuple[HitRecord, float, QueryVariant, int]],
         similarity_threshold: float
-    ) -> List[Tuple[SearchHit, float, QueryVariant, int]]:
+    ) -> List[Tuple[HitRecord, float, QueryVariant, int]]:
         """
         Apply content similarity-based deduplication.
         
@@ -1024,9 +1033,9 @@ class ResultRanker:
     
     def _weighted_score_algorithm(
         self, 
-        scored_hits: List[Tuple[SearchHit, float, QueryVariant, int]], 
+        scored_hits: List[Tuple[HitRecord, float, QueryVariant, int]], 
         query_context: QueryContext
-    ) -> List[SearchHit]:
+    ) -> List[HitRecord]:
         """
         Weighted scoring algorithm with enhanced deduplication and merging.
         
@@ -1073,9 +1082,9 @@ class ResultRanker:
     
     def _optimized_score_algorithm(
         self, 
-        scored_hits: List[Tuple[SearchHit, float, QueryVariant, int]], 
+        scored_hits: List[Tuple[HitRecord, float, QueryVariant, int]], 
         query_context: QueryContext
-    ) -> List[SearchHit]:
+    ) -> List[HitRecord]:
         """
         Optimized scoring algorithm for production use with better performance.
         
@@ -1182,9 +1191,9 @@ class ResultRanker:
     
     def _simple_score_algorithm(
         self, 
-        scored_hits: List[Tuple[SearchHit, float, QueryVariant, int]], 
+        scored_hits: List[Tuple[HitRecord, float, QueryVariant, int]], 
         query_context: QueryContext
-    ) -> List[SearchHit]:
+    ) -> List[HitRecord]:
         """
         Simple scoring algorithm that uses basic deduplication and scoring.
         """
@@ -1206,9 +1215,9 @@ class ResultRanker:
     
     def _experimental_score_algorithm(
         self, 
-        scored_hits: List[Tuple[SearchHit, float, QueryVariant, int]], 
+        scored_hits: List[Tuple[HitRecord, float, QueryVariant, int]], 
         query_context: QueryContext
-    ) -> List[SearchHit]:
+    ) -> List[HitRecord]:
         """
         Experimental scoring algorithm for testing new approaches.
         """
@@ -1283,7 +1292,7 @@ class ResultRanker:
         
         return boost
     
-    def _is_exact_match(self, result: SearchHit, original_query: str) -> bool:
+    def _is_exact_match(self, result: HitRecord, original_query: str) -> bool:
         """Check if result contains exact match for original query."""
         # Simple exact match detection
         # In a more sophisticated implementation, this could check specific fields
@@ -1302,7 +1311,7 @@ class ResultRanker:
         
         return False
     
-    def _normalize_scores(self, hits: List[SearchHit]) -> List[SearchHit]:
+    def _normalize_scores(self, hits: List[HitRecord]) -> List[HitRecord]:
         """Normalize scores to 0-1 range."""
         if not hits:
             return hits
@@ -1333,8 +1342,7 @@ class ResultRanker:
     ) -> QueryContext:
         """Create QueryContext from available information."""
         # Analyze query for Thai content
-        thai_chars = sum(1 for char in original_query if '\u0e00' <= char <= '\u0e7f')
-        thai_content_ratio = thai_chars / len(original_query) if original_query else 0.0
+        thai_content_ratio = scan_text(original_query).thai_ratio
         
         # Determine primary language
         if thai_content_ratio > 0.7:
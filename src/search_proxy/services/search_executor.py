@@ -14,9 +14,9 @@ from collections import defaultdict
 
 from ...meilisearch_integration.client import MeiliSearchClient
 from ...utils.logging import get_structured_logger
+from ...utils.tracing import current_span, start_span
 from ..models.query import QueryVariant
-from ..models.search import SearchResult
-from ..models.responses import SearchHit
+from ..models.search import SearchResult, HitRecord
 from ..models.requests import SearchOptions
 
 
@@ -215,19 +215,26 @@ class SearchExecutor:
         )
         
         try:
-            # Execute search with retry logic if enabled
-            if self.config.retry_failed_searches:
-                raw_results = await self._search_with_retry(
-                    index_name, variant.query_text, meilisearch_params
-                )
-            else:
-                raw_results = await self.client.search(
-                    index_name, variant.query_text, meilisearch_params
-                )
+            with start_span("search.variant", {
+                "variant_type": variant.variant_type.value,
+                "tokenization_engine": variant.tokenization_engine,
+                "weight": variant.weight,
+                "index": index_name
+            }) as span:
+                # Execute search with retry logic if enabled
+                if self.config.retry_failed_searches:
+                    raw_results = await self._search_with_retry(
+                        index_name, variant.query_text, meilisearch_params
+                    )
+                else:
+                    raw_results = await self.client.search(
+                        index_name, variant.query_text, meilisearch_params
+                    )
+                span.set_attribute("hits", len(raw_results.get('hits', [])))
             
             processing_time = (time.time() - start_time) * 1000
             
-            # Convert raw results to SearchHit objects
+            # Convert raw results to lightweight hit records
             hits = self._convert_raw_hits_to_search_hits(
                 raw_results.get('hits', []), variant
             )
@@ -240,6 +247,9 @@ class SearchExecutor:
                 'offset': raw_results.get('offset', 0),
                 'estimatedTotalHits': raw_results.get('estimatedTotalHits', 0)
             }
+            if 'shards' in raw_results:
+                # Scatter-gather summary; failed shards mean partial results
+                meilisearch_metadata['shards'] = raw_results['shards']
             
             search_result = SearchResult(
                 query_variant=variant,
@@ -296,8 +306,12 @@ class SearchExecutor:
         search_options: Optional[SearchOptions]
     ) -> SearchResult:
         """Execute single search with semaphore for concurrency control."""
-        async with self._search_semaphore:
+        with start_span("semaphore.wait", {"variant_type": variant.variant_type.value}):
+            await self._search_semaphore.acquire()
+        try:
             return await self.execute_single_search(variant, index_name, search_options)
+        finally:
+            self._search_semaphore.release()
     
     async def _search_with_retry(
         self, 
@@ -327,7 +341,9 @@ class SearchExecutor:
                             "index_name": index_name
                         }
                     )
-                    await asyncio.sleep(retry_delay)
+                    current_span().add_event("retry", {"attempt": attempt + 1, "error": str(e)[:200]})
+                    with start_span("retry.wait", {"attempt": attempt + 1, "delay_ms": self.config.retry_delay_ms}):
+                        await asyncio.sleep(retry_delay)
                 else:
                     logger.error(
                         f"Search failed after {self.config.max_retries + 1} attempts",
@@ -344,10 +360,20 @@ class SearchExecutor:
         self, 
         raw_hits: List[Dict[str, Any]], 
         variant: QueryVariant
-    ) -> List[SearchHit]:
-        """Convert raw Meilisearch hits to SearchHit objects."""
+    ) -> List[HitRecord]:
+        """
+        Convert raw Meilisearch hits to HitRecord objects.
+        
+        Hit records are unvalidated slotted dataclasses; they are converted to
+        the public SearchHit model only for the final response page.
+        """
         search_hits = []
         
+        # Variant-level ranking info is identical for every hit of this search
+        variant_weight = variant.weight
+        variant_type = variant.variant_type.value
+        tokenization_engine = variant.tokenization_engine
+        
         # Log first hit to debug field names
         if raw_hits:
             logger.debug(
@@ -366,23 +392,23 @@ class SearchExecutor:
                 # MeiliSearch uses _score in some versions and _rankingScore in others
                 score = float(hit.get('_rankingScore', hit.get('_score', 0.0)))
                 
-                search_hit = SearchHit(
+                search_hit = HitRecord(
                     id=str(hit.get('id', hit.get('_id', ''))),
                     score=score,
                     document=document,
                     highlight=hit.get('_formatted', {}),
                     ranking_info={
                         'base_score': score,
-                        'variant_weight': variant.weight,
-                        'variant_type': variant.variant_type.value,
-                        'tokenization_engine': variant.tokenization_engine
+                        'variant_weight': variant_weight,
+                        'variant_type': variant_type,
+                        'tokenization_engine': tokenization_engine
                     }
                 )
                 search_hits.append(search_hit)
                 
             except Exception as e:
                 logger.warning(
-                    "Failed to convert raw hit to SearchHit",
+                    "Failed to convert raw hit to HitRecord",
                     extra={
                         "error": str(e),
                         "hit_keys": list(hit.keys()) if isinstance(hit, dict) else "not_dict",
@@ -439,7 +465,7 @@ class SearchExecutor:
         self, 
         search_results: List[SearchResult],
         deduplication_strategy: str = "id_based"
-    ) -> Tuple[List[SearchHit], Dict[str, Any]]:
+    ) -> Tuple[List[HitRecord], Dict[str, Any]]:
         """
         Collect and deduplicate search results from multiple search variants.
         
@@ -523,7 +549,7 @@ class SearchExecutor:
     def _deduplicate_by_id(
         self, 
         hits_with_metadata: List[Dict[str, Any]]
-    ) -> Tuple[List[SearchHit], int]:
+    ) -> Tuple[List[HitRecord], int]:
         """Deduplicate hits based on document ID, keeping the highest scoring version."""
         seen_ids: Dict[str, Dict[str, Any]] = {}
         dedup_count = 0
@@ -550,7 +576,7 @@ class SearchExecutor:
     def _deduplicate_by_content(
         self, 
         hits_with_metadata: List[Dict[str, Any]]
-    ) -> Tuple[List[SearchHit], int]:
+    ) -> Tuple[List[HitRecord], int]:
         """Deduplicate hits based on content similarity."""
         # For content-based deduplication, we'll use a simple approach
         # comparing title and content fields
@@ -581,7 +607,7 @@ class SearchExecutor:
     def _deduplicate_hybrid(
         self, 
         hits_with_metadata: List[Dict[str, Any]]
-    ) -> Tuple[List[SearchHit], int]:
+    ) -> Tuple[List[HitRecord], int]:
         """Hybrid deduplication using both ID and content similarity."""
         # First deduplicate by ID
         id_deduplicated, id_dedup_count = self._deduplicate_by_id(hits_with_metadata)
@@ -616,9 +642,9 @@ class SearchExecutor:
     
     def add_search_metadata_to_hits(
         self, 
-        hits: List[SearchHit], 
+        hits: List[HitRecord], 
         search_results: List[SearchResult]
-    ) -> List[SearchHit]:
+    ) -> List[HitRecord]:
         """
         Add search execution metadata to hits for debugging and analytics.
         
@@ -6,21 +6,34 @@ to ranked results, integrating tokenization, search execution, and ranking.
 """
 
 import asyncio
+import os
 import time
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional
 
 from ...meilisearch_integration.client import MeiliSearchClient, MeiliSearchConfig
+from ...meilisearch_integration.sharding import ShardedMeiliSearchClient, sharding_config_from_settings
+from ...meilisearch_integration.replicas import ReplicatedMeiliSearchClient
 from ...utils.logging import get_structured_logger
+from ...utils.tracing import FileSpanExporter, OTLPHttpSpanExporter, start_span, tracer
 from ..config.settings import SearchProxySettings
 from ..models.requests import SearchRequest, BatchSearchRequest
 from ..models.responses import SearchResponse, SearchErrorResponse
 from ..models.query import ProcessedQuery
+from ..models.search import to_search_hits
 from ..metrics import metrics_collector
 from ..analytics import analytics_collector
 from .query_processor import QueryProcessor
 from .search_executor import SearchExecutor, SearchExecutorConfig
 from .result_ranker import ResultRanker
 from ..config.hot_reload import HotReloadConfigManager
+from ..cache import (
+    CacheBackend,
+    RedisCacheBackend,
+    TwoTierCache,
+    content_version,
+    file_version
+)
 
 
 logger = get_structured_logger(__name__)
@@ -40,7 +53,8 @@ class SearchProxyService:
     def __init__(
         self, 
         settings: SearchProxySettings,
-        meilisearch_client: Optional[MeiliSearchClient] = None
+        meilisearch_client: Optional[MeiliSearchClient] = None,
+        cache_backend: Optional[CacheBackend] = None
     ):
         """
         Initialize the search proxy service.
@@ -48,6 +62,8 @@ class SearchProxyService:
         Args:
             settings: Configuration settings for the service
             meilisearch_client: Optional MeiliSearch client instance
+            cache_backend: Optional shared (L2) cache backend; built from
+                settings.cache_redis_url when not given
         """
         self.settings = settings
         self._initialized = False
@@ -55,6 +71,10 @@ class SearchProxyService:
         # Store MeiliSearch client
         self._meilisearch_client = meilisearch_client
         
+        # Query and result cache
+        self._cache_backend = cache_backend
+        self._cache: Optional[TwoTierCache] = None
+        
         # Initialize components
         self._query_processor: Optional[QueryProcessor] = None
         self._search_executor: Optional[SearchExecutor] = None
@@ -118,13 +138,16 @@ class SearchProxyService:
     
     async def search(
         self, 
-        request: SearchRequest
+        request: SearchRequest,
+        record: bool = True
     ) -> SearchResponse:
         """
         Execute a single search request.
         
         Args:
             request: Search request with query and options
+            record: Count the search in metrics and query analytics; off for
+                internal traffic such as startup warm-up
             
         Returns:
             SearchResponse with ranked results and metadata
@@ -137,132 +160,182 @@ class SearchProxyService:
             raise RuntimeError("Search proxy service not initialized")
         
         start_time = time.time()
-        tokenization_start = 0.0
-        search_start = 0.0
-        ranking_start = 0.0
         
         # Update active searches counter
         metrics_collector.update_active_searches(1)
         
-        try:
-            # Validate request
-            self._validate_search_request(request)
+        # Stage start times and durations, filled in by the pipeline
+        timings = {}
+        
+        async def run_pipeline() -> SearchResponse:
+            pipeline_start = time.time()
             
             # Process query with timing
-            tokenization_start = time.time()
-            processed_query = await self._process_query(request.query)
-            tokenization_time = (time.time() - tokenization_start) * 1000
+            timings["tokenization_start"] = time.time()
+            with start_span("query.process") as stage:
+                processed_query = await self._process_query(request.query)
+                stage.set_attributes({
+                    "variants": len(processed_query.query_variants),
+                    "fallback_used": processed_query.fallback_used
+                })
+            timings["tokenization_time"] = (time.time() - timings["tokenization_start"]) * 1000
             
             # Record query processing metrics
             language_detected = "thai" if processed_query.thai_content_detected else "english"
             if processed_query.mixed_content:
                 language_detected = "mixed"
             
-            metrics_collector.record_query_processing(
-                query=request.query,
-                language_detected=language_detected,
-                tokenization_success=not processed_query.fallback_used,
-                variants_generated=len(processed_query.query_variants),
-                fallback_used=processed_query.fallback_used,
-                compound_words_found=0  # TODO: Extract from processed_query when available
-            )
+            if record:
+                metrics_collector.record_query_processing(
+                    query=request.query,
+                    language_detected=language_detected,
+                    tokenization_success=not processed_query.fallback_used,
+                    variants_generated=len(processed_query.query_variants),
+                    fallback_used=processed_query.fallback_used,
+                    compound_words_found=0  # TODO: Extract from processed_query when available
+                )
+            timings["language"] = processed_query.primary_language or ("thai" if processed_query.thai_content_detected else "english")
             
             # Execute searches with timing
-            search_start = time.time()
-            search_results = await self._execute_searches(
-                processed_query, 
-                request.index_name,
-                request.options
+            timings["search_start"] = time.time()
+            with start_span("search.execute", {"index": request.index_name}):
+                search_results = await self._execute_searches(
+                    processed_query, 
+                    request.index_name,
+                    request.options
+                )
+            timings["search_time"] = (time.time() - timings["search_start"]) * 1000
+            # Results missing a variant or a shard must not be served from the cache
+            timings["complete"] = all(
+                result.success and not result.meilisearch_metadata.get("shards", {}).get("failed")
+                for result in search_results
             )
-            search_time = (time.time() - search_start) * 1000
             
             # Rank and merge results with timing
-            ranking_start = time.time()
-            ranked_results = await self._rank_results(search_results, processed_query)
-            ranking_time = (time.time() - ranking_start) * 1000
+            timings["ranking_start"] = time.time()
+            with start_span("results.rank"):
+                ranked_results = await self._rank_results(search_results, processed_query)
+            timings["ranking_time"] = (time.time() - timings["ranking_start"]) * 1000
             
             # Build response
-            processing_time = (time.time() - start_time) * 1000
-            response = self._build_search_response(
-                ranked_results,
-                processed_query,
-                request,
-                processing_time
-            )
-            
-            # Record successful search metrics
-            metrics_collector.record_search_request(
-                query=request.query,
-                success=True,
-                processing_time_ms=processing_time,
-                query_variants_count=len(processed_query.query_variants),
-                results_count=len(ranked_results["hits"]),
-                unique_results_count=ranked_results["total_hits"],
-                tokenization_time_ms=tokenization_time,
-                search_time_ms=search_time,
-                ranking_time_ms=ranking_time,
-                cache_hit=False  # TODO: Implement caching
-            )
-            
-            # Record analytics
-            analytics_collector.record_search(
-                query=request.query,
-                session_id=getattr(request, 'session_id', None),
-                success=True,
-                response_time_ms=processing_time,
-                results_count=len(ranked_results["hits"]),
-                language=processed_query.primary_language or ("thai" if processed_query.thai_content_detected else "english")
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Record failed search metrics
-            processing_time = (time.time() - start_time) * 1000
-            error_type = type(e).__name__
-            
-            # Log the error with traceback for debugging
-            logger.error(
-                "Search processing failed",
-                extra={
-                    "error_type": error_type,
-                    "error_message": str(e),
-                    "query": request.query,
-                    "index_name": request.index_name
-                },
-                exc_info=True
-            )
-            
-            metrics_collector.record_search_request(
-                query=request.query,
-                success=False,
-                processing_time_ms=processing_time,
-                query_variants_count=0,
-                results_count=0,
-                unique_results_count=0,
-                tokenization_time_ms=(time.time() - tokenization_start) * 1000 if tokenization_start else 0,
-                search_time_ms=(time.time() - search_start) * 1000 if search_start else 0,
-                ranking_time_ms=(time.time() - ranking_start) * 1000 if ranking_start else 0,
-                cache_hit=False,
-                error_type=error_type
-            )
-            
-            # Record analytics for failed search
-            analytics_collector.record_search(
-                query=request.query,
-                session_id=getattr(request, 'session_id', None),
-                success=False,
-                response_time_ms=processing_time,
-                results_count=0,
-                language="unknown",
-                error_type=error_type
-            )
-            
-            # Handle errors gracefully
-            return await self._handle_search_error(e, request, start_time)
-        finally:
-            # Always update active searches counter
-            metrics_collector.update_active_searches(-1)
+            with start_span("response.build"):
+                return self._build_search_response(
+                    ranked_results,
+                    processed_query,
+                    request,
+                    (time.time() - pipeline_start) * 1000
+                )
+        
+        span = start_span(
+            "search",
+            {"index": request.index_name, "query.length": len(request.query)},
+            root=True
+        )
+        with span:
+            try:
+                # Validate request
+                self._validate_search_request(request)
+                
+                if self._cache is not None:
+                    response, cache_hit = await self._cache.get_or_compute(
+                        "search",
+                        self._search_cache_parts(request),
+                        run_pipeline,
+                        serialize=lambda value: value.model_dump_json().encode("utf-8"),
+                        deserialize=SearchResponse.model_validate_json,
+                        cacheable=lambda _: timings.get("complete", False)
+                    )
+                else:
+                    response, cache_hit = await run_pipeline(), False
+                
+                processing_time = (time.time() - start_time) * 1000
+                span.set_attributes({
+                    "cache_hit": cache_hit,
+                    "hits": len(response.hits),
+                    "total_hits": response.total_hits
+                })
+                if cache_hit:
+                    response = response.model_copy(update={
+                        "processing_time_ms": processing_time,
+                        "timestamp": datetime.utcnow()
+                    })
+                
+                if record:
+                    # Record successful search metrics
+                    metrics_collector.record_search_request(
+                        query=request.query,
+                        success=True,
+                        processing_time_ms=processing_time,
+                        query_variants_count=response.query_info.query_variants_used,
+                        results_count=len(response.hits),
+                        unique_results_count=response.total_hits,
+                        tokenization_time_ms=timings.get("tokenization_time", 0.0),
+                        search_time_ms=timings.get("search_time", 0.0),
+                        ranking_time_ms=timings.get("ranking_time", 0.0),
+                        cache_hit=cache_hit
+                    )
+                
+                    # Record analytics
+                    analytics_collector.record_search(
+                        query=request.query,
+                        session_id=getattr(request, 'session_id', None),
+                        success=True,
+                        response_time_ms=processing_time,
+                        results_count=len(response.hits),
+                        language=timings.get("language") or ("thai" if response.query_info.thai_content_detected else "english")
+                    )
+                
+                return response
+                
+            except Exception as e:
+                # Record failed search metrics
+                processing_time = (time.time() - start_time) * 1000
+                error_type = type(e).__name__
+                span.record_exception(e)
+                
+                # Log the error with traceback for debugging
+                logger.error(
+                    "Search processing failed",
+                    extra={
+                        "error_type": error_type,
+                        "error_message": str(e),
+                        "query": request.query,
+                        "index_name": request.index_name
+                    },
+                    exc_info=True
+                )
+                
+                if record:
+                    metrics_collector.record_search_request(
+                        query=request.query,
+                        success=False,
+                        processing_time_ms=processing_time,
+                        query_variants_count=0,
+                        results_count=0,
+                        unique_results_count=0,
+                        tokenization_time_ms=(time.time() - timings["tokenization_start"]) * 1000 if "tokenization_start" in timings else 0,
+                        search_time_ms=(time.time() - timings["search_start"]) * 1000 if "search_start" in timings else 0,
+                        ranking_time_ms=(time.time() - timings["ranking_start"]) * 1000 if "ranking_start" in timings else 0,
+                        cache_hit=False,
+                        error_type=error_type
+                    )
+                
+                    # Record analytics for failed search
+                    analytics_collector.record_search(
+                        query=request.query,
+                        session_id=getattr(request, 'session_id', None),
+                        success=False,
+                        response_time_ms=processing_time,
+                        results_count=0,
+                        language="unknown",
+                        error_type=error_type
+                    )
+                
+                # Handle errors gracefully
+                return await self._handle_search_error(e, request, start_time)
+            finally:
+                # Always update active searches counter
+                metrics_collector.update_active_searches(-1)
     
     async def batch_search(
         self, 
@@ -305,7 +378,8 @@ class SearchProxyService:
                 query=query,
                 index_name=request.index_name,
                 options=request.options,
-                include_tokenization_info=request.include_tokenization_info
+                include_tokenization_info=request.include_tokenization_info,
+                include_ranking_info=request.include_ranking_info
             )
             for query in request.queries
         ]
@@ -333,13 +407,14 @@ class SearchProxyService:
                     return await self._handle_search_error(e, search_request, time.time())
         
         # Execute all searches concurrently
-        results = await asyncio.gather(
-            *[
-                execute_single_search_with_error_handling(req, i) 
-                for i, req in enumerate(search_requests)
-            ],
-            return_exceptions=False  # Errors are handled in the wrapper function
-        )
+        with start_span("batch_search", {"index": request.index_name, "queries": len(search_requests)}, root=True):
+            results = await asyncio.gather(
+                *[
+                    execute_single_search_with_error_handling(req, i) 
+                    for i, req in enumerate(search_requests)
+                ],
+                return_exceptions=False  # Errors are handled in the wrapper function
+            )
         
         batch_processing_time = (time.time() - start_time) * 1000
         successful_searches = sum(1 for r in results if r.total_hits >= 0)  # Basic success check
@@ -404,6 +479,9 @@ class SearchProxyService:
                 "active_searches": metrics_summary["performance_metrics"]["active_searches"],
                 "cache_hit_rate_percent": metrics_summary["search_metrics"]["cache_hit_rate_percent"]
             }
+            
+            if self._cache is not None:
+                health_status["cache"] = self._cache.get_stats()
         
         return health_status
     
@@ -448,6 +526,11 @@ class SearchProxyService:
                 if self._result_ranker:
                     self._result_ranker.config = self.settings.ranking
                     
+            if self._cache is not None:
+                # Results computed with the old configuration are stale on every replica
+                self._cache.set_version(**self._cache_version_parts())
+                await self._cache.invalidate(reason=f"{config_type} reload")
+                    
             logger.info(f"Successfully reloaded {config_type} configuration")
             
         except Exception as e:
@@ -461,6 +544,13 @@ class SearchProxyService:
         if self._hot_reload_manager:
             self._hot_reload_manager.stop()
         
+        if self._cache is not None:
+            await self._cache.close()
+        
+        if self.settings.tracing.enabled:
+            # Exports traces still queued
+            await asyncio.to_thread(tracer.shutdown)
+        
         # Cleanup other resources
         self._initialized = False
         
@@ -477,14 +567,36 @@ class SearchProxyService:
         await self._query_processor.initialize()
         
         # Initialize search executor
-        if self._meilisearch_client is None:
+        sharding_config = sharding_config_from_settings(self.settings)
+        if self._meilisearch_client is None and sharding_config is not None:
+            # Scatter-gather across shards, each owning a partition of the index
+            self._meilisearch_client = ShardedMeiliSearchClient.from_config(sharding_config)
+        elif self._meilisearch_client is None:
             # Create default MeiliSearch client if not provided
+            timeout = int(self.settings.meilisearch_timeout_ms / 1000)
             config = MeiliSearchConfig(
                 host=self.settings.meilisearch_url,
                 api_key=self.settings.meilisearch_api_key,
-                timeout=int(self.settings.meilisearch_timeout_ms / 1000)
+                timeout=timeout
             )
             self._meilisearch_client = MeiliSearchClient(config)
+            
+            if self.settings.meilisearch_replica_urls:
+                # Reads are routed across replicas; writes stay on the primary
+                replicas = [
+                    MeiliSearchClient(MeiliSearchConfig(
+                        host=url,
+                        api_key=self.settings.meilisearch_api_key,
+                        timeout=timeout
+                    ))
+                    for url in self.settings.meilisearch_replica_urls
+                ]
+                self._meilisearch_client = ReplicatedMeiliSearchClient(
+                    self._meilisearch_client,
+                    replicas,
+                    hedge_after_ms=self.settings.search.hedge_after_ms
+                )
+                metrics_collector.set_replica_stats_provider(self._meilisearch_client.get_stats)
         
         # Configure search executor
         executor_config = SearchExecutorConfig(
@@ -504,6 +616,22 @@ class SearchProxyService:
         # Initialize result ranker
         self._result_ranker = ResultRanker(self.settings.ranking)
         
+        # Initialize query and result cache
+        if self.settings.performance.cache_enabled:
+            if self._cache_backend is None and self.settings.cache_redis_url:
+                self._cache_backend = RedisCacheBackend(self.settings.cache_redis_url)
+            self._cache = TwoTierCache(
+                l2=self._cache_backend,
+                l1_max_entries=self.settings.performance.cache_l1_max_entries,
+                fresh_seconds=self.settings.performance.cache_ttl_seconds,
+                stale_seconds=self.settings.performance.cache_stale_seconds
+            )
+            self._cache.set_version(**self._cache_version_parts())
+            await self._cache.start()
+        
+        if self.settings.tracing.enabled:
+            self._configure_tracing()
+        
         logger.info(
             "Search proxy components initialized successfully",
             extra={
@@ -514,6 +642,37 @@ class SearchProxyService:
             }
         )
     
+    def _configure_tracing(self) -> None:
+        """Configure span export for search requests."""
+        tracing = self.settings.tracing
+        if tracing.otlp_endpoint:
+            exporter = OTLPHttpSpanExporter(tracing.otlp_endpoint)
+        elif tracing.export_path:
+            exporter = FileSpanExporter(tracing.export_path)
+        else:
+            logger.warning("Tracing is enabled but neither an OTLP endpoint nor an export path is set")
+            return
+        
+        tracer.configure(
+            enabled=True,
+            sample_rate=tracing.sample_rate,
+            slow_threshold_ms=tracing.slow_threshold_ms,
+            exporter=exporter,
+            service_name=self.settings.service_name,
+            service_version=self.settings.service_version,
+            environment=self.settings.environment,
+            max_spans_per_trace=tracing.max_spans_per_trace,
+            export_errors=tracing.export_errors
+        )
+        logger.info(
+            "Request tracing enabled",
+            extra={
+                "sample_rate": tracing.sample_rate,
+                "slow_threshold_ms": tracing.slow_threshold_ms,
+                "exporter": type(exporter).__name__
+            }
+        )
+    
     async def _verify_dependencies(self) -> None:
         """Verify connectivity to external dependencies."""
         logger.info("Verifying external dependencies")
@@ -522,7 +681,8 @@ class SearchProxyService:
             # Verify MeiliSearch connectivity
             if self._meilisearch_client:
                 health_status = await self._meilisearch_client.health_check()
-                if health_status.get("status") != "healthy":
+                # A sharded client is degraded, but still searchable, with some shards down
+                if health_status.get("status") not in ("healthy", "degraded"):
                     raise RuntimeError(f"MeiliSearch health check failed: {health_status}")
                 
                 logger.info(
@@ -547,7 +707,39 @@ class SearchProxyService:
         if not self._query_processor:
             raise RuntimeError("Query processor not initialized")
         
-        return await self._query_processor.process_query(query)
+        if self._cache is None:
+            return await self._query_processor.process_query(query)
+        
+        processed_query, _ = await self._cache.get_or_compute(
+            "query",
+            [query],
+            lambda: self._query_processor.process_query(query),
+            serialize=lambda value: value.model_dump_json().encode("utf-8"),
+            deserialize=ProcessedQuery.model_validate_json
+        )
+        return processed_query
+    
+    def _search_cache_parts(self, request: SearchRequest) -> List[Any]:
+        """Inputs identifying a cached search response."""
+        return [
+            request.index_name,
+            request.query,
+            request.options.model_dump(mode="json"),
+            request.include_tokenization_info,
+            request.include_ranking_info
+        ]
+    
+    def _cache_version_parts(self) -> dict:
+        """Versions of the configuration cached results depend on."""
+        if self._hot_reload_manager:
+            dictionary_path = self._hot_reload_manager.config_paths["dictionary"]
+        else:
+            dictionary_path = os.getenv("CUSTOM_DICTIONARY_PATH", "data/dictionaries/thai_compounds.json")
+        return {
+            "dictionary": file_version(dictionary_path),
+            "tokenization": content_version(self.settings.tokenization.model_dump(mode="json")),
+            "ranking": content_version(self.settings.ranking.model_dump(mode="json"))
+        }
     
     async def _execute_searches(self, processed_query: ProcessedQuery, index_name: str, options) -> list:
         """Execute searches with query variants."""
@@ -626,8 +818,12 @@ class SearchProxyService:
             has_previous_page=request.options.offset > 0
         )
         
+        # Ranking works on lightweight hit records; only the returned page is
+        # converted to (validated) response models
+        page_hits = ranked_results["hits"][:request.options.limit]
+        
         return SearchResponse(
-            hits=ranked_results["hits"],
+            hits=to_search_hits(page_hits, include_ranking_info=request.include_ranking_info),
             total_hits=ranked_results["total_hits"],
             processing_time_ms=processing_time,
             query_info=query_info,
@@ -0,0 +1,364 @@
+"""
+Precomputed compound word decompositions.
+
+Splitting a long Thai token at query time used to mean running the fallback
+engines (attacut, deepcut, newmm) one after another, or a naive midpoint
+split. The decomposition table is built offline by
+``scripts/build_compound_table.py`` for every custom dictionary entry and
+every frequently seen long token of a sample corpus, and shipped next to the
+dictionary. At query time splitting is a dictionary lookup; the fallback
+engines only run on a true miss, and their answer is remembered in a bounded
+runtime overlay.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+TABLE_FORMAT_VERSION = 1
+TABLE_SUFFIX = ".decompositions.json"
+PART_SEPARATOR = "|"
+
+# Shorter parts are almost always single syllables of a transliterated
+# loanword (e.g. วา|กา|เมะ) rather than words of a compound
+MIN_PART_LENGTH = 3
+
+DEFAULT_OVERLAY_SIZE = 10000
+DEFAULT_ENGINES = ("attacut", "deepcut", "newmm")
+
+Decomposition = Tuple[str, ...]
+
+
+def dictionary_version(words: Iterable[str]) -> str:
+    """Derive a stable version string from dictionary contents."""
+    digest = hashlib.blake2b(digest_size=8)
+    for word in sorted(set(words)):
+        digest.update(word.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def default_table_path(dictionary_path: Union[str, Path]) -> Path:
+    """Path of the decomposition table shipped next to a dictionary file."""
+    path = Path(dictionary_path)
+    return path.with_name(path.stem + TABLE_SUFFIX)
+
+
+class CompoundTable:
+    """
+    Word -> decomposition lookup table.
+
+    ``lookup`` returns ``None`` for words the table knows nothing about,
+    a one-element tuple for words that should stay whole, and the parts
+    for words that split.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, Sequence[str]]] = None,
+        dictionary_version: Optional[str] = None,
+        engines: Sequence[str] = (),
+        max_overlay_size: int = DEFAULT_OVERLAY_SIZE
+    ):
+        """
+        Initialize compound table.
+
+        Args:
+            entries: Precomputed word -> parts mapping
+            dictionary_version: Version of the dictionary the table was built from
+            engines: Fallback engines used to build the table
+            max_overlay_size: Maximum number of decompositions remembered at runtime
+        """
+        self.entries: Dict[str, Decomposition] = {
+            word: tuple(parts) for word, parts in (entries or {}).items()
+        }
+        self.dictionary_version = dictionary_version
+        self.engines = tuple(engines)
+        self.max_overlay_size = max_overlay_size
+        self._overlay: Dict[str, Decomposition] = {}
+        # Segmenters in worker threads add to the overlay concurrently
+        self._overlay_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries) + len(self._overlay)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.entries or word in self._overlay
+
+    def lookup(self, word: str) -> Optional[Decomposition]:
+        """Get the decomposition of a word, or None on a miss."""
+        parts = self.entries.get(word)
+        if parts is None:
+            parts = self._overlay.get(word)
+        if parts is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return parts
+
+    def add(self, word: str, parts: Sequence[str]) -> None:
+        """Remember a decomposition computed at runtime."""
+        if word in self.entries:
+            return
+        with self._overlay_lock:
+            if len(self._overlay) >= self.max_overlay_size and word not in self._overlay:
+                # Drop the oldest entry; dicts keep insertion order
+                del self._overlay[next(iter(self._overlay))]
+            self._overlay[word] = tuple(parts) or (word,)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get table size and hit statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "overlay_entries": len(self._overlay),
+            "dictionary_version": self.dictionary_version,
+            "engines": list(self.engines),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the precomputed entries (not the runtime overlay)."""
+        return {
+            "version": TABLE_FORMAT_VERSION,
+            "dictionary_version": self.dictionary_version,
+            "engines": list(self.engines),
+            # Words that stay whole are stored as an empty string
+            "entries": {
+                word: PART_SEPARATOR.join(parts) if len(parts) > 1 else ""
+                for word, parts in sorted(self.entries.items())
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object], **kwargs) -> "CompoundTable":
+        """Create a table from its serialized form."""
+        if data.get("version") != TABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compound table version: {data.get('version')}")
+
+        entries = {
+            word: tuple(value.split(PART_SEPARATOR)) if value else (word,)
+            for word, value in data.get("entries", {}).items()
+        }
+        return cls(
+            entries=entries,
+            dictionary_version=data.get("dictionary_version"),
+            engines=data.get("engines", ()),
+            **kwargs
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the table atomically."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "CompoundTable":
+        """Read a table written by ``save``."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), **kwargs)
+
+
+def load_compound_table(
+    dictionary_path: Union[str, Path],
+    table_path: Optional[Union[str, Path]] = None,
+    dictionary_words: Optional[Iterable[str]] = None
+) -> Optional[CompoundTable]:
+    """
+    Load the decomposition table shipped with a dictionary.
+
+    Args:
+        dictionary_path: Custom dictionary file the table belongs to
+        table_path: Explicit table path (defaults to the file next to the dictionary)
+        dictionary_words: Current dictionary contents, used to detect a stale table
+
+    Returns:
+        The table, or None when no usable table exists
+    """
+    path = Path(table_path) if table_path else default_table_path(dictionary_path)
+    if not path.exists():
+        logger.info(f"No compound decomposition table at {path}")
+        return None
+
+    try:
+        table = CompoundTable.load(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load compound decomposition table {path}: {e}")
+        return None
+
+    if dictionary_words is not None and table.dictionary_version != dictionary_version(dictionary_words):
+        # Entries for words that are still in the dictionary stay valid,
+        # new words simply miss and go through the fallback engines
+        logger.warning(
+            f"Compound decomposition table {path} was built from a different dictionary; "
+            f"rebuild it with scripts/build_compound_table.py"
+        )
+
+    logger.info(f"Loaded {len(table.entries)} compound decompositions from {path}")
+    return table
+
+
+def split_with_vocabulary(word: str, vocabulary: Iterable[str]) -> Optional[List[str]]:
+    """
+    Split a word into the fewest vocabulary words.
+
+    The word itself is never used as a part. Returns None when the word
+    cannot be covered entirely by vocabulary words.
+    """
+    n = len(word)
+    vocabulary = vocabulary if isinstance(vocabulary, (set, frozenset)) else set(vocabulary)
+
+    # best[i] = (parts, previous cut) for the shortest cover of word[:i]
+    best: List[Optional[Tuple[int, int]]] = [None] * (n + 1)
+    best[0] = (0, 0)
+    for end in range(MIN_PART_LENGTH, n + 1):
+        for start in range(0, end - MIN_PART_LENGTH + 1):
+            if best[start] is None or (start == 0 and end == n):
+                continue
+            if word[start:end] in vocabulary:
+                count = best[start][0] + 1
+                if best[end] is None or count < best[end][0]:
+                    best[end] = (count, start)
+
+    if best[n] is None:
+        return None
+
+    parts = []
+    end = n
+    while end > 0:
+        start = best[end][1]
+        parts.append(word[start:end])
+        end = start
+    return parts[::-1]
+
+
+def _engine_candidates(word: str, engines: Sequence[str]) -> List[List[str]]:
+    """Decompositions proposed by the available tokenization engines."""
+    from pythainlp import word_tokenize
+
+    candidates = []
+    for engine in engines:
+        try:
+            tokens = [t for t in word_tokenize(word, engine=engine, keep_whitespace=False) if t.strip()]
+        except Exception as e:
+            logger.debug(f"Engine {engine} unavailable for compound table: {e}")
+            continue
+        if len(tokens) > 1 and "".join(tokens) == word:
+            candidates.append(tokens)
+    return candidates
+
+
+def available_engines(engines: Sequence[str]) -> Tuple[str, ...]:
+    """Engines that can actually tokenize in this environment."""
+    from pythainlp import word_tokenize
+
+    available = []
+    for engine in engines:
+        try:
+            word_tokenize("ภาษาไทย", engine=engine)
+        except Exception as e:
+            logger.warning(f"Skipping unavailable engine {engine}: {e}")
+            continue
+        available.append(engine)
+    return tuple(available)
+
+
+def best_decomposition(
+    word: str,
+    vocabulary: Iterable[str],
+    engines: Sequence[str] = DEFAULT_ENGINES
+) -> Decomposition:
+    """
+    Pick the best decomposition of a word.
+
+    Candidates come from the engines and from a fewest-parts vocabulary
+    split. Only candidates made entirely of known words of at least
+    MIN_PART_LENGTH characters count; the one with the fewest parts wins.
+    Words without such a candidate stay whole.
+    """
+    vocabulary = vocabulary if isinstance(vocabulary, (set, frozenset)) else set(vocabulary)
+
+    candidates = _engine_candidates(word, engines)
+    vocabulary_split = split_with_vocabulary(word, vocabulary)
+    if vocabulary_split and len(vocabulary_split) > 1:
+        candidates.append(vocabulary_split)
+
+    # Only splits into known words are kept; anything else is indexing noise
+    candidates = [
+        parts for parts in candidates
+        if all(len(part) >= MIN_PART_LENGTH and part in vocabulary for part in parts)
+    ]
+    if not candidates:
+        return (word,)
+
+    return tuple(min(candidates, key=len))
+
+
+def frequent_long_tokens(
+    texts: Iterable[str],
+    min_count: int = 3,
+    min_length: int = 7
+) -> List[str]:
+    """Long Thai tokens seen at least ``min_count`` times in a corpus."""
+    from pythainlp import word_tokenize
+
+    from .script_scanner import is_thai_text
+
+    counts: Counter = Counter()
+    for text in texts:
+        for token in word_tokenize(text, engine="newmm", keep_whitespace=False):
+            if len(token) >= min_length and is_thai_text(token):
+                counts[token] += 1
+    return [token for token, count in counts.most_common() if count >= min_count]
+
+
+def build_compound_table(
+    dictionary_words: Iterable[str],
+    extra_words: Iterable[str] = (),
+    engines: Sequence[str] = DEFAULT_ENGINES,
+    base_vocabulary: Optional[Iterable[str]] = None
+) -> CompoundTable:
+    """
+    Precompute decompositions for dictionary entries and extra tokens.
+
+    Args:
+        dictionary_words: Custom dictionary entries
+        extra_words: Additional words, e.g. frequent long tokens of a corpus
+        engines: Tokenization engines to propose decompositions
+        base_vocabulary: Known words (defaults to PyThaiNLP's word list)
+
+    Returns:
+        CompoundTable covering every input word
+    """
+    dictionary_words = sorted({w.strip() for w in dictionary_words if w.strip()})
+    if base_vocabulary is None:
+        from pythainlp.corpus.common import thai_words
+        base_vocabulary = thai_words()
+    vocabulary = set(base_vocabulary) | set(dictionary_words)
+    engines = available_engines(engines)
+
+    entries: Dict[str, Decomposition] = {}
+    for word in dict.fromkeys(list(dictionary_words) + [w.strip() for w in extra_words if w.strip()]):
+        entries[word] = best_decomposition(word, vocabulary, engines)
+
+    return CompoundTable(
+        entries=entries,
+        dictionary_version=dictionary_version(dictionary_words),
+        engines=engines
+    )
@@ -15,6 +15,8 @@ from enum import Enum
 from pydantic import BaseModel, Field, field_validator, ValidationError, ConfigDict
 from pydantic_settings import BaseSettings
 
+from .compound_table import CompoundTable, load_compound_table
+
 
 logger = logging.getLogger(__name__)
 
@@ -222,6 +224,40 @@ class ThaiTokenizerSettings(BaseSettings):
     
     # Custom dictionary path
     custom_dictionary_path: Optional[str] = Field(None, description="Path to custom dictionary file")
+    compound_table_path: Optional[str] = Field(
+        None, description="Path to precomputed compound decomposition table (default: next to the dictionary)"
+    )
+    
+    # Response configuration
+    response_compression_enabled: bool = Field(True, description="Gzip responses for clients sending Accept-Encoding: gzip")
+    response_compression_min_size: int = Field(1024, ge=0, description="Minimum response size in bytes to compress")
+    response_compression_level: int = Field(5, ge=1, le=9, description="Gzip compression level")
+    
+    # Access logging
+    access_log_sample_rate: float = Field(0.01, ge=0, le=1, description="Share of successful requests written to the access log")
+    access_log_slow_request_ms: float = Field(1000.0, ge=0, description="Requests slower than this are always logged")
+    
+    # Event loop monitoring
+    event_loop_monitor_enabled: bool = Field(True, description="Measure event loop lag and capture blocking stacks")
+    event_loop_probe_interval_ms: int = Field(50, ge=1, description="Interval between event loop lag probes")
+    event_loop_block_threshold_ms: int = Field(100, ge=1, description="Event loop lag recorded as a blocking stall")
+    
+    # Health and system metrics
+    system_metrics_interval_seconds: float = Field(5.0, gt=0, description="Interval between background system metrics samples")
+    health_check_cache_seconds: float = Field(5.0, ge=0, description="How long health check results are reused")
+    
+    # Startup warm-up
+    warmup_enabled: bool = Field(True, description="Warm up engines and caches after startup; readiness waits for it")
+    warmup_timeout_seconds: float = Field(120.0, gt=0, description="Time after which the worker is marked ready regardless")
+    warmup_queries: List[str] = Field(default_factory=list, description="Representative queries run during warm-up (built-in set when empty)")
+    warmup_search_proxy: bool = Field(True, description="Initialize the search proxy and run the warm-up queries through it")
+    warmup_replay_top_queries: int = Field(0, ge=0, le=10000, description="Most frequent analytics queries replayed into the search cache")
+    warmup_index_name: Optional[str] = Field(None, description="Index searched during warm-up (meilisearch_index when unset)")
+    warmup_concurrency: int = Field(4, ge=1, le=64, description="Concurrent warm-up searches")
+    
+    # Pre-fork preloading (gunicorn, see src/api/gunicorn_conf.py)
+    preload_enabled: bool = Field(True, description="Build tokenizer state in the master process and share it with the workers")
+    preload_engine_models: bool = Field(True, description="Also load the attacut/deepcut models in the master")
     
     model_config = ConfigDict(
         env_file=".env",
@@ -388,6 +424,16 @@ class ConfigManager:
         except ValidationError as e:
             raise ConfigurationError(f"Invalid tokenizer configuration: {e}")
     
+    def get_compound_table(self) -> Optional[CompoundTable]:
+        """Load the precomputed compound decomposition table for the custom dictionary."""
+        if not self.settings.custom_dictionary_path and not self.settings.compound_table_path:
+            return None
+        return load_compound_table(
+            self.settings.custom_dictionary_path or "",
+            table_path=self.settings.compound_table_path,
+            dictionary_words=self._custom_dictionary
+        )
+    
     def get_processing_config(self) -> ProcessingConfig:
         """Get validated processing configuration."""
         try:
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from .thai_segmenter import ThaiSegmenter
+from .compound_table import CompoundTable, load_compound_table
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,7 @@ class TokenizerFactory:
     """Factory for creating tokenizers with compound dictionary support."""
     
     _compound_dictionary: Optional[List[str]] = None
+    _compound_table: Optional[CompoundTable] = None
     _dictionary_path: str = "data/dictionaries/thai_compounds.json"
     
     @classmethod
@@ -64,6 +66,16 @@ class TokenizerFactory:
             cls._compound_dictionary = []
             return cls._compound_dictionary
     
+    @classmethod
+    def load_compound_table(cls) -> CompoundTable:
+        """Load the precomputed decompositions shipped with the compound dictionary."""
+        if cls._compound_table is None:
+            cls._compound_table = load_compound_table(
+                cls._dictionary_path,
+                dictionary_words=cls.load_compound_dictionary()
+            ) or CompoundTable()
+        return cls._compound_table
+    
     @classmethod
     def create_segmenter(
         cls,
@@ -77,6 +89,7 @@ class TokenizerFactory:
         custom_dict = []
         if use_compounds:
             custom_dict = cls.load_compound_dictionary(custom_dict_path)
+            kwargs.setdefault("compound_table", cls.load_compound_table())
         
         return ThaiSegmenter(
             engine=engine,
@@ -108,13 +121,15 @@ class TokenizerFactory:
         return ThaiSegmenter(
             engine="newmm",
             custom_dict=compounds,
-            keep_whitespace=True
+            keep_whitespace=True,
+            compound_table=cls.load_compound_table()
         )
     
     @classmethod
     def reload_dictionary(cls, dict_path: Optional[str] = None) -> None:
         """Reload the compound dictionary (for hot-reload functionality)."""
         cls._compound_dictionary = None
+        cls._compound_table = None
         cls.load_compound_dictionary(dict_path)
         logger.info("Compound dictionary reloaded")
     
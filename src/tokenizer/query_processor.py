@@ -13,6 +13,9 @@ from enum import Enum
 
 from .thai_segmenter import ThaiSegmenter, TokenizationResult
 from .token_processor import TokenProcessor, ContentType
+from .script_scanner import scan_text, is_thai_text
+from .compound_table import CompoundTable
+from .suggestion_index import SuggestionIndex
 from ..utils.logging import get_structured_logger, SearchMetrics, performance_monitor
 
 
@@ -66,7 +69,10 @@ class QueryProcessor:
         thai_segmenter: Optional[ThaiSegmenter] = None,
         token_processor: Optional[TokenProcessor] = None,
         enable_query_expansion: bool = True,
-        enable_partial_matching: bool = True
+        enable_partial_matching: bool = True,
+        compound_table: Optional[CompoundTable] = None,
+        suggestion_index: Optional[SuggestionIndex] = None,
+        max_completions: int = 10
     ):
         """
         Initialize query processor.
@@ -76,11 +82,17 @@ class QueryProcessor:
             token_processor: Token processing utilities
             enable_query_expansion: Whether to expand queries with variants
             enable_partial_matching: Whether to support partial matching
+            compound_table: Precomputed compound decompositions
+            suggestion_index: Prefix index used to complete partial tokens
+            max_completions: Completions generated per partial token
         """
         self.thai_segmenter = thai_segmenter or ThaiSegmenter()
         self.token_processor = token_processor or TokenProcessor()
         self.enable_query_expansion = enable_query_expansion
         self.enable_partial_matching = enable_partial_matching
+        self.compound_table = compound_table
+        self.suggestion_index = suggestion_index
+        self.max_completions = max_completions
         
         # Common Thai compound word patterns for partial matching
         self.compound_patterns = [
@@ -130,7 +142,7 @@ class QueryProcessor:
         # Process each token for search optimization
         query_tokens = []
         search_variants = set()
-        suggested_completions = set()
+        suggested_completions: Dict[str, None] = {}  # Ordered set, best first
         
         for token in tokenization_result.tokens:
             if not token.strip():
@@ -146,7 +158,7 @@ class QueryProcessor:
             # Generate completions for partial tokens
             if query_token.is_partial:
                 completions = self._generate_completions(token)
-                suggested_completions.update(completions)
+                suggested_completions.update(dict.fromkeys(completions))
         
         # Generate processed query for MeiliSearch
         processed_query = self._build_processed_query(query_tokens)
@@ -353,6 +365,14 @@ class QueryProcessor:
         """Generate compound word variants for better matching."""
         variants = set()
         
+        if self.compound_table is not None:
+            parts = self.compound_table.lookup(token)
+            if parts is not None:
+                # Known word: use its precomputed parts, no guessing
+                if len(parts) > 1:
+                    variants.update(part for part in parts if len(part) > 1)
+                return variants
+        
         # Try different compound splitting approaches
         for pattern in self.compound_patterns:
             match = re.match(pattern, token)
@@ -378,6 +398,11 @@ class QueryProcessor:
     
     def _extract_compound_parts(self, token: str) -> Optional[List[str]]:
         """Extract parts of compound words."""
+        if self.compound_table is not None:
+            parts = self.compound_table.lookup(token)
+            if parts is not None:
+                return list(parts) if len(parts) > 1 else None
+        
         for pattern in self.compound_patterns:
             match = re.match(pattern, token)
             if match:
@@ -448,12 +473,16 @@ class QueryProcessor:
         
         return expansions
     
-    def _generate_completions(self, partial_token: str) -> Set[str]:
-        """Generate completion suggestions for partial tokens."""
-        completions = set()
-        
+    def _generate_completions(self, partial_token: str) -> List[str]:
+        """Generate completion suggestions for partial tokens, best first."""
         if not self._is_thai_text(partial_token):
-            return completions
+            return []
+        
+        if self.suggestion_index is not None:
+            suggestions = self.suggestion_index.top_k(partial_token, self.max_completions + 1)
+            return [term for term, _ in suggestions if term != partial_token][:self.max_completions]
+        
+        completions = set()
         
         # Generate completions based on common patterns
         for prefix in self.thai_prefixes:
@@ -468,7 +497,7 @@ class QueryProcessor:
                 completions.add(f"การ{partial_token}")
                 completions.add(f"ความ{partial_token}")
         
-        return completions
+        return sorted(completions)
     
     def _is_potential_compound_part(self, token: str) -> bool:
         """Check if token might be part of a compound word."""
@@ -490,10 +519,7 @@ class QueryProcessor:
     
     def _has_mixed_content(self, token: str) -> bool:
         """Check if token has mixed Thai/non-Thai content."""
-        thai_chars = sum(1 for c in token if self._is_thai_char(c))
-        non_thai_chars = sum(1 for c in token if c.isalnum() and not self._is_thai_char(c))
-        
-        return thai_chars > 0 and non_thai_chars > 0
+        return scan_text(token).is_mixed
     
     def _is_thai_char(self, char: str) -> bool:
         """Check if character is Thai."""
@@ -501,10 +527,7 @@ class QueryProcessor:
     
     def _is_thai_text(self, text: str) -> bool:
         """Check if text is primarily Thai."""
-        if not text:
-            return False
-        thai_chars = sum(1 for char in text if self._is_thai_char(char))
-        return thai_chars / len(text) > 0.3  # More permissive for queries
+        return is_thai_text(text, threshold=0.3)  # More permissive for queries
     
     def get_stats(self) -> Dict[str, Any]:
         """Get query processor statistics and configuration."""
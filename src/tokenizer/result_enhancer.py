@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .thai_segmenter import ThaiSegmenter
+from .script_scanner import is_thai_text
+from .token_offsets import TOKEN_OFFSETS_FIELD, Segment, stored_segments
 from .query_processor import QueryProcessor, QueryToken
 
 
@@ -90,6 +92,10 @@ class SearchResultEnhancer:
         self.enable_compound_highlighting = enable_compound_highlighting
         self.enable_relevance_boosting = enable_relevance_boosting
         
+        # Fields served from stored token offsets vs segmented at query time
+        self.stored_offset_hits = 0
+        self.segmented_fields = 0
+        
         # Highlighting patterns
         self.highlight_patterns = {
             'meilisearch_default': r'<em>(.*?)</em>',
@@ -209,12 +215,19 @@ class SearchResultEnhancer:
         compound_matches = []
         original_text = {}
         tokenized_text = {}
+        token_offsets = hit.get(TOKEN_OFFSETS_FIELD) or {}
         
         for field in highlight_fields:
             if field in hit:
                 # Get original text
                 original_text[field] = hit[field]
                 
+                # Token boundaries stored at index time, segmenting only
+                # documents indexed without them (or changed since)
+                segments = self._get_field_segments(
+                    original_text[field], token_offsets.get(field)
+                )
+                
                 # Get highlighted version if available
                 highlighted_field = f"_formatted.{field}" if "_formatted" in hit else field
                 highlighted_text = hit.get("_formatted", {}).get(field, hit.get(field, ""))
@@ -223,14 +236,15 @@ class SearchResultEnhancer:
                 field_highlights, field_compounds = self._enhance_field_highlighting(
                     original_text[field],
                     highlighted_text,
-                    query_analysis
+                    query_analysis,
+                    segments
                 )
                 
                 highlight_spans.extend(field_highlights)
                 compound_matches.extend(field_compounds)
                 
                 # Create tokenized version
-                tokenized_text[field] = self._create_tokenized_version(original_text[field])
+                tokenized_text[field] = self._create_tokenized_version(original_text[field], segments)
         
         # Calculate relevance factors
         relevance_factors = self._calculate_relevance_factors(
@@ -339,7 +353,8 @@ class SearchResultEnhancer:
         self,
         original_text: str,
         highlighted_text: str,
-        query_analysis: Dict[str, Any]
+        query_analysis: Dict[str, Any],
+        segments: Optional[List[Segment]] = None
     ) -> Tuple[List[HighlightSpan], List[str]]:
         """Enhance highlighting for a specific field."""
         highlight_spans = []
@@ -363,7 +378,7 @@ class SearchResultEnhancer:
         
         # Add partial match highlighting
         partial_spans = self._add_partial_match_highlighting(
-            original_text, query_analysis
+            original_text, query_analysis, segments
         )
         highlight_spans.extend(partial_spans)
         
@@ -434,7 +449,8 @@ class SearchResultEnhancer:
     def _add_partial_match_highlighting(
         self,
         text: str,
-        query_analysis: Dict[str, Any]
+        query_analysis: Dict[str, Any],
+        segments: Optional[List[Segment]] = None
     ) -> List[HighlightSpan]:
         """Add highlighting for partial matches."""
         spans = []
@@ -443,7 +459,7 @@ class SearchResultEnhancer:
         
         for token in partial_tokens:
             # Use fuzzy matching for partial tokens
-            fuzzy_matches = self._find_fuzzy_matches(text, token)
+            fuzzy_matches = self._find_fuzzy_matches(text, token, segments=segments)
             for match_start, match_end, matched_text, confidence in fuzzy_matches:
                 span = HighlightSpan(
                     start=match_start,
@@ -461,7 +477,8 @@ class SearchResultEnhancer:
         self,
         text: str,
         query_token: str,
-        min_confidence: float = 0.6
+        min_confidence: float = 0.6,
+        segments: Optional[List[Segment]] = None
     ) -> List[Tuple[int, int, str, float]]:
         """Find fuzzy matches for partial tokens."""
         matches = []
@@ -473,7 +490,7 @@ class SearchResultEnhancer:
         # In a production system, you might use more sophisticated algorithms
         
         # Look for tokens that contain the query token
-        words = self._extract_thai_words(text)
+        words = self._extract_thai_words(text, segments)
         for word_start, word_end, word in words:
             if query_token in word:
                 confidence = len(query_token) / len(word)
@@ -486,23 +503,46 @@ class SearchResultEnhancer:
         
         return matches
     
-    def _extract_thai_words(self, text: str) -> List[Tuple[int, int, str]]:
+    def _extract_thai_words(
+        self,
+        text: str,
+        segments: Optional[List[Segment]] = None
+    ) -> List[Tuple[int, int, str]]:
         """Extract Thai words with their positions."""
-        words = []
+        if segments is None:
+            # Use the Thai segmenter to find word boundaries
+            segments = self._segment_field(text)
         
-        # Use the Thai segmenter to find word boundaries
+        return [
+            (start, end, token) for start, end, token in segments
+            if self._is_thai_text(token) and len(token.strip()) > 0
+        ]
+    
+    def _get_field_segments(self, text: Any, encoded: Optional[str]) -> List[Segment]:
+        """Get the segments of a field from its stored offsets, or by segmenting it."""
+        if not isinstance(text, str):
+            return []
+        segments = stored_segments(text, encoded)
+        if segments is not None:
+            self.stored_offset_hits += 1
+            return segments
+        return self._segment_field(text)
+    
+    def _segment_field(self, text: str) -> List[Segment]:
+        """Segment text and locate every token in it."""
+        self.segmented_fields += 1
         result = self.thai_segmenter.segment_text(text)
         
+        segments = []
         current_pos = 0
         for token in result.tokens:
-            if self._is_thai_text(token) and len(token.strip()) > 0:
-                start_pos = text.find(token, current_pos)
-                if start_pos >= 0:
-                    end_pos = start_pos + len(token)
-                    words.append((start_pos, end_pos, token))
-                    current_pos = end_pos
-        
-        return words
+            start_pos = text.find(token, current_pos) if token else -1
+            if start_pos >= 0:
+                end_pos = start_pos + len(token)
+                segments.append((start_pos, end_pos, token))
+                current_pos = end_pos
+        
+        return segments
     
     def _merge_overlapping_spans(self, spans: List[HighlightSpan]) -> List[HighlightSpan]:
         """Merge overlapping highlight spans."""
@@ -542,13 +582,20 @@ class SearchResultEnhancer:
         
         return merged
     
-    def _create_tokenized_version(self, text: str) -> str:
+    def _create_tokenized_version(
+        self,
+        text: str,
+        segments: Optional[List[Segment]] = None
+    ) -> str:
         """Create tokenized version of text for display."""
-        result = self.thai_segmenter.segment_text(text)
+        if segments is None:
+            tokens = self.thai_segmenter.segment_text(text).tokens
+        else:
+            tokens = [token for _, _, token in segments]
         
         # Add visible separators for Thai word boundaries
         tokenized_parts = []
-        for token in result.tokens:
+        for token in tokens:
             if self._is_thai_text(token):
                 tokenized_parts.append(f"{token}|")  # Use | as visible separator
             else:
@@ -614,10 +661,7 @@ class SearchResultEnhancer:
     
     def _is_thai_text(self, text: str) -> bool:
         """Check if text is primarily Thai."""
-        if not text:
-            return False
-        thai_chars = sum(1 for char in text if '\u0e00' <= char <= '\u0e7f')
-        return thai_chars / len(text) > 0.3
+        return is_thai_text(text, threshold=0.3)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get enhancer statistics and configuration."""
@@ -626,5 +670,7 @@ class SearchResultEnhancer:
             "relevance_boosting_enabled": self.enable_relevance_boosting,
             "highlight_patterns_count": len(self.highlight_patterns),
             "segmenter_engine": self.thai_segmenter.engine,
-            "query_processor_enabled": self.query_processor is not None
+            "query_processor_enabled": self.query_processor is not None,
+            "stored_offset_hits": self.stored_offset_hits,
+            "segmented_fields": self.segmented_fields
         }
\ No newline at end of file
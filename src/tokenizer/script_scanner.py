@@ -0,0 +1,216 @@
+"""
+Shared Thai script scanner.
+
+Classifies every character of a text with a single ``str.translate`` call over
+a codepoint -> class table (precomputed for ASCII and the Thai block, filled
+lazily for anything else), then derives script counts, ratios and the
+mixed-content flag from C-level ``str.count`` calls. Thai run boundaries and
+character-level fallback tokens use precompiled regexes.
+
+All Thai content detectors (segmenter, token processor, query processors,
+result ranker/enhancer, document processor) use this module so the
+classification rules live in one place.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+THAI_RANGE = (0x0E00, 0x0E7F)
+THAI_RUN_PATTERN = re.compile(r'[\u0E00-\u0E7F]+')
+
+# Thai runs plus every other non-whitespace character on its own
+_FALLBACK_TOKEN_PATTERN = re.compile(r'[\u0E00-\u0E7F]+|[^\u0E00-\u0E7F\s]')
+
+# Mutually exclusive character classes
+_THAI_LETTER = "T"    # Thai, alphabetic
+_THAI_DIGIT = "D"     # Thai digit, also counted as numeric
+_THAI_MARK = "M"      # Thai vowel/tone mark or symbol, also counted as punctuation
+_ASCII_LETTER = "A"
+_OTHER_LETTER = "L"   # Non-Thai, non-ASCII letter
+_DIGIT = "N"          # Non-Thai digit
+_SPACE = "S"
+_PUNCTUATION = "P"    # Non-Thai, neither alphanumeric nor whitespace
+_OTHER = "O"          # Alphanumeric but neither letter nor digit (e.g. '½')
+
+# Class -> content type value (matches token_processor.ContentType values)
+_RUN_TYPES: Dict[str, str] = {
+    _THAI_LETTER: "thai",
+    _THAI_DIGIT: "thai",
+    _THAI_MARK: "thai",
+    _ASCII_LETTER: "english",
+    _OTHER_LETTER: "english",
+    _DIGIT: "numeric",
+    _PUNCTUATION: "punctuation",
+    _SPACE: "whitespace",
+    _OTHER: "mixed",
+}
+_RUN_TABLE = str.maketrans({cls: _RUN_TYPES[cls][0] for cls in _RUN_TYPES})
+_RUN_NAMES = {name[0]: name for name in _RUN_TYPES.values()}
+_RUN_PATTERN = re.compile(r'(.)\1*', re.DOTALL)
+
+
+def _classify_codepoint(codepoint: int) -> str:
+    """Classify a single codepoint into one of the character classes."""
+    char = chr(codepoint)
+    if THAI_RANGE[0] <= codepoint <= THAI_RANGE[1]:
+        if char.isdigit():
+            return _THAI_DIGIT
+        if char.isalpha():
+            return _THAI_LETTER
+        return _THAI_MARK
+    if char.isspace():
+        return _SPACE
+    if char.isalpha():
+        return _ASCII_LETTER if codepoint < 0x80 else _OTHER_LETTER
+    if char.isdigit():
+        return _DIGIT
+    if not char.isalnum():
+        return _PUNCTUATION
+    return _OTHER
+
+
+class _ClassTable(dict):
+    """Codepoint -> class mapping for str.translate, filled on first use."""
+
+    def __missing__(self, codepoint: int) -> str:
+        value = _classify_codepoint(codepoint)
+        self[codepoint] = value
+        return value
+
+
+_CLASS_TABLE = _ClassTable()
+for _codepoint in range(0x80):
+    _CLASS_TABLE[_codepoint] = _classify_codepoint(_codepoint)
+for _codepoint in range(THAI_RANGE[0], THAI_RANGE[1] + 1):
+    _CLASS_TABLE[_codepoint] = _classify_codepoint(_codepoint)
+del _codepoint
+
+
+@dataclass(slots=True)
+class ScriptProfile:
+    """Per-class character counts for a text."""
+
+    length: int
+    thai_letters: int
+    thai_digits: int
+    thai_marks: int
+    ascii_letters: int
+    other_letters: int
+    digits: int
+    whitespace: int
+    punctuation: int
+    other: int
+
+    @property
+    def thai_chars(self) -> int:
+        """Characters in the Thai Unicode block."""
+        return self.thai_letters + self.thai_digits + self.thai_marks
+
+    @property
+    def letter_chars(self) -> int:
+        """Non-Thai alphabetic characters."""
+        return self.ascii_letters + self.other_letters
+
+    @property
+    def numeric_chars(self) -> int:
+        """Digits, including Thai digits."""
+        return self.digits + self.thai_digits
+
+    @property
+    def punctuation_chars(self) -> int:
+        """Non-alphanumeric, non-whitespace characters, including Thai marks."""
+        return self.punctuation + self.thai_marks
+
+    @property
+    def non_thai_alnum_chars(self) -> int:
+        """Alphanumeric characters outside the Thai block."""
+        return self.ascii_letters + self.other_letters + self.digits + self.other
+
+    @property
+    def thai_ratio(self) -> float:
+        """Ratio of Thai characters to all characters."""
+        return self.thai_chars / self.length if self.length else 0.0
+
+    @property
+    def has_thai(self) -> bool:
+        """Whether the text contains any Thai characters."""
+        return self.thai_chars > 0
+
+    @property
+    def is_mixed(self) -> bool:
+        """Whether the text has both Thai and non-Thai alphanumeric content."""
+        return self.thai_chars > 0 and self.non_thai_alnum_chars > 0
+
+    def is_primarily_thai(self, threshold: float = 0.5) -> bool:
+        """Whether the Thai character ratio exceeds threshold."""
+        return self.thai_ratio > threshold
+
+
+def scan_text(text: str) -> ScriptProfile:
+    """
+    Scan text once and return its script profile.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        ScriptProfile with per-class character counts
+    """
+    codes = text.translate(_CLASS_TABLE)
+    count = codes.count
+    return ScriptProfile(
+        length=len(text),
+        thai_letters=count(_THAI_LETTER),
+        thai_digits=count(_THAI_DIGIT),
+        thai_marks=count(_THAI_MARK),
+        ascii_letters=count(_ASCII_LETTER),
+        other_letters=count(_OTHER_LETTER),
+        digits=count(_DIGIT),
+        whitespace=count(_SPACE),
+        punctuation=count(_PUNCTUATION),
+        other=count(_OTHER)
+    )
+
+
+def is_thai_text(text: str, threshold: float = 0.5) -> bool:
+    """Check whether the Thai character ratio of text exceeds threshold."""
+    if not text:
+        return False
+    return scan_text(text).is_primarily_thai(threshold)
+
+
+def thai_runs(text: str) -> List[Tuple[int, int]]:
+    """Return (start, end) offsets of contiguous Thai runs."""
+    return [match.span() for match in THAI_RUN_PATTERN.finditer(text)]
+
+
+def extract_thai_runs(text: str) -> List[str]:
+    """Return contiguous Thai runs in text order."""
+    return THAI_RUN_PATTERN.findall(text)
+
+
+def fallback_tokens(text: str) -> List[str]:
+    """
+    Character-level fallback tokenization.
+
+    Thai runs are kept whole; every other non-whitespace character becomes
+    its own token and whitespace is dropped.
+    """
+    return _FALLBACK_TOKEN_PATTERN.findall(text)
+
+
+def content_type_runs(text: str) -> List[Tuple[int, int, str]]:
+    """
+    Split text into runs of the same content type.
+
+    Returns:
+        (start, end, content_type) tuples, where content_type is one of
+        "thai", "english", "numeric", "punctuation", "whitespace", "mixed"
+    """
+    run_codes = text.translate(_CLASS_TABLE).translate(_RUN_TABLE)
+    return [
+        (match.start(), match.end(), _RUN_NAMES[match.group(1)])
+        for match in _RUN_PATTERN.finditer(run_codes)
+    ]
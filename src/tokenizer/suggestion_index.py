@@ -0,0 +1,386 @@
+"""
+Weighted prefix suggestion index for search-as-you-type.
+
+Terms are kept in one sorted array, so every prefix maps to a contiguous
+range found with two binary searches. That is a flattened trie. Small ranges
+are ranked on the fly. Prefixes whose range is large (short Thai prefixes
+match thousands of words) get their top results precomputed at build time.
+This keeps every lookup well under a millisecond.
+
+Updates go into a small pending overlay that lookups merge in. The sorted
+array is only rebuilt once the overlay grows past a limit, so analytics
+refreshes are cheap.
+
+The arrays and the overlay form one immutable snapshot. Updates build a new
+snapshot and swap it in with a single assignment, so lookups on the event
+loop never wait for a rebuild running in a worker thread and never see a
+half-applied update.
+"""
+
+import asyncio
+import bisect
+import heapq
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Weight of one source occurrence; query weights are per recorded search
+DICTIONARY_WEIGHT = 5.0
+BASE_WORD_WEIGHT = 1.0
+QUERY_WEIGHT = 10.0
+
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_term(text: str) -> str:
+    """Lookup key of a term or prefix: collapsed whitespace, casefolded."""
+    return " ".join(text.split()).casefold()
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string sorting after every string starting with prefix."""
+    return prefix + _MAX_CHAR
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """Index contents at one point in time; never modified once published."""
+    keys: List[str]
+    terms: List[str]
+    weights: List[float]
+    dense: Dict[str, List[int]]
+    # key -> (term, weight); a weight of None marks a removal
+    pending: Dict[str, Tuple[str, Optional[float]]]
+
+    def rank(self, i: int) -> Tuple[float, int, str]:
+        """Sort key of a base entry (descending weight, then short, then alphabetical)."""
+        return (-self.weights[i], len(self.keys[i]), self.keys[i])
+
+    def contains_base(self, key: str) -> bool:
+        """Check whether the sorted array holds a key."""
+        i = bisect.bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+
+class SuggestionIndex:
+    """
+    Weighted top-k prefix lookup over a sorted term array.
+
+    Higher weights rank first; ties go to the shorter, then alphabetically
+    smaller term.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 20,
+        dense_threshold: int = 128,
+        max_pending: int = 1000
+    ):
+        """
+        Initialize suggestion index.
+
+        Args:
+            cache_size: Results precomputed per dense prefix (largest supported k)
+            dense_threshold: Prefix ranges larger than this get precomputed results
+            max_pending: Pending updates merged at lookup time before a rebuild
+        """
+        self.cache_size = cache_size
+        self.dense_threshold = dense_threshold
+        self.max_pending = max_pending
+
+        self._snapshot = _Snapshot([], [], [], {}, {})
+
+        self.build_time_ms = 0.0
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        removed = sum(1 for _, weight in snapshot.pending.values() if weight is None)
+        added = sum(
+            1 for key, (_, weight) in snapshot.pending.items()
+            if weight is not None and not snapshot.contains_base(key)
+        )
+        return len(snapshot.keys) + added - removed
+
+    def build(self, weights: Mapping[str, float]) -> None:
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            weights: Term -> weight; terms with the same key keep the first
+                spelling and add up their weights
+        """
+        start_time = time.time()
+
+        merged: Dict[str, List] = {}
+        for term, weight in weights.items():
+            key = normalize_term(term)
+            if not key or weight <= 0:
+                continue
+            if key in merged:
+                merged[key][1] += weight
+            else:
+                merged[key] = [" ".join(term.split()), weight]
+
+        keys = sorted(merged)
+        snapshot = _Snapshot(
+            keys=keys,
+            terms=[merged[key][0] for key in keys],
+            weights=[float(merged[key][1]) for key in keys],
+            dense={},
+            pending={}
+        )
+        self._index_dense_prefixes(snapshot, 0, len(keys), 0)
+        self._snapshot = snapshot
+
+        self.build_time_ms = (time.time() - start_time) * 1000
+        self.rebuilds += 1
+        logger.info(
+            f"Suggestion index built: {len(keys)} terms, {len(snapshot.dense)} dense prefixes "
+            f"in {self.build_time_ms:.1f}ms"
+        )
+
+    def _index_dense_prefixes(self, snapshot: _Snapshot, lo: int, hi: int, depth: int) -> None:
+        """Precompute top results for every prefix whose range exceeds the threshold."""
+        if hi - lo <= self.dense_threshold:
+            return
+
+        keys = snapshot.keys
+        if depth:
+            snapshot.dense[keys[lo][:depth]] = heapq.nsmallest(
+                self.cache_size, range(lo, hi), key=snapshot.rank
+            )
+
+        # Keys in [lo, hi) share their first `depth` characters; split the
+        # range by the next character. The key equal to the prefix sorts first.
+        i = lo
+        while i < hi:
+            key = keys[i]
+            if len(key) <= depth:
+                i += 1
+                continue
+            child = key[:depth + 1]
+            j = bisect.bisect_left(keys, _prefix_end(child), i, hi)
+            self._index_dense_prefixes(snapshot, i, j, depth + 1)
+            i = j
+
+    def upsert(self, term: str, weight: float) -> None:
+        """Add a term or replace its weight; applied immediately to lookups."""
+        self.upsert_many({term: weight})
+
+    def upsert_many(self, weights: Mapping[str, float]) -> None:
+        """Add or reweight several terms; lookups see all of them at once."""
+        pending = dict(self._snapshot.pending)
+        for term, weight in weights.items():
+            key = normalize_term(term)
+            if key:
+                pending[key] = (" ".join(term.split()), weight if weight > 0 else None)
+        self._publish_pending(pending)
+
+    def remove(self, term: str) -> None:
+        """Remove a term."""
+        key = normalize_term(term)
+        if key:
+            pending = dict(self._snapshot.pending)
+            pending[key] = (term, None)
+            self._snapshot = replace(self._snapshot, pending=pending)
+
+    def _publish_pending(self, pending: Dict[str, Tuple[str, Optional[float]]]) -> None:
+        """Swap in a new overlay, folding it into the array once it is too large."""
+        if len(pending) > self.max_pending:
+            self._compact(self._snapshot, pending)
+        else:
+            self._snapshot = replace(self._snapshot, pending=pending)
+
+    def compact(self) -> None:
+        """Fold pending updates into the sorted array."""
+        snapshot = self._snapshot
+        if snapshot.pending:
+            self._compact(snapshot, snapshot.pending)
+
+    def _compact(self, snapshot: _Snapshot, pending: Dict[str, Tuple[str, Optional[float]]]) -> None:
+        weights: Dict[str, float] = {}
+        for i, key in enumerate(snapshot.keys):
+            if key not in pending:
+                weights[snapshot.terms[i]] = snapshot.weights[i]
+        for term, weight in pending.values():
+            if weight is not None:
+                weights[term] = weight
+        self.build(weights)
+
+    def top_k(self, prefix: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Get the k highest weighted terms starting with prefix.
+
+        Args:
+            prefix: Typed prefix
+            k: Number of suggestions
+
+        Returns:
+            List of (term, weight), best first
+        """
+        key = normalize_term(prefix)
+        if not key or k <= 0:
+            return []
+
+        snapshot = self._snapshot
+        keys = snapshot.keys
+
+        # Pending updates under this prefix replace base entries
+        results = []
+        overridden = 0
+        for pending_key, (term, weight) in snapshot.pending.items():
+            if pending_key.startswith(key):
+                overridden += 1
+                if weight is not None:
+                    results.append((-weight, len(pending_key), pending_key, term))
+
+        need = k + overridden
+        candidates = snapshot.dense.get(key)
+        if candidates is None or need > len(candidates):
+            lo = bisect.bisect_left(keys, key)
+            hi = bisect.bisect_left(keys, _prefix_end(key), lo)
+            candidates = heapq.nsmallest(need, range(lo, hi), key=snapshot.rank)
+
+        for i in candidates[:need]:
+            if overridden and keys[i] in snapshot.pending:
+                continue
+            results.append((-snapshot.weights[i], len(keys[i]), keys[i], snapshot.terms[i]))
+
+        return [(term, -neg_weight) for neg_weight, _, _, term in heapq.nsmallest(k, results)]
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get index size and build statistics."""
+        snapshot = self._snapshot
+        return {
+            "terms": len(self),
+            "dense_prefixes": len(snapshot.dense),
+            "pending_updates": len(snapshot.pending),
+            "build_time_ms": self.build_time_ms,
+            "rebuilds": self.rebuilds
+        }
+
+
+def collect_suggestion_weights(
+    dictionary_words: Iterable[str] = (),
+    base_words: Iterable[str] = (),
+    query_frequencies: Optional[Mapping[str, int]] = None
+) -> Dict[str, float]:
+    """
+    Combine suggestion sources into one term -> weight mapping.
+
+    Args:
+        dictionary_words: Custom (compound) dictionary entries
+        base_words: General vocabulary, e.g. PyThaiNLP's word list
+        query_frequencies: Successful search queries and how often they were run
+
+    Returns:
+        Term -> summed weight
+    """
+    weights: Dict[str, float] = {}
+    for word in base_words:
+        weights[word] = weights.get(word, 0.0) + BASE_WORD_WEIGHT
+    for word in dictionary_words:
+        weights[word] = weights.get(word, 0.0) + DICTIONARY_WEIGHT
+    for query, count in (query_frequencies or {}).items():
+        weights[query] = weights.get(query, 0.0) + QUERY_WEIGHT * count
+    return weights
+
+
+class SuggestionService:
+    """
+    Suggestion index fed by static vocabularies and live query statistics.
+
+    Static sources are indexed once; query frequencies are pulled from a
+    callable at most every ``refresh_interval`` seconds and applied as
+    incremental updates. Refreshes run in a worker thread, so lookups never
+    wait for them.
+    """
+
+    def __init__(
+        self,
+        dictionary_words: Iterable[str] = (),
+        base_words: Iterable[str] = (),
+        query_source: Optional[Callable[[], Mapping[str, int]]] = None,
+        refresh_interval: float = 60.0,
+        index: Optional[SuggestionIndex] = None
+    ):
+        """
+        Initialize suggestion service.
+
+        Args:
+            dictionary_words: Custom (compound) dictionary entries
+            base_words: General vocabulary
+            query_source: Returns current query -> frequency statistics
+            refresh_interval: Minimum seconds between query statistic refreshes
+            index: Index to fill (a default one is created otherwise)
+        """
+        self.index = index or SuggestionIndex()
+        self.query_source = query_source
+        self.refresh_interval = refresh_interval
+
+        self._static_weights = {
+            normalize_term(term): weight
+            for term, weight in collect_suggestion_weights(dictionary_words, base_words).items()
+        }
+        self._query_frequencies: Dict[str, int] = {}
+        self._last_refresh: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.index.build(collect_suggestion_weights(dictionary_words, base_words))
+
+    def refresh_queries(self, query_frequencies: Mapping[str, int]) -> int:
+        """
+        Apply new query statistics incrementally.
+
+        Returns:
+            Number of terms updated
+        """
+        updates: Dict[str, float] = {}
+        for query, count in query_frequencies.items():
+            if self._query_frequencies.get(query) == count:
+                continue
+            self._query_frequencies[query] = count
+            static = self._static_weights.get(normalize_term(query), 0.0)
+            updates[query] = static + QUERY_WEIGHT * count
+        if updates:
+            self.index.upsert_many(updates)
+            logger.debug(f"Suggestion index updated with {len(updates)} query statistics")
+        self._last_refresh = time.monotonic()
+        return len(updates)
+
+    def maybe_refresh(self) -> Optional[asyncio.Task]:
+        """
+        Start pulling query statistics if the refresh interval has passed.
+
+        The statistics are applied in a worker thread; lookups keep using the
+        current index until the updated one is swapped in.
+
+        Returns:
+            The refresh task, or None when no refresh was started
+        """
+        if self.query_source is None or self._refresh_task is not None:
+            return None
+        now = time.monotonic()
+        if self._last_refresh is not None and now - self._last_refresh < self.refresh_interval:
+            return None
+        self._last_refresh = now
+        self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> None:
+        try:
+            await asyncio.to_thread(lambda: self.refresh_queries(self.query_source()))
+        except Exception as e:
+            # Suggestions keep working from the existing index
+            logger.warning(f"Failed to refresh suggestion query statistics: {e}")
+        finally:
+            self._refresh_task = None
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Get weighted suggestions for a prefix (read-only, never rebuilds)."""
+        return self.index.top_k(prefix, limit)
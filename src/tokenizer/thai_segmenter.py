@@ -6,8 +6,9 @@ word components, with special handling for compound words.
 """
 
 import logging
+import threading
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, FrozenSet, Tuple
 from dataclasses import dataclass
 
 try:
@@ -21,10 +22,54 @@ except ImportError as e:
     ) from e
 
 from ..utils.logging import get_structured_logger, TokenizationMetrics, performance_monitor
+from .script_scanner import scan_text, is_thai_text, fallback_tokens
+from .compound_table import CompoundTable
 
 
 logger = get_structured_logger(__name__)
 
+# Chunk split points, in order of preference: whitespace, punctuation (ASCII
+# and Thai paiyannoi/maiyamok/angkhankhu/khomut), then before a Thai leading
+# vowel, which always starts a new syllable
+_CHUNK_PUNCTUATION = frozenset(".,;:!?)]}\"'\u0e2f\u0e46\u0e5a\u0e5b")
+_THAI_LEADING_VOWELS = frozenset("\u0e40\u0e41\u0e42\u0e43\u0e44")
+
+# Tokens on each side of a chunk seam that are segmented again as one span
+# when merging, so that words cut by a split inside a Thai run are rejoined
+_SEAM_TOKENS = 4
+
+# Custom-dictionary tokenizers by dictionary. The trie over thai_words() plus
+# the custom words is the largest object a segmenter holds, so segmenters
+# with the same dictionary share one; a preloaded master process builds it
+# once for all of its workers (see src/api/preload.py).
+_MAX_CUSTOM_TOKENIZERS = 4
+_custom_tokenizers: Dict[FrozenSet[str], Tokenizer] = {}
+_custom_tokenizers_lock = threading.Lock()
+
+
+def get_custom_tokenizer(custom_dict: List[str]) -> Tokenizer:
+    """
+    Get the shared tokenizer for thai_words() extended with custom_dict.
+
+    Args:
+        custom_dict: Additional dictionary words
+
+    Returns:
+        Tokenizer built once per distinct dictionary
+    """
+    key = frozenset(custom_dict)
+    with _custom_tokenizers_lock:
+        tokenizer = _custom_tokenizers.get(key)
+        if tokenizer is None:
+            custom_words = set(thai_words()) | key
+            tokenizer = Tokenizer(custom_words)
+            if len(_custom_tokenizers) >= _MAX_CUSTOM_TOKENIZERS:
+                # Dictionary reloads leave the oldest one unused
+                del _custom_tokenizers[next(iter(_custom_tokenizers))]
+            _custom_tokenizers[key] = tokenizer
+            logger.info(f"Initialized custom tokenizer with {len(custom_words)} words")
+        return tokenizer
+
 
 @dataclass
 class TokenizationResult:
@@ -50,7 +95,8 @@ class ThaiSegmenter:
         self,
         engine: str = "newmm",
         custom_dict: Optional[List[str]] = None,
-        keep_whitespace: bool = True
+        keep_whitespace: bool = True,
+        compound_table: Optional[CompoundTable] = None
     ):
         """
         Initialize Thai segmenter.
@@ -59,26 +105,28 @@ class ThaiSegmenter:
             engine: Tokenization engine ('newmm', 'attacut', 'deepcut')
             custom_dict: Additional words for custom dictionary
             keep_whitespace: Whether to preserve whitespace in tokenization
+            compound_table: Precomputed compound decompositions; fallback
+                engine results are remembered in it
         """
         self.engine = engine
         self.keep_whitespace = keep_whitespace
         self.custom_dict = custom_dict or []
+        self.compound_table = compound_table if compound_table is not None else CompoundTable()
         
         # Initialize custom tokenizer if custom dictionary provided
         self._custom_tokenizer = None
         if self.custom_dict:
             try:
-                # Create custom word set combining default and custom words
-                custom_words = set(thai_words()) | set(self.custom_dict)
-                self._custom_tokenizer = Tokenizer(custom_words)
-                logger.info(f"Initialized custom tokenizer with {len(custom_words)} words")
+                # Shared trie over the default and custom words
+                self._custom_tokenizer = get_custom_tokenizer(self.custom_dict)
             except Exception as e:
                 logger.warning(f"Failed to initialize custom tokenizer: {e}")
         
         logger.info("ThaiSegmenter initialized", 
                     engine=engine, 
                     custom_dict_size=len(self.custom_dict),
-                    has_custom_tokenizer=self._custom_tokenizer is not None)
+                    has_custom_tokenizer=self._custom_tokenizer is not None,
+                    compound_table_size=len(self.compound_table))
     
     @performance_monitor("thai_text_segmentation")
     def segment_text(self, text: str) -> TokenizationResult:
@@ -120,11 +168,6 @@ class ThaiSegmenter:
             
             processing_time = (time.time() - start_time) * 1000
             
-            # Detect compound words and mixed content
-            compound_words_detected = sum(1 for token in tokens if len(token) > 6 and self._is_thai_text(token))
-            thai_content_ratio = sum(1 for char in text if self._is_thai_char(char)) / len(text) if text else 0
-            mixed_content = self._has_mixed_content(text)
-            
             result = TokenizationResult(
                 original_text=text,
                 tokens=tokens,
@@ -133,18 +176,22 @@ class ThaiSegmenter:
                 engine=engine_used
             )
             
-            # Log structured tokenization metrics
-            metrics = TokenizationMetrics(
-                text_length=len(text),
-                token_count=len(tokens),
-                processing_time_ms=processing_time,
-                engine=engine_used,
-                compound_words_detected=compound_words_detected,
-                thai_content_ratio=thai_content_ratio,
-                mixed_content=mixed_content,
-                fallback_used=False
-            )
-            logger.tokenization(metrics)
+            # Log structured tokenization metrics; compound and mixed content
+            # detection is only needed for them
+            if logger.isEnabledFor(logging.INFO):
+                compound_words_detected = sum(1 for token in tokens if len(token) > 6 and is_thai_text(token))
+                profile = scan_text(text)
+                metrics = TokenizationMetrics(
+                    text_length=len(text),
+                    token_count=len(tokens),
+                    processing_time_ms=processing_time,
+                    engine=engine_used,
+                    compound_words_detected=compound_words_detected,
+                    thai_content_ratio=profile.thai_ratio,
+                    mixed_content=profile.is_mixed,
+                    fallback_used=False
+                )
+                logger.tokenization(metrics)
             
             return result
             
@@ -173,7 +220,7 @@ class ThaiSegmenter:
         # Check for potential compound words (long tokens)
         compound_candidates = [
             token for token in primary_result.tokens 
-            if len(token) > 6 and self._is_thai_text(token)
+            if len(token) > 6 and is_thai_text(token)
         ]
         
         if not compound_candidates:
@@ -188,11 +235,10 @@ class ThaiSegmenter:
                     enhanced_tokens.append(token)
                     logger.debug(f"Preserved compound word from dictionary: '{token}'")
                 else:
-                    # Try alternative segmentation for potential compounds
-                    sub_result = self._segment_with_fallback(token)
-                    if len(sub_result.tokens) > 1:
-                        enhanced_tokens.extend(sub_result.tokens)
-                        logger.debug(f"Split compound word '{token}' into: {sub_result.tokens}")
+                    parts = self._decompose_compound(token)
+                    if len(parts) > 1:
+                        enhanced_tokens.extend(parts)
+                        logger.debug(f"Split compound word '{token}' into: {list(parts)}")
                     else:
                         enhanced_tokens.append(token)
             else:
@@ -209,6 +255,120 @@ class ThaiSegmenter:
             engine=f"{primary_result.engine}_compound"
         )
     
+    def split_into_chunks(self, text: str, chunk_size: int) -> List[Tuple[int, str]]:
+        """
+        Split text into chunks of roughly chunk_size characters at safe points.
+        
+        Each chunk ends at the preferred split point found in the second half
+        of its window (see _CHUNK_PUNCTUATION); only runs without any such
+        point are split hard at chunk_size. Chunks concatenate back to text.
+        A split inside a Thai run can cut a word, so results must be joined
+        with merge_chunk_results, which segments each such seam again.
+        
+        Args:
+            text: Text to split
+            chunk_size: Target maximum chunk length in characters
+            
+        Returns:
+            List of (offset, chunk) tuples in text order
+        """
+        if chunk_size <= 0 or len(text) <= chunk_size:
+            return [(0, text)]
+        
+        chunks = []
+        start = 0
+        text_length = len(text)
+        
+        while text_length - start > chunk_size:
+            limit = start + chunk_size
+            floor = start + chunk_size // 2
+            split = self._find_split_point(text, floor, limit)
+            chunks.append((start, text[start:split]))
+            start = split
+        
+        chunks.append((start, text[start:]))
+        return chunks
+    
+    def _find_split_point(self, text: str, floor: int, limit: int) -> int:
+        """Find the best split position in text[floor:limit] scanning backwards."""
+        punctuation_split = 0
+        vowel_split = 0
+        
+        for pos in range(limit, floor, -1):
+            char = text[pos - 1]
+            if char.isspace():
+                return pos
+            if not punctuation_split and char in _CHUNK_PUNCTUATION:
+                punctuation_split = pos
+            elif not vowel_split and text[pos] in _THAI_LEADING_VOWELS:
+                vowel_split = pos
+        
+        return punctuation_split or vowel_split or limit
+    
+    def merge_chunk_results(
+        self,
+        text: str,
+        chunk_results: List[Tuple[int, TokenizationResult]]
+    ) -> TokenizationResult:
+        """
+        Stitch per-chunk tokenization results back into a single result.
+        
+        Seams that do not fall on whitespace may cut a word, so the last
+        _SEAM_TOKENS tokens before each such seam and the first after it are
+        segmented again as one span, which gives the tokens that segmenting
+        the whole text would.
+        
+        Args:
+            text: Original full text
+            chunk_results: (offset, result) tuples as produced for split_into_chunks
+            
+        Returns:
+            TokenizationResult with tokens and boundaries relative to text
+        """
+        tokens: List[str] = []
+        word_boundaries = [0]
+        processing_time_ms = 0.0
+        engines = set()
+        
+        for offset, result in chunk_results:
+            chunk_tokens = result.tokens
+            chunk_boundaries = [offset + boundary for boundary in result.word_boundaries[1:]]
+            processing_time_ms += result.processing_time_ms
+            engines.add(result.engine)
+            
+            if tokens and chunk_tokens and not text[offset - 1].isspace():
+                before = min(_SEAM_TOKENS, len(tokens))
+                after = min(_SEAM_TOKENS, len(chunk_tokens))
+                seam_start = word_boundaries[-before - 1]
+                seam = self.segment_text(text[seam_start:chunk_boundaries[after - 1]])
+                processing_time_ms += seam.processing_time_ms
+                
+                del tokens[-before:]
+                del word_boundaries[-before:]
+                tokens.extend(seam.tokens)
+                word_boundaries.extend(seam_start + boundary for boundary in seam.word_boundaries[1:])
+                chunk_tokens = chunk_tokens[after:]
+                chunk_boundaries = chunk_boundaries[after:]
+            
+            tokens.extend(chunk_tokens)
+            word_boundaries.extend(chunk_boundaries)
+        
+        return TokenizationResult(
+            original_text=text,
+            tokens=tokens,
+            word_boundaries=word_boundaries if tokens else [],
+            processing_time_ms=processing_time_ms,
+            engine=engines.pop() if len(engines) == 1 else self.engine
+        )
+    
+    def _decompose_compound(self, token: str) -> Tuple[str, ...]:
+        """Split a potential compound using the table, running the fallback engines only on a miss."""
+        parts = self.compound_table.lookup(token)
+        if parts is None:
+            parts = tuple(self._segment_with_fallback(token).tokens)
+            self.compound_table.add(token, parts)
+        return parts
+    
     def _segment_with_fallback(self, text: str) -> TokenizationResult:
         """Try alternative engines for better compound word segmentation."""
         fallback_engines = ["attacut", "deepcut", "newmm"]
@@ -244,17 +404,18 @@ class ThaiSegmenter:
         current_pos = 0
         
         for token in tokens:
-            # Find the token in the remaining text
-            remaining_text = text[current_pos:]
-            token_pos = remaining_text.find(token)
-            
-            if token_pos >= 0:
-                current_pos += token_pos + len(token)
-                boundaries.append(current_pos)
-            else:
-                # Fallback: estimate position
+            # Tokens are normally contiguous, so check the cursor position
+            # first and only search forward (without copying) when they are not
+            if text.startswith(token, current_pos):
                 current_pos += len(token)
-                boundaries.append(current_pos)
+            else:
+                token_pos = text.find(token, current_pos)
+                if token_pos >= 0:
+                    current_pos = token_pos + len(token)
+                else:
+                    # Fallback: estimate position
+                    current_pos += len(token)
+            boundaries.append(current_pos)
         
         return boundaries
     
@@ -264,33 +425,20 @@ class ThaiSegmenter:
                       text_length=len(text), original_engine=self.engine)
         
         # Simple character-based segmentation preserving Thai characters
-        tokens = []
-        current_token = ""
-        
-        for char in text:
-            if self._is_thai_char(char):
-                current_token += char
-            else:
-                if current_token:
-                    tokens.append(current_token)
-                    current_token = ""
-                if char.strip():  # Non-whitespace non-Thai character
-                    tokens.append(char)
-        
-        if current_token:
-            tokens.append(current_token)
+        tokens = fallback_tokens(text)
         
         processing_time = (time.time() - start_time) * 1000
         
         # Log fallback metrics
+        profile = scan_text(text)
         metrics = TokenizationMetrics(
             text_length=len(text),
             token_count=len(tokens),
             processing_time_ms=processing_time,
             engine="fallback_char",
             compound_words_detected=0,
-            thai_content_ratio=sum(1 for char in text if self._is_thai_char(char)) / len(text) if text else 0,
-            mixed_content=self._has_mixed_content(text),
+            thai_content_ratio=profile.thai_ratio,
+            mixed_content=profile.is_mixed,
             fallback_used=True
         )
         logger.tokenization(metrics)
@@ -305,11 +453,7 @@ class ThaiSegmenter:
     
     def _is_thai_text(self, text: str) -> bool:
         """Check if text contains primarily Thai characters."""
-        if not text:
-            return False
-        
-        thai_chars = sum(1 for char in text if self._is_thai_char(char))
-        return thai_chars / len(text) > 0.5
+        return is_thai_text(text)
     
     def _is_thai_char(self, char: str) -> bool:
         """Check if character is Thai."""
@@ -317,11 +461,7 @@ class ThaiSegmenter:
     
     def _has_mixed_content(self, text: str) -> bool:
         """Check if text has mixed Thai/non-Thai content."""
-        if not text:
-            return False
-        thai_chars = sum(1 for char in text if self._is_thai_char(char))
-        non_thai_chars = sum(1 for char in text if char.isalnum() and not self._is_thai_char(char))
-        return thai_chars > 0 and non_thai_chars > 0
+        return scan_text(text).is_mixed
     
     def get_stats(self) -> Dict[str, Any]:
         """Get segmenter statistics and configuration."""
@@ -329,5 +469,6 @@ class ThaiSegmenter:
             "engine": self.engine,
             "custom_dict_size": len(self.custom_dict),
             "keep_whitespace": self.keep_whitespace,
-            "has_custom_tokenizer": self._custom_tokenizer is not None
+            "has_custom_tokenizer": self._custom_tokenizer is not None,
+            "compound_table": self.compound_table.get_stats()
         }
\ No newline at end of file
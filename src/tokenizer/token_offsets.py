@@ -0,0 +1,145 @@
+"""
+Compact token boundary encoding stored with indexed documents.
+
+The document processor records where every token of a field starts and ends
+at index time, so result highlighting can walk the stored boundaries instead
+of re-segmenting hit text at query time.
+
+Boundaries are stored as the lengths of consecutive segments, each written
+as a little-endian base-32 varint over a URL-safe alphabet. Characters
+``0-9a-v`` end a number and ``w-zA-Z-_`` continue it. Thai tokens are almost
+always shorter than 32 characters, so a field costs about one character per
+token.
+"""
+
+from itertools import pairwise
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .script_scanner import thai_runs
+
+
+# Document field holding {field name: encoded boundaries}
+TOKEN_OFFSETS_FIELD = "token_offsets"
+
+_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-_"
+_DIGIT_VALUES: Dict[str, int] = {char: value for value, char in enumerate(_ALPHABET)}
+_GROUP_BITS = 5
+_GROUP_SIZE = 1 << _GROUP_BITS
+
+Segment = Tuple[int, int, str]
+
+
+def encode_boundaries(boundaries: Iterable[int]) -> str:
+    """
+    Encode ascending boundary positions starting at 0.
+
+    Args:
+        boundaries: Cut positions, e.g. TokenizationResult.word_boundaries
+
+    Returns:
+        Encoded segment lengths
+    """
+    parts = []
+    previous = 0
+    for position in boundaries:
+        length = position - previous
+        if length <= 0:
+            continue
+        previous = position
+        while length >= _GROUP_SIZE:
+            parts.append(_ALPHABET[_GROUP_SIZE + (length & (_GROUP_SIZE - 1))])
+            length >>= _GROUP_BITS
+        parts.append(_ALPHABET[length])
+    return "".join(parts)
+
+
+def decode_boundaries(encoded: str) -> List[int]:
+    """
+    Decode boundary positions, including the leading 0.
+
+    Raises:
+        ValueError: If the string is not a valid encoding
+    """
+    boundaries = [0]
+    position = 0
+    length = 0
+    shift = 0
+    for char in encoded:
+        value = _DIGIT_VALUES.get(char)
+        if value is None:
+            raise ValueError(f"Invalid token offset character: {char!r}")
+        if value >= _GROUP_SIZE:
+            length |= (value - _GROUP_SIZE) << shift
+            shift += _GROUP_BITS
+            continue
+        position += length | (value << shift)
+        boundaries.append(position)
+        length = 0
+        shift = 0
+    if shift:
+        raise ValueError("Truncated token offsets")
+    return boundaries
+
+
+def stored_segments(text: str, encoded: Optional[str]) -> Optional[List[Segment]]:
+    """
+    Rebuild the segments of a field from its stored boundaries.
+
+    Args:
+        text: Field text as returned in the search hit
+        encoded: Stored boundaries for that field
+
+    Returns:
+        (start, end, segment text) covering the whole text, or None when
+        nothing is stored or the boundaries do not match the text (e.g. the
+        field changed after indexing)
+    """
+    if not encoded or not isinstance(text, str):
+        return None
+    try:
+        boundaries = decode_boundaries(encoded)
+    except ValueError:
+        return None
+    if boundaries[-1] != len(text):
+        return None
+    return [
+        (start, end, text[start:end])
+        for start, end in pairwise(boundaries)
+    ]
+
+
+def field_boundaries(text: str, run_tokens: Iterable[List[str]]) -> List[int]:
+    """
+    Boundaries of a field from the tokens of each of its Thai runs.
+
+    Non-Thai stretches between runs become single segments.
+
+    Args:
+        text: Field text
+        run_tokens: Tokens of every Thai run of text, in order
+
+    Returns:
+        Ascending boundary positions from 0 to len(text)
+
+    Raises:
+        ValueError: If run_tokens does not have one entry per Thai run
+    """
+    boundaries = [0]
+    for (start, end), tokens in zip(thai_runs(text), run_tokens, strict=True):
+        if start > boundaries[-1]:
+            boundaries.append(start)
+        position = start
+        for token in tokens:
+            # Segmenters may drop whitespace; resynchronize on the run text
+            found = text.find(token, position, end) if token else -1
+            if found < 0:
+                continue
+            if found > boundaries[-1]:
+                boundaries.append(found)
+            position = found + len(token)
+            boundaries.append(position)
+        if end > boundaries[-1]:
+            boundaries.append(end)
+    if len(text) > boundaries[-1]:
+        boundaries.append(len(text))
+    return boundaries
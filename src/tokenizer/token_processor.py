@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from enum import Enum
 
 from .thai_segmenter import TokenizationResult
+from .compound_table import CompoundTable
+from .script_scanner import scan_text, is_thai_text, content_type_runs
 
 
 logger = logging.getLogger(__name__)
@@ -76,7 +78,8 @@ class TokenProcessor:
         self,
         custom_separators: Optional[List[str]] = None,
         preserve_original: bool = True,
-        handle_compounds: bool = True
+        handle_compounds: bool = True,
+        compound_table: Optional[CompoundTable] = None
     ):
         """
         Initialize token processor.
@@ -85,10 +88,12 @@ class TokenProcessor:
             custom_separators: Additional separator tokens
             preserve_original: Whether to preserve original text
             handle_compounds: Whether to process compound words specially
+            compound_table: Precomputed compound decompositions
         """
         self.custom_separators = custom_separators or []
         self.preserve_original = preserve_original
         self.handle_compounds = handle_compounds
+        self.compound_table = compound_table
         
         # Combine default and custom separators
         self.separators = list(set(self.DEFAULT_SEPARATORS + self.custom_separators))
@@ -269,11 +274,12 @@ class TokenProcessor:
         if not token.strip():
             return ContentType.WHITESPACE
         
-        # Count character types
-        thai_chars = sum(1 for c in token if self._is_thai_char(c))
-        english_chars = sum(1 for c in token if c.isalpha() and not self._is_thai_char(c))
-        numeric_chars = sum(1 for c in token if c.isdigit())
-        punct_chars = sum(1 for c in token if not c.isalnum() and not c.isspace())
+        # Count character types in a single scan
+        profile = scan_text(token)
+        thai_chars = profile.thai_chars
+        english_chars = profile.letter_chars
+        numeric_chars = profile.numeric_chars
+        punct_chars = profile.punctuation_chars
         
         total_chars = len(token.strip())
         
@@ -314,26 +320,27 @@ class TokenProcessor:
         current_segment = ""
         current_type = None
         
-        for char in text:
-            char_type = self._classify_content_type(char)
+        for start, end, run_type in content_type_runs(text):
+            run_text = text[start:end]
+            char_type = ContentType(run_type)
             
             if char_type == ContentType.WHITESPACE:
-                # Add whitespace to current segment or as separate segment
+                # Add whitespace to current segment or as separate segments
                 if current_segment:
-                    current_segment += char
+                    current_segment += run_text
                 else:
-                    segments.append((char, char_type))
+                    segments.extend((char, char_type) for char in run_text)
                 continue
             
             if current_type is None or current_type == char_type:
                 # Continue current segment
-                current_segment += char
+                current_segment += run_text
                 current_type = char_type
             else:
                 # Start new segment
                 if current_segment:
                     segments.append((current_segment, current_type))
-                current_segment = char
+                current_segment = run_text
                 current_type = char_type
         
         # Add final segment
@@ -353,6 +360,11 @@ class TokenProcessor:
     
     def _split_compound_word(self, token: str) -> List[str]:
         """Attempt to split compound word into components."""
+        if self.compound_table is not None:
+            parts = self.compound_table.lookup(token)
+            if parts is not None:
+                return list(parts)
+        
         # This is a simplified approach - in practice, you might use
         # more sophisticated compound word detection
         
@@ -400,10 +412,7 @@ class TokenProcessor:
     
     def _is_thai_text(self, text: str) -> bool:
         """Check if text is primarily Thai."""
-        if not text:
-            return False
-        thai_chars = sum(1 for char in text if self._is_thai_char(char))
-        return thai_chars / len(text) > 0.5
+        return is_thai_text(text)
     
     def get_meilisearch_settings(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,273 @@
+"""
+High Dynamic Range (HDR) latency histogram.
+
+A pure-Python implementation of the HdrHistogram bucketing scheme: values
+are recorded into log-linear buckets with a fixed number of significant
+decimal digits, so percentiles stay accurate from microseconds to minutes
+with constant memory and O(1) recording.
+"""
+
+import math
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 99.99, 100.0)
+
+
+class HdrHistogram:
+    """
+    Histogram of integer values with bounded relative error.
+
+    Values are typically latencies in microseconds. A value is reported as
+    the highest value equivalent to it at the configured precision, e.g. to
+    within 0.1% with 3 significant figures.
+    """
+
+    def __init__(
+        self,
+        lowest_discernible_value: int = 1,
+        highest_trackable_value: int = 3_600_000_000,
+        significant_figures: int = 3
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            lowest_discernible_value: Smallest value distinguishable from 0
+            highest_trackable_value: Largest value that can be recorded
+            significant_figures: Decimal precision kept (1-5)
+
+        Raises:
+            ValueError: If the range or precision is invalid
+        """
+        if lowest_discernible_value < 1:
+            raise ValueError("lowest_discernible_value must be >= 1")
+        if highest_trackable_value < 2 * lowest_discernible_value:
+            raise ValueError("highest_trackable_value must be >= 2 * lowest_discernible_value")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+
+        self.lowest_discernible_value = lowest_discernible_value
+        self.highest_trackable_value = highest_trackable_value
+        self.significant_figures = significant_figures
+
+        largest_single_unit_value = 2 * 10 ** significant_figures
+        self._unit_magnitude = int(math.floor(math.log2(lowest_discernible_value)))
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit_value)))
+        self._sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self._sub_bucket_count = 1 << (self._sub_bucket_half_count_magnitude + 1)
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        smallest_untrackable_value = self._sub_bucket_count << self._unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable_value <= highest_trackable_value:
+            smallest_untrackable_value <<= 1
+            bucket_count += 1
+        self._bucket_count = bucket_count
+
+        self._counts = [0] * ((bucket_count + 1) * self._sub_bucket_half_count)
+        self.total_count = 0
+        self.min_value: Optional[int] = None
+        self.max_value = 0
+        self._sum = 0
+
+    # Index arithmetic
+
+    def _bucket_index(self, value: int) -> int:
+        return (value | self._sub_bucket_mask).bit_length() - self._unit_magnitude - (self._sub_bucket_half_count_magnitude + 1)
+
+    def _counts_index_for(self, value: int) -> int:
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self._unit_magnitude)
+        bucket_base_index = (bucket_index + 1) << self._sub_bucket_half_count_magnitude
+        return bucket_base_index + sub_bucket_index - self._sub_bucket_half_count
+
+    def _value_from_index(self, index: int) -> int:
+        bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << (bucket_index + self._unit_magnitude)
+
+    def _size_of_equivalent_range(self, value: int) -> int:
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self._unit_magnitude)
+        if sub_bucket_index >= self._sub_bucket_count:
+            bucket_index += 1
+        return 1 << (self._unit_magnitude + bucket_index)
+
+    def lowest_equivalent_value(self, value: int) -> int:
+        """Smallest value recorded in the same bucket as value."""
+        return self._value_from_index(self._counts_index_for(value))
+
+    def highest_equivalent_value(self, value: int) -> int:
+        """Largest value recorded in the same bucket as value."""
+        return self.lowest_equivalent_value(value) + self._size_of_equivalent_range(value) - 1
+
+    # Recording
+
+    def record_value(self, value: float, count: int = 1) -> None:
+        """
+        Record a value (rounded to an integer) count times.
+
+        Raises:
+            ValueError: If the value is negative or above the trackable range
+        """
+        value = int(round(value))
+        if value < 0 or value > self.highest_trackable_value:
+            raise ValueError(f"Value {value} outside the trackable range 0..{self.highest_trackable_value}")
+        self._counts[self._counts_index_for(value)] += count
+        self.total_count += count
+        self._sum += value * count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def record_corrected_value(self, value: float, expected_interval: float, count: int = 1) -> None:
+        """
+        Record a value, back-filling samples hidden by coordinated omission.
+
+        A closed-loop client that waits value units for a response skipped
+        the requests it would have sent every expected_interval meanwhile;
+        those would have seen linearly decreasing latencies, which are
+        recorded as well.
+        """
+        self.record_value(value, count)
+        if expected_interval <= 0:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record_value(missing, count)
+            missing -= expected_interval
+
+    def add(self, other: "HdrHistogram") -> None:
+        """
+        Add all values recorded in another histogram.
+
+        Histograms with the same configuration are merged exactly; otherwise
+        each bucket of other is re-recorded at its median equivalent value.
+        """
+        if not other.total_count:
+            return
+        if (len(other._counts), other._sub_bucket_count, other._unit_magnitude) == (len(self._counts), self._sub_bucket_count, self._unit_magnitude):
+            for index, count in enumerate(other._counts):
+                if count:
+                    self._counts[index] += count
+            self.total_count += other.total_count
+            self._sum += other._sum
+            if self.min_value is None or other.min_value < self.min_value:
+                self.min_value = other.min_value
+            self.max_value = max(self.max_value, other.max_value)
+            return
+        for value, count in other.iter_recorded():
+            self.record_value(min(value, self.highest_trackable_value), count)
+
+    def reset(self) -> None:
+        """Clear all recorded values."""
+        self._counts = [0] * len(self._counts)
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = 0
+        self._sum = 0
+
+    # Queries
+
+    def iter_recorded(self) -> Iterator[Tuple[int, int]]:
+        """Yield (median equivalent value, count) of every non-empty bucket."""
+        for index, count in enumerate(self._counts):
+            if count:
+                value = self._value_from_index(index)
+                yield value + (self._size_of_equivalent_range(value) >> 1), count
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        if not self.total_count:
+            return 0.0
+        mean = self.mean
+        variance = sum(count * (value - mean) ** 2 for value, count in self.iter_recorded()) / self.total_count
+        return math.sqrt(variance)
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Value at or below which the given percentage of values fall."""
+        if not self.total_count:
+            return 0
+        percentile = min(max(percentile, 0.0), 100.0)
+        count_at_percentile = max(1, int(math.ceil(percentile / 100 * self.total_count)))
+        running = 0
+        for index, count in enumerate(self._counts):
+            running += count
+            if running >= count_at_percentile:
+                value = self._value_from_index(index)
+                # Never report beyond what was actually recorded
+                return min(self.highest_equivalent_value(value), self.max_value)
+        return self.max_value
+
+    def percentiles(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, int]:
+        """Values at several percentiles, keyed like "p99.9"."""
+        return {f"p{p:g}": self.value_at_percentile(p) for p in percentiles}
+
+    def to_dict(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES, include_buckets: bool = False) -> Dict:
+        """Summary for machine-readable reports."""
+        summary = {
+            "count": self.total_count,
+            "min": self.min_value or 0,
+            "max": self.max_value,
+            "mean": self.mean,
+            "stdev": self.stdev,
+            "percentiles": self.percentiles(percentiles)
+        }
+        if include_buckets:
+            summary["buckets"] = [[value, count] for value, count in self.iter_recorded()]
+        return summary
+
+    def percentile_distribution(self, ticks_per_half_distance: int = 5, value_scale: float = 1.0) -> str:
+        """
+        Percentile distribution in the standard .hgrm text format.
+
+        The output can be plotted with the HdrHistogram plotter.
+
+        Args:
+            ticks_per_half_distance: Percentile steps per halving of the
+                distance to 100%
+            value_scale: Divisor applied to values (e.g. 1000 for us -> ms)
+        """
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}", ""]
+        if self.total_count:
+            percentile = 0.0
+            while True:
+                value = self.value_at_percentile(percentile)
+                count = self._count_at_or_below(value)
+                inverse = f"{1 / (1 - percentile / 100):14.2f}" if percentile < 100 else ""
+                lines.append(f"{value / value_scale:12.3f} {percentile / 100:14.12f} {count:10d} {inverse}".rstrip())
+                if percentile >= 100:
+                    break
+                half_distance = 2 ** (int(math.log2(100 / (100 - percentile))) + 1)
+                percentile += 100 / (half_distance * ticks_per_half_distance)
+                if self._count_at_or_below(self.value_at_percentile(percentile)) >= self.total_count and percentile < 100:
+                    percentile = 100.0
+        lines.append(f"#[Mean    = {self.mean / value_scale:12.3f}, StdDeviation   = {self.stdev / value_scale:12.3f}]")
+        lines.append(f"#[Max     = {self.max_value / value_scale:12.3f}, Total count    = {self.total_count:12d}]")
+        lines.append(f"#[Buckets = {self._bucket_count:12d}, SubBuckets     = {self._sub_bucket_count:12d}]")
+        return "\n".join(lines) + "\n"
+
+    def _count_at_or_below(self, value: int) -> int:
+        last_index = self._counts_index_for(min(value, self.highest_trackable_value))
+        return sum(self._counts[:last_index + 1])
+
+
+def merge_histograms(histograms: List[HdrHistogram]) -> HdrHistogram:
+    """Combine histograms with the same configuration into a new one."""
+    if not histograms:
+        return HdrHistogram()
+    first = histograms[0]
+    merged = HdrHistogram(first.lowest_discernible_value, first.highest_trackable_value, first.significant_figures)
+    for histogram in histograms:
+        merged.add(histogram)
+    return merged
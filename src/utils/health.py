@@ -2,9 +2,10 @@
 
 import asyncio
 import time
+from collections import deque
 import os
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -53,6 +54,11 @@ class SystemMetrics:
     uptime_seconds: int
     process_count: int
     load_average: Optional[List[float]] = None
+    process_cpu_percent: Optional[float] = None
+    process_memory_rss_mb: Optional[float] = None
+    process_threads: Optional[int] = None
+    process_open_fds: Optional[int] = None
+    sample_age_seconds: Optional[float] = None
 
 
 @dataclass
@@ -68,10 +74,157 @@ class TokenizerMetrics:
     tokenization_accuracy: float
 
 
+class SystemMetricsSampler:
+    """
+    Samples system and process metrics in the background.
+    
+    CPU usage is measured between consecutive samples instead of by sleeping
+    on each read, so readers get the latest snapshot without blocking.
+    """
+    
+    def __init__(self, interval_seconds: float = 5.0, disk_path: str = "/"):
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.interval_seconds = interval_seconds
+        self.disk_path = disk_path
+        self.samples_total = 0
+        self._snapshot: Optional[SystemMetrics] = None
+        self._sampled_at = 0.0
+        self._process = None
+        self._task: Optional[asyncio.Task] = None
+        if PSUTIL_AVAILABLE:
+            # Start the CPU measurement so the first sample has a baseline
+            psutil.cpu_percent(interval=None)
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def configure(self, interval_seconds: float) -> None:
+        """Change the sampling interval; takes effect after the current wait."""
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.interval_seconds = interval_seconds
+    
+    async def start(self) -> None:
+        """Take a first sample and keep sampling on the running loop."""
+        if self.running:
+            return
+        await asyncio.to_thread(self.sample)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="system-metrics-sampler")
+        logger.info("System metrics sampler started", interval_seconds=self.interval_seconds)
+    
+    async def stop(self) -> None:
+        """Stop sampling; the last snapshot stays readable."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                # psutil reads /proc and statfs; keep them off the event loop
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.error("Failed to sample system metrics", error=e)
+    
+    def sample(self) -> SystemMetrics:
+        """Take a sample now and make it the current snapshot."""
+        load_avg = None
+        try:
+            load_avg = list(os.getloadavg())
+        except (OSError, AttributeError):
+            pass  # Not available on Windows
+        
+        if not PSUTIL_AVAILABLE:
+            metrics = SystemMetrics(
+                cpu_usage_percent=0,
+                memory_usage_percent=0,
+                memory_used_mb=0,
+                memory_available_mb=0,
+                disk_usage_percent=0,
+                disk_free_gb=0,
+                uptime_seconds=0,
+                process_count=0,
+                load_average=load_avg
+            )
+        else:
+            memory = psutil.virtual_memory()
+            disk = psutil.disk_usage(self.disk_path)
+            process = self._current_process()
+            with process.oneshot():
+                process_cpu = process.cpu_percent(interval=None)
+                rss = process.memory_info().rss
+                threads = process.num_threads()
+                try:
+                    open_fds = process.num_fds()
+                except (AttributeError, psutil.Error):
+                    open_fds = None  # Not available on Windows
+            
+            metrics = SystemMetrics(
+                # Utilization since the previous sample
+                cpu_usage_percent=psutil.cpu_percent(interval=None),
+                memory_usage_percent=memory.percent,
+                memory_used_mb=memory.used / 1024 / 1024,
+                memory_available_mb=memory.available / 1024 / 1024,
+                disk_usage_percent=disk.percent,
+                disk_free_gb=disk.free / 1024 / 1024 / 1024,
+                uptime_seconds=0,
+                process_count=len(psutil.pids()),
+                load_average=load_avg,
+                process_cpu_percent=process_cpu,
+                process_memory_rss_mb=rss / 1024 / 1024,
+                process_threads=threads,
+                process_open_fds=open_fds
+            )
+        
+        self._snapshot = metrics
+        self._sampled_at = time.monotonic()
+        self.samples_total += 1
+        return metrics
+    
+    def _current_process(self) -> "psutil.Process":
+        """
+        psutil handle of this process, recreated after a fork.
+
+        The sampler is created at import, which happens in the gunicorn
+        master when the app is preloaded; a handle made then would keep
+        reporting the master from every worker.
+        """
+        if self._process is None or self._process.pid != os.getpid():
+            self._process = psutil.Process()
+            # Start the CPU measurement so the next sample has a baseline
+            self._process.cpu_percent(interval=None)
+        return self._process
+    
+    def get_snapshot(self) -> SystemMetrics:
+        """Latest sample, taken now if the sampler has not run yet."""
+        metrics = self._snapshot
+        if metrics is None:
+            metrics = self.sample()
+        return replace(metrics, sample_age_seconds=round(time.monotonic() - self._sampled_at, 3))
+
+
 class HealthChecker:
     """Enhanced health check utility class with detailed monitoring."""
     
-    def __init__(self):
+    def __init__(self, results_ttl_seconds: float = 0.0, sampler: Optional[SystemMetricsSampler] = None):
+        """
+        Initialize health checker.
+        
+        Args:
+            results_ttl_seconds: How long run_all_checks() results are reused
+            sampler: Source of system metrics (a new sampler if not given)
+        """
+        self.results_ttl_seconds = results_ttl_seconds
+        self.sampler = sampler if sampler is not None else SystemMetricsSampler()
+        self._results_time = 0.0
+        self._running_checks: Optional[asyncio.Future] = None
         self.checks: Dict[str, callable] = {}
         self.last_results: Dict[str, HealthCheckResult] = {}
         self.metrics_history: List[Dict[str, Any]] = []
@@ -80,7 +233,7 @@ class HealthChecker:
             "total": 0,
             "successful": 0,
             "failed": 0,
-            "response_times": []
+            "response_times": deque(maxlen=1000)
         }
     
     def register_check(self, name: str, check_func: callable, timeout: float = 5.0, 
@@ -173,20 +326,35 @@ class HealthChecker:
         return result
     
     async def run_all_checks(self) -> Dict[str, HealthCheckResult]:
-        """Run all registered health checks concurrently."""
+        """
+        Run all registered health checks concurrently.
+        
+        Results younger than results_ttl_seconds are reused, and callers
+        arriving while the checks run share that run.
+        """
         if not self.checks:
             logger.warning("No health checks registered")
             return {}
         
-        # Run all checks concurrently
-        tasks = {
-            name: self.run_check(name)
-            for name in self.checks.keys()
-        }
-        
-        results = {}
-        for name, task in tasks.items():
-            results[name] = await task
+        if (
+            self.results_ttl_seconds > 0
+            and time.monotonic() - self._results_time < self.results_ttl_seconds
+            and set(self.last_results) >= set(self.checks)
+        ):
+            return {name: self.last_results[name] for name in self.checks}
+        
+        running = self._running_checks
+        if running is None or running.done() or running.get_loop() is not asyncio.get_running_loop():
+            running = asyncio.ensure_future(self._run_all_checks())
+            self._running_checks = running
+        # One caller going away must not cancel the checks for the others
+        return await asyncio.shield(running)
+    
+    async def _run_all_checks(self) -> Dict[str, HealthCheckResult]:
+        names = list(self.checks.keys())
+        outcomes = await asyncio.gather(*(self.run_check(name) for name in names))
+        results = dict(zip(names, outcomes))
+        self._results_time = time.monotonic()
         
         # Log overall health status
         overall_status = self.get_overall_status(results)
@@ -235,41 +403,10 @@ class HealthChecker:
             return HealthStatus.DEGRADED
     
     def get_system_metrics(self) -> SystemMetrics:
-        """Get current system performance metrics."""
+        """Get the latest system performance metrics without blocking."""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            # Memory usage
-            memory = psutil.virtual_memory()
-            
-            # Disk usage
-            disk = psutil.disk_usage('/')
-            
-            # System uptime
-            uptime = time.time() - self.start_time
-            
-            # Process count
-            process_count = len(psutil.pids())
-            
-            # Load average (Unix-like systems only)
-            load_avg = None
-            try:
-                load_avg = list(os.getloadavg())
-            except (OSError, AttributeError):
-                pass  # Not available on Windows
-            
-            return SystemMetrics(
-                cpu_usage_percent=cpu_percent,
-                memory_usage_percent=memory.percent,
-                memory_used_mb=memory.used / 1024 / 1024,
-                memory_available_mb=memory.available / 1024 / 1024,
-                disk_usage_percent=disk.percent,
-                disk_free_gb=disk.free / 1024 / 1024 / 1024,
-                uptime_seconds=int(uptime),
-                process_count=process_count,
-                load_average=load_avg
-            )
+            metrics = self.sampler.get_snapshot()
+            return replace(metrics, uptime_seconds=int(time.time() - self.start_time))
             
         except Exception as e:
             logger.error("Failed to get system metrics", error=e)
@@ -319,11 +456,8 @@ class HealthChecker:
         else:
             self.request_stats["failed"] += 1
         
+        # Bounded to the last 1000 response times
         self.request_stats["response_times"].append(response_time_ms)
-        
-        # Keep only last 1000 response times to prevent memory growth
-        if len(self.request_stats["response_times"]) > 1000:
-            self.request_stats["response_times"] = self.request_stats["response_times"][-1000:]
     
     def record_tokenization_operation(self, token_count: int, processing_time_ms: float, 
                                     text_length: int, engine: str):
@@ -1,12 +1,17 @@
 """Comprehensive logging configuration utilities for Thai tokenizer service."""
 
 import asyncio
+import atexit
+import copy
 import logging
+import queue
+import random
 import sys
 import os
+import threading
 import time
 import uuid
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 import json
 from datetime import datetime, timedelta
 from contextvars import ContextVar
@@ -30,6 +35,311 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class _LenientEncoder(DateTimeEncoder):
+    """Encoder for log entries; values JSON cannot represent are logged as strings."""
+    
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+class LogLimiter:
+    """
+    Sampling and rate limiting of one logger's records below WARNING.
+    
+    A record is kept with probability sample_rate, and at most
+    max_per_second records are kept per second (token bucket with one
+    second of burst). Warnings and errors are never dropped.
+    """
+    
+    def __init__(self, sample_rate: float = 1.0, max_per_second: Optional[float] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if max_per_second is not None and max_per_second <= 0:
+            raise ValueError("max_per_second must be positive")
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.dropped = 0
+        self._tokens = max_per_second or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            with self._lock:
+                self.dropped += 1
+            return False
+        if self.max_per_second is not None:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_per_second, self._tokens + (now - self._updated) * self.max_per_second)
+                self._updated = now
+                if self._tokens < 1.0:
+                    self.dropped += 1
+                    return False
+                self._tokens -= 1.0
+        return True
+
+
+# Limiters by logger name prefix, and the limiter resolved for each logger
+_log_limiters: Dict[str, LogLimiter] = {}
+_resolved_limiters: Dict[str, Optional[LogLimiter]] = {}
+
+
+def configure_log_sampling(logger_name: str, sample_rate: float = 1.0,
+                           max_per_second: Optional[float] = None) -> None:
+    """
+    Sample and rate limit DEBUG and INFO records of a logger and its children.
+    
+    Args:
+        logger_name: Logger name, e.g. "src.search_proxy.services.result_ranker"
+        sample_rate: Share of records kept
+        max_per_second: Maximum records kept per second (unlimited when None)
+    """
+    if sample_rate >= 1.0 and max_per_second is None:
+        _log_limiters.pop(logger_name, None)
+    else:
+        _log_limiters[logger_name] = LogLimiter(sample_rate, max_per_second)
+    _resolved_limiters.clear()
+
+
+def _limiter_for(name: str) -> Optional[LogLimiter]:
+    try:
+        return _resolved_limiters[name]
+    except KeyError:
+        pass
+    limiter = None
+    candidate = name
+    while candidate:
+        if candidate in _log_limiters:
+            limiter = _log_limiters[candidate]
+            break
+        candidate = candidate.rpartition(".")[0]
+    _resolved_limiters[name] = limiter
+    return limiter
+
+
+def get_log_sampling_stats() -> Dict[str, Dict[str, Any]]:
+    """Configured limiters and the records each has dropped."""
+    return {
+        name: {
+            "sample_rate": limiter.sample_rate,
+            "max_per_second": limiter.max_per_second,
+            "dropped": limiter.dropped
+        }
+        for name, limiter in _log_limiters.items()
+    }
+
+
+class AsyncLogWriter:
+    """
+    Background thread that formats and writes log records in batches.
+    
+    Request handlers only put records on a bounded queue; JSON formatting
+    and writing to stdout or files happen on this thread, so a slow log
+    consumer does not slow down requests. Records queued while a batch is
+    written go out together in one write per handler. When the queue is
+    full, records are dropped and counted instead of blocking the caller.
+    """
+    
+    def __init__(self, queue_size: int = 10000, batch_size: int = 256):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._reset()
+        atexit.register(self.stop)
+        if hasattr(os, "register_at_fork"):
+            # The thread does not survive a fork (gunicorn preload); the
+            # child starts its own on first use
+            os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self) -> None:
+        self._queue: "queue.Queue[Tuple[Optional[logging.Handler], Any]]" = queue.Queue(self.queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.records_written = 0
+        self.records_dropped = 0
+        self.batches_written = 0
+        self._dropped_reported = 0
+    
+    def configure(self, queue_size: Optional[int] = None, batch_size: Optional[int] = None) -> None:
+        """Change the limits; a new queue size applies until the thread has started."""
+        if batch_size is not None:
+            self.batch_size = max(1, batch_size)
+        if queue_size is not None and self._thread is None:
+            self.queue_size = max(1, queue_size)
+            self._queue = queue.Queue(self.queue_size)
+    
+    def enqueue(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((handler, record))
+        except queue.Full:
+            self.records_dropped += 1
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is written."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put((None, None), timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        self._thread = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "records_written": self.records_written,
+            "records_dropped": self.records_dropped,
+            "batches_written": self.batches_written
+        }
+    
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = self._write(batch)
+            if stop:
+                return
+    
+    def _write(self, batch: List[Tuple[Optional[logging.Handler], Any]]) -> bool:
+        stop = False
+        markers = []
+        lines: Dict[logging.Handler, List[str]] = {}
+        for handler, record in batch:
+            if handler is None:
+                if record is None:
+                    stop = True
+                else:
+                    markers.append(record)
+                continue
+            if not isinstance(handler, logging.StreamHandler) or getattr(handler, "stream", None) is None:
+                handler.handle(record)
+                self.records_written += 1
+                continue
+            if not handler.filter(record):
+                continue
+            try:
+                lines.setdefault(handler, []).append(handler.format(record))
+            except Exception:
+                handler.handleError(record)
+        
+        if self.records_dropped > self._dropped_reported and lines:
+            dropped = self.records_dropped - self._dropped_reported
+            self._dropped_reported = self.records_dropped
+            warning = logging.LogRecord(
+                __name__, logging.WARNING, "", 0,
+                "Dropped %d log records because the log queue was full", (dropped,), None
+            )
+            for handler in lines:
+                lines[handler].append(handler.format(warning))
+        
+        for handler, handler_lines in lines.items():
+            handler.acquire()
+            try:
+                handler.stream.write(handler.terminator.join(handler_lines) + handler.terminator)
+                handler.flush()
+            except Exception:
+                # Reported like a failing emit, without the record
+                handler.handleError(logging.LogRecord(__name__, logging.ERROR, "", 0, "log write failed", (), None))
+            finally:
+                handler.release()
+            self.records_written += len(handler_lines)
+        if lines:
+            self.batches_written += 1
+        
+        for marker in markers:
+            marker.set()
+        return stop
+
+
+class QueuedHandler(logging.Handler):
+    """
+    Hands records for target to the shared AsyncLogWriter.
+    
+    Context variables are not visible on the writer thread, so the
+    correlation and request IDs are attached to the record here. The record
+    is formatted later, so the message and structured context are copied
+    first, as logging.handlers.QueueHandler.prepare does; a caller changing
+    its arguments after the call cannot change the output.
+    """
+    
+    def __init__(self, target: logging.Handler, writer: Optional[AsyncLogWriter] = None):
+        super().__init__(target.level)
+        self.target = target
+        self.writer = writer or log_writer
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy of record that does not share mutable state with the caller."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        structured = getattr(record, "structured", None)
+        if structured is not None:
+            # One level deep: extra={...} dicts are often reused by callers
+            record.structured = {
+                key: dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+                for key, value in structured.items()
+            }
+        if not hasattr(record, "correlation_id"):
+            record.correlation_id = correlation_id_var.get()
+            record.request_id = request_id_var.get()
+        return record
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.writer.enqueue(self.target, self.prepare(record))
+        except Exception:
+            self.handleError(record)
+    
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:
+        self.target.setFormatter(fmt)
+    
+    def flush(self) -> None:
+        self.writer.flush()
+    
+    def close(self) -> None:
+        self.writer.flush()
+        self.target.close()
+        super().close()
+
+
+# Shared background writer for all queued handlers
+log_writer = AsyncLogWriter()
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Wait until queued log records are written."""
+    return log_writer.flush(timeout)
+
+
 @dataclass
 class PerformanceMetrics:
     """Performance metrics for operations."""
@@ -75,6 +385,10 @@ class StructuredLogger:
         self.logger = logging.getLogger(name)
         self.name = name
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether records of this level are processed; check before costly log arguments."""
+        return self.logger.isEnabledFor(level)
+    
     def _get_base_context(self) -> Dict[str, Any]:
         """Get base context for all log entries."""
         return {
@@ -214,6 +528,13 @@ class StructuredLogger:
     
     def _log(self, log_level: int, message: str, **kwargs):
         """Internal logging method with context."""
+        if not self.logger.isEnabledFor(log_level):
+            return
+        if log_level < logging.WARNING:
+            limiter = _limiter_for(self.name)
+            if limiter is not None and not limiter.allow():
+                return
+        
         context = self._get_base_context()
         context.update({
             "level": logging.getLevelName(log_level),
@@ -221,16 +542,18 @@ class StructuredLogger:
             **kwargs
         })
         
-        # Use the original logger to emit the structured record
+        # The context is serialized by JSONFormatter when the record is
+        # written, which with async logging happens off the request path
         record = logging.LogRecord(
             name=self.name,
             level=log_level,
             pathname="",
             lineno=0,
-            msg=json.dumps(context, cls=DateTimeEncoder),
+            msg=message,
             args=(),
             exc_info=None
         )
+        record.structured = context
         self.logger.handle(record)
 
 
@@ -238,12 +561,19 @@ class JSONFormatter(logging.Formatter):
     """Enhanced JSON formatter for structured logging."""
     
     def format(self, record: logging.LogRecord) -> str:
-        # If the message is already JSON (from StructuredLogger), return it
-        try:
-            json.loads(record.getMessage())
-            return record.getMessage()
-        except (json.JSONDecodeError, ValueError):
-            pass
+        # Records from StructuredLogger carry their context
+        structured = getattr(record, "structured", None)
+        if structured is not None:
+            return json.dumps(structured, cls=_LenientEncoder)
+        
+        # If the message is already JSON, return it
+        message = record.getMessage()
+        if message.startswith("{"):
+            try:
+                json.loads(message)
+                return message
+            except (json.JSONDecodeError, ValueError):
+                pass
         
         # Otherwise, format as structured log entry
         log_entry: Dict[str, Any] = {
@@ -251,7 +581,7 @@ class JSONFormatter(logging.Formatter):
             "level": record.levelname,
             "service": "thai-tokenizer",
             "logger": record.name,
-            "message": record.getMessage(),
+            "message": message,
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
@@ -274,9 +604,12 @@ class JSONFormatter(logging.Formatter):
 def performance_monitor(operation_name: str):
     """Decorator to monitor performance of functions."""
     def decorator(func):
+        logger = StructuredLogger(func.__module__)
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            logger = StructuredLogger(func.__module__)
+            if not logger.isEnabledFor(logging.INFO):
+                return await func(*args, **kwargs)
             start_time = time.time()
             start_memory = _get_memory_usage()
             
@@ -318,7 +651,8 @@ def performance_monitor(operation_name: str):
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            logger = StructuredLogger(func.__module__)
+            if not logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwargs)
             start_time = time.time()
             start_memory = _get_memory_usage()
             
@@ -538,8 +872,35 @@ def _estimate_size(obj: Any) -> int:
         return 0
 
 
+def _parse_log_sampling(spec: str) -> None:
+    """Apply LOG_SAMPLING entries: "logger:sample_rate[:max_per_second]", comma separated."""
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            name, *values = entry.split(":")
+            sample_rate = float(values[0]) if values and values[0] else 1.0
+            max_per_second = float(values[1]) if len(values) > 1 and values[1] else None
+            configure_log_sampling(name, sample_rate, max_per_second)
+        except (ValueError, IndexError) as e:
+            print(f"Warning: Ignoring invalid LOG_SAMPLING entry '{entry}': {e}")
+
+
+def _queue_handlers(logger: logging.Logger) -> None:
+    """Replace the logger's stream and file handlers with queued ones."""
+    logger.handlers = [
+        QueuedHandler(handler) if type(handler) in (logging.StreamHandler, logging.FileHandler) else handler
+        for handler in logger.handlers
+    ]
+
+
 def setup_logging(level: str = "INFO", enable_performance_logging: bool = True) -> None:
-    """Set up comprehensive structured logging configuration."""
+    """
+    Set up comprehensive structured logging configuration.
+    
+    With LOG_ASYNC (default true) records are formatted and written by a
+    background thread in batches (see AsyncLogWriter). LOG_SAMPLING samples
+    and rate limits DEBUG/INFO records per logger, e.g.
+    "src.search_proxy.services.result_ranker:0.1,src.tokenizer:1:100".
+    """
     # Configure root logger
     logging.basicConfig(
         level=getattr(logging, level.upper()),
@@ -600,9 +961,21 @@ def setup_logging(level: str = "INFO", enable_performance_logging: bool = True)
             # Fallback to stdout if file logging fails
             print(f"Warning: Failed to set up file logging: {e}")
     
+    _parse_log_sampling(os.getenv("LOG_SAMPLING", ""))
+    
+    async_logging = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    if async_logging:
+        log_writer.configure(
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", str(log_writer.queue_size))),
+            batch_size=int(os.getenv("LOG_BATCH_SIZE", str(log_writer.batch_size)))
+        )
+        for name in ("", "performance", "errors", "metrics"):
+            _queue_handlers(logging.getLogger(name))
+    
     logger = get_structured_logger(__name__)
     logger.info("Logging system initialized", 
                 level=level, 
                 performance_logging=enable_performance_logging,
                 log_directory=log_dir,
-                file_logging_enabled=os.getenv("ENABLE_FILE_LOGGING", "false").lower() == "true")
\ No newline at end of file
+                file_logging_enabled=os.getenv("ENABLE_FILE_LOGGING", "false").lower() == "true",
+                async_logging=async_logging)
\ No newline at end of file
@@ -0,0 +1,335 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A probe task sleeps for a fixed interval and measures how late it wakes
+up; the difference is the event-loop lag every other callback saw at that
+moment. Lags are recorded in HDR histograms over a rolling window.
+
+A watchdog thread checks the probe's heartbeat. When the loop has not run
+the probe for longer than the blocking threshold, the watchdog captures the
+loop thread's stack while the offending callback or task step is still
+running, so the stall can be traced to the code that caused it.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from .hdr_histogram import HdrHistogram, merge_histograms
+from .logging import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class StallEvent:
+    """An event-loop stall caught while it was happening."""
+
+    started_at: datetime
+    task: Optional[str]
+    stack: List[str]
+    lag_ms: float = 0.0
+    finished: bool = False
+
+    @property
+    def location(self) -> str:
+        """Innermost project frame, or the innermost frame if none."""
+        for frame in reversed(self.stack):
+            if not frame.startswith(("/", "<")):
+                return frame
+        return self.stack[-1] if self.stack else "<unknown>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "lag_ms": round(self.lag_ms, 3),
+            "finished": self.finished,
+            "task": self.task,
+            "location": self.location,
+            "stack": self.stack
+        }
+
+
+@dataclass
+class _Offender:
+    count: int = 0
+    total_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    last_seen: Optional[datetime] = None
+    example_stack: List[str] = field(default_factory=list)
+
+
+def _format_stack(frame, limit: int) -> List[str]:
+    frames = []
+    for summary in traceback.extract_stack(frame, limit=limit):
+        filename = summary.filename
+        if filename.startswith(_PROJECT_ROOT + os.sep):
+            filename = os.path.relpath(filename, _PROJECT_ROOT)
+        frames.append(f"{filename}:{summary.lineno} in {summary.name}")
+    return frames
+
+
+class EventLoopMonitor:
+    """
+    Continuously measures event-loop lag and records blocking stalls.
+
+    Start it from the loop to monitor (e.g. in the application lifespan).
+    """
+
+    def __init__(
+        self,
+        probe_interval_seconds: float = 0.05,
+        block_threshold_seconds: float = 0.1,
+        window_seconds: float = 60.0,
+        max_events: int = 50,
+        stack_limit: int = 40
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            probe_interval_seconds: How often the probe task runs
+            block_threshold_seconds: Lag above which a stall is recorded
+            window_seconds: Length of each rolling lag histogram window
+            max_events: Number of recent stalls kept
+            stack_limit: Frames kept per captured stack
+
+        Raises:
+            ValueError: If an interval or threshold is not positive
+        """
+        if probe_interval_seconds <= 0 or block_threshold_seconds <= 0:
+            raise ValueError("probe_interval_seconds and block_threshold_seconds must be positive")
+
+        self.probe_interval = probe_interval_seconds
+        self.block_threshold = block_threshold_seconds
+        self.window_seconds = window_seconds
+        self.stack_limit = stack_limit
+
+        self._current_window = self._new_histogram()
+        self._previous_window = self._new_histogram()
+        self._window_started = time.monotonic()
+        self._max_lag_ms = 0.0
+
+        self.events: Deque[StallEvent] = deque(maxlen=max_events)
+        self._offenders: Dict[str, _Offender] = {}
+        self._active_event: Optional[StallEvent] = None
+        self._events_lock = threading.Lock()
+
+        self.stalls_total = 0
+        self.blocked_seconds_total = 0.0
+        self.probes_total = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._last_beat = 0.0
+
+    def configure(
+        self,
+        probe_interval_seconds: Optional[float] = None,
+        block_threshold_seconds: Optional[float] = None,
+        window_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Change settings; only allowed while stopped.
+
+        Raises:
+            RuntimeError: If the monitor is running
+            ValueError: If an interval or threshold is not positive
+        """
+        if self.running:
+            raise RuntimeError("Cannot reconfigure a running event loop monitor")
+        if probe_interval_seconds is not None:
+            if probe_interval_seconds <= 0:
+                raise ValueError("probe_interval_seconds must be positive")
+            self.probe_interval = probe_interval_seconds
+        if block_threshold_seconds is not None:
+            if block_threshold_seconds <= 0:
+                raise ValueError("block_threshold_seconds must be positive")
+            self.block_threshold = block_threshold_seconds
+        if window_seconds is not None:
+            self.window_seconds = window_seconds
+
+    @staticmethod
+    def _new_histogram() -> HdrHistogram:
+        # Lag in microseconds, up to one hour
+        return HdrHistogram(1, 3_600_000_000, 3)
+
+    @property
+    def running(self) -> bool:
+        return self._probe_task is not None and not self._probe_task.done()
+
+    async def start(self) -> None:
+        """Start the probe task on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._probe_task = self._loop.create_task(self._probe(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info("Event loop monitor started",
+                   probe_interval_ms=self.probe_interval * 1000,
+                   block_threshold_ms=self.block_threshold * 1000)
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._stop_event.set()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+        while True:
+            scheduled = time.monotonic()
+            await asyncio.sleep(self.probe_interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - scheduled - self.probe_interval)
+            self.record_lag(lag, now)
+
+    def record_lag(self, lag_seconds: float, now: Optional[float] = None) -> None:
+        """Record one lag measurement and close any stall in progress."""
+        now = time.monotonic() if now is None else now
+        if now - self._window_started >= self.window_seconds:
+            self._previous_window = self._current_window
+            self._current_window = self._new_histogram()
+            self._window_started = now
+
+        lag_ms = lag_seconds * 1000
+        self._current_window.record_value(min(lag_seconds * 1_000_000, 3_600_000_000))
+        self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+        self.probes_total += 1
+
+        if lag_seconds >= self.block_threshold:
+            self.stalls_total += 1
+            self.blocked_seconds_total += lag_seconds
+            with self._events_lock:
+                event, self._active_event = self._active_event, None
+            if event is None:
+                # Stalled between watchdog checks; nothing was captured
+                event = StallEvent(started_at=datetime.now(), task=None, stack=[])
+                self.events.append(event)
+            event.lag_ms = lag_ms
+            event.finished = True
+            self._record_offender(event)
+            logger.warning("Event loop blocked",
+                          lag_ms=round(lag_ms, 3),
+                          task=event.task,
+                          location=event.location)
+        else:
+            with self._events_lock:
+                self._active_event = None
+
+    def _record_offender(self, event: StallEvent) -> None:
+        offender = self._offenders.setdefault(event.location, _Offender())
+        offender.count += 1
+        offender.total_lag_ms += event.lag_ms
+        offender.max_lag_ms = max(offender.max_lag_ms, event.lag_ms)
+        offender.last_seen = event.started_at
+        if event.stack:
+            offender.example_stack = event.stack
+
+    def _watch(self) -> None:
+        check_interval = min(self.probe_interval, self.block_threshold) / 2
+        while not self._stop_event.wait(check_interval):
+            overdue = time.monotonic() - self._last_beat - self.probe_interval
+            if overdue < self.block_threshold or self._active_event is not None:
+                continue
+            try:
+                self._capture()
+            except Exception:
+                # The loop thread may have exited or unwound mid-capture
+                pass
+
+    def _capture(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(self._loop)
+        event = StallEvent(
+            started_at=datetime.now(),
+            task=task.get_name() if task is not None else None,
+            stack=_format_stack(frame, self.stack_limit)
+        )
+        with self._events_lock:
+            if self._active_event is not None:
+                return
+            self._active_event = event
+        self.events.append(event)
+
+    def lag_histogram(self) -> HdrHistogram:
+        """Lag over the current and previous windows, in microseconds."""
+        return merge_histograms([self._previous_window, self._current_window])
+
+    def get_lag_percentiles(self) -> Dict[str, float]:
+        """Lag percentiles over the rolling window, in milliseconds."""
+        histogram = self.lag_histogram()
+        return {name: value / 1000 for name, value in histogram.percentiles((50.0, 90.0, 99.0, 99.9, 100.0)).items()}
+
+    def get_offenders(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Code locations ranked by total time they blocked the loop."""
+        ranked = sorted(self._offenders.items(), key=lambda item: item[1].total_lag_ms, reverse=True)
+        return [
+            {
+                "location": location,
+                "stalls": offender.count,
+                "total_lag_ms": round(offender.total_lag_ms, 3),
+                "max_lag_ms": round(offender.max_lag_ms, 3),
+                "last_seen": offender.last_seen.isoformat() if offender.last_seen else None,
+                "example_stack": offender.example_stack
+            }
+            for location, offender in ranked[:limit]
+        ]
+
+    def get_stats(self, include_events: bool = True) -> Dict[str, Any]:
+        """Current lag statistics, recent stalls and top offenders."""
+        histogram = self.lag_histogram()
+        stats = {
+            "running": self.running,
+            "probe_interval_ms": self.probe_interval * 1000,
+            "block_threshold_ms": self.block_threshold * 1000,
+            "window_seconds": self.window_seconds,
+            "probes_total": self.probes_total,
+            "lag_ms": {
+                "mean": round(histogram.mean / 1000, 3),
+                "max_in_window": histogram.max_value / 1000,
+                "max_since_start": round(self._max_lag_ms, 3),
+                "percentiles": self.get_lag_percentiles()
+            },
+            "stalls_total": self.stalls_total,
+            "blocked_seconds_total": round(self.blocked_seconds_total, 6),
+            "offenders": self.get_offenders()
+        }
+        if include_events:
+            stats["recent_stalls"] = [event.to_dict() for event in reversed(self.events)]
+        return stats
+
+
+# Global monitor instance
+loop_monitor = EventLoopMonitor()
+
+
+def get_loop_monitor() -> EventLoopMonitor:
+    """Get the global event loop monitor."""
+    return loop_monitor
@@ -0,0 +1,368 @@
+"""
+In-process statistical stack sampler.
+
+A background thread periodically snapshots the Python stacks of all other
+threads (sys._current_frames) and aggregates them into collapsed stacks,
+the "frame;frame;frame count" text format consumed by flamegraph.pl,
+speedscope and similar tools. Nothing is instrumented, so the cost is one
+stack walk per thread per sample and the profiled code runs unmodified.
+
+Two modes are supported:
+
+- ``wall``: every thread is sampled whether running or waiting, which shows
+  where request latency goes. Samples of threads idling in the event loop's
+  selector or in a thread pool's queue are dropped unless requested.
+- ``cpu``: only threads the kernel reports as running are sampled (Linux,
+  via /proc/self/task/<tid>/stat), which shows where CPU time goes.
+
+Samples taken on an event loop's thread are prefixed with the name of the
+asyncio task being executed. In wall mode the await chains of suspended
+tasks can be sampled as well, showing what each request is waiting on.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+PROFILE_MODES = ("wall", "cpu")
+
+# Leaf frames where a thread is blocked waiting for work
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+_SOURCE_ROOTS = sorted(
+    {os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))}
+    | {path for path in sys.path if path and os.path.isdir(path)},
+    key=len,
+    reverse=True
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass
+class ProfileResult:
+    """Aggregated samples of one profiling session."""
+
+    mode: str
+    duration_seconds: float
+    interval_seconds: float
+    samples: int = 0
+    idle_samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    sampling_seconds: float = 0.0
+    cpu_mode_supported: bool = True
+
+    @property
+    def overhead_percent(self) -> float:
+        """Share of wall time the sampler thread spent walking stacks."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return 100.0 * self.sampling_seconds / self.duration_seconds
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format, one "root;...;leaf count" per line."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.stacks.items())
+        )
+
+    def top_frames(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Frames with the most samples.
+
+        "self" counts samples where the frame was the leaf, "total" counts
+        samples where it appeared anywhere on the stack.
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+
+        weight = sum(self.stacks.values()) or 1
+        ranked = sorted(total, key=lambda frame: (own[frame], total[frame]), reverse=True)
+        return [
+            {
+                "frame": frame,
+                "self_samples": own[frame],
+                "total_samples": total[frame],
+                "self_percent": round(100.0 * own[frame] / weight, 2),
+                "total_percent": round(100.0 * total[frame] / weight, 2)
+            }
+            for frame in ranked[:limit]
+            if not frame.startswith("task:") and frame != "<thread>"
+        ]
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "interval_ms": self.interval_seconds * 1000,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "unique_stacks": len(self.stacks),
+            "overhead_percent": round(self.overhead_percent, 3),
+            "cpu_mode_supported": self.cpu_mode_supported,
+            "top_frames": self.top_frames(top),
+            "collapsed": self.collapsed()
+        }
+
+
+def _short_filename(filename: str) -> str:
+    for root in _SOURCE_ROOTS:
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+
+def _frame_label(code, lineno: Optional[int], include_lines: bool) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    location = _short_filename(code.co_filename)
+    if include_lines and lineno is not None:
+        location = f"{location}:{lineno}"
+    # Separators of the collapsed format must not appear inside a frame
+    return f"{name} ({location})".replace(";", ":")
+
+
+def _thread_is_running(native_id: Optional[int]) -> Optional[bool]:
+    """Whether the kernel reports a thread as running, or None if unknown."""
+    if native_id is None:
+        return None
+    try:
+        with open(f"/proc/self/task/{native_id}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The state field follows the parenthesised command name
+    return stat[stat.rfind(b")") + 2:stat.rfind(b")") + 3] == b"R"
+
+
+def _coroutine_frames(task: "asyncio.Task", include_lines: bool) -> List[str]:
+    """Await chain of a suspended task, outermost coroutine first."""
+    frames = []
+    awaitable = task.get_coro()
+    depth = 0
+    while awaitable is not None and depth < 128:
+        depth += 1
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is not None:
+            frames.append(_frame_label(frame.f_code, frame.f_lineno, include_lines))
+        next_awaitable = getattr(awaitable, "cr_await", None)
+        if next_awaitable is None:
+            next_awaitable = getattr(awaitable, "gi_yieldfrom", None)
+        if frame is None and next_awaitable is None:
+            # A future (or its __await__ iterator) the chain is blocked on
+            name = type(awaitable).__name__
+            frames.append(f"<{name[:-4] if name.endswith('Iter') else name}>")
+        awaitable = next_awaitable
+    return frames
+
+
+class StackSampler:
+    """
+    Samples thread stacks from a background thread.
+
+    Use start() and stop(), or profile() from a coroutine. Only one sampler
+    can run per process at a time.
+    """
+
+    _active_lock = threading.Lock()
+
+    def __init__(
+        self,
+        mode: str = "wall",
+        interval_seconds: float = 0.01,
+        include_idle: bool = False,
+        include_lines: bool = False,
+        sample_tasks: bool = True,
+        max_depth: int = 128
+    ):
+        """
+        Initialize sampler.
+
+        Args:
+            mode: "wall" or "cpu"
+            interval_seconds: Time between samples
+            include_idle: Keep samples of threads waiting for work
+            include_lines: Add line numbers to frames
+            sample_tasks: In wall mode, also sample suspended asyncio tasks
+            max_depth: Frames kept per stack, counted from the leaf
+
+        Raises:
+            ValueError: If mode or interval is invalid
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (choose from {', '.join(PROFILE_MODES)})")
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+
+        self.mode = mode
+        self.interval_seconds = interval_seconds
+        self.include_idle = include_idle
+        self.include_lines = include_lines
+        self.sample_tasks = sample_tasks and mode == "wall"
+        self.max_depth = max_depth
+
+        self._loops: Dict[int, asyncio.AbstractEventLoop] = {}
+        self._ignored_tasks = set()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._result: Optional[ProfileResult] = None
+        self._started_at = 0.0
+
+    def watch_loop(self, loop: asyncio.AbstractEventLoop, thread_id: Optional[int] = None) -> None:
+        """Attribute samples of the loop's thread to its running task."""
+        self._loops[thread_id if thread_id is not None else threading.get_ident()] = loop
+
+    def start(self) -> None:
+        """
+        Start sampling.
+
+        Raises:
+            ProfilerBusyError: If another sampler is running
+        """
+        if not StackSampler._active_lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running in this process")
+
+        self._result = ProfileResult(
+            mode=self.mode,
+            duration_seconds=0.0,
+            interval_seconds=self.interval_seconds,
+            cpu_mode_supported=self.mode != "cpu" or os.path.isdir("/proc/self/task")
+        )
+        self._stop_event.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileResult:
+        """Stop sampling and return the aggregated result."""
+        if self._thread is None:
+            raise RuntimeError("Sampler was not started")
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._result.duration_seconds = time.perf_counter() - self._started_at
+        StackSampler._active_lock.release()
+        return self._result
+
+    async def profile(self, seconds: float) -> ProfileResult:
+        """Sample for the given number of seconds without blocking the loop."""
+        self.watch_loop(asyncio.get_running_loop())
+        # The task waiting for the profile is not interesting to profile
+        self._ignored_tasks.add(asyncio.current_task())
+        self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = self.stop()
+        return result
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        next_sample = time.perf_counter()
+        while not self._stop_event.is_set():
+            began = time.perf_counter()
+            try:
+                self._sample(own_id)
+            except Exception:
+                # A thread or task can disappear mid-walk; skip that sample
+                pass
+            ended = time.perf_counter()
+            self._result.sampling_seconds += ended - began
+
+            next_sample += self.interval_seconds
+            if next_sample < ended:
+                # Fell behind (e.g. GIL contention); don't burst to catch up
+                next_sample = ended + self.interval_seconds
+            self._stop_event.wait(next_sample - ended)
+
+    def _sample(self, own_id: int) -> None:
+        result = self._result
+        native_ids = {thread.ident: thread.native_id for thread in threading.enumerate()}
+        running_tasks = {}
+        for thread_id, loop in self._loops.items():
+            task = asyncio.current_task(loop)
+            if task is not None:
+                running_tasks[thread_id] = task
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if self.mode == "cpu" and result.cpu_mode_supported:
+                if not _thread_is_running(native_ids.get(thread_id)):
+                    continue
+
+            frames = []
+            leaf = frame
+            while frame is not None and len(frames) < self.max_depth:
+                frames.append(frame)
+                frame = frame.f_back
+
+            leaf_key = (os.path.basename(leaf.f_code.co_filename), leaf.f_code.co_name)
+            if leaf_key in _IDLE_FRAMES and not self.include_idle:
+                result.idle_samples += 1
+                continue
+
+            labels = [_frame_label(f.f_code, f.f_lineno, self.include_lines) for f in reversed(frames)]
+            task = running_tasks.get(thread_id)
+            if task is not None:
+                labels.insert(0, f"task:{task.get_name()}")
+            result.stacks[";".join(labels)] += 1
+            result.samples += 1
+
+        if self.sample_tasks:
+            self._sample_suspended_tasks(running_tasks)
+
+    def _sample_suspended_tasks(self, running_tasks: Dict[int, "asyncio.Task"]) -> None:
+        result = self._result
+        skipped = set(running_tasks.values()) | self._ignored_tasks
+        for loop in self._loops.values():
+            try:
+                tasks = asyncio.all_tasks(loop)
+            except RuntimeError:
+                # The task set changed while being copied
+                continue
+            for task in tasks:
+                if task in skipped:
+                    continue
+                frames = _coroutine_frames(task, self.include_lines)
+                if not frames:
+                    continue
+                stack = ";".join([f"task:{task.get_name()}", "<suspended>"] + frames[-self.max_depth:])
+                result.stacks[stack] += 1
+                result.samples += 1
+
+
+async def profile_current_process(
+    seconds: float,
+    mode: str = "wall",
+    interval_seconds: float = 0.01,
+    include_idle: bool = False,
+    include_lines: bool = False,
+    sample_tasks: bool = True
+) -> ProfileResult:
+    """Profile the running process for the given number of seconds."""
+    sampler = StackSampler(
+        mode=mode,
+        interval_seconds=interval_seconds,
+        include_idle=include_idle,
+        include_lines=include_lines,
+        sample_tasks=sample_tasks
+    )
+    return await sampler.profile(seconds)
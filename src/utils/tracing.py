@@ -0,0 +1,578 @@
+"""
+Lightweight span tracing with OTLP-compatible JSON export.
+
+Spans are timed sections of a request (query processing, one Meilisearch
+call, ranking, ...). They nest through a context variable, so spans opened
+in tasks created by a traced coroutine become its children. The trace ID is
+derived from the request's correlation ID, which ties traces to logs.
+
+Sampling is decided when the root span ends: a trace is exported when it
+was picked by the head sample rate, or when it turned out slow or failed
+(tail sampling). Untraced code paths and disabled tracing return a no-op
+span, so instrumentation costs little when nothing is recorded.
+
+Finished traces are encoded as OTLP/JSON ExportTraceServiceRequest
+documents and written by a background thread, either as JSON lines to a
+file or POSTed to an OTLP/HTTP collector endpoint.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+from .logging import correlation_id_var, get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+
+class SpanKind(IntEnum):
+    """OTLP span kinds."""
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class StatusCode(IntEnum):
+    """OTLP status codes."""
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """Span that records nothing; returned when the request is not traced."""
+
+    recording = False
+    trace_id = None
+    span_id = None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, code: StatusCode, message: str = "") -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _TraceState:
+    """Spans of one trace, shared by all its spans."""
+
+    __slots__ = ("trace_id", "sampled", "spans", "dropped_spans", "has_error")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+        self.dropped_spans = 0
+        self.has_error = False
+
+
+class Span:
+    """A timed, attributed section of a trace. Use as a context manager."""
+
+    recording = True
+
+    __slots__ = (
+        "tracer", "trace", "name", "kind", "span_id", "parent", "parent_span_id",
+        "start_ns", "end_ns", "attributes", "events", "status_code", "status_message", "_token"
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace: _TraceState,
+        name: str,
+        kind: SpanKind,
+        parent: Optional["Span"],
+        attributes: Optional[Dict[str, Any]]
+    ):
+        self.tracer = tracer
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.parent = parent
+        self.parent_span_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = StatusCode.UNSET
+        self.status_message = ""
+        self._token = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1_000_000
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if isinstance(exc, asyncio.CancelledError):
+            # A cancelled hedge or timed-out variant is not a failure
+            self.attributes["cancelled"] = True
+        elif exc is not None:
+            self.record_exception(exc)
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end()
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}})
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.add_event("exception", {
+            "exception.type": type(exception).__name__,
+            "exception.message": str(exception)[:500]
+        })
+        self.set_status(StatusCode.ERROR, f"{type(exception).__name__}: {exception}"[:500])
+
+    def set_status(self, code: StatusCode, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+        if code == StatusCode.ERROR:
+            self.trace.has_error = True
+
+    def end(self) -> None:
+        """End the span; ending the root span completes the trace."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.parent is None:
+            self.tracer._finish_trace(self)
+
+
+def trace_id_for(correlation_id: Optional[str]) -> str:
+    """32-hex-digit trace ID for a correlation ID (random when there is none)."""
+    if not correlation_id:
+        return os.urandom(16).hex()
+    compact = correlation_id.replace("-", "").lower()
+    if len(compact) == 32 and all(c in "0123456789abcdef" for c in compact):
+        # UUID correlation IDs map to the same hex digits
+        return compact
+    return hashlib.blake2b(correlation_id.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_attribute_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def encode_otlp(
+    traces: List[List[Span]],
+    resource_attributes: Dict[str, Any],
+    scope_name: str = "thai-search-proxy"
+) -> Dict[str, Any]:
+    """Encode finished traces as an OTLP/JSON ExportTraceServiceRequest."""
+    spans = []
+    for trace in traces:
+        for span in trace:
+            encoded = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": int(span.kind),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns if span.end_ns is not None else span.start_ns),
+                "attributes": _attributes(span.attributes),
+                "status": {"code": int(span.status_code)}
+            }
+            if span.parent_span_id:
+                encoded["parentSpanId"] = span.parent_span_id
+            if span.status_message:
+                encoded["status"]["message"] = span.status_message
+            if span.events:
+                encoded["events"] = [
+                    {
+                        "timeUnixNano": str(event["time_ns"]),
+                        "name": event["name"],
+                        "attributes": _attributes(event["attributes"])
+                    }
+                    for event in span.events
+                ]
+            spans.append(encoded)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _attributes(resource_attributes)},
+            "scopeSpans": [{"scope": {"name": scope_name}, "spans": spans}]
+        }]
+    }
+
+
+class SpanExporter(ABC):
+    """Destination for encoded OTLP/JSON payloads."""
+
+    @abstractmethod
+    def export(self, payload: Dict[str, Any]) -> None:
+        """Send one encoded batch of spans."""
+
+    def shutdown(self) -> None:  # noqa: B027
+        """Release resources; a no-op for exporters that hold none."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON document per line, as the collector's file exporter does."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        line = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """POSTs OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        import httpx
+
+        self.endpoint = endpoint if endpoint.rstrip("/").endswith("/v1/traces") else endpoint.rstrip("/") + "/v1/traces"
+        self._client = httpx.Client(timeout=timeout, headers={"Content-Type": "application/json", **(headers or {})})
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        response = self._client.post(self.endpoint, content=json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps exported payloads in memory."""
+
+    def __init__(self):
+        self.payloads: List[Dict[str, Any]] = []
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        self.payloads.append(payload)
+
+    @property
+    def spans(self) -> List[Dict[str, Any]]:
+        return [
+            span
+            for payload in self.payloads
+            for resource in payload["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+
+class _ExportWorker:
+    """Encodes and exports finished traces off the event loop."""
+
+    def __init__(self, tracer: "Tracer", max_queue_size: int = 2048, max_batch: int = 64):
+        self.tracer = tracer
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: List[Span]) -> bool:
+        try:
+            self._queue.put_nowait(spans)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(more)
+            self._export(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _export(self, batch: List[List[Span]]) -> None:
+        exporter = self.tracer.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export(encode_otlp(batch, self.tracer.resource_attributes))
+            self.tracer.exported_traces += len(batch)
+        except Exception as e:
+            self.tracer.export_errors += 1
+            logger.warning("Trace export failed", error=str(e), traces=len(batch))
+
+    def flush(self, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class Tracer:
+    """
+    Creates spans and decides which traces are exported.
+
+    Disabled until configure() is called with enabled=True.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.slow_threshold_ms: Optional[float] = None
+        self.export_errors_always = True
+        self.max_spans_per_trace = 256
+        self.exporter: Optional[SpanExporter] = None
+        self.resource_attributes: Dict[str, Any] = {"service.name": "thai-search-proxy"}
+        self._random: Callable[[], float] = random.random
+        self._worker: Optional[_ExportWorker] = None
+
+        self.started_traces = 0
+        self.sampled_traces = 0
+        self.tail_sampled_traces = 0
+        self.exported_traces = 0
+        self.dropped_traces = 0
+        self.export_errors = 0
+
+    def configure(
+        self,
+        enabled: bool = True,
+        sample_rate: float = 0.01,
+        slow_threshold_ms: Optional[float] = 500.0,
+        exporter: Optional[SpanExporter] = None,
+        service_name: str = "thai-search-proxy",
+        service_version: Optional[str] = None,
+        environment: Optional[str] = None,
+        max_spans_per_trace: int = 256,
+        export_errors: bool = True
+    ) -> None:
+        """
+        (Re)configure tracing.
+
+        Args:
+            enabled: Record spans at all
+            sample_rate: Share of traces exported regardless of outcome (head sampling)
+            slow_threshold_ms: Export traces whose root span took at least this long
+            exporter: Where to send traces; nothing is exported without one
+            service_name: OTLP service.name resource attribute
+            service_version: OTLP service.version resource attribute
+            environment: OTLP deployment.environment resource attribute
+            max_spans_per_trace: Spans kept per trace; more are counted as dropped
+            export_errors: Export traces containing a failed span
+        """
+        self.shutdown()
+        self.enabled = enabled and exporter is not None
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.slow_threshold_ms = slow_threshold_ms
+        self.export_errors_always = export_errors
+        self.max_spans_per_trace = max_spans_per_trace
+        self.exporter = exporter
+        self.resource_attributes = {
+            "service.name": service_name,
+            "service.version": service_version,
+            "deployment.environment": environment,
+            "process.pid": os.getpid()
+        }
+        if self.enabled:
+            self._worker = _ExportWorker(self)
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        root: bool = False
+    ):
+        """
+        Start a span as a child of the current one.
+
+        With root=True a new trace is started when no span is active;
+        otherwise a no-op span is returned outside of traces.
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is None:
+            if not root:
+                return NOOP_SPAN
+            self.started_traces += 1
+            trace = _TraceState(
+                trace_id_for(correlation_id_var.get()),
+                sampled=self._random() < self.sample_rate
+            )
+            span = Span(self, trace, name, kind, None, attributes)
+            correlation_id = correlation_id_var.get()
+            if correlation_id:
+                span.attributes.setdefault("correlation_id", correlation_id)
+        else:
+            trace = parent.trace
+            if len(trace.spans) >= self.max_spans_per_trace:
+                trace.dropped_spans += 1
+                return NOOP_SPAN
+            span = Span(self, trace, name, kind, parent, attributes)
+        trace.spans.append(span)
+        return span
+
+    def _finish_trace(self, root: Span) -> None:
+        trace = root.trace
+        reason = None
+        if trace.sampled:
+            reason = "head"
+        elif self.slow_threshold_ms is not None and root.duration_ms >= self.slow_threshold_ms:
+            reason = "slow"
+        elif trace.has_error and self.export_errors_always:
+            reason = "error"
+        if reason is None:
+            return
+
+        if reason == "head":
+            self.sampled_traces += 1
+        else:
+            self.tail_sampled_traces += 1
+        root.attributes["sampling.reason"] = reason
+        if trace.dropped_spans:
+            root.attributes["dropped_spans"] = trace.dropped_spans
+
+        # Only finished spans are exported; abandoned children (e.g. a
+        # cancelled hedge request) are closed at the root's end time
+        spans = []
+        for span in trace.spans:
+            if span.end_ns is None:
+                span.end_ns = root.end_ns
+                span.attributes["unfinished"] = True
+            spans.append(span)
+
+        if self._worker is None or not self._worker.submit(spans):
+            self.dropped_traces += 1
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued traces have been exported."""
+        if self._worker is not None:
+            self._worker.flush(timeout)
+
+    def shutdown(self) -> None:
+        """Export queued traces and stop the exporter thread."""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+        if self.exporter is not None:
+            try:
+                self.exporter.shutdown()
+            except Exception as e:
+                logger.warning("Trace exporter shutdown failed", error=str(e))
+        self.enabled = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "started_traces": self.started_traces,
+            "head_sampled_traces": self.sampled_traces,
+            "tail_sampled_traces": self.tail_sampled_traces,
+            "exported_traces": self.exported_traces,
+            "dropped_traces": self.dropped_traces,
+            "export_errors": self.export_errors
+        }
+
+
+# Global tracer instance
+tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer."""
+    return tracer
+
+
+def current_span():
+    """The active span, or a no-op span outside of traces."""
+    span = _current_span.get()
+    return span if span is not None else NOOP_SPAN
+
+
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: SpanKind = SpanKind.INTERNAL,
+    root: bool = False
+):
+    """Start a span on the global tracer."""
+    return tracer.start_span(name, attributes, kind, root)
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Reproducible micro and macro benchmark suite with stored baselines.
+
+Micro-benchmarks time the hot-path building blocks (segmentation, token
+processing, query processing, every ranking algorithm, result
+deduplication). Macro-benchmarks run SearchProxyService.search end to end
+against an in-process fake Meilisearch loaded with the data/samples
+corpora, so no server is needed, and send small /tokenize requests through
+the full ASGI application (middleware included) in process.
+
+Each benchmark collects repeated samples (auto-calibrated loops per
+sample) in several fresh worker processes; timings vary more between
+processes (memory layout, hash seeds) than within one, so samples are
+pooled across processes before comparing. Every sample is paired with a
+timing of a fixed reference workload taken right before it, and
+comparisons use the ratio, which cancels out a faster, slower or
+momentarily busier machine. Results can be saved as a JSON baseline per commit in
+data/benchmarks/ and compared with an earlier baseline. A benchmark is
+reported as a regression only when the bootstrap confidence interval of
+its median slowdown lies entirely above the noise threshold.
+
+Usage:
+    python tests/performance/benchmark_suite.py --save
+    python tests/performance/benchmark_suite.py --compare latest --fail-on-regression
+    python tests/performance/benchmark_suite.py --filter ranker --samples 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from src.search_proxy.config.settings import get_production_settings  # noqa: E402
+from src.search_proxy.models.query import ProcessedQuery, QueryVariant  # noqa: E402
+from src.search_proxy.models.requests import SearchRequest  # noqa: E402
+from src.search_proxy.models.search import HitRecord, QueryContext, SearchResult  # noqa: E402
+from src.search_proxy.services.query_processor import QueryProcessor  # noqa: E402
+from src.search_proxy.services.result_ranker import RankingAlgorithm, ResultRanker  # noqa: E402
+from src.search_proxy.services.search_executor import SearchExecutor  # noqa: E402
+from src.search_proxy.services.search_proxy_service import SearchProxyService  # noqa: E402
+from src.tokenizer.thai_segmenter import ThaiSegmenter  # noqa: E402
+from src.tokenizer.token_processor import TokenProcessor  # noqa: E402
+
+SAMPLES_DIR = ROOT / "data" / "samples"
+BASELINE_DIR = ROOT / "data" / "benchmarks"
+CORPORA = ("thai_documents.json", "formal_documents.json", "informal_documents.json")
+INDEX_NAME = "benchmark"
+
+BenchmarkFn = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+def load_corpus() -> List[Dict[str, Any]]:
+    """Load the sample documents."""
+    documents = []
+    for name in CORPORA:
+        documents.extend(json.loads((SAMPLES_DIR / name).read_text(encoding="utf-8")))
+    return documents
+
+
+def load_queries() -> List[str]:
+    """Load the sample search queries."""
+    return [q["query"] for q in json.loads((SAMPLES_DIR / "test_queries.json").read_text(encoding="utf-8"))]
+
+
+class FakeMeiliSearch:
+    """
+    In-process stand-in for MeiliSearch.
+
+    Scores documents by the fraction of query terms found in their title and
+    content, which is enough to produce realistic hit lists for ranking.
+    """
+
+    _TERM_SPLIT = re.compile(r"[\s​]+")
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+        self._texts = [f"{doc.get('title', '')} {doc.get('content', '')}" for doc in documents]
+
+    async def search(self, index_name: str, query: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        options = options or {}
+        terms = [term for term in self._TERM_SPLIT.split(query.strip('"')) if term]
+        scored = []
+        for doc, text in zip(self.documents, self._texts, strict=True):
+            matched = sum(1 for term in terms if term in text)
+            if matched:
+                scored.append((matched / len(terms), doc))
+        scored.sort(key=lambda item: -item[0])
+
+        offset = options.get("offset", 0)
+        limit = options.get("limit", 20)
+        return {
+            "hits": [{**doc, "_rankingScore": score} for score, doc in scored[offset:offset + limit]],
+            "estimatedTotalHits": len(scored),
+            "processingTimeMs": 0,
+            "query": query
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        return {"status": "healthy"}
+
+    async def close(self) -> None:
+        pass
+
+
+def make_search_results(documents: List[Dict[str, Any]], variants: List[QueryVariant]) -> List[SearchResult]:
+    """Build search results of several variants with overlapping hits."""
+    results = []
+    for v, variant in enumerate(variants):
+        hits = [
+            HitRecord(
+                id=str(doc["id"]),
+                score=1.0 - (i + v) / (len(documents) * 2),
+                document=doc,
+                ranking_info={"base_score": 1.0 - i / len(documents), "variant_weight": variant.weight}
+            )
+            # Shifted windows so variants share most but not all hits
+            for i, doc in enumerate(documents[v:] + documents[:v])
+        ]
+        results.append(SearchResult(
+            query_variant=variant,
+            hits=hits,
+            total_hits=len(hits),
+            processing_time_ms=1.0,
+            success=True
+        ))
+    return results
+
+
+def make_query_context(processed_query: ProcessedQuery) -> QueryContext:
+    """Build the ranking context the way SearchProxyService does."""
+    return QueryContext(
+        original_query=processed_query.original_query,
+        processed_query=" ".join(variant.query_text for variant in processed_query.query_variants[:1]),
+        thai_content_ratio=1.0 if processed_query.thai_content_detected else 0.0,
+        mixed_content=processed_query.mixed_content,
+        primary_language=processed_query.primary_language,
+        query_length=len(processed_query.original_query),
+        tokenization_confidence=processed_query.average_tokenization_confidence,
+        variant_count=len(processed_query.query_variants),
+        processing_time_ms=processed_query.processing_time_ms
+    )
+
+
+def benchmark_settings():
+    """
+    Production settings restricted to newmm.
+
+    The fallback engines are optional packages; relying on them would make
+    timings depend on what happens to be installed.
+    """
+    settings = get_production_settings()
+    settings.tokenization.fallback_engines = []
+    return settings
+
+
+def cycle(items: List[Any]) -> Callable[[], Any]:
+    """Return a function yielding the items round-robin."""
+    state = {"i": -1}
+
+    def next_item():
+        state["i"] = (state["i"] + 1) % len(items)
+        return items[state["i"]]
+    return next_item
+
+
+async def build_benchmarks() -> Dict[str, BenchmarkFn]:
+    """Create the benchmark callables, sharing set-up between them."""
+    documents = load_corpus()
+    queries = load_queries()
+    fake = FakeMeiliSearch(documents)
+    settings = benchmark_settings()
+
+    segmenter = ThaiSegmenter()
+    contents = [doc["content"] for doc in documents]
+    compounds = [word for doc in documents for word in doc.get("metadata", {}).get("compound_words", [])]
+    segmented = [segmenter.segment_text(text) for text in contents]
+    token_processor = TokenProcessor()
+
+    query_processor = QueryProcessor(settings)
+    await query_processor.initialize()
+
+    # Ranking input: every variant of a compound query matching the whole corpus
+    processed_query = await query_processor.process_query(queries[0])
+    query_context = make_query_context(processed_query)
+    search_results = make_search_results(documents, processed_query.query_variants)
+    executor = SearchExecutor(meilisearch_client=fake)
+
+    next_content = cycle(contents)
+    next_compound = cycle(compounds)
+    next_segmented = cycle(segmented)
+    next_query = cycle(queries)
+
+    benchmarks: Dict[str, BenchmarkFn] = {
+        "micro.segmenter.segment_text": lambda: segmenter.segment_text(next_content()),
+        "micro.segmenter.segment_compound_words": lambda: segmenter.segment_compound_words(next_compound()),
+        "micro.token_processor.process_tokenization_result": (
+            lambda: token_processor.process_tokenization_result(next_segmented())
+        ),
+        "micro.query_processor.process_query": lambda: query_processor.process_query(next_query()),
+    }
+
+    for algorithm in RankingAlgorithm:
+        ranker = ResultRanker(settings.ranking)
+        ranker.config.algorithm = algorithm
+        benchmarks[f"micro.ranker.{algorithm.value}"] = (
+            lambda ranker=ranker: ranker.rank_results(search_results, processed_query.original_query, query_context)
+        )
+
+    for strategy in ("id_based", "content_based", "hybrid"):
+        benchmarks[f"micro.executor.deduplicate.{strategy}"] = (
+            lambda strategy=strategy: executor.collect_and_deduplicate_results(search_results, strategy)
+        )
+
+    for cached in (False, True):
+        service_settings = benchmark_settings()
+        service_settings.performance.cache_enabled = cached
+        service = SearchProxyService(service_settings, meilisearch_client=fake)
+        await service.initialize()
+        requests = [SearchRequest(query=query, index_name=INDEX_NAME) for query in queries]
+        if cached:
+            # Measure warm-cache hits only
+            for request in requests:
+                await service.search(request)
+        next_request = cycle(requests)
+        name = "macro.search_proxy.search" + ("_cached" if cached else "")
+        benchmarks[name] = lambda service=service, next_request=next_request: service.search(next_request())
+
+    # Short texts keep tokenization cheap, so middleware and framework
+    # overhead make up most of the request time. Imported here because the
+    # application logs on import and the parent process prints JSON.
+    from src.api.main import app as api_app
+
+    api_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api_app), base_url="http://benchmark")
+    next_short_query = cycle(sorted(queries, key=len)[:10])
+    benchmarks["macro.api.tokenize"] = (
+        lambda: api_client.post("/api/v1/tokenize", json={"text": next_short_query()})
+    )
+
+    return benchmarks
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+_REFERENCE_WORDS = ("การ ค้นหา เอกสาร ภาษาไทย search engine " * 200).split()
+
+
+def reference_workload() -> List[Tuple[str, int]]:
+    """Fixed pure-Python work (dict, string, sort) measuring machine speed."""
+    counts: Dict[str, int] = {}
+    for word in _REFERENCE_WORDS:
+        counts[word] = counts.get(word, 0) + len(word.upper())
+    return sorted(counts.items())
+
+
+async def time_loops(fn: BenchmarkFn, loops: int) -> float:
+    """Run fn loops times and return seconds per call."""
+    start = time.perf_counter()
+    for _ in range(loops):
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+    return (time.perf_counter() - start) / loops
+
+
+async def calibrate(fn: BenchmarkFn, min_sample_seconds: float) -> int:
+    """Loops per sample so each sample is long enough for the timer resolution."""
+    loops = 1
+    while await time_loops(fn, loops) * loops < min_sample_seconds and loops < 1 << 20:
+        loops *= 2
+    return loops
+
+
+async def measure(
+    fn: BenchmarkFn,
+    samples: int,
+    min_sample_seconds: float,
+    warmup: int,
+    reference_loops: int
+) -> Dict[str, Any]:
+    """
+    Collect timing samples (milliseconds per call) of one benchmark in this process.
+
+    Each sample is preceded by a short reference workload timing; their
+    ratio is kept as the sample's relative timing.
+    """
+    await time_loops(fn, warmup)
+    loops = await calibrate(fn, min_sample_seconds)
+
+    timings, relative = [], []
+    for _ in range(samples):
+        reference = await time_loops(reference_workload, reference_loops)
+        timing = await time_loops(fn, loops)
+        timings.append(round(timing * 1000, 6))
+        relative.append(round(timing / reference, 6))
+    return {"loops": loops, "samples": timings, "relative": relative}
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pool the samples of one benchmark from all worker processes."""
+    timings = [t for run in runs for t in run["samples"]]
+    ordered = sorted(timings)
+    return {
+        "unit": "ms",
+        "loops": max(run["loops"] for run in runs),
+        "runs": [run["samples"] for run in runs],
+        "relative_runs": [run["relative"] for run in runs],
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "min": ordered[0],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    }
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def bootstrap_ratio_interval(
+    current_runs: List[List[float]],
+    baseline_runs: List[List[float]],
+    confidence: float,
+    resamples: int = 2000,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """
+    Confidence interval of median(current) / median(baseline).
+
+    Hierarchical bootstrap: processes are resampled first, then samples
+    within each chosen process, so variance between processes widens the
+    interval instead of being mistaken for a real change.
+    """
+    rng = random.Random(seed)
+
+    def resample(runs: List[List[float]]) -> float:
+        pooled = []
+        for run in rng.choices(runs, k=len(runs)):
+            pooled.extend(rng.choices(run, k=len(run)))
+        return statistics.median(pooled)
+
+    ratios = sorted(resample(current_runs) / resample(baseline_runs) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return (
+        ratios[int(tail * (resamples - 1))],
+        ratios[int((1 - tail) * (resamples - 1))]
+    )
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    alpha: float,
+    threshold_percent: float
+) -> List[Dict[str, Any]]:
+    """
+    Classify each benchmark as regression, improvement or unchanged.
+
+    A change is significant when the whole (1 - alpha) confidence interval
+    of the median ratio lies beyond the noise threshold.
+    """
+    rows = []
+    threshold = threshold_percent / 100
+    for name, stats in current.items():
+        old = baseline.get(name)
+        if old is None:
+            rows.append({"name": name, "verdict": "new", "current_ms": stats["median"]})
+            continue
+        current_runs, baseline_runs = stats["relative_runs"], old["relative_runs"]
+        low, high = bootstrap_ratio_interval(current_runs, baseline_runs, 1 - alpha)
+        change = (
+            statistics.median(t for run in current_runs for t in run)
+            / statistics.median(t for run in baseline_runs for t in run) - 1
+        ) * 100
+        if low > 1 + threshold:
+            verdict = "regression"
+        elif high < 1 - threshold:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        rows.append({
+            "name": name,
+            "verdict": verdict,
+            "baseline_ms": old["median"],
+            "current_ms": stats["median"],
+            "change_percent": change,
+            "interval_percent": [(low - 1) * 100, (high - 1) * 100]
+        })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def current_commit() -> str:
+    """Short commit id, suffixed with -dirty when tracked files are modified."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment() -> Dict[str, str]:
+    """Machine details stored with a baseline; timings only compare on like machines."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor()
+    }
+
+
+def load_baseline(spec: str, exclude_commit: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+    """
+    Load a baseline by commit id, path, or "latest".
+
+    "latest" is the newest baseline of a different commit.
+    """
+    if spec != "latest":
+        path = Path(spec)
+        if not path.exists():
+            path = BASELINE_DIR / f"{spec}.json"
+        if not path.exists():
+            return None
+        return path, json.loads(path.read_text(encoding="utf-8"))
+
+    candidates = []
+    for path in BASELINE_DIR.glob("*.json"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("commit") != exclude_commit:
+            candidates.append((data.get("created_at", ""), path, data))
+    if not candidates:
+        return None
+    _, path, data = max(candidates, key=lambda item: item[0])
+    return path, data
+
+
+def print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<52} {'median':>10} {'p95':>10} {'stdev':>9}  loops")
+    print("-" * 92)
+    for name, stats in results.items():
+        print(
+            f"{name:<52} {stats['median']:9.3f}ms {stats['p95']:9.3f}ms "
+            f"{stats['stdev']:8.3f}ms  {stats['loops']}"
+        )
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline_commit: str) -> None:
+    print()
+    print(f"Comparison with {baseline_commit}")
+    print("(change is relative to the reference workload timed before each sample)")
+    print(f"{'benchmark':<52} {'baseline':>10} {'current':>10} {'change':>8} {'interval':>17}  verdict")
+    print("-" * 113)
+    for row in rows:
+        if row["verdict"] == "new":
+            print(f"{row['name']:<52} {'-':>10} {row['current_ms']:9.3f}ms {'-':>8} {'-':>17}  new")
+            continue
+        low, high = row["interval_percent"]
+        interval = f"[{low:+.0f}%, {high:+.0f}%]"
+        print(
+            f"{row['name']:<52} {row['baseline_ms']:9.3f}ms {row['current_ms']:9.3f}ms "
+            f"{row['change_percent']:+7.1f}% {interval:>17}  {row['verdict']}"
+        )
+
+
+async def run_worker(args: argparse.Namespace) -> None:
+    """Measure every selected benchmark and print the raw samples as JSON."""
+    benchmarks = await build_benchmarks()
+    if args.filter:
+        benchmarks = {name: fn for name, fn in benchmarks.items() if re.search(args.filter, name)}
+
+    await time_loops(reference_workload, args.warmup)
+    # A quarter of a sample keeps the reference close in time to what it calibrates
+    reference_loops = await calibrate(reference_workload, args.min_sample_ms / 4000)
+
+    results = {}
+    for name, fn in benchmarks.items():
+        results[name] = await measure(fn, args.samples, args.min_sample_ms / 1000, args.warmup, reference_loops)
+    print(json.dumps(results))
+
+
+def spawn_workers(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run the benchmarks in fresh processes and pool their samples."""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "--worker",
+        "--samples", str(args.samples),
+        "--min-sample-ms", str(args.min_sample_ms),
+        "--warmup", str(args.warmup)
+    ]
+    if args.filter:
+        command += ["--filter", args.filter]
+
+    runs: Dict[str, List[Dict[str, Any]]] = {}
+    for i in range(args.processes):
+        if not args.json:
+            print(f"  worker {i + 1}/{args.processes}", file=sys.stderr)
+        completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Benchmark worker failed:\n{completed.stderr}")
+        # The results are the last line; anything before it is stray output
+        for name, result in json.loads(completed.stdout.strip().splitlines()[-1]).items():
+            runs.setdefault(name, []).append(result)
+    return {name: summarize(results) for name, results in runs.items()}
+
+
+async def run(args: argparse.Namespace) -> int:
+    results = spawn_workers(args)
+
+    commit = current_commit()
+    report: Dict[str, Any] = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {
+            "processes": args.processes,
+            "samples": args.samples,
+            "min_sample_ms": args.min_sample_ms,
+            "warmup": args.warmup
+        },
+        "benchmarks": results
+    }
+
+    exit_code = 0
+    comparison = None
+    if args.compare:
+        loaded = load_baseline(args.compare, commit)
+        if loaded is None:
+            print(f"No baseline found for '{args.compare}'", file=sys.stderr)
+        else:
+            path, baseline = loaded
+            if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+                print("Warning: baseline was recorded on a different machine", file=sys.stderr)
+            rows = compare(results, baseline["benchmarks"], args.alpha, args.threshold)
+            comparison = {"baseline": path.name, "baseline_commit": baseline.get("commit"), "rows": rows}
+            if args.fail_on_regression and any(row["verdict"] == "regression" for row in rows):
+                exit_code = 1
+
+    if args.save:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASELINE_DIR / f"{commit}.json"
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        if not args.json:
+            print(f"Saved baseline to {path.relative_to(ROOT)}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({**report, "comparison": comparison}, indent=2, ensure_ascii=False))
+    else:
+        print_results(results)
+        if comparison:
+            print_comparison(comparison["rows"], comparison["baseline_commit"])
+    return exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the micro and macro benchmark suite")
+    parser.add_argument("--filter", help="Only run benchmarks whose name matches this regex")
+    parser.add_argument("--processes", type=int, default=5, help="Worker processes whose samples are pooled")
+    parser.add_argument("--samples", type=int, default=15, help="Timing samples per benchmark and process")
+    parser.add_argument("--min-sample-ms", type=float, default=20.0, help="Minimum duration of one sample")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls before sampling")
+    parser.add_argument("--save", action="store_true", help="Save results as data/benchmarks/<commit>.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Commit id, path, or 'latest'")
+    parser.add_argument("--alpha", type=float, default=0.05, help="One minus the confidence level of the change interval")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Ignore relative changes below this percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with 1 on a significant regression")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Per-call logging would dominate the micro-benchmarks
+        logging.disable(logging.CRITICAL)
+        asyncio.run(run_worker(args))
+        return
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for search hit representations on the search proxy hot path.
+
+Compares building pydantic SearchHit models against the slotted HitRecord
+dataclass used between the search executor and the result ranker, reporting
+CPU time and peak allocations per batch of hits.
+
+Usage:
+    python tests/performance/hit_model_benchmark.py --hits 1000 --rounds 20
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.search_proxy.models.responses import SearchHit  # noqa: E402
+from src.search_proxy.models.search import HitRecord  # noqa: E402
+
+
+def make_raw_hits(count: int) -> List[Dict[str, Any]]:
+    """Create raw Meilisearch-style hits with Thai documents."""
+    return [
+        {
+            "id": f"doc_{i}",
+            "title": f"เอกสารภาษาไทย {i}",
+            "content": "การค้นหาเอกสารภาษาไทยด้วยการตัดคำ " * 20,
+            "category": "research",
+            "_rankingScore": 1.0 - (i / (count * 2)),
+            "_formatted": {"title": f"<em>เอกสาร</em>ภาษาไทย {i}"}
+        }
+        for i in range(count)
+    ]
+
+
+def build_hits(raw_hits: List[Dict[str, Any]], hit_class: Callable[..., Any]) -> List[Any]:
+    """Convert raw hits the same way SearchExecutor does."""
+    hits = []
+    for hit in raw_hits:
+        score = float(hit.get("_rankingScore", hit.get("_score", 0.0)))
+        hits.append(hit_class(
+            id=str(hit.get("id", "")),
+            score=score,
+            document={k: v for k, v in hit.items() if not k.startswith("_")},
+            highlight=hit.get("_formatted", {}),
+            ranking_info={
+                "base_score": score,
+                "variant_weight": 1.0,
+                "variant_type": "tokenized",
+                "tokenization_engine": "newmm"
+            }
+        ))
+    return hits
+
+
+def measure(raw_hits: List[Dict[str, Any]], hit_class: Callable[..., Any], rounds: int) -> Dict[str, float]:
+    """Measure CPU time and peak allocation for building a batch of hits."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        build_hits(raw_hits, hit_class)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    hits = build_hits(raw_hits, hit_class)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del hits
+
+    return {
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "peak_alloc_kb": peak / 1024
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search hit representations")
+    parser.add_argument("--hits", type=int, default=1000, help="Hits per batch")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed rounds per representation")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    raw_hits = make_raw_hits(args.hits)
+
+    # Warm up both code paths
+    build_hits(raw_hits[:10], SearchHit)
+    build_hits(raw_hits[:10], HitRecord)
+
+    pydantic_stats = measure(raw_hits, SearchHit, args.rounds)
+    record_stats = measure(raw_hits, HitRecord, args.rounds)
+
+    report = {
+        "hits": args.hits,
+        "rounds": args.rounds,
+        "pydantic_search_hit": pydantic_stats,
+        "hit_record": record_stats,
+        "cpu_speedup": pydantic_stats["median_ms"] / record_stats["median_ms"],
+        "alloc_reduction_percent": (
+            (1 - record_stats["peak_alloc_kb"] / pydantic_stats["peak_alloc_kb"]) * 100
+        )
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Hit representation benchmark ({args.hits} hits x {args.rounds} rounds)")
+    print("=" * 60)
+    for name in ("pydantic_search_hit", "hit_record"):
+        stats = report[name]
+        print(
+            f"{name:<22} median {stats['median_ms']:8.2f} ms   "
+            f"min {stats['min_ms']:8.2f} ms   peak {stats['peak_alloc_kb']:9.1f} KB"
+        )
+    print("-" * 60)
+    print(f"CPU speedup:          {report['cpu_speedup']:.2f}x")
+    print(f"Allocation reduction: {report['alloc_reduction_percent']:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the Thai Search Proxy API.
+
+Unlike load_test.py, which keeps a fixed number of clients waiting on
+their own responses (closed loop), this generator sends requests at a fixed
+arrival rate whether or not earlier requests have completed. Latency is
+measured from the moment a request was *scheduled* to be sent, so queueing
+delay caused by a slow server is included instead of being hidden by the
+client backing off (coordinated omission).
+
+Rates can be held constant, stepped or ramped to find the knee of the
+latency/throughput curve. Results are written as JSON and, optionally, as
+.hgrm percentile distributions per phase.
+
+Examples:
+    # 200 req/s for 60 s with the default endpoint mix
+    python tests/performance/open_loop_load.py --rate 200 --duration 60
+
+    # Step from 50 to 500 req/s in 50 req/s increments, 30 s each
+    python tests/performance/open_loop_load.py --profile step --start-rate 50 \\
+        --step-rate 50 --steps 10 --phase-duration 30 --output step.json
+
+    # Linear ramp from 10 to 300 req/s over 120 s, in 10 s windows
+    python tests/performance/open_loop_load.py --profile ramp --start-rate 10 \\
+        --end-rate 300 --duration 120 --phase-duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.utils.hdr_histogram import HdrHistogram, merge_histograms  # noqa: E402
+
+
+DEFAULT_QUERIES_FILE = Path(__file__).resolve().parents[2] / "data" / "samples" / "test_queries.json"
+DEFAULT_MIX = "search=80,batch-search=10,tokenize=10"
+MAX_LATENCY_US = 60_000_000
+
+ENDPOINT_PATHS = {
+    "search": "/api/v1/search",
+    "batch-search": "/api/v1/batch-search",
+    "tokenize": "/api/v1/tokenize",
+}
+
+
+@dataclass
+class Phase:
+    """A period of constant offered load."""
+
+    name: str
+    rate: float
+    duration: float
+
+
+@dataclass
+class PhaseResult:
+    """Measurements for one phase."""
+
+    phase: Phase
+    response_time: Dict[str, HdrHistogram] = field(default_factory=dict)
+    service_time: Dict[str, HdrHistogram] = field(default_factory=dict)
+    scheduled: int = 0
+    completed: int = 0
+    dropped: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    def histogram(self, kind: str, endpoint: str) -> HdrHistogram:
+        histograms = self.response_time if kind == "response_time" else self.service_time
+        if endpoint not in histograms:
+            histograms[endpoint] = HdrHistogram(1, MAX_LATENCY_US, 3)
+        return histograms[endpoint]
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+
+class RequestFactory:
+    """Builds request bodies from the sample query set."""
+
+    def __init__(self, queries: List[str], index_name: str, batch_size: int, seed: int):
+        if not queries:
+            raise ValueError("No queries to send")
+        self.queries = queries
+        self.index_name = index_name
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+
+    def build(self, endpoint: str) -> Dict[str, Any]:
+        if endpoint == "search":
+            return {
+                "query": self.random.choice(self.queries),
+                "index_name": self.index_name,
+                "options": {"limit": 10}
+            }
+        if endpoint == "batch-search":
+            return {
+                "queries": self.random.sample(self.queries, min(self.batch_size, len(self.queries))),
+                "index_name": self.index_name,
+                "options": {"limit": 10}
+            }
+        if endpoint == "tokenize":
+            return {"text": self.random.choice(self.queries)}
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def load_queries(path: Path) -> List[str]:
+    """Load query strings from a test_queries.json style file."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    queries = [item["query"] if isinstance(item, dict) else item for item in data]
+    return [query for query in queries if isinstance(query, str) and query.strip()]
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """Parse "search=80,tokenize=20" into normalized endpoint weights."""
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINT_PATHS:
+            raise ValueError(f"Unknown endpoint in mix: {name!r} (choose from {', '.join(ENDPOINT_PATHS)})")
+        mix.append((name, float(weight or 1)))
+    total = sum(weight for _, weight in mix)
+    if total <= 0:
+        raise ValueError("Mix weights must be positive")
+    return [(name, weight / total) for name, weight in mix]
+
+
+def build_phases(args: argparse.Namespace) -> List[Phase]:
+    """Turn the profile arguments into constant-rate phases."""
+    if args.profile == "constant":
+        return [Phase("constant", args.rate, args.duration)]
+    if args.profile == "step":
+        return [
+            Phase(f"step-{i + 1}", args.start_rate + i * args.step_rate, args.phase_duration)
+            for i in range(args.steps)
+        ]
+    windows = max(1, int(round(args.duration / args.phase_duration)))
+    phases = []
+    for i in range(windows):
+        # Each window runs at the ramp's rate at its midpoint
+        fraction = (i + 0.5) / windows
+        rate = args.start_rate + (args.end_rate - args.start_rate) * fraction
+        phases.append(Phase(f"ramp-{i + 1}", rate, args.duration / windows))
+    return phases
+
+
+def arrival_offsets(rate: float, duration: float, arrivals: str, rng: random.Random) -> List[float]:
+    """Intended send times, relative to the phase start, in seconds."""
+    if rate <= 0:
+        return []
+    offsets = []
+    if arrivals == "poisson":
+        t = rng.expovariate(rate)
+        while t < duration:
+            offsets.append(t)
+            t += rng.expovariate(rate)
+    else:
+        interval = 1.0 / rate
+        t = 0.0
+        while t < duration:
+            offsets.append(t)
+            t += interval
+    return offsets
+
+
+class OpenLoopRunner:
+    """Sends requests on a fixed schedule and records their latencies."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        factory: RequestFactory,
+        mix: List[Tuple[str, float]],
+        arrivals: str = "uniform",
+        max_in_flight: int = 10000,
+        seed: int = 0,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        self.client = client
+        self.factory = factory
+        self.mix = mix
+        self.arrivals = arrivals
+        self.max_in_flight = max_in_flight
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.in_flight = 0
+
+    def _choose_endpoint(self) -> str:
+        point = self.random.random()
+        for name, weight in self.mix:
+            point -= weight
+            if point < 0:
+                return name
+        return self.mix[-1][0]
+
+    async def _send(self, result: PhaseResult, endpoint: str, body: Dict[str, Any], intended: float) -> None:
+        self.in_flight += 1
+        sent = self.clock()
+        try:
+            response = await self.client.post(ENDPOINT_PATHS[endpoint], json=body)
+            finished = self.clock()
+            if response.status_code >= 400:
+                key = f"{endpoint}:{response.status_code}"
+                result.errors[key] = result.errors.get(key, 0) + 1
+        except httpx.HTTPError as e:
+            finished = self.clock()
+            key = f"{endpoint}:{type(e).__name__}"
+            result.errors[key] = result.errors.get(key, 0) + 1
+        finally:
+            self.in_flight -= 1
+
+        result.completed += 1
+        # Response time counts from the intended send time, so any delay in
+        # getting the request out (client or server backlog) is included
+        response_us = min((finished - intended) * 1_000_000, MAX_LATENCY_US)
+        service_us = min((finished - sent) * 1_000_000, MAX_LATENCY_US)
+        for name in (endpoint, "all"):
+            result.histogram("response_time", name).record_value(response_us)
+            result.histogram("service_time", name).record_value(service_us)
+
+    async def run_phase(self, phase: Phase, drain_timeout: float = 30.0) -> PhaseResult:
+        """Run one phase and wait for its requests to finish."""
+        result = PhaseResult(phase=phase)
+        offsets = arrival_offsets(phase.rate, phase.duration, self.arrivals, self.random)
+        tasks = []
+
+        start = self.clock()
+        result.started_at = time.time()
+        for offset in offsets:
+            intended = start + offset
+            delay = intended - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            result.scheduled += 1
+            if self.in_flight >= self.max_in_flight:
+                result.dropped += 1
+                continue
+            endpoint = self._choose_endpoint()
+            body = self.factory.build(endpoint)
+            tasks.append(asyncio.create_task(self._send(result, endpoint, body, intended)))
+
+        remaining = phase.duration - (self.clock() - start)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=drain_timeout)
+            for task in pending:
+                task.cancel()
+            result.dropped += len(pending)
+        result.finished_at = time.time()
+        return result
+
+
+def summarize_phase(result: PhaseResult, elapsed: float) -> Dict[str, Any]:
+    """Machine-readable summary of one phase, latencies in milliseconds."""
+    def to_ms(histogram: HdrHistogram) -> Dict[str, Any]:
+        summary = histogram.to_dict()
+        return {
+            "count": summary["count"],
+            "min": summary["min"] / 1000,
+            "max": summary["max"] / 1000,
+            "mean": round(summary["mean"] / 1000, 3),
+            "stdev": round(summary["stdev"] / 1000, 3),
+            "percentiles": {name: value / 1000 for name, value in summary["percentiles"].items()}
+        }
+
+    return {
+        "name": result.phase.name,
+        "offered_rate": round(result.phase.rate, 3),
+        "duration_s": result.phase.duration,
+        "scheduled": result.scheduled,
+        "completed": result.completed,
+        "dropped": result.dropped,
+        "achieved_rate": round(result.completed / elapsed, 3) if elapsed > 0 else 0.0,
+        "error_count": result.error_count,
+        "error_rate": round(result.error_count / result.scheduled, 4) if result.scheduled else 0.0,
+        "errors": dict(sorted(result.errors.items())),
+        "response_time_ms": {name: to_ms(h) for name, h in sorted(result.response_time.items())},
+        "service_time_ms": {name: to_ms(h) for name, h in sorted(result.service_time.items())},
+    }
+
+
+def find_knee(
+    phases: List[Dict[str, Any]],
+    slo_p99_ms: float,
+    max_error_rate: float,
+    min_throughput_ratio: float
+) -> Dict[str, Any]:
+    """
+    Locate the first phase where the system stops keeping up.
+
+    A phase is saturated when achieved throughput falls below
+    min_throughput_ratio of the offered rate, p99 response time exceeds the
+    SLO, or the error rate exceeds max_error_rate.
+    """
+    last_good = None
+    for phase in phases:
+        reasons = []
+        if phase["offered_rate"] and phase["achieved_rate"] < min_throughput_ratio * phase["offered_rate"]:
+            reasons.append("throughput")
+        p99 = phase["response_time_ms"].get("all", {}).get("percentiles", {}).get("p99", 0.0)
+        if p99 > slo_p99_ms:
+            reasons.append("p99_latency")
+        if phase["error_rate"] > max_error_rate or phase["dropped"]:
+            reasons.append("errors")
+        if reasons:
+            return {
+                "knee_phase": phase["name"],
+                "knee_rate": phase["offered_rate"],
+                "reasons": reasons,
+                "max_sustainable_rate": last_good["offered_rate"] if last_good else None
+            }
+        last_good = phase
+    return {
+        "knee_phase": None,
+        "knee_rate": None,
+        "reasons": [],
+        "max_sustainable_rate": last_good["offered_rate"] if last_good else None
+    }
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    print(f"{'phase':<12} {'offered':>9} {'achieved':>9} {'p50':>9} {'p99':>9} {'p99.9':>9} {'max':>9} {'errors':>7}")
+    for phase in report["phases"]:
+        latency = phase["response_time_ms"].get("all", {"percentiles": {}, "max": 0.0})
+        percentiles = latency["percentiles"]
+        print(
+            f"{phase['name']:<12} {phase['offered_rate']:>9.1f} {phase['achieved_rate']:>9.1f} "
+            f"{percentiles.get('p50', 0):>9.2f} {percentiles.get('p99', 0):>9.2f} "
+            f"{percentiles.get('p99.9', 0):>9.2f} {latency['max']:>9.2f} "
+            f"{phase['error_count'] + phase['dropped']:>7}"
+        )
+    knee = report["knee"]
+    if knee["knee_phase"]:
+        print(f"\nKnee at {knee['knee_rate']:.1f} req/s ({', '.join(knee['reasons'])}); "
+              f"max sustainable rate: {knee['max_sustainable_rate']}")
+    else:
+        print(f"\nNo knee found; highest rate tested: {knee['max_sustainable_rate']}")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    queries = load_queries(Path(args.queries))
+    factory = RequestFactory(queries, args.index, args.batch_size, args.seed)
+    mix = parse_mix(args.mix)
+    phases = build_phases(args)
+
+    headers = {"Content-Type": "application/json"}
+    if args.api_key:
+        headers["X-API-Key"] = args.api_key
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    timeout = httpx.Timeout(args.timeout)
+
+    results = []
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=timeout) as client:
+        runner = OpenLoopRunner(client, factory, mix, args.arrivals, args.max_in_flight, args.seed)
+        for phase in phases:
+            print(f"Running {phase.name}: {phase.rate:.1f} req/s for {phase.duration:.0f}s", file=sys.stderr)
+            start = time.perf_counter()
+            result = await runner.run_phase(phase, drain_timeout=args.timeout)
+            results.append((result, time.perf_counter() - start))
+
+    summaries = [summarize_phase(result, elapsed) for result, elapsed in results]
+    overall = merge_histograms([result.histogram("response_time", "all") for result, _ in results])
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "target": args.url,
+        "settings": {
+            "profile": args.profile,
+            "arrivals": args.arrivals,
+            "mix": dict(mix),
+            "connections": args.connections,
+            "max_in_flight": args.max_in_flight,
+            "timeout_s": args.timeout,
+            "seed": args.seed,
+            "queries": len(queries)
+        },
+        "phases": summaries,
+        "overall_response_time_ms": {
+            name: value / 1000 for name, value in overall.percentiles().items()
+        },
+        "knee": find_knee(summaries, args.slo_p99_ms, args.max_error_rate, args.min_throughput_ratio)
+    }
+
+    if args.hgrm_dir:
+        os.makedirs(args.hgrm_dir, exist_ok=True)
+        for result, _ in results:
+            for endpoint, histogram in result.response_time.items():
+                path = Path(args.hgrm_dir) / f"{result.phase.name}.{endpoint}.hgrm"
+                path.write_text(histogram.percentile_distribution(value_scale=1000), encoding="utf-8")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the Thai Search Proxy API")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the API")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY"), help="Value for the X-API-Key header")
+    parser.add_argument("--index", default="documents", help="Index name used in search requests")
+    parser.add_argument("--queries", default=str(DEFAULT_QUERIES_FILE), help="JSON file with queries")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Endpoint weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--batch-size", type=int, default=5, help="Queries per batch-search request")
+
+    parser.add_argument("--profile", choices=["constant", "step", "ramp"], default="constant")
+    parser.add_argument("--rate", type=float, default=50.0, help="Requests per second (constant profile)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Total seconds (constant and ramp profiles)")
+    parser.add_argument("--start-rate", type=float, default=10.0, help="First rate (step and ramp profiles)")
+    parser.add_argument("--step-rate", type=float, default=10.0, help="Rate increment per step")
+    parser.add_argument("--steps", type=int, default=10, help="Number of steps")
+    parser.add_argument("--end-rate", type=float, default=200.0, help="Final rate (ramp profile)")
+    parser.add_argument("--phase-duration", type=float, default=30.0, help="Seconds per step or ramp window")
+    parser.add_argument("--arrivals", choices=["uniform", "poisson"], default="uniform",
+                        help="Evenly spaced or Poisson-distributed arrivals")
+
+    parser.add_argument("--connections", type=int, default=256, help="Maximum HTTP connections")
+    parser.add_argument("--max-in-flight", type=int, default=10000,
+                        help="Outstanding requests above which new arrivals are counted as dropped")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for queries and arrivals")
+
+    parser.add_argument("--slo-p99-ms", type=float, default=100.0, help="p99 response time target for the knee")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Error rate marking saturation")
+    parser.add_argument("--min-throughput-ratio", type=float, default=0.9,
+                        help="Achieved/offered throughput below which a phase is saturated")
+
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--hgrm-dir", help="Write .hgrm percentile distributions to this directory")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_summary(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark search response serialization paths.
+
+Compares FastAPI's default response path (jsonable_encoder + json.dumps)
+against PydanticJSONResponse, with and without per-hit ranking_info and
+gzip compression, reporting bytes on the wire and CPU time per response.
+
+Usage:
+    python tests/performance/response_serialization_benchmark.py --hits 100 --rounds 50
+"""
+
+import argparse
+import gzip
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from src.api.serialization import PydanticJSONResponse  # noqa: E402
+from src.search_proxy.models.responses import (  # noqa: E402
+    PaginationInfo,
+    QueryInfo,
+    SearchHit,
+    SearchResponse
+)
+
+
+def make_response(hit_count: int, include_ranking_info: bool) -> SearchResponse:
+    """Build a search response page with full Thai documents."""
+    hits = [
+        SearchHit(
+            id=f"doc_{i}",
+            score=1.0 - i / (hit_count * 2),
+            document={
+                "id": f"doc_{i}",
+                "title": f"การค้นหาเอกสารภาษาไทย ตอนที่ {i}",
+                "content": "ระบบค้นหาข้อความภาษาไทยด้วยการตัดคำและจัดอันดับผลลัพธ์ " * 40,
+                "tags": ["ภาษาไทย", "การค้นหา", "search"],
+                "category": "research"
+            },
+            highlight={"title": f"<em>การค้นหา</em>เอกสารภาษาไทย ตอนที่ {i}"},
+            ranking_info={
+                "base_score": 0.8,
+                "variant_weight": 1.0,
+                "variant_type": "tokenized",
+                "tokenization_engine": "newmm",
+                "ranking_metadata": {
+                    "base_score": 0.8,
+                    "final_score": 0.92,
+                    "thai_boost": 1.2,
+                    "exact_match_boost": 1.0,
+                    "tokenization_boost": 1.05,
+                    "ranking_factors": {"content_length": 0.98, "position": 1.0}
+                }
+            } if include_ranking_info else None,
+            match_type="tokenized",
+            query_variant_source="tokenized",
+            original_meilisearch_score=0.8,
+            thai_content_ratio=0.95
+        )
+        for i in range(hit_count)
+    ]
+    return SearchResponse(
+        hits=hits,
+        total_hits=hit_count * 10,
+        processing_time_ms=42.0,
+        query_info=QueryInfo(
+            original_query="ค้นหาเอกสาร",
+            processed_query="ค้นหา เอกสาร",
+            thai_content_detected=True,
+            mixed_content=False,
+            query_variants_used=3
+        ),
+        pagination=PaginationInfo(
+            offset=0,
+            limit=hit_count,
+            total_hits=hit_count * 10,
+            has_next_page=True,
+            has_previous_page=False
+        )
+    )
+
+
+def default_path(response: SearchResponse) -> bytes:
+    """Approximate FastAPI's default path for a returned model."""
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def fast_path(response: SearchResponse) -> bytes:
+    """Direct pydantic-core serialization."""
+    return PydanticJSONResponse(response).body
+
+
+def measure(render: Callable[[], bytes], rounds: int, compress: bool) -> Dict[str, Any]:
+    """Time rendering (and optionally gzip) of a response."""
+    timings = []
+    body = b""
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = render()
+        if compress:
+            body = gzip.compress(body, compresslevel=5)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "bytes": len(body)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search response serialization")
+    parser.add_argument("--hits", type=int, default=100, help="Hits per response page")
+    parser.add_argument("--rounds", type=int, default=50, help="Timed rounds per scenario")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args()
+
+    with_debug = make_response(args.hits, include_ranking_info=True)
+    without_debug = make_response(args.hits, include_ranking_info=False)
+
+    # Both paths must produce the same document
+    assert json.loads(default_path(with_debug)) == json.loads(fast_path(with_debug))
+
+    scenarios = {
+        "default": lambda: default_path(with_debug),
+        "fast": lambda: fast_path(with_debug),
+        "fast_no_ranking_info": lambda: fast_path(without_debug),
+    }
+
+    report: Dict[str, Any] = {"hits": args.hits, "rounds": args.rounds, "results": {}}
+    for name, render in scenarios.items():
+        render()  # warm up
+        report["results"][name] = measure(render, args.rounds, compress=False)
+        report["results"][f"{name}_gzip"] = measure(render, args.rounds, compress=True)
+
+    baseline = report["results"]["default"]
+    report["cpu_speedup"] = baseline["median_ms"] / report["results"]["fast"]["median_ms"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Search response serialization ({args.hits} hits x {args.rounds} rounds)")
+    print("=" * 72)
+    for name, stats in report["results"].items():
+        print(
+            f"{name:<28} median {stats['median_ms']:8.2f} ms   "
+            f"min {stats['min_ms']:8.2f} ms   {stats['bytes']:>10,} bytes"
+        )
+    print("-" * 72)
+    print(f"Serialization speedup (default -> fast): {report['cpu_speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for asynchronous batched logging, lazy formatting and sampling.
+"""
+
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from src.utils.logging import (
+    AsyncLogWriter,
+    JSONFormatter,
+    QueuedHandler,
+    configure_log_sampling,
+    correlation_id_var,
+    get_log_sampling_stats,
+    get_structured_logger,
+)
+
+
+class SlowStream(io.StringIO):
+    """Stream whose writes take a while, like stdout under backpressure."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.writes += 1
+        return super().write(text)
+
+
+def make_logger(name, stream, writer, level=logging.INFO):
+    target = logging.StreamHandler(stream)
+    target.setFormatter(JSONFormatter())
+    stdlib_logger = logging.getLogger(name)
+    stdlib_logger.handlers = [QueuedHandler(target, writer)]
+    stdlib_logger.setLevel(level)
+    stdlib_logger.propagate = False
+    return get_structured_logger(name)
+
+
+@pytest.fixture
+def writer():
+    writer = AsyncLogWriter()
+    yield writer
+    writer.stop()
+
+
+class TestAsyncLogWriter:
+    """Test cases for the background log writer."""
+
+    def test_slow_stream_does_not_block_callers(self, writer):
+        """Test records are written in batches off the calling thread."""
+        stream = SlowStream(delay=0.05)
+        logger = make_logger("test.async.slow", stream, writer)
+
+        started = time.perf_counter()
+        for i in range(50):
+            logger.info("Search completed", hits=i)
+        elapsed = time.perf_counter() - started
+
+        assert writer.flush()
+        lines = stream.getvalue().splitlines()
+        assert elapsed < 0.05 * 5
+        assert [json.loads(line)["hits"] for line in lines] == list(range(50))
+        assert stream.writes < 50
+        assert writer.get_stats()["records_written"] == 50
+
+    def test_formatting_happens_on_writer_thread(self, writer):
+        """Test log values are serialized by the writer, not the caller."""
+        stream = io.StringIO()
+        logger = make_logger("test.async.lazy", stream, writer)
+
+        class ThreadName:
+            def __str__(self):
+                return threading.current_thread().name
+
+        logger.info("Lazy", value=ThreadName())
+        writer.flush()
+
+        assert json.loads(stream.getvalue())["value"] == "log-writer"
+
+    def test_full_queue_drops_records(self, writer):
+        """Test a full queue drops and counts records instead of blocking."""
+        writer.configure(queue_size=2)
+        stream = SlowStream(delay=0.2)
+        logger = make_logger("test.async.full", stream, writer)
+
+        started = time.perf_counter()
+        for i in range(20):
+            logger.info("Flood", i=i)
+
+        assert time.perf_counter() - started < 0.2
+        assert writer.records_dropped > 0
+        writer.flush()
+        assert "Dropped" in stream.getvalue()
+
+    def test_context_is_captured_for_stdlib_records(self, writer):
+        """Test the correlation ID of plain logging calls is taken from the caller."""
+        stream = io.StringIO()
+        make_logger("test.async.stdlib", stream, writer)
+
+        token = correlation_id_var.set("req-42")
+        try:
+            logging.getLogger("test.async.stdlib").warning("Plain %s", "record")
+        finally:
+            correlation_id_var.reset(token)
+        writer.flush()
+
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "Plain record"
+        assert entry["correlation_id"] == "req-42"
+
+    def test_later_mutation_does_not_change_output(self, writer):
+        """Test arguments changed by the caller after logging are logged as they were."""
+        stream = SlowStream(delay=0.05)
+        logger = make_logger("test.async.snapshot", stream, writer)
+        stdlib_logger = logging.getLogger("test.async.snapshot")
+        details = {"hits": 1}
+        variants = ["ไทย"]
+        args = ["first"]
+
+        logger.info("Search", extra=details, variants=variants)
+        stdlib_logger.info("Plain %s", args)
+        details["hits"] = 2
+        variants.append("อังกฤษ")
+        args[0] = "changed"
+        writer.flush()
+
+        structured, plain = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert structured["extra"] == {"hits": 1}
+        assert structured["variants"] == ["ไทย"]
+        assert plain["message"] == "Plain ['first']"
+
+
+class TestLazyLogging:
+    """Test cases for skipping disabled and sampled-out records."""
+
+    def test_disabled_level_skips_record(self, writer):
+        """Test no record is built when the level is disabled."""
+        stream = io.StringIO()
+        logger = make_logger("test.lazy.disabled", stream, writer, level=logging.WARNING)
+
+        logger.info("Skipped", value=object())
+        logger.warning("Kept")
+        writer.flush()
+
+        assert [json.loads(line)["message"] for line in stream.getvalue().splitlines()] == ["Kept"]
+        assert not logger.isEnabledFor(logging.INFO)
+
+    def test_sampling_and_rate_limit(self, writer):
+        """Test per-logger sampling and rate limits apply below WARNING only."""
+        stream = io.StringIO()
+        sampled = make_logger("test.lazy.sampled", stream, writer)
+        child = get_structured_logger("test.lazy.sampled.child")
+        limited = make_logger("test.lazy.limited", stream, writer)
+        configure_log_sampling("test.lazy.sampled", sample_rate=0.0)
+        configure_log_sampling("test.lazy.limited", max_per_second=5)
+        try:
+            for _ in range(100):
+                sampled.info("Sampled out")
+                child.info("Sampled out")
+                limited.info("Limited")
+            sampled.warning("Always kept")
+            writer.flush()
+            stats = get_log_sampling_stats()
+        finally:
+            configure_log_sampling("test.lazy.sampled")
+            configure_log_sampling("test.lazy.limited")
+
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        assert messages.count("Sampled out") == 0
+        assert 5 <= messages.count("Limited") <= 6
+        assert messages.count("Always kept") == 1
+        assert stats["test.lazy.sampled"]["dropped"] == 200
+        assert "test.lazy.sampled" not in get_log_sampling_stats()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the batch tokenization endpoint.
+"""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.tokenize import router, get_thai_segmenter, _stream_batch_tokenization
+from src.api.models.requests import BatchTokenizeRequest
+from src.tokenizer.thai_segmenter import ThaiSegmenter
+
+
+class TestBatchTokenizeEndpoint:
+    """Test cases for the /tokenize/batch endpoint."""
+
+    @pytest.fixture
+    def segmenter(self):
+        """Create a Thai segmenter that records calls."""
+        real_segmenter = ThaiSegmenter()
+        segmenter = MagicMock(wraps=real_segmenter)
+        segmenter.segment_text = MagicMock(side_effect=real_segmenter.segment_text)
+        segmenter.segment_compound_words = MagicMock(side_effect=real_segmenter.segment_compound_words)
+        return segmenter
+
+    @pytest.fixture
+    def client(self, segmenter):
+        """Create a test client with the segmenter dependency overridden."""
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        app.dependency_overrides[get_thai_segmenter] = lambda: segmenter
+        return TestClient(app)
+
+    def _parse(self, response):
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_results_are_streamed_in_order(self, client):
+        """Test NDJSON output preserves request order."""
+        texts = ["สวัสดีครับ", "ระบบค้นหาข้อความภาษาไทย", "", "hello world"]
+
+        response = client.post("/api/v1/tokenize/batch", json={"texts": texts})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = self._parse(response)
+        assert [item["index"] for item in items] == [0, 1, 2, 3]
+        assert [item["original_text"] for item in items] == texts
+        assert "ค้นหา" in items[1]["tokens"]
+        assert items[2]["tokens"] == []
+        assert all(item["error"] is None for item in items)
+
+    def test_duplicate_texts_are_segmented_once(self, client, segmenter):
+        """Test identical strings are deduplicated before segmentation."""
+        texts = ["สวัสดีครับ", "ภาษาไทย", "สวัสดีครับ", "ภาษาไทย", "สวัสดีครับ"]
+
+        response = client.post("/api/v1/tokenize/batch", json={"texts": texts})
+
+        items = self._parse(response)
+        assert len(items) == 5
+        assert items[0]["tokens"] == items[2]["tokens"] == items[4]["tokens"]
+        assert segmenter.segment_text.call_count == 2
+
+    def test_compound_and_confidence_options(self, client, segmenter):
+        """Test compound segmentation and confidence scores."""
+        response = client.post(
+            "/api/v1/tokenize/batch",
+            json={"texts": ["วากาเมะ"], "compound": True, "include_confidence": True}
+        )
+
+        item = self._parse(response)[0]
+        assert segmenter.segment_compound_words.call_count == 1
+        assert item["confidence_scores"] == [0.85] * len(item["tokens"])
+
+    def test_failed_text_is_reported_inline(self, client, segmenter):
+        """Test a failing text produces an error line without aborting the stream."""
+        real_segment = segmenter.segment_text.side_effect
+
+        def segment_or_fail(text):
+            if text == "bad":
+                raise RuntimeError("boom")
+            return real_segment(text)
+
+        segmenter.segment_text.side_effect = segment_or_fail
+
+        response = client.post("/api/v1/tokenize/batch", json={"texts": ["bad", "ภาษาไทย"]})
+
+        items = self._parse(response)
+        assert items[0]["error"] is not None
+        assert items[1]["error"] is None
+        assert items[1]["tokens"]
+
+    def test_empty_batch_is_rejected(self, client):
+        """Test validation of an empty texts list."""
+        response = client.post("/api/v1/tokenize/batch", json={"texts": []})
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_chunks_span_duplicates(self, segmenter):
+        """Test chunking by distinct texts while emitting every input position."""
+        texts = ["ก", "ข", "ก", "ค", "ข", "ง", "ก"]
+        request = BatchTokenizeRequest(texts=texts)
+
+        chunks = [
+            chunk async for chunk in _stream_batch_tokenization(request, segmenter, chunk_size=2)
+        ]
+
+        lines = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+        assert [line["index"] for line in lines] == list(range(len(texts)))
+        assert [line["original_text"] for line in lines] == texts
+        assert len(chunks) == 2
+        assert segmenter.segment_text.call_count == 4
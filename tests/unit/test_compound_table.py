@@ -0,0 +1,218 @@
+"""
+Unit tests for the precomputed compound decomposition table.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.search_proxy.config.settings import SearchProxySettings
+from src.search_proxy.services.query_processor import QueryProcessor as SearchQueryProcessor
+from src.tokenizer.compound_table import (
+    CompoundTable,
+    best_decomposition,
+    build_compound_table,
+    default_table_path,
+    dictionary_version,
+    load_compound_table,
+    split_with_vocabulary
+)
+from src.tokenizer.factory import TokenizerFactory
+from src.tokenizer.thai_segmenter import ThaiSegmenter, TokenizationResult
+from src.tokenizer.token_processor import TokenProcessor
+from src.tokenizer.query_processor import QueryProcessor
+
+
+VOCABULARY = {"การ", "ศึกษา", "ภาษา", "ไทย", "สาหร่าย", "วา", "กา", "เมะ"}
+
+
+@pytest.fixture
+def table():
+    """Small precomputed table."""
+    return CompoundTable(
+        entries={
+            "การศึกษา": ("การ", "ศึกษา"),
+            "วากาเมะ": ("วากาเมะ",)
+        },
+        dictionary_version="test"
+    )
+
+
+class TestCompoundTable:
+    """Test cases for CompoundTable."""
+
+    def test_lookup(self, table):
+        """Test hits return parts and misses return None."""
+        assert table.lookup("การศึกษา") == ("การ", "ศึกษา")
+        assert table.lookup("วากาเมะ") == ("วากาเมะ",)
+        assert table.lookup("ภาษาไทย") is None
+
+        stats = table.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_overlay_is_bounded(self, table):
+        """Test runtime additions evict the oldest entry when full."""
+        table.max_overlay_size = 2
+        table.add("ก1", ["ก", "1"])
+        table.add("ก2", ["ก", "2"])
+        table.add("ก3", ["ก", "3"])
+
+        assert "ก1" not in table
+        assert table.lookup("ก3") == ("ก", "3")
+        assert table.get_stats()["overlay_entries"] == 2
+
+    def test_concurrent_adds(self, table):
+        """Test adds from several threads keep the overlay bounded and consistent."""
+        table.max_overlay_size = 10
+
+        def add_words(thread):
+            for i in range(2000):
+                table.add(f"ก{thread}-{i}", ["ก", str(i)])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(add_words, range(8)))
+
+        assert table.get_stats()["overlay_entries"] == 10
+
+    def test_add_does_not_override_precomputed(self, table):
+        """Test runtime results never replace offline decompositions."""
+        table.add("การศึกษา", ["การศึกษา"])
+
+        assert table.lookup("การศึกษา") == ("การ", "ศึกษา")
+
+    def test_save_and_load_roundtrip(self, table, tmp_path):
+        """Test the compact file format round-trips and skips the overlay."""
+        table.add("ภาษาไทย", ["ภาษา", "ไทย"])
+        path = tmp_path / "table.json"
+
+        table.save(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        loaded = CompoundTable.load(path)
+
+        assert data["entries"] == {"การศึกษา": "การ|ศึกษา", "วากาเมะ": ""}
+        assert loaded.entries == table.entries
+        assert loaded.dictionary_version == "test"
+        assert loaded.lookup("ภาษาไทย") is None
+
+    def test_load_rejects_unknown_version(self, tmp_path):
+        """Test tables written by an unknown format version are rejected."""
+        path = tmp_path / "table.json"
+        path.write_text(json.dumps({"version": 99, "entries": {}}), encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            CompoundTable.load(path)
+
+
+class TestLoadCompoundTable:
+    """Test cases for loading the table shipped with a dictionary."""
+
+    def test_default_path(self):
+        """Test the table lives next to the dictionary."""
+        path = default_table_path("data/dictionaries/thai_compounds.json")
+
+        assert path.as_posix() == "data/dictionaries/thai_compounds.decompositions.json"
+
+    def test_missing_table(self, tmp_path):
+        """Test a missing table is not an error."""
+        assert load_compound_table(tmp_path / "dict.json") is None
+
+    def test_stale_table_still_loads(self, table, tmp_path):
+        """Test a table built from another dictionary version is still used."""
+        dict_path = tmp_path / "dict.json"
+        table.save(default_table_path(dict_path))
+
+        loaded = load_compound_table(dict_path, dictionary_words=["การศึกษา", "ใหม่"])
+
+        assert loaded is not None
+        assert loaded.lookup("การศึกษา") == ("การ", "ศึกษา")
+
+    def test_shipped_table_matches_dictionary(self):
+        """Test the committed table was built from the committed dictionary."""
+        dict_path = "data/dictionaries/thai_compounds.json"
+        with open(dict_path, encoding="utf-8") as f:
+            words = [w.strip() for entries in json.load(f).values() for w in entries if w.strip()]
+
+        table = load_compound_table(dict_path)
+
+        assert table is not None
+        assert table.dictionary_version == dictionary_version(words)
+        assert all(word in table for word in words)
+
+
+class TestBuildCompoundTable:
+    """Test cases for the offline build."""
+
+    def test_split_with_vocabulary(self):
+        """Test the fewest-parts vocabulary split never uses the word itself."""
+        assert split_with_vocabulary("การศึกษา", VOCABULARY | {"การศึกษา"}) == ["การ", "ศึกษา"]
+        assert split_with_vocabulary("ภาษาจีน", VOCABULARY) is None
+
+    def test_short_syllable_splits_are_rejected(self):
+        """Test transliterated loanwords are not broken into syllables."""
+        assert best_decomposition("วากาเมะ", VOCABULARY, engines=()) == ("วากาเมะ",)
+
+    def test_build(self):
+        """Test dictionary words and extra tokens are all decomposed."""
+        table = build_compound_table(
+            ["สาหร่ายวากาเมะ", "วากาเมะ"],
+            extra_words=["ภาษาไทย"],
+            engines=(),
+            base_vocabulary=VOCABULARY
+        )
+
+        assert table.lookup("สาหร่ายวากาเมะ") == ("สาหร่าย", "วากาเมะ")
+        assert table.lookup("วากาเมะ") == ("วากาเมะ",)
+        assert table.lookup("ภาษาไทย") == ("ภาษา", "ไทย")
+        assert table.dictionary_version == dictionary_version(["วากาเมะ", "สาหร่ายวากาเมะ"])
+
+
+class TestCompoundTableIntegration:
+    """Test cases for table lookups in the tokenizer components."""
+
+    def test_segmenter_uses_table_before_fallback(self, table):
+        """Test fallback engines only run on a table miss and are remembered."""
+        segmenter = ThaiSegmenter(compound_table=table)
+        fallback = TokenizationResult(
+            original_text="ภาษาไทยกลาง",
+            tokens=["ภาษาไทย", "กลาง"],
+            word_boundaries=[0, 7, 11]
+        )
+
+        with patch.object(segmenter, "_segment_with_fallback", return_value=fallback) as mock_fallback:
+            assert segmenter._decompose_compound("การศึกษา") == ("การ", "ศึกษา")
+            assert segmenter._decompose_compound("ภาษาไทยกลาง") == ("ภาษาไทย", "กลาง")
+            assert segmenter._decompose_compound("ภาษาไทยกลาง") == ("ภาษาไทย", "กลาง")
+
+        mock_fallback.assert_called_once_with("ภาษาไทยกลาง")
+
+    def test_token_processor_uses_table(self, table):
+        """Test compound splitting uses table parts instead of a midpoint split."""
+        processor = TokenProcessor(compound_table=table)
+
+        assert processor._split_compound_word("การศึกษา") == ["การ", "ศึกษา"]
+        assert processor._split_compound_word("วากาเมะ") == ["วากาเมะ"]
+
+    def test_query_processor_uses_table(self, table):
+        """Test compound parts and variants come from the table on a hit."""
+        processor = QueryProcessor(compound_table=table)
+
+        assert processor._extract_compound_parts("การศึกษา") == ["การ", "ศึกษา"]
+        assert processor._extract_compound_parts("วากาเมะ") is None
+        assert processor._generate_compound_variants("การศึกษา") == {"การ", "ศึกษา"}
+        assert processor._generate_compound_variants("วากาเมะ") == set()
+
+    async def test_search_proxy_segmenters_use_table(self, table):
+        """Test the /search query processor's segmenters share the shipped table."""
+        processor = SearchQueryProcessor(SearchProxySettings())
+
+        with patch.object(TokenizerFactory, "load_compound_table", return_value=table):
+            await processor.initialize()
+
+        segmenters = [processor._thai_segmenter, *processor._fallback_segmenters.values()]
+        assert all(segmenter.compound_table is table for segmenter in segmenters)
+        with patch.object(processor._thai_segmenter, "_segment_with_fallback") as mock_fallback:
+            assert processor._thai_segmenter._decompose_compound("การศึกษา") == ("การ", "ศึกษา")
+        mock_fallback.assert_not_called()
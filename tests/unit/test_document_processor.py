@@ -387,6 +387,25 @@ class TestDocumentProcessor:
         assert stats["max_concurrent"] == 5
         assert stats["meilisearch_configured"] is True
         assert "thai_segmenter_engine" in stats
+    
+    @pytest.mark.asyncio
+    async def test_long_thai_text_is_segmented_in_chunks(self):
+        """Test long Thai segments are chunked and stitched back exactly."""
+        segmenter = ThaiSegmenter()
+        processor = DocumentProcessor(thai_segmenter=segmenter, chunk_size=100)
+        text = "การศึกษาเป็นเรื่องสำคัญของประเทศไทย" * 20
+        expected = segmenter.segment_text(text)
+        
+        with patch.object(segmenter, "segment_text", wraps=segmenter.segment_text) as segment_text:
+            result = await processor._segment_thai_text(text)
+        
+        assert segment_text.call_count > 1
+        assert result.original_text == text
+        assert "".join(result.tokens) == text
+        boundaries = result.word_boundaries
+        for token, start, end in zip(result.tokens, boundaries, boundaries[1:]):
+            assert text[start:end] == token
+        assert result.tokens == expected.tokens
 
 
 class TestUtilityFunctions:
@@ -399,6 +418,7 @@ class TestUtilityFunctions:
         assert isinstance(processor, DocumentProcessor)
         assert processor.batch_size == 100
         assert processor.max_concurrent == 10
+        assert processor.chunk_size == 1000
         assert processor.meilisearch_client is None
     
     def test_create_document_processor_custom(self):
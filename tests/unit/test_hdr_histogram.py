@@ -0,0 +1,102 @@
+"""
+Unit tests for the HDR latency histogram.
+"""
+
+import math
+import random
+
+import pytest
+
+from src.utils.hdr_histogram import HdrHistogram, merge_histograms
+
+
+def exact_percentile(values, percentile):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile / 100 * len(ordered)) - 1)]
+
+
+class TestHdrHistogram:
+    """Test cases for HdrHistogram."""
+
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within the configured relative error."""
+        rng = random.Random(0)
+        values = [int(rng.lognormvariate(8, 1.5)) + 1 for _ in range(20000)]
+        histogram = HdrHistogram(1, 60_000_000, 3)
+        for value in values:
+            histogram.record_value(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            exact = exact_percentile(values, percentile)
+            assert abs(histogram.value_at_percentile(percentile) - exact) <= exact * 0.001 + 1
+
+        assert histogram.value_at_percentile(100) == max(values)
+        assert histogram.min_value == min(values)
+        assert histogram.total_count == len(values)
+
+    def test_small_values_are_exact(self):
+        """Test values below the sub-bucket count are recorded exactly."""
+        histogram = HdrHistogram(1, 3_600_000_000, 3)
+        for value in range(1, 1001):
+            histogram.record_value(value)
+
+        assert histogram.value_at_percentile(50) == 500
+        assert histogram.mean == pytest.approx(500.5)
+
+    def test_out_of_range_value(self):
+        """Test values above the trackable range are rejected."""
+        histogram = HdrHistogram(1, 1000, 2)
+
+        with pytest.raises(ValueError):
+            histogram.record_value(10_000)
+        with pytest.raises(ValueError):
+            histogram.record_value(-1)
+
+    def test_invalid_configuration(self):
+        """Test invalid precision is rejected."""
+        with pytest.raises(ValueError):
+            HdrHistogram(significant_figures=6)
+
+    def test_coordinated_omission_correction(self):
+        """Test a stall back-fills the requests a closed loop skipped."""
+        histogram = HdrHistogram()
+        for _ in range(99):
+            histogram.record_corrected_value(1_000, expected_interval=10_000)
+        histogram.record_corrected_value(1_000_000, expected_interval=10_000)
+
+        assert histogram.total_count == 99 + 100
+        assert histogram.value_at_percentile(75) > 400_000
+
+    def test_merge(self):
+        """Test merging keeps counts and extremes."""
+        first, second = HdrHistogram(), HdrHistogram()
+        first.record_value(10, count=3)
+        second.record_value(5_000)
+
+        merged = merge_histograms([first, second])
+
+        assert merged.total_count == 4
+        assert merged.min_value == 10
+        assert merged.max_value == 5_000
+
+    def test_reports(self):
+        """Test dictionary and .hgrm reports."""
+        histogram = HdrHistogram()
+        for value in range(1, 101):
+            histogram.record_value(value * 1000)
+
+        report = histogram.to_dict(include_buckets=True)
+        text = histogram.percentile_distribution(value_scale=1000)
+
+        assert report["count"] == 100
+        assert report["percentiles"]["p99"] == pytest.approx(99_000, rel=0.001)
+        assert sum(count for _, count in report["buckets"]) == 100
+        assert "#[Max     =      100.000" in text
+        assert text.splitlines()[-4].split()[1] == "1.000000000000"
+
+    def test_empty_histogram(self):
+        """Test an empty histogram reports zeros."""
+        histogram = HdrHistogram()
+
+        assert histogram.value_at_percentile(99) == 0
+        assert histogram.to_dict()["min"] == 0
@@ -0,0 +1,123 @@
+"""
+Unit tests for health checks and the background system metrics sampler.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.utils.health import HealthChecker, HealthStatus, SystemMetricsSampler
+
+
+class TestSystemMetricsSampler:
+    """Test cases for SystemMetricsSampler."""
+
+    def test_invalid_interval(self):
+        """Test the sampling interval must be positive."""
+        with pytest.raises(ValueError):
+            SystemMetricsSampler(interval_seconds=0)
+
+    def test_reads_do_not_resample(self):
+        """Test reads return the snapshot instead of sampling again."""
+        sampler = SystemMetricsSampler()
+
+        first = sampler.get_snapshot()
+        second = sampler.get_snapshot()
+
+        assert sampler.samples_total == 1
+        assert second.memory_usage_percent == first.memory_usage_percent
+        assert second.sample_age_seconds >= 0
+
+    def test_samples_the_current_process_after_fork(self):
+        """Test a handle inherited from another process is replaced."""
+        psutil = pytest.importorskip("psutil")
+        sampler = SystemMetricsSampler()
+        # What a worker inherits from a preloading master
+        sampler._process = psutil.Process(os.getppid())
+
+        sampler.sample()
+
+        assert sampler._process.pid == os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_background_sampling(self):
+        """Test the sampler refreshes the snapshot until stopped."""
+        sampler = SystemMetricsSampler(interval_seconds=0.02)
+        await sampler.start()
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            await sampler.stop()
+        samples = sampler.samples_total
+        await asyncio.sleep(0.05)
+
+        assert samples >= 3
+        assert sampler.samples_total == samples
+        assert not sampler.running
+        metrics = sampler.get_snapshot()
+        assert metrics.process_memory_rss_mb is None or metrics.process_memory_rss_mb > 0
+
+    def test_system_metrics_do_not_block(self):
+        """Test reading system metrics does not wait for a CPU measurement."""
+        checker = HealthChecker()
+        checker.get_system_metrics()
+
+        started = time.perf_counter()
+        metrics = checker.get_system_metrics()
+
+        assert time.perf_counter() - started < 0.1
+        assert metrics.uptime_seconds >= 0
+
+
+class TestHealthChecks:
+    """Test cases for running registered health checks."""
+
+    @staticmethod
+    def slow_check(calls, delay=0.1):
+        async def check():
+            calls.append(time.perf_counter())
+            await asyncio.sleep(delay)
+            return {"status": "healthy", "message": "ok"}
+        return check
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        """Test checks run in parallel rather than one after another."""
+        checker = HealthChecker()
+        calls = []
+        for name in ("a", "b", "c"):
+            checker.register_check(name, self.slow_check(calls))
+
+        started = time.perf_counter()
+        results = await checker.run_all_checks()
+
+        assert time.perf_counter() - started < 0.25
+        assert list(results) == ["a", "b", "c"]
+        assert checker.get_overall_status(results) == HealthStatus.HEALTHY
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached(self):
+        """Test results are reused within the TTL and shared by concurrent callers."""
+        checker = HealthChecker(results_ttl_seconds=60)
+        calls = []
+        checker.register_check("a", self.slow_check(calls, delay=0.05))
+
+        first, second = await asyncio.gather(checker.run_all_checks(), checker.run_all_checks())
+        third = await checker.run_all_checks()
+
+        assert len(calls) == 1
+        assert first["a"] is second["a"] is third["a"]
+
+    @pytest.mark.asyncio
+    async def test_results_not_cached_without_ttl(self):
+        """Test checks run on every call by default."""
+        checker = HealthChecker()
+        calls = []
+        checker.register_check("a", self.slow_check(calls, delay=0))
+
+        await checker.run_all_checks()
+        await checker.run_all_checks()
+
+        assert len(calls) == 2
@@ -0,0 +1,124 @@
+"""
+Unit tests for the event loop lag monitor.
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.metrics import prometheus_metrics
+from src.api.endpoints.monitoring import router
+from src.utils.loop_monitor import EventLoopMonitor
+
+
+def block_loop(seconds):
+    time.sleep(seconds)
+
+
+async def blocking_handler():
+    await asyncio.sleep(0.02)
+    block_loop(0.25)
+
+
+class TestEventLoopMonitor:
+    """Test cases for EventLoopMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_quiet_loop_has_no_stalls(self):
+        """Test an idle loop records lag samples but no stalls."""
+        monitor = EventLoopMonitor(probe_interval_seconds=0.005, block_threshold_seconds=0.1)
+        await monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+        assert monitor.probes_total > 5
+        assert monitor.stalls_total == 0
+        assert not monitor.running
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_captured(self):
+        """Test a blocking task step is recorded with its stack and task."""
+        monitor = EventLoopMonitor(probe_interval_seconds=0.01, block_threshold_seconds=0.05)
+        await monitor.start()
+        try:
+            await asyncio.create_task(blocking_handler(), name="search-request")
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        assert monitor.stalls_total == 1
+        event = monitor.events[-1]
+        assert event.finished
+        assert event.task == "search-request"
+        assert event.lag_ms >= 150
+        assert any(frame.endswith("in block_loop") for frame in event.stack)
+        assert event.location.endswith("in block_loop")
+
+        stats = monitor.get_stats()
+        assert stats["offenders"][0]["location"] == event.location
+        assert stats["lag_ms"]["percentiles"]["p100"] >= 150
+
+    def test_short_lag_is_not_a_stall(self):
+        """Test lag below the threshold is only recorded in the histogram."""
+        monitor = EventLoopMonitor(block_threshold_seconds=0.1)
+
+        monitor.record_lag(0.002)
+        monitor.record_lag(0.2)
+
+        assert monitor.lag_histogram().total_count == 2
+        assert monitor.stalls_total == 1
+        assert monitor.events[-1].stack == []
+
+    @pytest.mark.asyncio
+    async def test_reconfigure_while_running(self):
+        """Test settings cannot change while monitoring."""
+        monitor = EventLoopMonitor()
+        await monitor.start()
+        try:
+            with pytest.raises(RuntimeError):
+                monitor.configure(block_threshold_seconds=0.5)
+        finally:
+            await monitor.stop()
+
+        monitor.configure(block_threshold_seconds=0.5)
+        assert monitor.block_threshold == 0.5
+
+
+class TestEventLoopReporting:
+    """Test cases for exposing event loop statistics."""
+
+    @pytest.fixture
+    def monitor(self, monkeypatch):
+        monitor = EventLoopMonitor(block_threshold_seconds=0.1)
+        monitor.record_lag(0.004)
+        monitor.record_lag(0.3)
+        monkeypatch.setattr("src.api.endpoints.metrics.loop_monitor", monitor)
+        monkeypatch.setattr("src.api.endpoints.monitoring.loop_monitor", monitor)
+        return monitor
+
+    def test_prometheus_metrics(self, monitor, monkeypatch):
+        """Test lag and stall metrics are formatted when monitoring."""
+        monkeypatch.setattr(EventLoopMonitor, "running", property(lambda self: True))
+
+        text = "\n".join(prometheus_metrics.format_event_loop_metrics())
+
+        assert 'thai_tokenizer_event_loop_lag_seconds{quantile="0.99"} 0.3' in text
+        assert "thai_tokenizer_event_loop_lag_seconds_count 2" in text
+        assert "thai_tokenizer_event_loop_stalls_total 1" in text
+
+    def test_diagnostics_endpoint(self, monitor):
+        """Test the diagnostics endpoint returns stalls."""
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+
+        response = TestClient(app).get("/api/v1/diagnostics/event-loop")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stalls_total"] == 1
+        assert len(data["recent_stalls"]) == 1
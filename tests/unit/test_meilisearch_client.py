@@ -288,6 +288,21 @@ class TestMeiliSearchClient:
         assert result["finished_at"] == "2024-01-01T12:00:01Z"
         assert result["error"] is None
 
+    @pytest.mark.asyncio
+    async def test_swap_indexes(self, client, mock_meilisearch_client):
+        """Test swapping two indexes waits for the swap task."""
+        mock_meilisearch_client.swap_indexes.return_value = {"taskUid": 321}
+        mock_meilisearch_client.get_task.return_value = {"status": "succeeded", "uid": 321}
+
+        result = await client.swap_indexes("docs", "docs__reindex_20240101_120000")
+
+        assert result["status"] == "swapped"
+        assert result["task_uid"] == 321
+        mock_meilisearch_client.swap_indexes.assert_called_once_with(
+            [{"indexes": ["docs", "docs__reindex_20240101_120000"]}]
+        )
+        mock_meilisearch_client.get_task.assert_called_with(321)
+
 
 class TestDocumentModel:
     """Test cases for DocumentModel."""
@@ -0,0 +1,100 @@
+"""
+Unit tests for pre-fork preloading and the memory report.
+"""
+
+import gc
+import os
+import time
+
+import pytest
+
+from src.api.endpoints.metrics import prometheus_metrics
+from src.api.preload import memory_report, preload_tokenizer_state
+from src.tokenizer.config_manager import ThaiTokenizerSettings
+from src.tokenizer.thai_segmenter import ThaiSegmenter
+
+
+@pytest.fixture
+def no_preload_state(monkeypatch):
+    monkeypatch.setattr("src.api.preload._preload_report", None)
+
+
+class TestPreload:
+    """Test cases for preload_tokenizer_state."""
+
+    def test_custom_dictionary_trie_is_shared(self):
+        """Test segmenters with the same dictionary share one tokenizer."""
+        first = ThaiSegmenter(custom_dict=["วากาเมะ", "สาหร่ายวากาเมะ"])
+        second = ThaiSegmenter(custom_dict=["สาหร่ายวากาเมะ", "วากาเมะ"])
+        other = ThaiSegmenter(custom_dict=["ซาชิมิ"])
+
+        assert first._custom_tokenizer is second._custom_tokenizer
+        assert other._custom_tokenizer is not first._custom_tokenizer
+
+    def test_preload_builds_and_freezes(self, no_preload_state, monkeypatch):
+        """Test the state is built, failures are recorded and objects are frozen."""
+        from src.api import preload
+
+        monkeypatch.setattr(preload, "_engines_to_preload", lambda settings: ["no-such-engine"])
+        try:
+            report = preload_tokenizer_state(ThaiTokenizerSettings())
+        finally:
+            gc.unfreeze()
+
+        assert list(report.steps) == ["dictionary", "segmenter", "query_processor", "engine:no-such-engine"]
+        assert list(report.errors) == ["engine:no-such-engine"]
+        assert report.frozen_objects > 0
+        assert preload.get_preload_report() is report
+
+    def test_master_reenables_gc_when_ready(self, no_preload_state):
+        """Test the gunicorn master collects garbage again once the state is built."""
+        from types import SimpleNamespace
+
+        from src.api import gunicorn_conf
+
+        server = SimpleNamespace(cfg=SimpleNamespace(preload_app=False))
+        gc.disable()
+        try:
+            gunicorn_conf.when_ready(server)
+            assert gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_engine_models_can_be_skipped(self, no_preload_state):
+        """Test engine models are not loaded when disabled."""
+        report = preload_tokenizer_state(ThaiTokenizerSettings(preload_engine_models=False), freeze=False)
+
+        assert not any(name.startswith("engine:") for name in report.steps)
+        assert report.errors == {}
+
+
+class TestMemoryReport:
+    """Test cases for the per-process memory report."""
+
+    def test_report_covers_children(self, no_preload_state):
+        """Test the report lists the root process and its forked children."""
+        pid = os.fork()
+        if pid == 0:
+            time.sleep(5)
+            os._exit(0)
+        try:
+            report = memory_report()
+        finally:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+
+        roles = {process["pid"]: process["role"] for process in report["processes"]}
+        assert roles[os.getpid()] == "master"
+        assert roles[pid] == "worker"
+        assert report["preloaded"] is False
+        totals = report["totals"]
+        assert totals["rss_mb"] >= totals["uss_mb"] > 0
+        if totals["pss_mb"] is not None:
+            assert totals["shared_savings_mb"] == pytest.approx(totals["rss_mb"] - totals["pss_mb"], abs=0.01)
+
+    def test_prometheus_metrics(self, no_preload_state):
+        """Test the report is exported per process."""
+        text = "\n".join(prometheus_metrics.format_memory_metrics(memory_report()))
+
+        assert "thai_tokenizer_preloaded 0" in text
+        assert f'thai_tokenizer_process_memory_uss_bytes{{pid="{os.getpid()}",role="master"}}' in text
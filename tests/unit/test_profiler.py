@@ -0,0 +1,169 @@
+"""
+Unit tests for the in-process stack sampler and its diagnostics endpoint.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.monitoring import router
+from src.utils.profiler import ProfilerBusyError, StackSampler
+
+
+def spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def wait(stop: threading.Event):
+    stop.wait()
+
+
+async def sleeper():
+    await asyncio.sleep(10)
+
+
+class TestStackSampler:
+    """Test cases for StackSampler."""
+
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            StackSampler(mode="memory")
+
+    def test_wall_mode_samples_busy_thread(self):
+        """Test a busy thread shows up as a leaf frame."""
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,))
+        worker.start()
+        try:
+            sampler = StackSampler(interval_seconds=0.002)
+            sampler.start()
+            time.sleep(0.2)
+            result = sampler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert result.samples > 0
+        assert any(stack.split(";")[-1].startswith("spin (") for stack in result.stacks)
+        assert result.top_frames(5)[0]["frame"].startswith("spin (")
+
+    def test_cpu_mode_skips_waiting_threads(self):
+        """Test CPU mode only samples running threads."""
+        stop = threading.Event()
+        workers = [threading.Thread(target=spin, args=(stop,)), threading.Thread(target=wait, args=(stop,))]
+        for worker in workers:
+            worker.start()
+        try:
+            sampler = StackSampler(mode="cpu", interval_seconds=0.002, include_idle=True)
+            sampler.start()
+            time.sleep(0.2)
+            result = sampler.stop()
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+        if not result.cpu_mode_supported:
+            pytest.skip("Thread states are not available on this platform")
+        assert any(";spin (" in stack for stack in result.stacks)
+        assert not any(";wait (" in stack for stack in result.stacks)
+
+    def test_idle_threads_are_dropped(self):
+        """Test threads waiting for work are counted as idle."""
+        stop = threading.Event()
+        worker = threading.Thread(target=wait, args=(stop,))
+        worker.start()
+        try:
+            sampler = StackSampler(interval_seconds=0.002)
+            sampler.start()
+            time.sleep(0.05)
+            result = sampler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert result.idle_samples > 0
+        assert not any(";wait (" in stack for stack in result.stacks)
+
+    @pytest.mark.asyncio
+    async def test_suspended_tasks_are_sampled(self):
+        """Test wall mode records the await chain of suspended tasks."""
+        task = asyncio.create_task(sleeper(), name="slow-request")
+        await asyncio.sleep(0)
+        try:
+            result = await StackSampler(interval_seconds=0.002).profile(0.05)
+        finally:
+            task.cancel()
+
+        stacks = [stack for stack in result.stacks if stack.startswith("task:slow-request;")]
+        assert stacks
+        assert stacks[0].endswith("test_profiler.py);sleep (asyncio/tasks.py);<Future>")
+        assert ";sleeper (" in stacks[0]
+        assert not any("StackSampler.profile" in stack for stack in result.stacks)
+
+    def test_collapsed_format(self):
+        """Test collapsed output has one "stack count" line per stack."""
+        sampler = StackSampler()
+        sampler.start()
+        result = sampler.stop()
+        result.stacks["a (x.py);b (y.py)"] += 3
+
+        assert "a (x.py);b (y.py) 3\n" in result.collapsed()
+
+    def test_one_profile_at_a_time(self):
+        """Test a second concurrent profile is refused."""
+        first = StackSampler()
+        first.start()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                StackSampler().start()
+        finally:
+            first.stop()
+
+
+class TestProfileEndpoint:
+    """Test cases for the /diagnostics/profile endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        return TestClient(app)
+
+    def test_disabled_without_authentication(self, client, monkeypatch):
+        """Test profiling is refused when it is not enabled."""
+        monkeypatch.delenv("PROFILER_ENABLED", raising=False)
+
+        response = client.get("/api/v1/diagnostics/profile", params={"seconds": 0.05})
+
+        assert response.status_code == 403
+
+    def test_json_summary(self, client, monkeypatch):
+        """Test the JSON summary."""
+        monkeypatch.setenv("PROFILER_ENABLED", "true")
+
+        response = client.get("/api/v1/diagnostics/profile", params={"seconds": 0.05, "interval_ms": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["mode"] == "wall"
+        assert {"samples", "top_frames", "collapsed", "overhead_percent"} <= set(data)
+
+    def test_collapsed_output(self, client, monkeypatch):
+        """Test collapsed stacks are returned as text."""
+        monkeypatch.setenv("PROFILER_ENABLED", "true")
+
+        response = client.get(
+            "/api/v1/diagnostics/profile",
+            params={"seconds": 0.05, "format": "collapsed", "include_idle": True}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
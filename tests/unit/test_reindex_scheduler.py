@@ -0,0 +1,161 @@
+"""
+Unit tests for concurrent multi-index reindexing.
+"""
+
+import asyncio
+
+import pytest
+
+from src.meilisearch_integration.document_processor import DocumentProcessor
+from src.meilisearch_integration.reindex_scheduler import ReindexProgress, ReindexScheduler
+from src.meilisearch_integration.reindexer import ByteBudget, ReindexBudget, ReindexStats
+
+
+class TestReindexScheduler:
+    """Test cases for ReindexScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_runs_smallest_first_with_bounded_concurrency(self):
+        """Test indexes start smallest first and at most N run at once."""
+        scheduler = ReindexScheduler(max_concurrent_indexes=2, progress_interval=0)
+        started = []
+        running = 0
+        peak = 0
+
+        async def reindex(index_name):
+            nonlocal running, peak
+            started.append(index_name)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            scheduler.progress.advance(index_name, 10)
+            running -= 1
+            return ReindexStats(index_name=index_name, total_documents=10)
+
+        results = await scheduler.run({"big": 1000, "tiny": 1, "medium": 50, "small": 10}, reindex)
+
+        assert started[:2] == ["tiny", "small"]
+        assert peak == 2
+        assert list(results) == ["tiny", "small", "medium", "big"]
+        assert scheduler.progress.snapshot()["indexes_finished"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_is_isolated(self):
+        """Test one failing index does not stop the others."""
+        scheduler = ReindexScheduler(max_concurrent_indexes=2, progress_interval=0)
+
+        async def reindex(index_name):
+            if index_name == "broken":
+                raise RuntimeError("boom")
+            return ReindexStats(index_name=index_name)
+
+        results = await scheduler.run({"broken": 1, "ok": 2}, reindex)
+
+        assert "boom" in results["broken"].errors[0]
+        assert not results["ok"].errors
+
+
+class TestReindexProgress:
+    """Test cases for ReindexProgress."""
+
+    def test_snapshot_and_eta(self):
+        """Test combined progress and ETA."""
+        progress = ReindexProgress()
+        progress.register("a", 100)
+        progress.register("b", 300)
+        progress.start("a")
+        progress.advance("a", 100)
+        progress.finish("a")
+        progress.start("b")
+        progress.advance("b", 100)
+        progress.started_at -= 10
+
+        snapshot = progress.snapshot()
+
+        assert snapshot["documents_done"] == 200
+        assert snapshot["percent"] == pytest.approx(50.0)
+        assert snapshot["eta_seconds"] == pytest.approx(10.0, rel=0.05)
+        assert snapshot["active"] == {"b": pytest.approx(33.3)}
+        assert "1/2 indexes" in progress.format()
+
+    def test_resumed_index(self):
+        """Test a resumed run counts its offset as done but not as throughput."""
+        progress = ReindexProgress()
+        progress.register("a", 400)
+        progress.start("a")
+        progress.resume("a", 200)
+        progress.advance("a", 100)
+        progress.started_at -= 10
+
+        snapshot = progress.snapshot()
+
+        assert snapshot["documents_done"] == 300
+        assert snapshot["documents_resumed"] == 200
+        assert snapshot["percent"] == pytest.approx(75.0)
+        assert snapshot["documents_per_second"] == pytest.approx(10.0, rel=0.05)
+        assert snapshot["eta_seconds"] == pytest.approx(10.0, rel=0.05)
+
+
+class TestReindexBudget:
+    """Test cases for shared reindex budgets."""
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_blocks_until_released(self):
+        """Test byte budget admits requests only while they fit."""
+        budget = ByteBudget(100)
+        await budget.acquire(80)
+
+        waiter = asyncio.create_task(budget.acquire(30))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await budget.release(80)
+        await asyncio.wait_for(waiter, timeout=1)
+        assert budget.in_flight == 30
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_alone(self):
+        """Test a request larger than the budget is admitted when idle."""
+        budget = ByteBudget(10)
+
+        await asyncio.wait_for(budget.acquire(50), timeout=1)
+
+        assert budget.in_flight == 50
+
+    @pytest.mark.asyncio
+    async def test_upload_holds_task_slot(self):
+        """Test uploads hold a task slot and bytes until they complete."""
+        budget = ReindexBudget(tokenize_workers=1, max_inflight_bytes=100, max_pending_tasks=1)
+
+        async with budget.upload(40):
+            assert budget.upload_bytes.in_flight == 40
+            assert budget.task_slots.locked()
+
+        assert budget.upload_bytes.in_flight == 0
+        assert not budget.task_slots.locked()
+
+    @pytest.mark.asyncio
+    async def test_processors_share_tokenization_slots(self):
+        """Test processors sharing a limiter never exceed it together."""
+        budget = ReindexBudget(tokenize_workers=2)
+        running = 0
+        peak = 0
+
+        class SlowProcessor(DocumentProcessor):
+            async def process_document(self, document, preserve_original=True):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return await super().process_document(document, preserve_original)
+
+        processors = [
+            SlowProcessor(max_concurrent=10, concurrency_limiter=budget.tokenize_slots)
+            for _ in range(3)
+        ]
+        documents = [{"id": str(i), "title": "ไทย", "content": ""} for i in range(4)]
+
+        await asyncio.gather(*(processor.process_batch(documents) for processor in processors))
+
+        assert peak == 2
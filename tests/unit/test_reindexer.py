@@ -0,0 +1,334 @@
+"""
+Unit tests for the streaming reindex pipeline.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.meilisearch_integration.client import MeiliSearchClient, IndexStats
+from src.meilisearch_integration.document_processor import DocumentProcessor
+from src.meilisearch_integration.reindexer import (
+    FINGERPRINT_FIELD,
+    SHADOW_INDEX_MARKER,
+    CheckpointStore,
+    ReindexBudget,
+    ReindexCheckpoint,
+    ReindexVersions,
+    StreamingReindexer,
+    compute_content_hash,
+    compute_dictionary_version,
+    iter_document_pages
+)
+
+
+def make_client(documents, index_name="docs"):
+    """Create a MeiliSearch client mock backed by in-memory indexes."""
+    indexes = {index_name: {doc["id"]: dict(doc) for doc in documents}}
+
+    def make_index(name):
+        def get_documents(parameters):
+            docs = list(indexes[name].values())
+            docs = docs[parameters["offset"]:parameters["offset"] + parameters["limit"]]
+            if "fields" in parameters:
+                docs = [{k: v for k, v in doc.items() if k in parameters["fields"]} for doc in docs]
+            return {"results": docs}
+
+        index = Mock()
+        index.get_documents = Mock(side_effect=get_documents)
+        return index
+
+    async def retry_operation(operation, *args, **kwargs):
+        return operation(*args, **kwargs)
+
+    async def update_documents(name, docs, primary_key=None):
+        for doc in docs:
+            indexes[name][doc["id"]].update(doc)
+        return {"status": "updated", "count": len(docs), "task_uid": 1}
+
+    async def add_documents(name, docs, primary_key=None):
+        for doc in docs:
+            indexes[name][doc["id"]] = dict(doc)
+        return {"status": "added", "count": len(docs), "task_uid": 2}
+
+    async def create_index(name, primary_key=None):
+        indexes[name] = {}
+        return {"status": "created", "index": name, "task_uid": 3}
+
+    async def get_index_stats(name):
+        return IndexStats(number_of_documents=len(indexes[name]), is_indexing=False, field_distribution={})
+
+    async def search(name, query, options=None):
+        hits = [doc for doc in indexes[name].values() if query in (doc.get("tokenized_content") or "")]
+        return {"hits": hits[:1], "estimatedTotalHits": len(hits)}
+
+    async def swap_indexes(index_a, index_b, timeout=60):
+        indexes[index_a], indexes[index_b] = indexes[index_b], indexes[index_a]
+        return {"status": "swapped", "indexes": [index_a, index_b], "task_uid": 4}
+
+    client = Mock(spec=MeiliSearchClient)
+    client.get_index = AsyncMock(side_effect=lambda name: make_index(name))
+    client.index_exists = AsyncMock(side_effect=lambda name: name in indexes)
+    client.get_primary_key = AsyncMock(return_value="id")
+    client.create_index = AsyncMock(side_effect=create_index)
+    client.get_index_settings = AsyncMock(return_value={"separatorTokens": []})
+    client.update_index_settings = AsyncMock(return_value={"status": "updated", "task_uid": 5})
+    client.get_index_stats = AsyncMock(side_effect=get_index_stats)
+    client.search = AsyncMock(side_effect=search)
+    client.swap_indexes = AsyncMock(side_effect=swap_indexes)
+    client._retry_operation = AsyncMock(side_effect=retry_operation)
+    client.update_documents = AsyncMock(side_effect=update_documents)
+    client.add_documents = AsyncMock(side_effect=add_documents)
+    client._wait_for_task = AsyncMock(return_value={"status": "succeeded"})
+    client.indexes = indexes
+    client.store = indexes[index_name]
+    return client
+
+
+@pytest.fixture
+def documents():
+    """Create a small index of Thai and English documents."""
+    docs = [
+        {"id": f"th_{i}", "title": f"เอกสาร {i}", "content": "ระบบค้นหาข้อความภาษาไทย", "tags": ["keep"]}
+        for i in range(5)
+    ]
+    docs.append({"id": "en_0", "title": "English", "content": "no Thai here"})
+    return docs
+
+
+@pytest.fixture
+def versions():
+    """Create reindex versions."""
+    return ReindexVersions.for_tokenizer("newmm", ["วากาเมะ"])
+
+
+class TestFingerprints:
+    """Test cases for content hashes and versions."""
+
+    def test_content_hash_ignores_generated_fields(self):
+        """Test that only source fields feed the content hash."""
+        doc = {"id": "1", "title": "ไทย", "content": "ข้อความ"}
+        tokenized = dict(doc, tokenized_content="ข้อ ความ", tags=["x"])
+
+        assert compute_content_hash(doc) == compute_content_hash(tokenized)
+        assert compute_content_hash(doc) != compute_content_hash(dict(doc, content="อื่น"))
+
+    def test_dictionary_version_is_order_independent(self):
+        """Test dictionary versions depend on contents only."""
+        assert compute_dictionary_version(["ก", "ข"]) == compute_dictionary_version(["ข", "ก", "ก"])
+        assert compute_dictionary_version(["ก"]) != compute_dictionary_version(["ก", "ข"])
+
+    def test_is_current(self, versions):
+        """Test fingerprint comparison against document content and versions."""
+        doc = {"id": "1", "title": "ไทย", "content": "ข้อความ"}
+        doc[FINGERPRINT_FIELD] = versions.fingerprint(compute_content_hash(doc))
+
+        assert versions.is_current(doc)
+        assert not versions.is_current(dict(doc, content="เปลี่ยน"))
+        assert not ReindexVersions.for_tokenizer("newmm", ["ใหม่"]).is_current(doc)
+        assert not versions.is_current({"id": "2", "title": "ไทย"})
+
+
+class TestCheckpointStore:
+    """Test cases for CheckpointStore."""
+
+    def test_round_trip(self, tmp_path, versions):
+        """Test checkpoints are saved and loaded."""
+        store = CheckpointStore(tmp_path)
+        checkpoint = ReindexCheckpoint(
+            index_name="docs",
+            target_index="docs",
+            tokenizer_version=versions.tokenizer_version,
+            dictionary_version=versions.dictionary_version,
+            offset=2000
+        )
+
+        store.save(checkpoint)
+        loaded = store.load("docs")
+
+        assert loaded.offset == 2000
+        assert loaded.updated_at is not None
+        assert loaded.matches("docs", versions)
+        assert not loaded.matches("docs", ReindexVersions("other", versions.dictionary_version))
+
+    def test_unreadable_checkpoint_is_ignored(self, tmp_path):
+        """Test a corrupt checkpoint file is ignored."""
+        store = CheckpointStore(tmp_path)
+        store.path_for("docs").write_text("{not json")
+
+        assert store.load("docs") is None
+
+
+class TestStreamingReindexer:
+    """Test cases for StreamingReindexer."""
+
+    @pytest.mark.asyncio
+    async def test_iter_document_pages(self, documents):
+        """Test paging yields every document with the next offset."""
+        client = make_client(documents)
+
+        pages = [page async for page in iter_document_pages(client, "docs", page_size=4)]
+
+        assert [offset for offset, _ in pages] == [4, 6]
+        assert sum(len(docs) for _, docs in pages) == len(documents)
+
+    @pytest.mark.asyncio
+    async def test_reindex_writes_partial_updates(self, tmp_path, documents, versions):
+        """Test stale documents are tokenized and written back as partial updates."""
+        client = make_client(documents)
+        reindexer = StreamingReindexer(
+            client, DocumentProcessor(), versions, CheckpointStore(tmp_path), page_size=2
+        )
+
+        stats = await reindexer.reindex_index("docs")
+
+        assert stats.total_documents == 6
+        assert stats.processed_documents == 5
+        assert stats.skipped_documents == 1
+        assert stats.committed_batches == 3
+        assert not stats.errors
+        assert client.store["th_0"]["tokenized_content"]
+        assert client.store["th_0"]["tags"] == ["keep"]
+        assert all(versions.is_current(doc) for doc in client.store.values())
+        assert CheckpointStore(tmp_path).load("docs").completed
+
+    @pytest.mark.asyncio
+    async def test_second_run_skips_unchanged(self, tmp_path, documents, versions):
+        """Test documents with a current fingerprint are not reprocessed."""
+        client = make_client(documents)
+        reindexer = StreamingReindexer(client, DocumentProcessor(), versions, CheckpointStore(tmp_path))
+        await reindexer.reindex_index("docs")
+        client.update_documents.reset_mock()
+        client.store["th_1"]["content"] = "เนื้อหาใหม่"
+
+        stats = await reindexer.reindex_index("docs")
+
+        assert stats.unchanged_documents == 5
+        assert stats.processed_documents == 1
+        updates = client.update_documents.call_args.args[1]
+        assert [doc["id"] for doc in updates] == ["th_1"]
+
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(self, tmp_path, documents, versions):
+        """Test a failed run resumes after the last committed batch."""
+        client = make_client(documents)
+        store = CheckpointStore(tmp_path)
+        update_documents = client.update_documents.side_effect
+        calls = []
+
+        async def fail_second_batch(index_name, docs, primary_key=None):
+            calls.append(docs)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return await update_documents(index_name, docs, primary_key)
+
+        client.update_documents.side_effect = fail_second_batch
+        reindexer = StreamingReindexer(client, DocumentProcessor(), versions, store, page_size=2)
+
+        failed = await reindexer.reindex_index("docs")
+
+        assert failed.errors
+        assert store.load("docs").offset == 2
+
+        client.update_documents.side_effect = update_documents
+        resumed_offsets = []
+        reindexer.on_resume = lambda index_name, offset: resumed_offsets.append((index_name, offset))
+        resumed = await reindexer.reindex_index("docs")
+
+        assert resumed.resumed_from_offset == 2
+        assert resumed_offsets == [("docs", 2)]
+        assert resumed.total_documents == 4
+        assert not resumed.errors
+        assert all(versions.is_current(doc) for doc in client.store.values())
+
+    @pytest.mark.asyncio
+    async def test_dry_run_makes_no_changes(self, tmp_path, documents, versions):
+        """Test dry runs count stale documents without writing."""
+        client = make_client(documents)
+        reindexer = StreamingReindexer(
+            client, DocumentProcessor(), versions, CheckpointStore(tmp_path), dry_run=True
+        )
+
+        stats = await reindexer.reindex_index("docs")
+
+        assert stats.processed_documents == 6
+        client.update_documents.assert_not_called()
+        assert CheckpointStore(tmp_path).load("docs") is None
+
+
+    @pytest.mark.asyncio
+    async def test_budget_and_progress_callback(self, tmp_path, documents, versions):
+        """Test uploads go through the shared budget and batches are reported."""
+        client = make_client(documents)
+        budget = ReindexBudget(tokenize_workers=2, max_inflight_bytes=1024, max_pending_tasks=1)
+        reported = []
+        reindexer = StreamingReindexer(
+            client, DocumentProcessor(concurrency_limiter=budget.tokenize_slots), versions,
+            CheckpointStore(tmp_path), page_size=4, budget=budget,
+            on_batch=lambda name, count: reported.append((name, count))
+        )
+
+        stats = await reindexer.reindex_index("docs")
+
+        assert not stats.errors
+        assert reported == [("docs", 4), ("docs", 2)]
+        assert budget.upload_bytes.in_flight == 0
+
+
+class TestShadowReindex:
+    """Test cases for blue/green reindexing with an index swap."""
+
+    @pytest.mark.asyncio
+    async def test_swap_replaces_live_index(self, tmp_path, documents, versions):
+        """Test the live index is rebuilt in a shadow index and swapped in."""
+        client = make_client(documents)
+        original = dict(client.store)
+        reindexer = StreamingReindexer(
+            client, DocumentProcessor(), versions, CheckpointStore(tmp_path), page_size=4
+        )
+
+        stats = await reindexer.reindex_with_swap("docs", sample_queries=["ภาษาไทย"])
+
+        assert stats.swapped
+        assert stats.validation["passed"]
+        assert stats.shadow_index.startswith(f"docs{SHADOW_INDEX_MARKER}")
+        live = client.indexes["docs"]
+        assert len(live) == len(documents)
+        assert live["th_0"]["tags"] == ["keep"]
+        assert all(versions.is_current(doc) for doc in live.values())
+        # Previous contents are kept for rollback, untouched
+        assert client.indexes[stats.shadow_index] == original
+        client.update_index_settings.assert_awaited_once_with(stats.shadow_index, {"separatorTokens": []})
+        client.update_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_count_mismatch_blocks_swap(self, tmp_path, documents, versions):
+        """Test a shadow index with a different document count is not swapped in."""
+        client = make_client(documents)
+        live_stats = client.get_index_stats.side_effect
+
+        async def grow_live_index(name):
+            if name == "docs":
+                client.indexes["docs"]["late"] = {"id": "late", "title": "ใหม่", "content": ""}
+            return await live_stats(name)
+
+        client.get_index_stats.side_effect = grow_live_index
+        reindexer = StreamingReindexer(client, DocumentProcessor(), versions, CheckpointStore(tmp_path))
+
+        stats = await reindexer.reindex_with_swap("docs")
+
+        assert not stats.swapped
+        assert not stats.validation["passed"]
+        assert "Document count mismatch" in stats.errors[0]
+        client.swap_indexes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rollback_swaps_back(self, tmp_path, documents, versions):
+        """Test rollback restores the previous contents."""
+        client = make_client(documents)
+        original = dict(client.store)
+        reindexer = StreamingReindexer(client, DocumentProcessor(), versions, CheckpointStore(tmp_path))
+        stats = await reindexer.reindex_with_swap("docs")
+
+        await reindexer.rollback_swap("docs", stats.shadow_index)
+
+        assert client.indexes["docs"] == original
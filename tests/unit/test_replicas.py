@@ -0,0 +1,139 @@
+"""
+Unit tests for replica-aware read routing with hedged requests.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.meilisearch_integration.client import MeiliSearchClient, MeiliSearchConfig
+from src.meilisearch_integration.replicas import HEDGE_DELAY_REFRESH_SAMPLES, ReplicatedMeiliSearchClient
+from src.search_proxy.metrics import SearchProxyMetricsCollector
+
+
+def make_replica(host, delay=0.0, error=None):
+    """Create a mock replica answering after a delay."""
+    replica = AsyncMock(spec=MeiliSearchClient)
+    replica.config = MeiliSearchConfig(host=host)
+    replica.cancelled = False
+
+    async def search(index_name, query, options=None):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            replica.cancelled = True
+            raise
+        if error:
+            raise error
+        return {"hits": [{"id": host}]}
+
+    replica.search.side_effect = search
+    replica.health_check.return_value = {"status": "healthy"}
+    return replica
+
+
+class TestReplicatedMeiliSearchClient:
+    """Test cases for ReplicatedMeiliSearchClient."""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding_routing(self):
+        """Test concurrent searches spread across replicas."""
+        replicas = [make_replica("http://r0", 0.01), make_replica("http://r1", 0.01)]
+        client = ReplicatedMeiliSearchClient(make_replica("http://primary"), replicas, hedge_after_ms=1000)
+
+        await asyncio.gather(*(client.search("docs", "ไทย") for _ in range(4)))
+
+        assert [state.requests for state in client.states] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_ewma_breaks_ties(self):
+        """Test idle replicas are chosen by their latency history."""
+        client = ReplicatedMeiliSearchClient(
+            make_replica("http://primary"),
+            [make_replica("http://r0"), make_replica("http://r1")]
+        )
+        client.states[0].ewma_latency_ms = 50.0
+        client.states[1].ewma_latency_ms = 5.0
+
+        assert client._pick() == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_and_loser_is_cancelled(self):
+        """Test a slow replica is hedged and its request cancelled."""
+        slow = make_replica("http://slow", delay=1.0)
+        fast = make_replica("http://fast", delay=0.0)
+        client = ReplicatedMeiliSearchClient(make_replica("http://primary"), [slow, fast], hedge_after_ms=20)
+        client.states[1].outstanding = 1  # Make the slow replica the first choice
+
+        result = await client.search("docs", "ไทย")
+        await asyncio.sleep(0)
+
+        assert result["hits"][0]["id"] == "http://fast"
+        assert slow.cancelled
+        assert client.hedges == 1
+        assert client.states[1].hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_replica_is_retried_and_rotated_out(self):
+        """Test errors fail over and take the replica out of rotation."""
+        broken = make_replica("http://broken", error=RuntimeError("down"))
+        client = ReplicatedMeiliSearchClient(
+            make_replica("http://primary"),
+            [broken, make_replica("http://r1")],
+            hedge_after_ms=1000,
+            max_consecutive_errors=1
+        )
+        client.states[0].ewma_latency_ms = 0.0
+        client.states[1].ewma_latency_ms = 1.0
+
+        result = await client.search("docs", "ไทย")
+
+        assert result["hits"][0]["id"] == "http://r1"
+        assert not client.states[0].healthy
+        assert client._pick() == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_go_to_primary(self):
+        """Test non-search methods are delegated to the primary."""
+        primary = make_replica("http://primary")
+        replica = make_replica("http://r0")
+        client = ReplicatedMeiliSearchClient(primary, [replica])
+
+        await client.add_documents("docs", [{"id": "1"}])
+
+        primary.add_documents.assert_awaited_once()
+        replica.add_documents.assert_not_called()
+
+    def test_adaptive_hedge_delay(self):
+        """Test the hedge delay follows the recent p95 latency."""
+        client = ReplicatedMeiliSearchClient(make_replica("http://primary"), [], min_hedge_delay_ms=5)
+        client._recent_latencies_ms.extend(range(1, 101))
+
+        assert client.hedge_delay_ms() == 96
+
+    def test_hedge_delay_is_recomputed_periodically(self):
+        """Test the p95 is cached until enough new samples arrive."""
+        client = ReplicatedMeiliSearchClient(make_replica("http://primary"), [], min_hedge_delay_ms=5)
+        client._recent_latencies_ms.extend(range(1, 101))
+        assert client.hedge_delay_ms() == 96
+
+        client._recent_latencies_ms.extend([1000.0] * 100)
+        client._samples_since_p95 = HEDGE_DELAY_REFRESH_SAMPLES - 1
+        assert client.hedge_delay_ms() == 96
+
+        client._samples_since_p95 = HEDGE_DELAY_REFRESH_SAMPLES
+        assert client.hedge_delay_ms() == 1000.0
+
+    @pytest.mark.asyncio
+    async def test_replica_metrics_exposed(self):
+        """Test per-replica statistics appear in the Prometheus output."""
+        client = ReplicatedMeiliSearchClient(make_replica("http://primary"), [make_replica("http://r0")])
+        await client.search("docs", "ไทย")
+        collector = SearchProxyMetricsCollector()
+        collector.set_replica_stats_provider(client.get_stats)
+
+        lines = collector.get_prometheus_metrics()
+
+        assert 'search_proxy_replica_requests{replica="http://r0"} 1' in lines
+        assert 'search_proxy_replica_healthy{replica="http://r0"} 1' in lines
@@ -0,0 +1,109 @@
+"""
+Unit tests for the request context middleware.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middleware.request_context import RequestContextMiddleware
+from src.utils.health import HealthChecker
+from src.utils.logging import correlation_id_var
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.records = []
+
+    def info(self, message, **kwargs):
+        self.records.append((message, kwargs))
+
+
+@pytest.fixture
+def checker(monkeypatch):
+    checker = HealthChecker()
+    monkeypatch.setattr("src.api.middleware.request_context.health_checker", checker)
+    return checker
+
+
+@pytest.fixture
+def access_log(monkeypatch):
+    recorder = RecordingLogger()
+    monkeypatch.setattr("src.api.middleware.request_context.logger", recorder)
+    return recorder
+
+
+def make_client(**options):
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, **options)
+
+    @app.get("/echo")
+    async def echo():
+        return {"correlation_id": correlation_id_var.get()}
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestRequestContextMiddleware:
+    """Test cases for RequestContextMiddleware."""
+
+    def test_correlation_id_and_timing_headers(self, checker, access_log):
+        """Test the correlation ID reaches the endpoint and the response headers."""
+        client = make_client()
+
+        response = client.get("/echo", headers={"X-Correlation-ID": "req-42"})
+        generated = client.get("/echo")
+
+        assert response.json() == {"correlation_id": "req-42"}
+        assert response.headers["X-Correlation-ID"] == "req-42"
+        assert float(response.headers["X-Process-Time"]) >= 0
+        assert generated.headers["X-Correlation-ID"] == generated.json()["correlation_id"]
+
+    def test_requests_are_recorded(self, checker, access_log):
+        """Test successes and unhandled errors are counted."""
+        client = make_client()
+
+        client.get("/echo")
+        assert client.get("/fail").status_code == 500
+
+        assert checker.request_stats["total"] == 2
+        assert checker.request_stats["successful"] == 1
+        assert checker.request_stats["failed"] == 1
+
+    def test_access_log_sampling(self, checker, access_log):
+        """Test successful requests are only logged when sampled, errors always."""
+        client = make_client(access_log_sample_rate=0.0)
+
+        for _ in range(5):
+            client.get("/echo", params={"q": "ข้อมูลส่วนตัว"})
+        client.get("/fail")
+
+        assert len(access_log.records) == 1
+        message, fields = access_log.records[0]
+        assert fields["path"] == "/fail"
+        assert fields["status_code"] == 500
+        assert fields["log_reason"] == "error"
+
+        make_client(access_log_sample_rate=1.0).get("/echo", params={"q": "ข้อมูลส่วนตัว"})
+        message, fields = access_log.records[-1]
+        assert fields["log_reason"] == "sampled"
+        assert "query_params" not in fields
+
+    def test_slow_requests_are_logged(self, checker, access_log):
+        """Test requests over the slow threshold are logged regardless of sampling."""
+        make_client(access_log_sample_rate=0.0, slow_request_ms=0.0).get("/echo")
+
+        assert access_log.records[0][1]["log_reason"] == "slow"
+
+    def test_application_has_no_base_http_middleware(self):
+        """Test the API does not route requests through BaseHTTPMiddleware."""
+        from src.api.main import app
+
+        classes = [middleware.cls for middleware in app.user_middleware]
+        assert RequestContextMiddleware in classes
+        assert BaseHTTPMiddleware not in classes
@@ -0,0 +1,108 @@
+"""
+Unit tests for the fast JSON response serialization path.
+"""
+
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from src.api.serialization import PydanticJSONResponse
+from src.search_proxy.models.requests import SearchRequest
+from src.search_proxy.models.responses import SearchHit, SearchResponse, QueryInfo, PaginationInfo
+from src.search_proxy.models.search import HitRecord, to_search_hits
+
+
+class TestPydanticJSONResponse:
+    """Test cases for PydanticJSONResponse."""
+
+    @pytest.fixture
+    def search_response(self):
+        """Create a search response with Thai content."""
+        return SearchResponse(
+            hits=[
+                SearchHit(
+                    id="doc_1",
+                    score=0.95,
+                    document={"title": "เอกสารภาษาไทย", "tags": ["ไทย", "search"]},
+                    highlight={"title": "<em>เอกสาร</em>ภาษาไทย"},
+                    ranking_info={"base_score": 0.8}
+                )
+            ],
+            total_hits=1,
+            processing_time_ms=12.5,
+            query_info=QueryInfo(
+                original_query="เอกสาร",
+                processed_query="เอกสาร",
+                thai_content_detected=True,
+                mixed_content=False,
+                query_variants_used=1
+            ),
+            pagination=PaginationInfo(
+                offset=0,
+                limit=10,
+                total_hits=1,
+                has_next_page=False,
+                has_previous_page=False
+            )
+        )
+
+    def test_matches_default_encoding(self, search_response):
+        """Test that the fast path produces the same document as jsonable_encoder."""
+        response = PydanticJSONResponse(search_response)
+
+        assert json.loads(response.body) == jsonable_encoder(search_response)
+        assert response.media_type == "application/json"
+
+    def test_thai_text_is_not_escaped(self, search_response):
+        """Test that Thai text is written as UTF-8 rather than \\u escapes."""
+        response = PydanticJSONResponse(search_response)
+
+        assert "เอกสารภาษาไทย".encode("utf-8") in response.body
+        assert b"\\u0e" not in response.body
+
+    def test_serializes_model_lists(self, search_response):
+        """Test serialization of batch (list) responses."""
+        response = PydanticJSONResponse([search_response, search_response])
+
+        data = json.loads(response.body)
+        assert len(data) == 2
+        assert data[0]["hits"][0]["id"] == "doc_1"
+
+    def test_exclude_none(self, search_response):
+        """Test that None fields can be dropped from the payload."""
+        response = PydanticJSONResponse(search_response, exclude_none=True)
+
+        data = json.loads(response.body)
+        assert "tokenization_info" not in data
+        assert "match_type" not in data["hits"][0]
+
+
+class TestRankingInfoOmission:
+    """Test cases for omitting ranking debug payloads."""
+
+    def test_request_defaults_to_omitting_ranking_info(self):
+        """Test that ranking info must be requested explicitly."""
+        request = SearchRequest(query="เอกสาร", index_name="documents")
+
+        assert request.include_ranking_info is False
+
+    def test_to_search_hits_drops_ranking_info(self):
+        """Test that ranking info is dropped from records and models."""
+        hits = [
+            HitRecord(id="doc_1", score=0.9, document={}, ranking_info={"base_score": 0.9}),
+            SearchHit(id="doc_2", score=0.8, document={}, ranking_info={"base_score": 0.8})
+        ]
+
+        converted = to_search_hits(hits, include_ranking_info=False)
+
+        assert all(hit.ranking_info is None for hit in converted)
+        assert hits[1].ranking_info == {"base_score": 0.8}
+
+    def test_to_search_hits_keeps_ranking_info_when_requested(self):
+        """Test that ranking info is kept when requested."""
+        hits = [HitRecord(id="doc_1", score=0.9, document={}, ranking_info={"base_score": 0.9})]
+
+        converted = to_search_hits(hits, include_ranking_info=True)
+
+        assert converted[0].ranking_info == {"base_score": 0.9}
@@ -0,0 +1,323 @@
+"""
+Unit tests for the two-tier query and result cache.
+"""
+
+import asyncio
+import json
+import sys
+import types
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.meilisearch_integration.client import MeiliSearchClient
+from src.search_proxy.config.settings import get_development_settings
+from src.search_proxy.models.requests import SearchRequest
+from src.search_proxy.services.search_proxy_service import SearchProxyService
+from src.search_proxy.cache import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    TwoTierCache,
+    decode_entry,
+    encode_entry
+)
+
+
+def dump(value):
+    return json.dumps(value).encode("utf-8")
+
+
+def load(data):
+    return json.loads(data)
+
+
+class Counter:
+    """Compute function counting its calls."""
+
+    def __init__(self, value="result", delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"{self.value}-{self.calls}"
+
+
+class TestEntryEncoding:
+    """Test cases for the binary entry frame."""
+
+    def test_round_trip(self):
+        """Test small and compressed payloads survive encoding."""
+        for payload in (b"small", "ภาษาไทย".encode("utf-8") * 200):
+            entry = decode_entry(encode_entry(payload, 300, 60, stored_at=100.0))
+
+            assert entry.payload == payload
+            assert (entry.stored_at, entry.fresh_seconds, entry.stale_seconds) == (100.0, 300, 60)
+
+    def test_large_payloads_are_compressed(self):
+        """Test repetitive payloads shrink."""
+        payload = b'{"hits": []}' * 500
+
+        assert len(encode_entry(payload, 300, 60)) < len(payload) / 10
+
+    def test_truncated_entry(self):
+        """Test truncated frames are rejected."""
+        with pytest.raises(ValueError):
+            decode_entry(b"\x01\x00")
+
+
+class TestTwoTierCache:
+    """Test cases for TwoTierCache."""
+
+    @pytest.mark.asyncio
+    async def test_l1_hit(self):
+        """Test repeated lookups are served from the in-process tier."""
+        cache = TwoTierCache()
+        compute = Counter()
+
+        first = await cache.get_or_compute("search", ["ไทย"], compute, dump, load)
+        second = await cache.get_or_compute("search", ["ไทย"], compute, dump, load)
+
+        assert first == ("result-1", False)
+        assert second == ("result-1", True)
+        assert compute.calls == 1
+        assert cache.get_stats()["l1_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_l2_across_replicas(self):
+        """Test a value computed on one replica is a hit on another."""
+        backend = InMemoryCacheBackend()
+        replica_a = TwoTierCache(l2=backend)
+        replica_b = TwoTierCache(l2=backend)
+        compute = Counter()
+
+        await replica_a.get_or_compute("search", ["ไทย"], compute, dump, load)
+        value, cache_hit = await replica_b.get_or_compute("search", ["ไทย"], compute, dump, load)
+
+        assert (value, cache_hit) == ("result-1", True)
+        assert compute.calls == 1
+        assert replica_b.get_stats()["l2_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """Test concurrent misses share one computation."""
+        cache = TwoTierCache()
+        compute = Counter(delay=0.01)
+
+        results = await asyncio.gather(*(
+            cache.get_or_compute("search", ["ไทย"], compute, dump, load) for _ in range(5)
+        ))
+
+        assert {value for value, _ in results} == {"result-1"}
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_waiters(self):
+        """Test the shared computation survives the first caller being cancelled."""
+        cache = TwoTierCache()
+        compute = Counter(delay=0.05)
+
+        first = asyncio.create_task(cache.get_or_compute("search", ["ไทย"], compute, dump, load))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_compute("search", ["ไทย"], compute, dump, load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == ("result-1", False)
+        assert first.cancelled()
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test stale entries are served while refreshed in the background."""
+        cache = TwoTierCache(fresh_seconds=0, stale_seconds=60)
+        compute = Counter()
+
+        await cache.get_or_compute("search", ["ไทย"], compute, dump, load)
+        value, cache_hit = await cache.get_or_compute("search", ["ไทย"], compute, dump, load)
+        await asyncio.sleep(0.01)
+
+        assert (value, cache_hit) == ("result-1", True)
+        assert compute.calls == 2
+        assert cache.get_stats()["stale_served"] == 1
+        assert cache._l1_get(cache.make_key("search", ["ไทย"]))[0] == "result-2"
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_values_are_not_stored(self):
+        """Test degraded results are recomputed."""
+        cache = TwoTierCache()
+        compute = Counter()
+
+        for _ in range(2):
+            await cache.get_or_compute("search", ["ไทย"], compute, dump, load, cacheable=lambda _: False)
+
+        assert compute.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_version_change_moves_keys(self):
+        """Test a new dictionary version misses old entries."""
+        cache = TwoTierCache()
+        cache.set_version(dictionary="v1")
+        old_key = cache.make_key("search", ["ไทย"])
+
+        cache.set_version(dictionary="v2")
+
+        assert cache.make_key("search", ["ไทย"]) != old_key
+
+    @pytest.mark.asyncio
+    async def test_invalidation_fans_out(self):
+        """Test invalidating on one replica drops entries on all of them."""
+        backend = InMemoryCacheBackend()
+        replica_a = TwoTierCache(l2=backend)
+        replica_b = TwoTierCache(l2=backend)
+        await replica_a.start()
+        await replica_b.start()
+        compute = Counter()
+        await replica_b.get_or_compute("search", ["ไทย"], compute, dump, load)
+
+        await replica_a.invalidate(reason="dictionary reload")
+        value, cache_hit = await replica_b.get_or_compute("search", ["ไทย"], compute, dump, load)
+
+        assert (value, cache_hit) == ("result-2", False)
+        assert replica_a.version == replica_b.version
+
+    @pytest.mark.asyncio
+    async def test_l2_errors_are_tolerated(self):
+        """Test a failing shared cache degrades to computing."""
+
+        class BrokenBackend(InMemoryCacheBackend):
+            async def get(self, key):
+                raise ConnectionError("cache down")
+
+        cache = TwoTierCache(l2=BrokenBackend(), l1_max_entries=0)
+        compute = Counter()
+
+        value, cache_hit = await cache.get_or_compute("search", ["ไทย"], compute, dump, load)
+
+        assert (value, cache_hit) == ("result-1", False)
+        assert cache.get_stats()["l2_errors"] == 1
+
+
+class FakePubSub:
+    """Pub/sub connection delivering scripted messages, then failing or blocking."""
+
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.closed = False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield {"type": "message", "data": message}
+        if self.error is not None:
+            raise self.error
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    """Client handing out the scripted pub/sub connections in order."""
+
+    def __init__(self, pubsubs=()):
+        self.pubsubs = list(pubsubs)
+        self.store = {}
+
+    def pubsub(self):
+        return self.pubsubs.pop(0)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def aclose(self):
+        pass
+
+
+class TestRedisCacheBackend:
+    """Test cases for RedisCacheBackend subscriptions."""
+
+    @pytest.fixture
+    def clients(self, monkeypatch):
+        """Fake redis module whose from_url returns the data and pub/sub clients in turn."""
+        clients = [FakeRedis(), FakeRedis()]
+        redis_asyncio = types.ModuleType("redis.asyncio")
+        remaining = iter(clients)
+        redis_asyncio.from_url = lambda url, **kwargs: next(remaining)
+        redis_module = types.ModuleType("redis")
+        redis_module.asyncio = redis_asyncio
+        monkeypatch.setitem(sys.modules, "redis", redis_module)
+        monkeypatch.setitem(sys.modules, "redis.asyncio", redis_asyncio)
+        return clients
+
+    @pytest.mark.asyncio
+    async def test_subscription_survives_connection_errors(self, clients):
+        """Test a dropped subscription is restored and the generation re-read."""
+        data_client, pubsub_client = clients
+        first = FakePubSub([b"1"], error=TimeoutError("read timed out"))
+        second = FakePubSub([])
+        pubsub_client.pubsubs = [first, second]
+        backend = RedisCacheBackend("redis://cache:6379/0", reconnect_delay=0)
+        cache = TwoTierCache(l2=backend)
+        # Generation 2 was published while the subscription was down
+        await cache.start()
+        data_client.store[cache.generation_key] = b"2"
+        await asyncio.sleep(0.05)
+
+        assert first.closed
+        assert not pubsub_client.pubsubs
+        assert cache.get_stats()["generation"] == 2
+        await cache.close()
+
+
+class TestSearchProxyServiceCache:
+    """Test cases for result caching in SearchProxyService."""
+
+    @pytest.fixture
+    def meilisearch_client(self):
+        client = AsyncMock(spec=MeiliSearchClient)
+        client.health_check.return_value = {"status": "healthy"}
+        client.search.return_value = {
+            "hits": [{"id": "1", "title": "เอกสารภาษาไทย", "_rankingScore": 0.9}],
+            "estimatedTotalHits": 1
+        }
+        return client
+
+    @pytest.mark.asyncio
+    async def test_replicas_share_results(self, meilisearch_client):
+        """Test a search answered by one replica is a cache hit on another."""
+        backend = InMemoryCacheBackend()
+        replicas = [
+            SearchProxyService(get_development_settings(), meilisearch_client, cache_backend=backend)
+            for _ in range(2)
+        ]
+        for service in replicas:
+            await service.initialize()
+        request = SearchRequest(query="เอกสารภาษาไทย", index_name="documents")
+
+        first = await replicas[0].search(request)
+        calls = meilisearch_client.search.call_count
+        second = await replicas[1].search(request)
+
+        assert meilisearch_client.search.call_count == calls
+        assert [hit.id for hit in second.hits] == [hit.id for hit in first.hits]
+        assert replicas[1]._cache.get_stats()["l2_hits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_config_reload_invalidates(self, meilisearch_client):
+        """Test a configuration reload drops cached results."""
+        service = SearchProxyService(get_development_settings(), meilisearch_client)
+        await service.initialize()
+        request = SearchRequest(query="เอกสารภาษาไทย", index_name="documents")
+        await service.search(request)
+        calls = meilisearch_client.search.call_count
+
+        await service._on_config_reload("ranking")
+        await service.search(request)
+
+        assert meilisearch_client.search.call_count > calls
@@ -0,0 +1,96 @@
+"""
+Unit tests for the shared Thai script scanner.
+"""
+
+import pytest
+
+from src.tokenizer.script_scanner import (
+    scan_text,
+    is_thai_text,
+    thai_runs,
+    extract_thai_runs,
+    fallback_tokens,
+    content_type_runs
+)
+
+
+class TestScanText:
+    """Test cases for scan_text and ScriptProfile."""
+
+    def test_empty_text(self):
+        """Test scanning an empty string."""
+        profile = scan_text("")
+
+        assert profile.length == 0
+        assert profile.thai_ratio == 0.0
+        assert not profile.has_thai
+        assert not profile.is_mixed
+
+    def test_counts_match_character_predicates(self):
+        """Test per-class counts agree with per-character checks."""
+        text = "ราคา iPhone 15 ๑๒๓ บาท! ภาษาไทย café ½"
+
+        profile = scan_text(text)
+
+        thai = sum(1 for c in text if '฀' <= c <= '๿')
+        assert profile.length == len(text)
+        assert profile.thai_chars == thai
+        assert profile.thai_digits == 3
+        assert profile.ascii_letters == sum(1 for c in text if c.isascii() and c.isalpha())
+        assert profile.other_letters == 1  # é
+        assert profile.whitespace == text.count(" ")
+        assert profile.other == 1
+        assert profile.thai_ratio == pytest.approx(thai / len(text))
+
+    def test_thai_marks_count_as_punctuation(self):
+        """Test Thai vowel and tone marks are counted with punctuation."""
+        profile = scan_text("ที่")
+
+        assert profile.thai_letters == 1
+        assert profile.thai_marks == 2
+        assert profile.punctuation_chars == 2
+
+    def test_mixed_content(self):
+        """Test mixed detection requires Thai plus non-Thai alphanumerics."""
+        assert scan_text("สวัสดี hello").is_mixed
+        assert scan_text("ราคา 100").is_mixed
+        assert not scan_text("สวัสดี!").is_mixed
+        assert not scan_text("hello 100").is_mixed
+
+
+class TestIsThaiText:
+    """Test cases for is_thai_text."""
+
+    def test_threshold(self):
+        """Test the Thai ratio must exceed the threshold."""
+        assert is_thai_text("ภาษาไทย")
+        assert not is_thai_text("ab ไทย")
+        assert is_thai_text("ab ไทย", threshold=0.3)
+        assert not is_thai_text("")
+
+
+class TestRuns:
+    """Test cases for run extraction helpers."""
+
+    def test_thai_runs(self):
+        """Test Thai run offsets and text."""
+        text = "abc ไทย 123 ภาษา"
+
+        assert thai_runs(text) == [(4, 7), (12, 16)]
+        assert extract_thai_runs(text) == ["ไทย", "ภาษา"]
+
+    def test_fallback_tokens(self):
+        """Test Thai runs stay whole and other characters are split."""
+        assert fallback_tokens("ไทย ab, ภาษา") == ["ไทย", "a", "b", ",", "ภาษา"]
+
+    def test_content_type_runs(self):
+        """Test text is split into contiguous content type runs."""
+        runs = content_type_runs("ไทยabc 12!")
+
+        assert runs == [
+            (0, 3, "thai"),
+            (3, 6, "english"),
+            (6, 7, "whitespace"),
+            (7, 9, "numeric"),
+            (9, 10, "punctuation")
+        ]
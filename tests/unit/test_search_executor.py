@@ -10,7 +10,7 @@ from typing import Dict, Any, List
 from src.search_proxy.services.search_executor import SearchExecutor, SearchExecutorConfig
 from src.search_proxy.models.query import QueryVariant, QueryVariantType
 from src.search_proxy.models.requests import SearchOptions
-from src.search_proxy.models.search import SearchResult
+from src.search_proxy.models.search import SearchResult, HitRecord, to_search_hits
 from src.search_proxy.models.responses import SearchHit
 
 
@@ -146,6 +146,42 @@ class TestSearchExecutor:
         assert first_hit.document["title"] == "Thai Document 1"
         assert first_hit.ranking_info["variant_weight"] == variant.weight
     
+    @pytest.mark.asyncio
+    async def test_execute_single_search_returns_hit_records(
+        self,
+        search_executor,
+        sample_query_variants,
+        sample_search_options,
+        mock_meilisearch_response
+    ):
+        """Test that executor hits are lightweight records convertible to SearchHit."""
+        variant = sample_query_variants[1]
+        search_executor.client.search.return_value = mock_meilisearch_response
+        
+        result = await search_executor.execute_single_search(
+            variant, "test_index", sample_search_options
+        )
+        
+        assert all(isinstance(hit, HitRecord) for hit in result.hits)
+        assert not hasattr(result.hits[0], "__dict__")
+        
+        search_hits = to_search_hits(result.hits)
+        assert all(isinstance(hit, SearchHit) for hit in search_hits)
+        assert search_hits[0].id == "doc_1"
+        assert search_hits[0].highlight["content"] == "<em>เอกสาร</em>ภาษาไทย"
+        assert search_hits[0].ranking_info["tokenization_engine"] == "newmm"
+    
+    def test_to_search_hits_passes_through_search_hits(self):
+        """Test that already validated SearchHit instances are kept as-is."""
+        existing = SearchHit(id="doc_1", score=0.5, document={"title": "x"})
+        record = HitRecord(id="doc_2", score=0.4, document={"title": "y"})
+        
+        converted = to_search_hits([existing, record])
+        
+        assert converted[0] is existing
+        assert isinstance(converted[1], SearchHit)
+        assert converted[1].id == "doc_2"
+    
     @pytest.mark.asyncio
     async def test_execute_single_search_failure(
         self, 
@@ -3,7 +3,7 @@ Unit tests for MeiliSearch tokenization settings manager.
 """
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock, Mock
 
 from src.meilisearch_integration.settings_manager import (
     TokenizationSettingsManager,
@@ -12,7 +12,10 @@ from src.meilisearch_integration.settings_manager import (
     TokenizerEngine,
     create_default_thai_settings,
     create_minimal_thai_settings,
-    validate_thai_text_settings
+    validate_thai_text_settings,
+    diff_settings,
+    reconcile_index_settings,
+    configure_thai_tokenization
 )
 
 
@@ -421,4 +424,97 @@ class TestTokenizerEngine:
         assert "pythainlp" in TokenizerEngine
         assert "attacut" in TokenizerEngine
         assert "deepcut" in TokenizerEngine
-        assert "invalid" not in TokenizerEngine
\ No newline at end of file
+        assert "invalid" not in TokenizerEngine
+
+
+class TestSettingsDiff:
+    """Test cases for settings diffing and reconciliation."""
+    
+    @pytest.fixture
+    def live_settings(self):
+        """Settings as returned by MeiliSearch for the default configuration."""
+        settings = create_default_thai_settings().create_meilisearch_settings()
+        live = {key: list(value) if isinstance(value, list) else value for key, value in settings.items()}
+        # MeiliSearch returns set-like settings sorted
+        live["separatorTokens"] = sorted(live["separatorTokens"])
+        live["stopWords"] = sorted(set(live["stopWords"]))
+        live["typoTolerance"] = {"enabled": True, "minWordSizeForTypos": {"oneTypo": 5, "twoTypos": 9}}
+        return live
+    
+    def test_identical_settings_are_noop(self, live_settings):
+        """Test re-applying the same settings produces no update."""
+        desired = create_default_thai_settings().create_meilisearch_settings()
+        
+        diff = diff_settings(live_settings, desired)
+        
+        assert diff.is_noop
+        assert diff.update == {}
+    
+    def test_order_matters_only_for_ordered_settings(self, live_settings):
+        """Test set-like settings ignore order while ranking rules do not."""
+        desired = {
+            "separatorTokens": list(reversed(live_settings["separatorTokens"])),
+            "rankingRules": list(reversed(live_settings["rankingRules"]))
+        }
+        
+        diff = diff_settings(live_settings, desired)
+        
+        assert list(diff.update) == ["rankingRules"]
+        assert not diff.requires_reindex
+    
+    def test_reindexing_changes_are_reported(self, live_settings):
+        """Test changes are classified by whether they trigger a reindex."""
+        desired = {
+            "dictionary": ["วากาเมะ"],
+            "synonyms": {"ซูชิ": ["sushi"]},
+            "typoTolerance": {"enabled": True}
+        }
+        
+        diff = diff_settings(live_settings, desired)
+        
+        assert set(diff.update) == {"dictionary", "synonyms"}
+        assert diff.requires_reindex
+        assert diff.reindexing_keys == ["dictionary"]
+    
+    @pytest.mark.asyncio
+    async def test_reconcile_sends_only_changed_keys(self, live_settings):
+        """Test reconciliation applies changed keys in a single task."""
+        client = Mock()
+        client.get_index_settings = AsyncMock(return_value=live_settings)
+        client.update_index_settings = AsyncMock(return_value={"status": "updated", "task_uid": 42})
+        desired = dict(live_settings, stopWords=["และ"], rankingRules=["words", "exactness"])
+        
+        result = await reconcile_index_settings(client, "documents", desired)
+        
+        client.update_index_settings.assert_awaited_once_with(
+            "documents", {"stopWords": ["และ"], "rankingRules": ["words", "exactness"]}
+        )
+        assert result["applied"] is True
+        assert result["task_uid"] == 42
+        assert result["reindexing_settings"] == ["stopWords"]
+    
+    @pytest.mark.asyncio
+    async def test_configure_skips_unchanged_settings(self, live_settings):
+        """Test configuring an up-to-date index sends nothing."""
+        client = Mock()
+        client.get_index_settings = AsyncMock(return_value=live_settings)
+        client.update_index_settings = AsyncMock()
+        
+        result = await configure_thai_tokenization(client, "documents")
+        
+        client.update_index_settings.assert_not_called()
+        assert result["status"] == "configured"
+        assert result["applied"] is False
+        assert result["changed_settings"] == []
+    
+    @pytest.mark.asyncio
+    async def test_configure_force_pushes_full_settings(self):
+        """Test force bypasses the diff."""
+        client = Mock()
+        client.get_index_settings = AsyncMock()
+        client.update_index_settings = AsyncMock(return_value={"task_uid": 7})
+        
+        result = await configure_thai_tokenization(client, "documents", force=True)
+        
+        client.get_index_settings.assert_not_called()
+        assert result["task_uid"] == 7
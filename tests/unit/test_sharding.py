@@ -0,0 +1,240 @@
+"""
+Unit tests for scatter-gather search across MeiliSearch shards.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.meilisearch_integration.client import MeiliSearchClient, MeiliSearchConfig
+from src.meilisearch_integration.document_processor import (
+    DocumentProcessor,
+    ProcessedDocument,
+    ProcessingStatus
+)
+from src.meilisearch_integration.sharding import (
+    ShardPartitioner,
+    ShardUnavailableError,
+    ShardedMeiliSearchClient,
+    merge_shard_hits,
+    sharding_config_from_settings
+)
+from src.search_proxy.config.settings import SearchProxySettings
+
+
+def make_shard(host, hits=None):
+    """Create a mock shard client returning hits sorted by score."""
+    shard = AsyncMock(spec=MeiliSearchClient)
+    shard.config = MeiliSearchConfig(host=host)
+    ordered = sorted(hits or [], key=lambda hit: -hit["_rankingScore"])
+    shard.search.return_value = {"hits": ordered, "estimatedTotalHits": len(ordered)}
+    shard.add_documents.side_effect = lambda index, docs, pk=None: {"task_uid": len(docs)}
+    shard.health_check.return_value = {"status": "healthy"}
+    return shard
+
+
+def hit(doc_id, score, **fields):
+    """Raw MeiliSearch hit."""
+    return {"id": doc_id, "_rankingScore": score, **fields}
+
+
+class TestShardPartitioner:
+    """Test cases for ShardPartitioner."""
+
+    def test_placement_is_stable(self):
+        """Test the same key always maps to the same shard."""
+        partitioner = ShardPartitioner(4)
+        placements = {partitioner.shard_for_key(f"doc{i}") for i in range(200)}
+
+        assert placements == {0, 1, 2, 3}
+        assert partitioner.shard_for_document({"id": "doc7"}) == partitioner.shard_for_key("doc7")
+
+    def test_tenant_partitioning(self):
+        """Test tenant placement keeps a tenant together and honors overrides."""
+        partitioner = ShardPartitioner(3, partition_field="tenant", tenant_shards={"acme": 2})
+        groups = partitioner.split_documents([
+            {"id": "1", "tenant": "acme"},
+            {"id": "2", "tenant": "acme"},
+            {"id": "3", "tenant": "other"}
+        ])
+
+        assert [doc["id"] for doc in groups[2]][:2] == ["1", "2"]
+        assert not partitioner.routes_by_primary_key
+
+    def test_missing_partition_key(self):
+        """Test documents without a partition key are rejected."""
+        with pytest.raises(ValueError):
+            ShardPartitioner(2, partition_field="tenant").shard_for_document({"id": "1"})
+
+
+class TestMergeShardHits:
+    """Test cases for the k-way merge."""
+
+    def test_merge_by_score(self):
+        """Test hits are interleaved by ranking score and paginated."""
+        merged = merge_shard_hits(
+            [[hit("a", 0.9), hit("c", 0.5)], [hit("b", 0.7), hit("d", 0.1)]],
+            limit=2,
+            offset=1
+        )
+
+        assert [h["id"] for h in merged] == ["b", "c"]
+
+    def test_merge_by_sort_rules(self):
+        """Test explicit sort rules decide the order, missing values last."""
+        merged = merge_shard_hits(
+            [[hit("a", 0.1, price=30), hit("c", 0.9)], [hit("b", 0.5, price=10)]],
+            limit=3,
+            sort=["price:desc"]
+        )
+
+        assert [h["id"] for h in merged] == ["a", "b", "c"]
+
+
+class TestShardedMeiliSearchClient:
+    """Test cases for ShardedMeiliSearchClient."""
+
+    @pytest.mark.asyncio
+    async def test_scatter_gather_search(self):
+        """Test every shard is asked for the full page and results are merged."""
+        shards = [
+            make_shard("http://s0", [hit("a", 0.9), hit("c", 0.4)]),
+            make_shard("http://s1", [hit("b", 0.8), hit("d", 0.2)])
+        ]
+        client = ShardedMeiliSearchClient(shards)
+
+        results = await client.search("docs", "ไทย", {"limit": 2, "offset": 1})
+
+        assert [h["id"] for h in results["hits"]] == ["b", "c"]
+        assert results["estimatedTotalHits"] == 4
+        assert results["shards"] == {"total": 2, "successful": 2, "failed": []}
+        for shard in shards:
+            _, _, options = shard.search.call_args.args
+            assert options["limit"] == 3 and options["offset"] == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_results_on_shard_timeout(self):
+        """Test a slow shard is dropped after its deadline."""
+        slow = make_shard("http://slow")
+
+        async def never_answers(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        slow.search.side_effect = never_answers
+        client = ShardedMeiliSearchClient([make_shard("http://s0", [hit("a", 0.9)]), slow], shard_timeout_ms=50)
+
+        results = await client.search("docs", "ไทย")
+
+        assert [h["id"] for h in results["hits"]] == ["a"]
+        assert results["shards"]["failed"] == [{"shard": 1, "host": "http://slow", "error": "timed out"}]
+        assert client.get_stats()["partial_searches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_too_few_shards(self):
+        """Test searches fail when fewer shards than required answer."""
+        failing = make_shard("http://s1")
+        failing.search.side_effect = RuntimeError("down")
+        client = ShardedMeiliSearchClient([make_shard("http://s0"), failing], min_successful_shards=2)
+
+        with pytest.raises(ShardUnavailableError) as exc_info:
+            await client.search("docs", "ไทย")
+
+        assert exc_info.value.failures[0]["error"] == "down"
+
+    @pytest.mark.asyncio
+    async def test_writes_are_routed(self):
+        """Test document processor writes land on the owning shard only."""
+        shards = [make_shard("http://s0"), make_shard("http://s1")]
+        client = ShardedMeiliSearchClient(shards)
+        processor = DocumentProcessor(meilisearch_client=client)
+        documents = [
+            ProcessedDocument(id=f"doc{i}", title="", content="", status=ProcessingStatus.COMPLETED)
+            for i in range(10)
+        ]
+
+        result = await processor.index_processed_documents(documents, "docs")
+
+        assert result["indexed_count"] == 10
+        assert sum(result["shard_counts"].values()) == 10
+        for shard_index, shard in enumerate(shards):
+            for call in shard.add_documents.call_args_list:
+                _, docs, _ = call.args
+                assert all(client.partitioner.shard_for_key(doc["id"]) == shard_index for doc in docs)
+
+    @pytest.mark.asyncio
+    async def test_processed_documents_keep_their_partition_key(self):
+        """Test tenant-partitioned writes carry the tenant field to its shard."""
+        shards = [make_shard("http://s0"), make_shard("http://s1"), make_shard("http://s2")]
+        client = ShardedMeiliSearchClient(
+            shards,
+            ShardPartitioner(3, partition_field="tenant", tenant_shards={"acme": 2})
+        )
+        processor = DocumentProcessor(meilisearch_client=client)
+        documents = [
+            {"id": f"doc{i}", "title": "ข่าว", "content": "การพัฒนาเทคโนโลยี", "tenant": tenant}
+            for i, tenant in enumerate(["acme", "globex", "acme", "initech", "globex"])
+        ]
+        batch = await processor.process_batch(documents)
+
+        result = await processor.index_processed_documents(batch.processed_documents, "docs")
+
+        assert result["indexed_count"] == 5
+        assert result["shard_counts"][2] >= 2
+        placed = {}
+        for shard_index, shard in enumerate(shards):
+            for call in shard.add_documents.call_args_list:
+                _, docs, _ = call.args
+                placed.update({doc["id"]: (shard_index, doc["tenant"]) for doc in docs})
+        assert set(placed) == {doc["id"] for doc in documents}
+        for shard_index, tenant in placed.values():
+            assert shard_index == client.partitioner.shard_for_key(tenant)
+
+    @pytest.mark.asyncio
+    async def test_health_degraded(self):
+        """Test the cluster is degraded while some shards are down."""
+        down = make_shard("http://s1")
+        down.health_check.return_value = {"status": "unhealthy"}
+        client = ShardedMeiliSearchClient([make_shard("http://s0"), down])
+
+        health = await client.health_check()
+
+        assert health["status"] == "degraded"
+        assert health["healthy_shards"] == 1
+
+
+class TestShardingSettings:
+    """Test cases for building the sharded client from settings."""
+
+    def test_single_node_without_shard_urls(self):
+        """Test no sharding configuration is built without shard URLs."""
+        assert sharding_config_from_settings(SearchProxySettings()) is None
+
+    def test_config_from_settings(self):
+        """Test shard URLs, partition field and deadlines are taken from settings."""
+        settings = SearchProxySettings(
+            meilisearch_shard_urls=["http://s0:7700", "http://s1:7700"],
+            meilisearch_partition_field="tenant",
+            meilisearch_api_key="key"
+        )
+
+        config = sharding_config_from_settings(settings)
+
+        assert config.hosts == ["http://s0:7700", "http://s1:7700"]
+        assert config.partition_field == "tenant"
+        assert config.api_key == "key"
+        assert config.shard_timeout_ms == settings.search.shard_timeout_ms
+
+    def test_documents_api_writes_to_shards(self, monkeypatch):
+        """Test the documents API indexes through a sharded client when shards are configured."""
+        from src.api.endpoints import documents
+
+        monkeypatch.setenv("SEARCH_PROXY_MEILISEARCH_SHARD_URLS", '["http://s0:7700", "http://s1:7700"]')
+        monkeypatch.setattr(documents, "_document_processor", None)
+        monkeypatch.setattr(documents, "_meilisearch_client", None)
+
+        processor = documents.get_document_processor()
+
+        assert isinstance(processor.meilisearch_client, ShardedMeiliSearchClient)
+        assert len(processor.meilisearch_client.shards) == 2
+        assert documents.get_meilisearch_client() is processor.meilisearch_client
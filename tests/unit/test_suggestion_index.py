@@ -0,0 +1,170 @@
+"""
+Unit tests for the prefix suggestion index and endpoint.
+"""
+
+import heapq
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.suggest import router, get_suggestion_service
+from src.tokenizer.query_processor import QueryProcessor
+from src.tokenizer.suggestion_index import (
+    BASE_WORD_WEIGHT,
+    DICTIONARY_WEIGHT,
+    QUERY_WEIGHT,
+    SuggestionIndex,
+    SuggestionService,
+    collect_suggestion_weights
+)
+
+
+WEIGHTS = {
+    "การตลาด": 6.0,
+    "การตลาดออนไลน์": 2.0,
+    "การบิน": 5.0,
+    "การ": 1.0,
+    "กาแฟเย็น": 3.0,
+    "ภาษาไทย": 4.0,
+    "Thai Food": 2.0
+}
+
+
+def brute_force(weights, prefix, k):
+    """Reference top-k by scanning every term."""
+    matches = [
+        (-weight, len(term), term) for term, weight in weights.items()
+        if term.casefold().startswith(prefix.casefold())
+    ]
+    return [(term, -weight) for weight, _, term in heapq.nsmallest(k, matches)]
+
+
+class TestSuggestionIndex:
+    """Test cases for SuggestionIndex."""
+
+    @pytest.fixture
+    def index(self):
+        """Index small enough to exercise both lookup paths."""
+        index = SuggestionIndex(cache_size=3, dense_threshold=2)
+        index.build(WEIGHTS)
+        return index
+
+    def test_top_k_by_weight(self, index):
+        """Test suggestions are ranked by weight."""
+        assert index.top_k("การ", 3) == [("การตลาด", 6.0), ("การบิน", 5.0), ("การตลาดออนไลน์", 2.0)]
+        assert index.top_k("ภา") == [("ภาษาไทย", 4.0)]
+        assert index.top_k("ข") == []
+        assert index.top_k("") == []
+
+    def test_dense_and_scanned_paths_agree(self, index):
+        """Test precomputed and on-the-fly results match a brute-force scan."""
+        for prefix in ["ก", "กา", "การ", "การต", "ภ", "t"]:
+            for k in (1, 3, 5):
+                assert index.top_k(prefix, k) == brute_force(WEIGHTS, prefix, k)
+        assert "ก" in index._snapshot.dense
+
+    def test_prefix_is_normalized(self, index):
+        """Test lookups ignore case and repeated whitespace."""
+        assert index.top_k("thai   f") == [("Thai Food", 2.0)]
+
+    def test_incremental_updates(self, index):
+        """Test pending upserts and removals are visible before a rebuild."""
+        index.upsert("การบินไทย", 10.0)
+        index.upsert("การตลาด", 0.5)
+        index.remove("การบิน")
+
+        assert index.top_k("การ", 3) == [("การบินไทย", 10.0), ("การตลาดออนไลน์", 2.0), ("การ", 1.0)]
+        assert index.rebuilds == 1
+        assert len(index) == len(WEIGHTS)
+
+    def test_compaction(self, index):
+        """Test the pending overlay is folded in once it exceeds its limit."""
+        index.max_pending = 2
+        index.upsert("การบินไทย", 10.0)
+        index.upsert("กาแฟร้อน", 1.0)
+        index.upsert("การตลาด", 0.5)
+
+        assert index.rebuilds == 2
+        assert index.get_stats()["pending_updates"] == 0
+        assert index.top_k("การ", 2) == [("การบินไทย", 10.0), ("การบิน", 5.0)]
+
+
+class TestSuggestionService:
+    """Test cases for SuggestionService."""
+
+    def test_collect_weights(self):
+        """Test sources add up per term."""
+        weights = collect_suggestion_weights(["การบิน"], ["การบิน", "การ"], {"การบิน": 2})
+
+        assert weights["การบิน"] == BASE_WORD_WEIGHT + DICTIONARY_WEIGHT + 2 * QUERY_WEIGHT
+        assert weights["การ"] == BASE_WORD_WEIGHT
+
+    @pytest.mark.asyncio
+    async def test_query_statistics_refresh(self):
+        """Test query statistics are pulled in the background at most once per interval."""
+        calls = []
+
+        def query_source():
+            calls.append(1)
+            return {"การบินไทย": 3}
+
+        service = SuggestionService(
+            dictionary_words=["การบิน"],
+            base_words=["การ"],
+            query_source=query_source,
+            refresh_interval=60.0
+        )
+
+        refresh = service.maybe_refresh()
+        assert service.suggest("การ", 1) == [("การบิน", DICTIONARY_WEIGHT)]
+        await refresh
+
+        assert service.suggest("การ", 1) == [("การบินไทย", 3 * QUERY_WEIGHT)]
+        assert service.maybe_refresh() is None
+        assert len(calls) == 1
+
+    def test_refresh_only_updates_changed_queries(self):
+        """Test unchanged query frequencies are not re-applied."""
+        service = SuggestionService(dictionary_words=["การบิน"])
+
+        assert service.refresh_queries({"การบิน": 1, "ภาษาไทย": 2}) == 2
+        assert service.refresh_queries({"การบิน": 1, "ภาษาไทย": 3}) == 1
+        assert service.index.top_k("การ") == [("การบิน", DICTIONARY_WEIGHT + QUERY_WEIGHT)]
+
+    def test_query_processor_completions(self):
+        """Test partial tokens are completed from the index."""
+        index = SuggestionIndex()
+        index.build(WEIGHTS)
+        processor = QueryProcessor(suggestion_index=index, max_completions=2)
+
+        assert processor._generate_completions("การ") == ["การตลาด", "การบิน"]
+        assert processor._generate_completions("hello") == []
+
+
+class TestSuggestEndpoint:
+    """Test cases for the /suggest endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client with a small suggestion service."""
+        service = SuggestionService(base_words=list(WEIGHTS))
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        app.dependency_overrides[get_suggestion_service] = lambda: service
+        return TestClient(app)
+
+    def test_suggest(self, client):
+        """Test suggestions are returned for a prefix."""
+        response = client.get("/api/v1/suggest", params={"q": "กาแ", "limit": 5})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["query"] == "กาแ"
+        assert data["suggestions"] == [{"text": "กาแฟเย็น", "score": BASE_WORD_WEIGHT}]
+
+    def test_suggest_validates_limit(self, client):
+        """Test out-of-range limits are rejected."""
+        response = client.get("/api/v1/suggest", params={"q": "ก", "limit": 500})
+
+        assert response.status_code == 422
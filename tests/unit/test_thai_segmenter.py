@@ -245,6 +245,75 @@ class TestThaiSegmenter:
         no_ws_tokens = [t for t in result_no_ws.tokens if t.strip()]
         
         assert len(ws_tokens) >= len(no_ws_tokens)
+    
+    def test_word_boundaries_match_token_positions(self):
+        """Test that boundaries slice the original text back into tokens."""
+        text = "ระบบค้นหาข้อความภาษาไทย และ search engine"
+        result = self.segmenter.segment_text(text)
+        
+        boundaries = result.word_boundaries
+        for token, start, end in zip(result.tokens, boundaries, boundaries[1:]):
+            assert text[start:end] == token
+    
+    def test_split_into_chunks_short_text(self):
+        """Test that short text is returned as a single chunk."""
+        assert self.segmenter.split_into_chunks("สวัสดี", 100) == [(0, "สวัสดี")]
+    
+    def test_split_into_chunks_prefers_whitespace(self):
+        """Test chunks split after whitespace and concatenate back exactly."""
+        text = " ".join(["ประเทศไทยมีวัฒนธรรม"] * 50)
+        
+        chunks = self.segmenter.split_into_chunks(text, 100)
+        
+        assert "".join(chunk for _, chunk in chunks) == text
+        assert all(text[offset:offset + len(chunk)] == chunk for offset, chunk in chunks)
+        assert all(len(chunk) <= 100 for _, chunk in chunks)
+        assert all(chunk.endswith(" ") for _, chunk in chunks[:-1])
+    
+    def test_split_into_chunks_unbroken_thai_run(self):
+        """Test unbroken Thai text splits before a leading vowel."""
+        text = "การศึกษาเป็นเรื่องสำคัญ" * 20
+        
+        chunks = self.segmenter.split_into_chunks(text, 50)
+        
+        assert "".join(chunk for _, chunk in chunks) == text
+        for _, chunk in chunks[1:]:
+            assert chunk[0] in "เแโใไ"
+    
+    def test_merge_chunk_results_stitches_offsets(self):
+        """Test merged chunk results have boundaries relative to the full text."""
+        text = " ".join(["ประเทศไทยเป็นประเทศที่มีวัฒนธรรมหลากหลาย"] * 30)
+        
+        chunks = self.segmenter.split_into_chunks(text, 200)
+        result = self.segmenter.merge_chunk_results(
+            text,
+            [(offset, self.segmenter.segment_text(chunk)) for offset, chunk in chunks]
+        )
+        
+        assert len(chunks) > 1
+        assert result.original_text == text
+        assert "".join(result.tokens) == text
+        assert len(result.word_boundaries) == len(result.tokens) + 1
+        assert result.word_boundaries[-1] == len(text)
+        boundaries = result.word_boundaries
+        for token, start, end in zip(result.tokens, boundaries, boundaries[1:]):
+            assert text[start:end] == token
+        assert result.tokens == self.segmenter.segment_text(text).tokens
+    
+    def test_merge_chunk_results_rejoins_words_cut_inside_thai_run(self):
+        """Test chunks of space-free Thai text merge to the unchunked tokens."""
+        text = "การพัฒนาเทคโนโลยีในประเทศไทยเป็นเรื่องสำคัญมากสำหรับเศรษฐกิจ" * 40
+        expected = self.segmenter.segment_text(text)
+        
+        for chunk_size in (50, 100, 333):
+            chunks = self.segmenter.split_into_chunks(text, chunk_size)
+            result = self.segmenter.merge_chunk_results(
+                text,
+                [(offset, self.segmenter.segment_text(chunk)) for offset, chunk in chunks]
+            )
+            
+            assert result.tokens == expected.tokens
+            assert result.word_boundaries == expected.word_boundaries
 
 
 class TestTokenizationResult:
@@ -0,0 +1,142 @@
+"""
+Unit tests for token offsets stored at index time.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.tokenize import router, get_result_enhancer
+from src.meilisearch_integration.document_processor import DocumentProcessor
+from src.tokenizer.result_enhancer import SearchResultEnhancer
+from src.tokenizer.token_offsets import (
+    TOKEN_OFFSETS_FIELD,
+    decode_boundaries,
+    encode_boundaries,
+    field_boundaries,
+    stored_segments
+)
+
+
+class TestBoundaryEncoding:
+    """Test cases for the boundary encoding."""
+
+    @pytest.mark.parametrize("boundaries", [
+        [0],
+        [0, 3, 8, 11],
+        [0, 31, 32, 33, 1056, 70000]
+    ])
+    def test_roundtrip(self, boundaries):
+        """Test boundaries survive an encode/decode round trip."""
+        assert decode_boundaries(encode_boundaries(boundaries)) == boundaries
+
+    def test_short_segments_take_one_character(self):
+        """Test segments shorter than 32 characters cost one character."""
+        assert encode_boundaries([0, 3, 8, 11]) == "353"
+        assert len(encode_boundaries([0, 40])) == 2
+
+    def test_invalid_encoding(self):
+        """Test malformed and truncated encodings are rejected."""
+        with pytest.raises(ValueError):
+            decode_boundaries("3!")
+        with pytest.raises(ValueError):
+            decode_boundaries("3w")
+
+    def test_field_boundaries(self):
+        """Test non-Thai stretches become single segments around Thai tokens."""
+        text = "Hello การศึกษาไทย 2024"
+        boundaries = field_boundaries(text, [["การศึกษา", "ไทย"]])
+
+        assert boundaries == [0, 6, 14, 17, 22]
+
+    def test_stored_segments(self):
+        """Test segments are rebuilt and stale offsets are ignored."""
+        encoded = encode_boundaries([0, 8, 11])
+
+        assert stored_segments("การศึกษาไทย", encoded) == [(0, 8, "การศึกษา"), (8, 11, "ไทย")]
+        assert stored_segments("การศึกษาไทยใหม่", encoded) is None
+        assert stored_segments("การศึกษาไทย", None) is None
+
+
+class TestDocumentProcessorOffsets:
+    """Test cases for storing offsets while processing documents."""
+
+    @pytest.mark.asyncio
+    async def test_offsets_stored_per_field(self):
+        """Test each field gets boundaries matching its own text."""
+        processor = DocumentProcessor()
+        document = {"id": "1", "title": "การศึกษาไทย", "content": "Hello ระบบการศึกษา"}
+
+        processed = await processor.process_document(document)
+
+        assert set(processed.token_offsets) == {"title", "content"}
+        for field in ("title", "content"):
+            segments = stored_segments(document[field], processed.token_offsets[field])
+            assert "".join(segment for _, _, segment in segments) == document[field]
+
+    @pytest.mark.asyncio
+    async def test_no_offsets_without_thai(self):
+        """Test documents without Thai content store no offsets."""
+        processed = await DocumentProcessor().process_document({"id": "1", "title": "Hello"})
+
+        assert processed.token_offsets is None
+
+
+class TestEnhancerOffsets:
+    """Test cases for highlighting from stored offsets."""
+
+    HIT = {
+        "id": "1",
+        "title": "การศึกษาไทย",
+        TOKEN_OFFSETS_FIELD: {"title": encode_boundaries([0, 8, 11])}
+    }
+
+    def test_stored_offsets_skip_segmentation(self):
+        """Test hits with stored offsets are never re-segmented."""
+        enhancer = SearchResultEnhancer()
+        query_analysis = {"compound_tokens": [], "partial_tokens": ["การศึก"]}
+
+        with patch.object(enhancer.thai_segmenter, "segment_text") as mock_segment:
+            enhanced = enhancer._enhance_single_hit(self.HIT, query_analysis, ["title"])
+
+        mock_segment.assert_not_called()
+        assert enhanced.tokenized_text["title"] == "การศึกษา|ไทย|"
+        assert [(span.start, span.end) for span in enhanced.highlight_spans] == [(0, 8)]
+
+    def test_stale_offsets_fall_back_to_segmentation(self):
+        """Test a field changed since indexing is segmented once."""
+        enhancer = SearchResultEnhancer()
+        hit = {**self.HIT, "title": "ระบบการศึกษาไทย"}
+        query_analysis = {"compound_tokens": [], "partial_tokens": ["การศึก", "ระบ"]}
+
+        enhanced = enhancer._enhance_single_hit(hit, query_analysis, ["title"])
+
+        assert enhancer.segmented_fields == 1
+        assert enhanced.tokenized_text["title"].startswith("ระบบ|")
+
+
+class TestEnhanceEndpoint:
+    """Test cases for the /search/enhance endpoint."""
+
+    def test_full_enhancement(self):
+        """Test the endpoint returns enhanced hits instead of placeholders."""
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        enhancer = SearchResultEnhancer()
+        app.dependency_overrides[get_result_enhancer] = lambda: enhancer
+        client = TestClient(app)
+
+        response = client.post("/api/v1/search/enhance", json={
+            "search_results": {"hits": [TestEnhancerOffsets.HIT]},
+            "original_query": "การศึกษา",
+            "highlight_fields": ["title"]
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enhancement_metadata"]["status"] == "enhanced"
+        hit = data["enhanced_hits"][0]
+        assert hit["tokenized_text"] == {"title": "การศึกษา|ไทย|"}
+        assert enhancer.get_stats()["stored_offset_hits"] == 1
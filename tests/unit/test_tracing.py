@@ -0,0 +1,190 @@
+"""
+Unit tests for span tracing and OTLP/JSON export.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.meilisearch_integration.client import MeiliSearchClient
+from src.search_proxy.models.query import QueryVariant, QueryVariantType
+from src.search_proxy.services.search_executor import SearchExecutor, SearchExecutorConfig
+from src.utils.logging import correlation_id_var
+from src.utils.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    NOOP_SPAN,
+    Tracer,
+    encode_otlp,
+    start_span,
+    trace_id_for,
+)
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter, monkeypatch):
+    tracer = Tracer()
+    tracer.configure(sample_rate=1.0, slow_threshold_ms=None, exporter=exporter)
+    monkeypatch.setattr("src.utils.tracing.tracer", tracer)
+    yield tracer
+    tracer.shutdown()
+
+
+def span_names(exporter):
+    return sorted(span["name"] for span in exporter.spans)
+
+
+class TestTracer:
+    """Test cases for Tracer."""
+
+    def test_disabled_tracer_returns_noop_span(self):
+        """Test nothing is recorded until tracing is configured."""
+        assert Tracer().start_span("search", root=True) is NOOP_SPAN
+
+    def test_no_span_outside_of_trace(self, tracer):
+        """Test child spans are not started without an active trace."""
+        assert start_span("tokenize") is NOOP_SPAN
+
+    def test_trace_id_from_correlation_id(self):
+        """Test UUID correlation IDs become the trace ID."""
+        assert trace_id_for("0f8fad5b-d9cb-469f-a165-70867728950e") == "0f8fad5bd9cb469fa16570867728950e"
+        assert len(trace_id_for("req-42")) == 32
+        assert trace_id_for("req-42") == trace_id_for("req-42")
+
+    @pytest.mark.asyncio
+    async def test_nested_spans(self, tracer, exporter):
+        """Test spans in child tasks share the trace and nest under their parent."""
+        async def variant(name):
+            with start_span("search.variant", {"variant_type": name}):
+                await asyncio.sleep(0)
+
+        token = correlation_id_var.set("0f8fad5b-d9cb-469f-a165-70867728950e")
+        try:
+            with start_span("search", root=True):
+                with start_span("search.execute"):
+                    await asyncio.gather(variant("original"), variant("tokenized"))
+        finally:
+            correlation_id_var.reset(token)
+        tracer.flush()
+
+        spans = {span["name"]: span for span in exporter.spans}
+        assert span_names(exporter) == ["search", "search.execute", "search.variant", "search.variant"]
+        assert {span["traceId"] for span in exporter.spans} == {"0f8fad5bd9cb469fa16570867728950e"}
+        assert "parentSpanId" not in spans["search"]
+        assert spans["search.execute"]["parentSpanId"] == spans["search"]["spanId"]
+        assert spans["search.variant"]["parentSpanId"] == spans["search.execute"]["spanId"]
+
+    def test_tail_sampling(self, tracer, exporter):
+        """Test unsampled traces are only exported when slow or failed."""
+        tracer.sample_rate = 0.0
+        tracer.slow_threshold_ms = 20
+
+        with start_span("fast", root=True):
+            pass
+        with start_span("slow", root=True):
+            time.sleep(0.03)
+        with pytest.raises(ValueError):
+            with start_span("failed", root=True):
+                with start_span("tokenize"):
+                    raise ValueError("boom")
+        tracer.flush()
+
+        assert span_names(exporter) == ["failed", "slow", "tokenize"]
+        assert tracer.tail_sampled_traces == 2
+        failed = next(span for span in exporter.spans if span["name"] == "tokenize")
+        assert failed["status"]["code"] == 2
+        assert failed["events"][0]["name"] == "exception"
+
+    def test_span_limit(self, tracer, exporter):
+        """Test spans beyond the per-trace limit are dropped and counted."""
+        tracer.max_spans_per_trace = 3
+
+        with start_span("search", root=True):
+            for _ in range(5):
+                with start_span("tokenize"):
+                    pass
+        tracer.flush()
+
+        assert len(exporter.spans) == 3
+        root = next(span for span in exporter.spans if span["name"] == "search")
+        assert {"key": "dropped_spans", "value": {"intValue": "3"}} in root["attributes"]
+
+
+class TestOTLPExport:
+    """Test cases for OTLP/JSON encoding and exporters."""
+
+    def test_encoding(self, tracer):
+        """Test spans are encoded in the OTLP/JSON layout."""
+        with start_span("search", {"index": "docs", "hits": 3, "score": 0.5, "cached": False}, root=True) as span:
+            span.add_event("retry", {"attempt": 1})
+
+        payload = encode_otlp([[span]], {"service.name": "thai-search-proxy"})
+
+        resource = payload["resourceSpans"][0]
+        assert resource["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "thai-search-proxy"}}
+        ]
+        encoded = resource["scopeSpans"][0]["spans"][0]
+        assert len(encoded["traceId"]) == 32 and len(encoded["spanId"]) == 16
+        assert int(encoded["endTimeUnixNano"]) >= int(encoded["startTimeUnixNano"])
+        assert encoded["kind"] == 1
+        assert {"key": "hits", "value": {"intValue": "3"}} in encoded["attributes"]
+        assert {"key": "score", "value": {"doubleValue": 0.5}} in encoded["attributes"]
+        assert {"key": "cached", "value": {"boolValue": False}} in encoded["attributes"]
+        assert encoded["events"][0]["name"] == "retry"
+
+    def test_file_exporter(self, tmp_path):
+        """Test the file exporter writes one JSON document per line."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = Tracer()
+        tracer.configure(sample_rate=1.0, exporter=FileSpanExporter(str(path)))
+        try:
+            for _ in range(2):
+                with tracer.start_span("search", root=True):
+                    pass
+        finally:
+            tracer.shutdown()
+
+        documents = [json.loads(line) for line in path.read_text().splitlines()]
+        assert sum(
+            len(scope["spans"])
+            for document in documents
+            for resource in document["resourceSpans"]
+            for scope in resource["scopeSpans"]
+        ) == 2
+        assert tracer.exported_traces == 2
+
+
+class TestSearchExecutorTracing:
+    """Test cases for spans recorded by the search executor."""
+
+    @pytest.mark.asyncio
+    async def test_variant_semaphore_and_retry_spans(self, tracer, exporter):
+        """Test variant searches record semaphore waits and retry waits."""
+        client = AsyncMock(spec=MeiliSearchClient)
+        client.search.side_effect = [ConnectionError("reset"), {"hits": [], "estimatedTotalHits": 0}]
+        executor = SearchExecutor(client, SearchExecutorConfig(max_retries=1, retry_delay_ms=1))
+        variant = QueryVariant(
+            query_text="สวัสดี",
+            variant_type=QueryVariantType.ORIGINAL,
+            tokenization_engine="newmm",
+            weight=1.0
+        )
+
+        with start_span("search", root=True):
+            results = await executor.execute_parallel_searches([variant], "docs")
+        tracer.flush()
+
+        assert results[0].success
+        assert span_names(exporter) == ["retry.wait", "search", "search.variant", "semaphore.wait"]
+        spans = {span["name"]: span for span in exporter.spans}
+        assert spans["retry.wait"]["parentSpanId"] == spans["search.variant"]["spanId"]
+        assert spans["search.variant"]["events"][0]["name"] == "retry"
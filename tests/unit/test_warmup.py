@@ -0,0 +1,159 @@
+"""
+Unit tests for the startup warm-up and readiness gating.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.endpoints.health import router
+from src.api.endpoints.metrics import prometheus_metrics
+from src.api.warmup import StartupWarmup, top_queries
+from src.tokenizer.config_manager import ThaiTokenizerSettings
+
+
+@pytest.fixture
+def settings():
+    return ThaiTokenizerSettings(warmup_search_proxy=False, warmup_queries=["ร้านอาหาร"])
+
+
+class TestStartupWarmup:
+    """Test cases for StartupWarmup."""
+
+    @pytest.mark.asyncio
+    async def test_steps_are_timed(self, settings, monkeypatch):
+        """Test every step is recorded and a failing step does not stop the rest."""
+        warmup = StartupWarmup()
+
+        async def broken(queries):
+            raise RuntimeError("dictionary missing")
+
+        monkeypatch.setattr(StartupWarmup, "_configured_engines", staticmethod(lambda settings: ["newmm"]))
+        monkeypatch.setattr(StartupWarmup, "_warm_query_processor", staticmethod(broken))
+
+        await warmup.run(settings)
+
+        assert warmup.status == "complete"
+        assert warmup.ready
+        assert [step.name for step in warmup.steps] == ["tokenizer", "engine:newmm", "query_processor"]
+        assert warmup.failed_steps == ["query_processor"]
+        assert "dictionary missing" in warmup.steps[-1].error
+        assert all(step.duration_ms >= 0 for step in warmup.steps)
+
+    @pytest.mark.asyncio
+    async def test_unavailable_engine_fails_its_step(self, settings):
+        """Test an engine that falls back to character segmentation is reported."""
+        warmup = StartupWarmup()
+
+        await warmup._step("engine:unknown", lambda: warmup._warm_engine("no-such-engine", ["ทดสอบ"]))
+
+        assert warmup.failed_steps == ["engine:unknown"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_marks_ready(self, monkeypatch):
+        """Test a warm-up that takes too long still lets the worker become ready."""
+        warmup = StartupWarmup()
+
+        async def slow(self, settings):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(StartupWarmup, "_run_steps", slow)
+
+        await warmup.run(ThaiTokenizerSettings(warmup_timeout_seconds=0.05))
+
+        assert warmup.status == "timed_out"
+        assert warmup.ready
+
+    def test_disabled(self):
+        """Test a disabled warm-up never holds readiness back."""
+        warmup = StartupWarmup()
+
+        warmup.start(ThaiTokenizerSettings(warmup_enabled=False))
+
+        assert warmup.status == "disabled"
+        assert warmup.ready
+
+    @pytest.mark.asyncio
+    async def test_warmup_searches_are_not_recorded(self, monkeypatch):
+        """Test warm-up searches stay out of metrics and query analytics."""
+        from src.meilisearch_integration.client import MeiliSearchClient
+        from src.search_proxy.analytics import analytics_collector
+        from src.search_proxy.config.settings import get_development_settings
+        from src.search_proxy.metrics import metrics_collector
+        from src.search_proxy.services.search_proxy_service import SearchProxyService
+
+        client = AsyncMock(spec=MeiliSearchClient)
+        client.health_check.return_value = {"status": "healthy"}
+        client.search.return_value = {"hits": [], "estimatedTotalHits": 0}
+        service = SearchProxyService(get_development_settings(), client)
+        await service.initialize()
+
+        async def get_service():
+            return service
+
+        monkeypatch.setattr("src.api.endpoints.search_proxy.get_search_proxy_service", get_service)
+        recorded = []
+        monkeypatch.setattr(analytics_collector, "record_search", lambda **kwargs: recorded.append(kwargs))
+        monkeypatch.setattr(metrics_collector, "record_search_request", lambda **kwargs: recorded.append(kwargs))
+
+        details = await StartupWarmup._search(ThaiTokenizerSettings(), ["ร้านกาแฟ"])
+
+        assert details["succeeded"] == 1
+        assert recorded == []
+
+    def test_top_queries_from_export(self, tmp_path, monkeypatch):
+        """Test replayed queries include exported patterns of earlier workers."""
+        from src.search_proxy.analytics import analytics_collector
+
+        (tmp_path / "query_patterns_20260101_000000.json").write_text(json.dumps([
+            {"query": "old", "frequency": 50, "success_rate": 1.0},
+            {"query": "failing", "frequency": 90, "success_rate": 0.1},
+            {"query": "ร้านกาแฟ", "frequency": 20, "success_rate": 0.9}
+        ]))
+        monkeypatch.setattr(analytics_collector, "analytics_dir", tmp_path)
+        monkeypatch.setattr(analytics_collector, "get_query_frequencies", lambda limit: {"recent": 30})
+
+        assert top_queries(3) == ["old", "recent", "ร้านกาแฟ"]
+
+
+class TestReadinessGating:
+    """Test cases for readiness while warming up."""
+
+    @pytest.fixture
+    def warmup(self, monkeypatch):
+        warmup = StartupWarmup()
+        monkeypatch.setattr("src.api.endpoints.health.startup_warmup", warmup)
+        monkeypatch.setattr("src.api.endpoints.metrics.startup_warmup", warmup)
+        monkeypatch.setattr("src.api.endpoints.health.health_checker.checks", {})
+        return warmup
+
+    def test_not_ready_while_warming_up(self, warmup):
+        """Test the readiness probe returns 503 until the warm-up finishes."""
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        client = TestClient(app)
+
+        warmup.status = "running"
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 503
+        assert response.json()["reason"] == "warming_up"
+
+        warmup.status = "complete"
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 200
+        assert response.json()["warmup"]["status"] == "complete"
+
+    @pytest.mark.asyncio
+    async def test_prometheus_metrics(self, warmup, settings, monkeypatch):
+        """Test step timings are exported."""
+        monkeypatch.setattr(StartupWarmup, "_configured_engines", staticmethod(lambda settings: []))
+
+        await warmup.run(settings)
+        text = "\n".join(prometheus_metrics.format_warmup_metrics())
+
+        assert "thai_tokenizer_warmup_complete 1" in text
+        assert 'thai_tokenizer_warmup_step_duration_seconds{step="tokenizer",outcome="success"}' in text